@@ -0,0 +1,5 @@
+"""
+@Title: AI Package
+@Description: MCP 서버 및 Gemini 기반 리포트 생성 에이전트
+@Author: Allen & Gemini
+"""
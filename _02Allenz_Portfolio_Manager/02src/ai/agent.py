@@ -1,112 +1,230 @@
 """
 @Title: Portfolio AI Agent (Multimodal PDF Native Support)
-@Description: Fetches data & PDF paths via MCP, uploads PDFs to Gemini via File API, and generates report.
+@Description: Fetches data & PDF paths via MCP, uploads PDFs to Gemini via File API, and generates reports.
+              여러 기간(월)을 제한된 동시성으로 일괄 생성하며, PDF 업로드(내용 해시)와 생성 결과(프롬프트 + 데이터 해시)를 캐시합니다.
 @Author: Allen & Gemini
 """
 
 import os
 import sys
+import time
 import asyncio
+import argparse
+import calendar
 import logging
-from datetime import datetime
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Google GenAI Native SDK
-from google import genai
+from typing import Dict, List
 
 from mcp.client.stdio import stdio_client, StdioServerParameters
 from mcp.client.session import ClientSession
 
-from prompts import SYSTEM_PROMPT, MASTER_REPORT_PROMPT
+import config
+from ai.llm import LLMClient, GeminiClient, FakeLLMClient, UploadCache, ResponseCache, file_sha256, estimate_tokens
+from ai.prompts import SYSTEM_PROMPT, MASTER_REPORT_PROMPT
 
-# 설정 로드
-load_dotenv()
 MODULE_TAG = "[AI Agent]"
-CURRENT_DIR = Path(__file__).resolve().parent
-ROOT_DIR = CURRENT_DIR.parent.parent
+ROOT_DIR = config.BASE_DIR
 OUTPUT_DIR = ROOT_DIR / "03Output"
-LOG_DIR = ROOT_DIR / "logs"
-SERVER_SCRIPT_PATH = CURRENT_DIR / "mcp_server.py"
+CACHE_DIR = OUTPUT_DIR / ".ai_cache"
+SERVER_MODULE = "ai.mcp_server"
+DEFAULT_CONCURRENCY = 3
 
-LOG_DIR.mkdir(exist_ok=True)
-log_file = LOG_DIR / f"ai_agent_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
-                    handlers=[logging.FileHandler(log_file, encoding="utf-8"), logging.StreamHandler(sys.stdout)])
 logger = logging.getLogger(__name__)
 
-async def generate_report():
-    logger.info(f"🚀 {MODULE_TAG} 파이프라인 가동 (Native PDF + MCP)")
 
-    if "GOOGLE_API_KEY" not in os.environ:
-        logger.error("❌ GOOGLE_API_KEY 환경 변수가 없습니다 (.env 확인).")
-        sys.exit(1)
+@dataclass(frozen=True)
+class ReportPeriod:
+    """리포트 한 건의 대상 기간 (label: 'YYYY-MM')"""
+    label: str
+    start_date: str
+    end_date: str
+
+    @property
+    def output_file(self) -> Path:
+        return OUTPUT_DIR / f"{self.label.replace('-', '_')}_Integrated_Report.md"
+
+
+def month_periods(first_month: str, last_month: str) -> List[ReportPeriod]:
+    """'YYYY-MM' 범위의 월별 기간 목록을 생성합니다. (양 끝 포함)"""
+    year, month = map(int, first_month.split('-'))
+    last_year, last_mon = map(int, last_month.split('-'))
+    periods = []
+    while (year, month) <= (last_year, last_mon):
+        last_day = calendar.monthrange(year, month)[1]
+        periods.append(ReportPeriod(f"{year:04d}-{month:02d}", date(year, month, 1).isoformat(),
+                                    date(year, month, last_day).isoformat()))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
 
-    # 1. Google GenAI 클라이언트 초기화
-    client = genai.Client()
-    server_params = StdioServerParameters(command=sys.executable, args=[str(SERVER_SCRIPT_PATH)])
 
+def setup_logging() -> None:
+    """실행 시점에 로그 파일 핸들러를 구성합니다. (import 시 logs/ 생성 부작용 방지)"""
+    config.LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_file = config.LOG_DIR / f"ai_agent_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        handlers=[logging.FileHandler(log_file, encoding="utf-8"), logging.StreamHandler(sys.stdout)])
+
+
+@contextmanager
+def phase(name: str, timings: Dict[str, float]):
+    """단계별 소요 시간을 기록합니다. (리포트 생성 총 시간이 어느 의존성에 묶여 있는지 확인용)"""
+    start_time = time.perf_counter()
     try:
-        async with stdio_client(server_params) as (read_stream, write_stream):
-            async with ClientSession(read_stream, write_stream) as session:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start_time
+        logger.info(f"⏱️ {MODULE_TAG} {name}: {timings[name]:.2f}초")
+
+
+async def upload_references(client: LLMClient, upload_cache: UploadCache, paths: List[Path]) -> List[str]:
+    """PDF 레퍼런스를 스레드 풀에서 동시에 업로드합니다. (내용이 같고 만료 전이면 기존 업로드 재사용)"""
+    return list(await asyncio.gather(*(asyncio.to_thread(upload_cache.get_or_upload, client, path) for path in paths)))
+
+
+async def generate_reports(periods: List[ReportPeriod], client: LLMClient,
+                           concurrency: int = DEFAULT_CONCURRENCY, force: bool = False) -> Dict[str, str]:
+    """
+    여러 기간의 리포트를 한 번의 MCP 세션에서 생성합니다.
+
+    Args:
+        periods (List[ReportPeriod]): 대상 기간
+        client (LLMClient): LLM 클라이언트 (Gemini 또는 Fake)
+        concurrency (int): 동시에 처리할 기간 수 (도구 호출 + 생성)
+        force (bool): True면 응답 캐시를 무시하고 다시 생성
+
+    Returns:
+        Dict[str, str]: {기간 label: 'generated' / 'cached' / 'failed'}
+    """
+    if not periods:
+        logger.warning(f"⚠️ {MODULE_TAG} 생성할 기간이 없습니다.")
+        return {}
+    server_params = StdioServerParameters(command=sys.executable, args=['-m', SERVER_MODULE], env=config.subprocess_env())
+    upload_cache = UploadCache(CACHE_DIR / "uploads.json")
+    response_cache = ResponseCache(CACHE_DIR / "responses")
+    timings: Dict[str, float] = {}
+    status: Dict[str, str] = {}
+    total_start = time.perf_counter()
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    async with stdio_client(server_params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            with phase("MCP 접속", timings):
                 await session.initialize()
-                logger.info("✅ MCP 서버 접속 성공!")
-
-                # 2. Resource (PDF 파일 경로) 수집
-                logger.info("📂 레퍼런스(PDF) 경로 수집 중...")
-                res_fact = await session.read_resource("resource://reference/factsheet_pdf")
-                res_phil = await session.read_resource("resource://reference/philosophy_pdf")
-                factsheet_path = res_fact.contents[0].text
-                philosophy_path = res_phil.contents[0].text
-
-                # 3. Tool (정량 데이터 CSV) 수집
-                logger.info("⚙️ 포트폴리오 성과 데이터 추출 중...")
-                perf_result = await session.call_tool("get_performance_vs_benchmarks", arguments={"target_month": "2025-01"})
-                hold_result = await session.call_tool("get_current_holdings_and_cash", arguments={})
-                change_result = await session.call_tool("get_key_portfolio_changes", arguments={"start_date": "2025-01-02", "end_date": "2025-01-31"})
-
-                perf_data = perf_result.content[0].text
-                hold_data = hold_result.content[0].text
-                change_data = change_result.content[0].text
-
-        # 4. PDF 구글 서버 업로드 (File API)
-        logger.info("📤 PDF 레퍼런스를 Gemini 서버로 전송 중...")
-        fact_file_obj = client.files.upload(file=factsheet_path)
-        phil_file_obj = client.files.upload(file=philosophy_path)
-
-        # 5. 프롬프트 조립 및 생성 요청 (멀티모달)
-        logger.info(f"🧠 Gemini-2.5-pro 모델이 PDF 레이아웃과 데이터를 분석하여 딥 밸류 서한을 집필 중입니다...")
-
-        final_prompt_text = MASTER_REPORT_PROMPT.format(
-            performance_data=perf_data,
-            holdings_data=hold_data,
-            portfolio_changes=change_data
-        )
-
-        # Flash 대신 가장 똑똑한 Pro 모델로 변경!
-        response = client.models.generate_content(
-            model='gemini-2.5-pro',
-            contents=[
-                SYSTEM_PROMPT,
-                fact_file_obj,  # 업로드된 Factsheet PDF 객체 전달
-                phil_file_obj,  # 업로드된 Letter PDF 객체 전달
-                final_prompt_text
-            ]
-        )
-
-        # 6. 파일 저장
-        output_file = OUTPUT_DIR / "2025_01_Integrated_Report.md"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(response.text)
-
-        logger.info(f"🎉 리포트 생성 완료! 파일 위치: {output_file.relative_to(ROOT_DIR)}")
-
-        # (선택) 구글 서버에 업로드된 임시 파일 삭제
-        client.files.delete(name=fact_file_obj.name)
-        client.files.delete(name=phil_file_obj.name)
-
-    except Exception as e:
-        logger.error(f"❌ 오류 발생: {e}", exc_info=True)
+            logger.info("✅ MCP 서버 접속 성공!")
+
+            # 1. Resource (PDF 파일 경로) 동시 수집
+            logger.info("📂 레퍼런스(PDF) 경로 수집 중...")
+            with phase("레퍼런스 경로 수집", timings):
+                res_fact, res_phil = await asyncio.gather(
+                    session.read_resource("resource://reference/factsheet_pdf"),
+                    session.read_resource("resource://reference/philosophy_pdf"),
+                )
+            pdf_paths = [Path(res_fact.contents[0].text), Path(res_phil.contents[0].text)]
+
+            # 2. PDF 업로드(캐시 확인 포함)를 백그라운드로 시작하고, 그동안 기간별 데이터를 수집
+            logger.info("📤 PDF 레퍼런스 업로드 확인 중... (데이터 수집과 병행)")
+            upload_task = asyncio.create_task(upload_references(client, upload_cache, pdf_paths))
+            attachment_hashes = await asyncio.gather(*(asyncio.to_thread(file_sha256, p) for p in pdf_paths))
+
+            # 파이프라인이 미리 계산한 요약(08)을 사용 - 현재 보유 현황은 기간과 무관하므로 한 번만 조회
+            hold_result = await session.call_tool("get_report_digest", arguments={"period": periods[0].label, "section": "holdings"})
+            hold_data = hold_result.content[0].text
+            semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+            async def run_period(period: ReportPeriod) -> str:
+                async with semaphore:
+                    period_start = time.perf_counter()
+                    perf_result, change_result = await asyncio.gather(
+                        session.call_tool("get_report_digest", arguments={"period": period.label, "section": "performance"}),
+                        session.call_tool("get_report_digest", arguments={"period": period.label, "section": "changes"}),
+                    )
+                    sections = {
+                        'performance_data': perf_result.content[0].text,
+                        'holdings_data': hold_data,
+                        'portfolio_changes': change_result.content[0].text,
+                    }
+                    final_prompt_text = MASTER_REPORT_PROMPT.format(**sections)
+                    token_usage = {name: estimate_tokens(text) for name, text in sections.items()}
+                    logger.info(f"📏 [{period.label}] 프롬프트 토큰(추정): "
+                                + " / ".join(f"{name} {n}" for name, n in token_usage.items())
+                                + f" / 전체 {estimate_tokens(final_prompt_text)}")
+
+                    # 모델 + 프롬프트 + 첨부 내용이 같으면 이전 결과를 재사용
+                    key = ResponseCache.key(client.model, SYSTEM_PROMPT, attachment_hashes, final_prompt_text)
+                    text = None if force else response_cache.get(key)
+                    result = 'cached'
+                    if text is None:
+                        file_names = await upload_task
+                        logger.info(f"🧠 [{period.label}] {client.model} 모델이 PDF 레이아웃과 데이터를 분석하여 딥 밸류 서한을 집필 중입니다...")
+                        text = await asyncio.to_thread(client.generate, SYSTEM_PROMPT, file_names, final_prompt_text)
+                        response_cache.put(key, text)
+                        result = 'generated'
+
+                    period.output_file.write_text(text, encoding="utf-8")
+                    logger.info(f"🎉 [{period.label}] 리포트 {'생성' if result == 'generated' else '캐시 재사용'} 완료! "
+                                f"파일 위치: {period.output_file.relative_to(ROOT_DIR)} ({time.perf_counter() - period_start:.2f}초)")
+                    return result
+
+            with phase(f"기간별 리포트 ({len(periods)}건, 동시 {concurrency})", timings):
+                results = await asyncio.gather(*(run_period(p) for p in periods), return_exceptions=True)
+
+            if not upload_task.done():
+                upload_task.cancel()
+
+    for period, result in zip(periods, results):
+        if isinstance(result, BaseException):
+            logger.error(f"❌ [{period.label}] 리포트 생성 실패: {result}", exc_info=result)
+            status[period.label] = 'failed'
+        else:
+            status[period.label] = result
+
+    counts = {s: list(status.values()).count(s) for s in ('generated', 'cached', 'failed')}
+    logger.info(f"ℹ️ {MODULE_TAG} 생성 {counts['generated']} / 캐시 {counts['cached']} / 실패 {counts['failed']} "
+                f"(총 {time.perf_counter() - total_start:.2f}초)")
+    return status
+
+
+def _month_arg(value: str) -> str:
+    """'YYYY-MM' 인자를 검증하고 0을 채운 형식으로 정규화합니다. (월 범위를 문자열로 비교)"""
+    try:
+        return datetime.strptime(value, '%Y-%m').strftime('%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'YYYY-MM' 형식이 아닙니다: {value}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Allenz 포트폴리오 AI 리포트 일괄 생성")
+    parser.add_argument('--from', dest='first_month', type=_month_arg, default="2025-01", help="첫 월 (YYYY-MM)")
+    parser.add_argument('--to', dest='last_month', type=_month_arg, default=None, help="마지막 월 (YYYY-MM, 기본값: 첫 월)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시 처리 기간 수")
+    parser.add_argument('--force', action='store_true', help="응답 캐시를 무시하고 다시 생성")
+    parser.add_argument('--fake', action='store_true', help="네트워크 없이 로컬 가짜 모델로 실행 (테스트용)")
+    parser.add_argument('--model', default=None, help="Gemini 모델 이름 (기본값: gemini-2.5-pro)")
+    args = parser.parse_args(argv)
+    args.last_month = args.last_month or args.first_month
+    if args.last_month < args.first_month:
+        parser.error(f"--to({args.last_month})가 --from({args.first_month})보다 앞섭니다.")
+    return args
+
 
 if __name__ == "__main__":
-    asyncio.run(generate_report())
\ No newline at end of file
+    from dotenv import load_dotenv
+    load_dotenv()
+    setup_logging()
+    args = parse_args()
+
+    if args.fake:
+        llm_client = FakeLLMClient()
+    else:
+        if "GOOGLE_API_KEY" not in os.environ:
+            logger.error("❌ GOOGLE_API_KEY 환경 변수가 없습니다 (.env 확인).")
+            sys.exit(1)
+        llm_client = GeminiClient(args.model) if args.model else GeminiClient()
+
+    logger.info(f"🚀 {MODULE_TAG} 파이프라인 가동 (Native PDF + MCP, 모델: {llm_client.model})")
+    report_periods = month_periods(args.first_month, args.last_month)
+    final_status = asyncio.run(generate_reports(report_periods, llm_client, args.concurrency, args.force))
+    sys.exit(1 if 'failed' in final_status.values() else 0)
@@ -0,0 +1,126 @@
+"""
+@Title: MCP Data Store
+@Description: MCP 서버 도구들이 공유하는 프로세스 내 아티팩트 캐시.
+              정제 데이터(01~07)를 아티팩트당 한 번만 로드하여 타입 변환(날짜/숫자)과 Date 인덱스(오름차순)를 적용해 보관하고,
+              파일 지문(매니페스트 해시 또는 크기/수정시각)이 바뀐 아티팩트만 다시 읽습니다.
+              리포트 세션 중 반복되는 도구 호출은 디스크 파싱 없이 메모리 조회로 응답합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+from pipeline.manifest import read_artifact_tokens
+
+# 2. Constants
+MODULE_TAG = "[MCP: DataStore]"
+
+# Date 인덱스를 적용할 시계열 아티팩트 (PROCESSED_FILES 키)
+DATE_INDEXED = ('asset', 'ledger', 'performance', 'benchmark', 'timeline')
+
+
+@dataclass(frozen=True)
+class _Entry:
+    token: str
+    df: Any  # DataFrame (CSV) 또는 dict (JSON 요약)
+    loaded_at: float
+
+
+# 3. Helper Functions
+def _load(path) -> Any:
+    """CSV는 DataFrame으로, JSON 아티팩트(리포트 요약 등)는 dict로 로드합니다."""
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return local_io.load_csv(path)
+
+
+def _prepare(key: str, df: pd.DataFrame) -> pd.DataFrame:
+    """시계열 아티팩트에 Date 인덱스를 적용합니다. (중복 날짜는 첫 행 유지, 오름차순 정렬)"""
+    if key not in DATE_INDEXED or not isinstance(df, pd.DataFrame) or 'Date' not in df.columns:
+        return df
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df = df.dropna(subset=['Date'])
+    df = df[~df['Date'].duplicated(keep='first')]
+    return df.set_index('Date').sort_index()
+
+
+# 4. Main Logic
+class ArtifactStore:
+    """
+    지문 기반 무효화 아티팩트 캐시 (스레드 안전)
+
+    Attributes:
+        loads: 디스크에서 실제로 읽은 횟수
+        hits: 메모리에서 응답한 횟수
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    @staticmethod
+    def path(key: str):
+        return config.PROCESSED_DIR / config.PROCESSED_FILES[key]
+
+    def token(self, key: str) -> str:
+        """아티팩트의 현재 지문 (stat + 매니페스트 조회만 수행)"""
+        return next(iter(read_artifact_tokens([self.path(key)]).values()))
+
+    def exists(self, key: str) -> bool:
+        return self.token(key) != 'missing'
+
+    def get(self, key: str) -> Any:
+        """
+        현재 버전의 아티팩트를 반환합니다. 시계열 아티팩트는 Date 인덱스(DatetimeIndex, 오름차순)를 가지며, JSON 아티팩트는 dict입니다.
+        반환된 DataFrame은 도구 호출 간 공유 객체이므로 수정하지 말고, 변형이 필요하면 copy() 후 사용합니다.
+
+        Raises:
+            FileNotFoundError: 아티팩트 파일이 없을 경우
+        """
+        token = self.token(key)
+        if token == 'missing':
+            raise FileNotFoundError(f"{config.PROCESSED_FILES[key]} missing.")
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.token == token:
+                self.hits += 1
+                return entry.df
+
+            start_time = time.time()
+            df = _prepare(key, _load(self.path(key)))
+            self._entries[key] = _Entry(token, df, time.time())
+            self.loads += 1
+            # stdio MCP 서버에서는 stdout이 프로토콜 채널이므로 로그는 stderr로 출력
+            print(f"ℹ️ {MODULE_TAG} {config.PROCESSED_FILES[key]} 로드 ({len(df)}건, {time.time() - start_time:.3f}초)", file=sys.stderr)
+            return df
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """캐시를 비웁니다. (key가 없으면 전체)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'loads': self.loads, 'hits': self.hits}
+
+
+# 서버 프로세스 전역 저장소 (모든 도구 호출이 공유)
+STORE = ArtifactStore()
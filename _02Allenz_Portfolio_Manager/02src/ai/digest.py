@@ -0,0 +1,194 @@
+"""
+@Title: Report Digest Builder
+@Description: AI 리포트 프롬프트용 압축 요약(08)을 파이프라인 마지막 단계에서 미리 계산합니다.
+              원본 표 덤프 대신 기간 KPI, 상위 변동 종목, 비중 변화, 입출금 합계를 섹션별 토큰 예산 안의 짧은 텍스트로 만들고,
+              월별 + 전체 기간 요약을 JSON으로 저장합니다. MCP 서버는 이 요약을 그대로 제공합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import json
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+
+import config
+from ai import queries
+from ai.data_store import ArtifactStore
+from ai.llm import estimate_tokens
+
+# 2. Constants
+MODULE_TAG = "[Digest]"
+ALL_PERIOD = 'ALL'
+
+# 프롬프트 슬롯별 토큰 예산 (MASTER_REPORT_PROMPT의 Data 1/2/3)
+SECTION_BUDGETS: Dict[str, int] = {
+    'performance': 250,
+    'holdings': 250,
+    'changes': 400,
+}
+SECTIONS = tuple(SECTION_BUDGETS)
+
+# 표시 하한 - 그 이하의 변화는 생략 (비중 %p / 평가금액 원)
+MIN_WEIGHT_CHANGE_PCT = 0.5
+MIN_MOVE_KRW = 10_000
+
+
+# 3. Helper Functions
+def _m(value: float) -> str:
+    """금액을 백만 원 단위의 짧은 문자열로 변환합니다. (예: +6.07M)"""
+    return f"{value / 1e6:+,.2f}M"
+
+
+def _fit(header: str, items: List[str], budget: int, sep: str = ", ") -> str:
+    """
+    항목을 토큰 예산 안에서 최대한 이어 붙입니다. (넘치는 항목은 '외 N개'로 생략)
+    """
+    text = header
+    for i, item in enumerate(items):
+        candidate = text + (sep if i else "") + item
+        rest = f" 외 {len(items) - i - 1}개" if i < len(items) - 1 else ""
+        if estimate_tokens(candidate + rest) > budget:
+            return text + f" 외 {len(items) - i}개" if i else text
+        text = candidate
+    return text
+
+
+def _fit_lines(lines: List[str], budget: int) -> str:
+    """줄 단위로 예산 안에 들어가는 만큼만 남깁니다. (앞쪽 줄이 우선)"""
+    kept = []
+    for line in lines:
+        if estimate_tokens("\n".join(kept + [line])) > budget:
+            break
+        kept.append(line)
+    return "\n".join(kept)
+
+
+# 4. Main Logic
+def performance_section(df_perf: pd.DataFrame, df_bench: pd.DataFrame, start_date: str, end_date: str,
+                        budget: int = SECTION_BUDGETS['performance']) -> str:
+    """기간 KPI + 입출금 합계"""
+    kpis = dict(queries.period_returns(df_perf, df_bench, start_date, end_date).itertuples(index=False, name=None))
+    flows = queries.flow_totals(df_perf, start_date, end_date, 'M').iloc[-1]
+
+    bench = " ".join(f"{t} {kpis[f'{t} 수익률']}" for t in queries.BENCHMARKS if f'{t} 수익률' in kpis)
+    lines = [
+        f"기간 {kpis['기간']}",
+        f"TWR {kpis['Portfolio TWR']} | MDD {kpis['Portfolio MDD']}" + (f" | 벤치마크: {bench}" if bench else ""),
+        f"자산 {kpis['시작 자산']} → {kpis['종료 자산']}원",
+        f"입출금: 순 {_m(flows['순입출금'])} (입금 {_m(flows['입금'])} / 출금 {_m(flows['출금'])}, {int(flows['건수'])}건)",
+    ]
+    return _fit_lines(lines, budget)
+
+
+def changes_section(df_history: pd.DataFrame, start_date: str, end_date: str,
+                    budget: int = SECTION_BUDGETS['changes']) -> str:
+    """
+    상위 변동 종목(평가금액 변화, 매매 포함)과 비중 변화.
+    07에는 종목별 매매 금액이 없으므로 기여도는 평가금액 변화로 근사합니다.
+    """
+    changes = queries.position_changes(df_history, start_date, end_date)
+    start, end = changes.attrs['range']
+    assets = changes[changes['자산'] != 'Cash']
+
+    def mover(row) -> str:
+        status = f"[{row['상태']}]" if row['상태'] != '유지' else ""
+        return f"{row['자산']} {_m(row['변화'])}{status}"
+
+    gainers = [mover(r) for _, r in assets[assets['변화'] >= MIN_MOVE_KRW].iterrows()]
+    losers = [mover(r) for _, r in assets[assets['변화'] <= -MIN_MOVE_KRW].sort_values('변화').iterrows()]
+
+    weight_delta = changes['종료 비중(%)'] - changes['시작 비중(%)']
+    weights = changes.assign(delta=weight_delta).loc[weight_delta.abs() >= MIN_WEIGHT_CHANGE_PCT]
+    weights = weights.reindex(weights['delta'].abs().sort_values(ascending=False).index)
+    weight_items = [f"{r['자산']} {r['시작 비중(%)']:.1f}→{r['종료 비중(%)']:.1f}%" for _, r in weights.iterrows()]
+
+    # 예산을 줄별로 나눠 한 항목이 다른 항목을 밀어내지 않도록 함
+    line_budget = budget // 3
+    lines = [
+        f"스냅샷 {start:%Y-%m-%d} → {end:%Y-%m-%d} (평가금액 변화, 매매 포함)",
+        _fit("증가: ", gainers, line_budget) if gainers else "증가: 없음",
+        _fit("감소: ", losers, line_budget) if losers else "감소: 없음",
+        _fit("비중 변화: ", weight_items, line_budget) if weight_items else "비중 변화: 없음",
+    ]
+    return _fit_lines(lines, budget)
+
+
+def holdings_section(df_full: pd.DataFrame, budget: int = SECTION_BUDGETS['holdings']) -> str:
+    """현재 보유 종목(비중 내림차순) + 현금 비중"""
+    df = df_full.sort_values('보유비중', ascending=False)
+    is_cash = df['종목코드'] == 'CASH' if '종목코드' in df.columns else pd.Series(False, index=df.index)
+    items = [f"{r['종목명']} {r['보유비중']:.1f}% (수익률 {r['수익률']:+.1f}%)" for _, r in df[~is_cash].iterrows()]
+    cash = df.loc[is_cash, '보유비중'].sum()
+    total = pd.to_numeric(df['평가금액'], errors='coerce').sum()
+    header = f"총 평가 {total / 1e6:,.2f}M원 | 현금 {cash:.1f}%\n보유: "
+    return _fit(header, items, budget)
+
+
+def build_period_digest(store: ArtifactStore, start_date: str, end_date: str) -> Dict[str, str]:
+    """한 기간의 performance / changes 섹션을 계산합니다. (holdings는 기간과 무관하여 별도)"""
+    df_bench = store.get('benchmark') if store.exists('benchmark') else store.get('performance').iloc[0:0]
+    return {
+        'performance': performance_section(store.get('performance'), df_bench, start_date, end_date),
+        'changes': changes_section(store.get('timeline'), start_date, end_date),
+    }
+
+
+def month_ranges(index: pd.DatetimeIndex) -> Dict[str, tuple]:
+    """데이터 기간의 월별 (시작일, 종료일) 문자열"""
+    months = pd.period_range(index.min(), index.max(), freq='M')
+    return {str(p): (p.start_time.strftime('%Y-%m-%d'), p.end_time.strftime('%Y-%m-%d')) for p in months}
+
+
+def build_digest(store: ArtifactStore = None) -> Dict:
+    """
+    월별 + 전체 기간 요약을 계산합니다.
+
+    Returns:
+        Dict: {'created_at', 'budgets', 'holdings', 'periods': {label: {'start', 'end', 'performance', 'changes'}}}
+    """
+    store = store or ArtifactStore()
+    index = store.get('performance').index
+    ranges = month_ranges(index)
+    ranges[ALL_PERIOD] = (index.min().strftime('%Y-%m-%d'), index.max().strftime('%Y-%m-%d'))
+
+    periods = {}
+    for label, (start, end) in ranges.items():
+        periods[label] = {'start': start, 'end': end, **build_period_digest(store, start, end)}
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'budgets': SECTION_BUDGETS,
+        'holdings': holdings_section(store.get('full_portfolio')),
+        'periods': periods,
+    }
+
+
+def section_text(digest: Dict, label: str, section: str) -> str:
+    """요약 JSON에서 섹션 텍스트를 꺼냅니다. (holdings는 공통)"""
+    if section == 'holdings':
+        return digest['holdings']
+    return digest['periods'][label][section]
+
+
+def run_digest() -> Dict:
+    """파이프라인 단계 진입점: 요약을 계산하여 08Report_Digest.json으로 저장합니다."""
+    print(f"🚀 {MODULE_TAG} AI 리포트 요약 생성 시작...")
+    digest = build_digest()
+
+    path_digest = config.PROCESSED_DIR / config.PROCESSED_FILES['digest']
+    path_digest.parent.mkdir(parents=True, exist_ok=True)
+    with open(path_digest, 'w', encoding='utf-8') as f:
+        json.dump(digest, f, ensure_ascii=False, indent=1)
+
+    sizes = [estimate_tokens(p[s]) for p in digest['periods'].values() for s in ('performance', 'changes')]
+    print(f"✅ {MODULE_TAG} {len(digest['periods'])}개 기간 요약 저장: {path_digest.name} "
+          f"(섹션당 최대 {max(sizes, default=0)} 토큰, holdings {estimate_tokens(digest['holdings'])} 토큰)")
+    return digest
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    run_digest()
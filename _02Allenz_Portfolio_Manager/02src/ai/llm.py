@@ -0,0 +1,208 @@
+"""
+@Title: LLM Client Abstraction & Caches
+@Description: 리포트 에이전트가 사용하는 LLM 클라이언트 인터페이스(Gemini / 로컬 Fake)와 두 가지 캐시를 제공합니다.
+              - UploadCache: PDF 내용 해시 -> 업로드 파일 이름 (만료 시간 포함). 내용이 같은 PDF는 만료 전까지 한 번만 업로드합니다.
+              - ResponseCache: (모델 + 프롬프트 + 첨부 해시) 해시 -> 생성 결과. 입력이 같은 기간은 다시 생성하지 않습니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import hashlib
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+# 2. Constants
+MODULE_TAG = "[AI: LLM]"
+DEFAULT_MODEL = 'gemini-2.5-pro'
+
+# Gemini File API 업로드 파일은 48시간 후 삭제되므로 여유를 두고 만료 처리
+UPLOAD_TTL_SEC = 47 * 3600
+CHARS_PER_TOKEN = 3  # 한글/숫자 혼합 텍스트 기준의 보수적 추정치
+
+
+# 3. Helper Functions
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 수를 문자 수로 추정합니다. (토크나이저 호출 없이 예산 관리용)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_sha256(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+# 4. Main Logic
+# --- LLM Clients ---
+class LLMClient(Protocol):
+    """
+    리포트 생성에 필요한 최소 LLM 인터페이스
+
+    Attributes:
+        model: 생성 모델 이름 (응답 캐시 키에 포함)
+    """
+    model: str
+
+    def upload(self, path: Path) -> str:
+        """파일을 업로드하고 원격 파일 이름을 반환합니다."""
+        ...
+
+    def file_available(self, name: str) -> bool:
+        """업로드된 원격 파일이 아직 사용 가능한지 확인합니다."""
+        ...
+
+    def generate(self, system_prompt: str, file_names: Sequence[str], prompt: str) -> str:
+        """시스템 프롬프트 + 첨부 파일 + 본문 프롬프트로 텍스트를 생성합니다."""
+        ...
+
+
+class GeminiClient:
+    """google-genai SDK 기반 클라이언트 (File API 업로드 + generate_content)"""
+
+    def __init__(self, model: str = DEFAULT_MODEL):
+        # SDK는 실제 생성 시에만 필요하므로 지연 로드
+        from google import genai
+        self.model = model
+        self._client = genai.Client()
+        self._files: Dict[str, Any] = {}
+
+    def _file(self, name: str):
+        if name not in self._files:
+            self._files[name] = self._client.files.get(name=name)
+        return self._files[name]
+
+    def upload(self, path: Path) -> str:
+        file_obj = self._client.files.upload(file=str(path))
+        self._files[file_obj.name] = file_obj
+        return file_obj.name
+
+    def file_available(self, name: str) -> bool:
+        try:
+            self._files.pop(name, None)
+            return str(getattr(self._file(name), 'state', 'ACTIVE')).endswith('ACTIVE')
+        except Exception:
+            return False
+
+    def generate(self, system_prompt: str, file_names: Sequence[str], prompt: str) -> str:
+        contents = [system_prompt, *(self._file(name) for name in file_names), prompt]
+        return self._client.models.generate_content(model=self.model, contents=contents).text
+
+
+@dataclass
+class FakeLLMClient:
+    """
+    네트워크 없이 동작하는 로컬 가짜 모델 (배치/캐시 동작 검증용). 프롬프트 해시를 포함한 결정적 마크다운을 반환합니다.
+
+    Attributes:
+        latency_sec: 업로드/생성 호출별 인위적 지연
+        uploads / generations: 호출 기록
+    """
+    model: str = 'fake-local'
+    latency_sec: float = 0.0
+    uploads: List[str] = field(default_factory=list)
+    generations: List[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def upload(self, path: Path) -> str:
+        time.sleep(self.latency_sec)
+        with self._lock:
+            self.uploads.append(str(path))
+            return f"files/fake-{len(self.uploads)}"
+
+    def file_available(self, name: str) -> bool:
+        return name.startswith('files/fake-')
+
+    def generate(self, system_prompt: str, file_names: Sequence[str], prompt: str) -> str:
+        time.sleep(self.latency_sec)
+        with self._lock:
+            self.generations.append(prompt)
+        first_line = next((line for line in prompt.splitlines() if line.startswith('###')), '')
+        return (f"# Fake Report ({text_sha256(prompt)[:12]})\n\n"
+                f"- attachments: {', '.join(file_names)}\n- prompt chars: {len(prompt)}\n- {first_line}\n")
+
+
+# --- Caches ---
+class UploadCache:
+    """
+    PDF 내용 해시 -> 업로드 파일 이름 캐시 (JSON 파일에 영속, 만료 시 재업로드)
+
+    Attributes:
+        path: 캐시 JSON 경로
+        ttl_sec: 업로드 유효 시간
+    """
+
+    def __init__(self, path: Path, ttl_sec: float = UPLOAD_TTL_SEC):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        try:
+            self._entries: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._entries, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    def get_or_upload(self, client: LLMClient, path: Path) -> str:
+        """
+        내용이 같은 파일의 유효한 업로드가 있으면 재사용하고, 없으면 업로드합니다.
+
+        Returns:
+            str: 원격 파일 이름
+        """
+        key = f"{client.model}:{file_sha256(path)}"
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry['expires_at'] > time.time() and client.file_available(entry['name']):
+            return entry['name']
+
+        name = client.upload(path)
+        with self._lock:
+            self._entries[key] = {'name': name, 'source': Path(path).name, 'expires_at': time.time() + self.ttl_sec}
+            # 만료된 항목은 저장 시 정리
+            self._entries = {k: v for k, v in self._entries.items() if v['expires_at'] > time.time()}
+            self._save()
+        return name
+
+
+class ResponseCache:
+    """
+    생성 결과 캐시 (디렉터리에 <해시>.md 파일로 저장)
+
+    Attributes:
+        directory: 캐시 디렉터리
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(model: str, system_prompt: str, attachment_hashes: Sequence[str], prompt: str) -> str:
+        return text_sha256(model, system_prompt, *attachment_hashes, prompt)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.directory / f"{key}.md"
+        return path.read_text(encoding='utf-8') if path.exists() else None
+
+    def put(self, key: str, text: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{key}.md.tmp"
+        tmp_path.write_text(text, encoding='utf-8')
+        tmp_path.replace(self.directory / f"{key}.md")
@@ -4,59 +4,129 @@
 @Author: Allen & Gemini
 """
 
-import sys
-import pandas as pd
-from pathlib import Path
 from mcp.server.fastmcp import FastMCP
 
-MODULE_TAG = "[MCP Server]"
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-ROOT_DIR = SRC_DIR.parent
+import config
 
-PROCESSED_DIR = ROOT_DIR / "01DATA" / "processed"
-REFERENCE_DIR = ROOT_DIR / "01DATA" / "reference"
+MODULE_TAG = "[MCP Server]"
 
 mcp = FastMCP("Allenz_Portfolio_Server")
 
 # --- 1. Resources (Returns Absolute File Paths for PDF Uploads) ---
 @mcp.resource("resource://reference/factsheet_pdf")
 def get_factsheet_pdf_path() -> str:
-    pdf_path = REFERENCE_DIR / "RVE-Fact-Sheet-December-2025.pdf"
+    pdf_path = config.REFERENCE_DIR / "RVE-Fact-Sheet-December-2025.pdf"
     if not pdf_path.exists(): raise FileNotFoundError("Factsheet PDF missing.")
     return str(pdf_path)
 
 @mcp.resource("resource://reference/philosophy_pdf")
 def get_philosophy_pdf_path() -> str:
-    pdf_path = REFERENCE_DIR / "Robotti-Company-Advisors-YE-2025-Letter-w-disc.pdf"
+    pdf_path = config.REFERENCE_DIR / "Robotti-Company-Advisors-YE-2025-Letter-w-disc.pdf"
     if not pdf_path.exists(): raise FileNotFoundError("Letter PDF missing.")
     return str(pdf_path)
 
 # --- 2. Tools (Dynamic Data Extractors) ---
+# 데이터 저장소(pandas)는 CSV 도구 호출 시에만 필요하므로 지연 로드 (PDF 경로 리소스는 pandas 없이 응답)
+def _store():
+    from ai.data_store import STORE
+    return STORE
+
+def _table(df) -> str:
+    """Date 인덱스를 'YYYY-MM-DD' 컬럼으로 되돌려 마크다운 표로 변환합니다."""
+    if df.index.name == 'Date':
+        df = df.reset_index()
+        df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
+    return df.to_markdown(index=False)
+
 @mcp.tool()
 def get_performance_vs_benchmarks(target_month: str) -> str:
-    asset_path = PROCESSED_DIR / "01Asset_Summary.csv"
-    bench_path = PROCESSED_DIR / "06Benchmark_Data.csv"
-    if not asset_path.exists() or not bench_path.exists(): raise FileNotFoundError("CSV missing.")
-    df_asset = pd.read_csv(asset_path)
-    return f"### My Data 1: Performance for {target_month}\n" + df_asset.tail(3).to_markdown(index=False)
+    store = _store()
+    if not store.exists('benchmark'): raise FileNotFoundError("CSV missing.")
+    return f"### My Data 1: Performance for {target_month}\n" + _table(store.get('asset').tail(3))
 
 @mcp.tool()
 def get_current_holdings_and_cash() -> str:
-    portfolio_path = PROCESSED_DIR / "03Full_Portfolio.csv"
-    if not portfolio_path.exists(): raise FileNotFoundError("CSV missing.")
-    df = pd.read_csv(portfolio_path)
+    df = _store().get('full_portfolio')
     top_holdings = df.sort_values(by='보유비중', ascending=False).head(10) if '보유비중' in df.columns else df.head(10)
     return "### My Data 2: Current Holdings\n" + top_holdings[['종목명', '보유비중', '수익률', '평가금액']].to_markdown(index=False)
 
 @mcp.tool()
 def get_key_portfolio_changes(start_date: str, end_date: str) -> str:
-    history_path = PROCESSED_DIR / "07Historical_Holdings.csv"
-    if not history_path.exists(): raise FileNotFoundError("CSV missing.")
-    df = pd.read_csv(history_path)
-    start_data = df[df['Date'] == start_date]
-    end_data = df[df['Date'] == end_date]
-    return f"### My Data 3: Changes\n**Start ({start_date}):**\n{start_data.to_markdown(index=False)}\n\n**End ({end_date}):**\n{end_data.to_markdown(index=False)}\n"
+    from ai.queries import asof_date
+    df = _store().get('timeline')
+    # 주말/휴일 날짜는 가장 가까운 이전 스냅샷으로 맞춤
+    start_data = df.loc[[asof_date(df.index, start_date)]]
+    end_data = df.loc[[asof_date(df.index, end_date)]]
+    return f"### My Data 3: Changes\n**Start ({start_date}):**\n{_table(start_data)}\n\n**End ({end_date}):**\n{_table(end_data)}\n"
+
+# --- 3. Range Query Tools (asof 날짜 정렬 + 페이지 단위 응답) ---
+@mcp.tool()
+def get_period_returns(start_date: str, end_date: str) -> str:
+    """Portfolio TWR/MDD/net flows and SPY/QQQ/IWM returns for any date range (YYYY-MM-DD, weekends snap to the prior trading day)."""
+    from ai import queries
+    store = _store()
+    df_bench = store.get('benchmark') if store.exists('benchmark') else store.get('performance').iloc[0:0]
+    result = queries.period_returns(store.get('performance'), df_bench, start_date, end_date)
+    return "### Period Returns\n" + result.to_markdown(index=False)
+
+@mcp.tool()
+def get_top_movers(start_date: str, end_date: str, top_n: int = 5) -> str:
+    """Assets with the largest market value increase/decrease between two dates (cash excluded)."""
+    from ai import queries
+    result = queries.top_movers(_store().get('timeline'), start_date, end_date, min(max(top_n, 1), queries.MAX_ROWS_PER_PAGE // 2))
+    return f"### Top Movers ({start_date} ~ {end_date})\n" + queries.paginate(result)
+
+@mcp.tool()
+def get_position_changes(start_date: str, end_date: str, page: int = 1) -> str:
+    """Per-asset start/end market value and weight with new/closed status. Paginated; request further pages with page=N."""
+    from ai import queries
+    result = queries.position_changes(_store().get('timeline'), start_date, end_date)
+    start, end = result.attrs['range']
+    return f"### Position Changes ({start:%Y-%m-%d} ~ {end:%Y-%m-%d})\n" + queries.paginate(result, page)
+
+@mcp.tool()
+def get_flow_totals(start_date: str, end_date: str, freq: str = 'M', page: int = 1) -> str:
+    """Deposits/withdrawals aggregated by period (freq: D/W/M/Q/Y) with a grand total row. Paginated."""
+    from ai import queries
+    result = queries.flow_totals(_store().get('performance'), start_date, end_date, freq.upper())
+    return f"### External Flows ({freq.upper()})\n" + queries.paginate(result, page)
+
+# --- 4. Report Digest (파이프라인이 미리 계산한 토큰 예산 요약) ---
+@mcp.tool()
+def get_report_digest(period: str, section: str = 'all') -> str:
+    """Compact token-budgeted digest for a month ('YYYY-MM') or 'ALL'. section: performance / holdings / changes / all."""
+    import pandas as pd
+    from ai import digest as report_digest
+    store = _store()
+    sections = report_digest.SECTIONS if section == 'all' else (section,)
+    if not set(sections) <= set(report_digest.SECTIONS):
+        raise ValueError(f"section must be one of {', '.join(report_digest.SECTIONS)}, all")
+
+    digest = store.get('digest') if store.exists('digest') else None
+    if digest is None or period not in digest['periods']:
+        # 미리 계산되지 않은 기간(파이프라인 이전 데이터 등)은 즉시 계산
+        month = pd.Period(period, freq='M')
+        digest = {
+            'holdings': report_digest.holdings_section(store.get('full_portfolio')),
+            'periods': {period: report_digest.build_period_digest(store, month.start_time.strftime('%Y-%m-%d'), month.end_time.strftime('%Y-%m-%d'))},
+        }
+    if len(sections) == 1:
+        return report_digest.section_text(digest, period, sections[0])
+    return "\n\n".join(f"#### {name}\n{report_digest.section_text(digest, period, name)}" for name in sections)
+
+# --- 5. Period Returns Cube (월/분기/연도별 수익률 조회) ---
+@mcp.tool()
+def get_period_return(period: str) -> str:
+    """Precomputed TWR/MWR/flows/benchmark returns for one calendar period: month 'YYYY-MM', quarter 'YYYYQn' or year 'YYYY'."""
+    from ai import queries
+    return f"### Period Return ({period})\n" + queries.cube_period(_store().get('returns_cube'), period).to_markdown(index=False, intfmt=',')
+
+@mcp.tool()
+def get_return_table(freq: str = 'M', year: int = None, page: int = 1) -> str:
+    """Calendar return table (freq: M/Q/Y), optionally filtered to one year. Paginated."""
+    from ai import queries
+    result = queries.cube_table(_store().get('returns_cube'), freq.upper(), year)
+    return f"### Calendar Returns ({freq.upper()})\n" + queries.paginate(result, page)
 
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
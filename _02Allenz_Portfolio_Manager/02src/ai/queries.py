@@ -0,0 +1,220 @@
+"""
+@Title: MCP Range Queries
+@Description: 데이터 저장소의 Date 인덱스(오름차순)를 이용한 기간 조회/집계 함수 모음.
+              요청 날짜는 가장 가까운 이전 거래일로 맞추고(asof), 결과 표는 행/토큰 상한에 맞춰 페이지로 나눕니다.
+              (에이전트가 전체 테이블을 컨텍스트로 가져오지 않도록 서버에서 응답 크기를 제한)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import math
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from ai.llm import estimate_tokens
+
+# 2. Constants
+MODULE_TAG = "[MCP: Queries]"
+BENCHMARKS = ('SPY', 'QQQ', 'IWM')
+
+# 응답 크기 상한 (페이지당 최대 행 수 / 추정 토큰 수)
+MAX_ROWS_PER_PAGE = 30
+MAX_TOKENS_PER_PAGE = 1500
+
+# 흐름 집계 주기 (도구 인자 -> pandas resample 규칙)
+FLOW_FREQS = {'D': 'D', 'W': 'W', 'M': 'ME', 'Q': 'QE', 'Y': 'YE'}
+
+
+# 3. Helper Functions
+def asof_date(index: pd.DatetimeIndex, date_str: str) -> pd.Timestamp:
+    """
+    요청 날짜 이하의 가장 가까운 인덱스 날짜를 반환합니다. (주말/휴일 대응, 시작 전 날짜는 첫 날짜로 보정)
+
+    Raises:
+        ValueError: 날짜 형식이 잘못되었거나 데이터가 비어 있을 경우
+    """
+    if len(index) == 0:
+        raise ValueError("데이터가 비어 있습니다.")
+    try:
+        target = pd.Timestamp(date_str)
+    except (ValueError, TypeError):
+        raise ValueError(f"날짜 형식 오류: '{date_str}' (YYYY-MM-DD)")
+    pos = index.searchsorted(target, side='right') - 1
+    return index[max(pos, 0)]
+
+
+def resolve_range(index: pd.DatetimeIndex, start_date: str, end_date: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """기간 양 끝을 asof 날짜로 맞춥니다. (순서가 뒤바뀌면 교환)"""
+    start, end = asof_date(index, start_date), asof_date(index, end_date)
+    return (start, end) if start <= end else (end, start)
+
+
+def _fmt_date(ts: pd.Timestamp) -> str:
+    return ts.strftime('%Y-%m-%d')
+
+
+def paginate(df: pd.DataFrame, page: int = 1, page_size: int = MAX_ROWS_PER_PAGE) -> str:
+    """
+    표를 페이지 단위 마크다운으로 변환합니다. 페이지 크기는 행 상한과 토큰 상한(평균 행 길이 기준) 중 작은 값입니다.
+
+    Args:
+        df (pd.DataFrame): 출력할 표 (인덱스 제외)
+        page (int): 1부터 시작하는 페이지 번호
+        page_size (int): 요청 페이지 크기 (MAX_ROWS_PER_PAGE 이하로 제한)
+    """
+    if df.empty:
+        return "(데이터 없음)"
+
+    # 헤더/구분선과 꼬리말(가장 긴 형태)을 뺀 토큰 예산을 평균 행 토큰으로 나눠 행 수 결정
+    lines = df.to_markdown(index=False, intfmt=',').split('\n')
+    header_tokens = estimate_tokens('\n'.join(lines[:2]))
+    footer_tokens = estimate_tokens(f"\n\n_page {len(df)}/{len(df)} · rows {len(df)}_ · 다음 페이지: page={len(df)}")
+    avg_row_tokens = estimate_tokens('\n'.join(lines[2:])) / len(df)
+    fit = max(1, int((MAX_TOKENS_PER_PAGE - header_tokens - footer_tokens) / avg_row_tokens))
+    size = max(1, min(page_size, MAX_ROWS_PER_PAGE, fit))
+    pages = math.ceil(len(df) / size)
+    page = min(max(page, 1), pages)
+
+    body = df.iloc[(page - 1) * size: page * size].to_markdown(index=False, intfmt=',')
+    footer = f"\n\n_page {page}/{pages} · rows {len(df)}_"
+    if page < pages:
+        footer += f" · 다음 페이지: page={page + 1}"
+    return body + footer
+
+
+# 4. Main Logic
+def period_returns(df_perf: pd.DataFrame, df_bench: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    기간 수익률 요약 (포트폴리오 TWR/MDD/순입출금 + 벤치마크 수익률). 대시보드 기간 분석과 같은 리베이싱 규칙을 사용합니다.
+
+    Returns:
+        pd.DataFrame: [항목, 값]
+    """
+    start, end = resolve_range(df_perf.index, start_date, end_date)
+    p = df_perf.loc[start:end]
+    wealth = (1 + p['Daily_Return'].fillna(0)).cumprod()
+    drawdown = wealth / wealth.cummax() - 1
+
+    rows = [
+        ('기간', f"{_fmt_date(start)} ~ {_fmt_date(end)} ({len(p)}일)"),
+        ('시작 자산', f"{p['Calculated_Asset'].iloc[0]:,.0f}"),
+        ('종료 자산', f"{p['Calculated_Asset'].iloc[-1]:,.0f}"),
+        ('순입출금', f"{p['External_Flow'].iloc[1:].sum():,.0f}"),
+        ('Portfolio TWR', f"{(wealth.iloc[-1] - 1) * 100:.2f}%"),
+        ('Portfolio MDD', f"{drawdown.min() * 100:.2f}%"),
+    ]
+    if not df_bench.empty:
+        b = df_bench.loc[asof_date(df_bench.index, _fmt_date(start)):asof_date(df_bench.index, _fmt_date(end))]
+        for ticker in BENCHMARKS:
+            if ticker in b.columns and len(b) > 0:
+                rows.append((f"{ticker} 수익률", f"{(b[ticker].iloc[-1] / b[ticker].iloc[0] - 1) * 100:.2f}%"))
+    return pd.DataFrame(rows, columns=['항목', '값'])
+
+
+def position_changes(df_history: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    기간 시작/종료 시점의 자산별 평가금액·비중 변화. (두 시점 모두 0인 자산 제외, 변화 절댓값 내림차순)
+
+    Returns:
+        pd.DataFrame: [자산, 상태, 시작 평가금액, 종료 평가금액, 변화, 시작 비중(%), 종료 비중(%)]
+    """
+    start, end = resolve_range(df_history.index, start_date, end_date)
+    values = df_history.apply(pd.to_numeric, errors='coerce').fillna(0.0)
+    v0, v1 = values.loc[start], values.loc[end]
+    held = (v0 > 0) | (v1 > 0)
+    v0, v1 = v0[held], v1[held]
+
+    status = np.select([(v0 <= 0) & (v1 > 0), (v0 > 0) & (v1 <= 0)], ['신규', '청산'], default='유지')
+    result = pd.DataFrame({
+        '자산': v0.index,
+        '상태': status,
+        '시작 평가금액': v0.round(0).astype('int64').to_numpy(),
+        '종료 평가금액': v1.round(0).astype('int64').to_numpy(),
+        '변화': (v1 - v0).round(0).astype('int64').to_numpy(),
+        '시작 비중(%)': (v0 / v0.sum() * 100 if v0.sum() > 0 else v0 * 0).round(2).to_numpy(),
+        '종료 비중(%)': (v1 / v1.sum() * 100 if v1.sum() > 0 else v1 * 0).round(2).to_numpy(),
+    })
+    result = result.reindex(result['변화'].abs().sort_values(ascending=False).index)
+    result.attrs['range'] = (start, end)
+    return result.reset_index(drop=True)
+
+
+def top_movers(df_history: pd.DataFrame, start_date: str, end_date: str, top_n: int = 5) -> pd.DataFrame:
+    """평가금액 증가 상위 / 감소 상위 자산 (각 top_n개, 현금 제외)"""
+    changes = position_changes(df_history, start_date, end_date)
+    changes = changes[changes['자산'] != 'Cash']
+    gainers = changes[changes['변화'] > 0].nlargest(top_n, '변화').assign(구분='증가')
+    losers = changes[changes['변화'] < 0].nsmallest(top_n, '변화').assign(구분='감소')
+    result = pd.concat([gainers, losers], ignore_index=True)
+    return result[['구분', '자산', '상태', '시작 평가금액', '종료 평가금액', '변화']]
+
+
+def flow_totals(df_perf: pd.DataFrame, start_date: str, end_date: str, freq: str = 'M') -> pd.DataFrame:
+    """
+    기간 내 외부 입출금 합계를 주기별로 집계합니다. (기간 첫날의 흐름은 시작 자산에 포함되므로 제외)
+
+    Args:
+        freq (str): 'D' / 'W' / 'M' / 'Q' / 'Y'
+
+    Returns:
+        pd.DataFrame: [기간, 입금, 출금, 순입출금, 건수] (마지막 행은 합계)
+    """
+    if freq not in FLOW_FREQS:
+        raise ValueError(f"지원하지 않는 주기: '{freq}' ({'/'.join(FLOW_FREQS)})")
+    start, end = resolve_range(df_perf.index, start_date, end_date)
+    flows = df_perf.loc[start:end, 'External_Flow'].iloc[1:].fillna(0.0)
+
+    grouped = pd.DataFrame({
+        '입금': flows.clip(lower=0),
+        '출금': flows.clip(upper=0),
+        '순입출금': flows,
+        '건수': (flows != 0).astype(int),
+    }).resample(FLOW_FREQS[freq]).sum()
+    grouped = grouped[grouped['건수'] > 0]
+
+    result = grouped.reset_index().rename(columns={'Date': '기간'})
+    result['기간'] = result['기간'].dt.strftime('%Y-%m-%d')
+    total = pd.DataFrame([{'기간': '합계', '입금': flows.clip(lower=0).sum(), '출금': flows.clip(upper=0).sum(),
+                           '순입출금': flows.sum(), '건수': (flows != 0).sum()}])
+    result = pd.concat([result, total], ignore_index=True)
+    for col in ('입금', '출금', '순입출금'):
+        result[col] = result[col].round(0).astype('int64')
+    return result
+
+
+def _cube_view(cube: pd.DataFrame) -> pd.DataFrame:
+    """수익률 큐브(09) 행을 표시용 표로 변환합니다. (수익률은 %, 금액은 원 단위 정수)"""
+    view = pd.DataFrame({'기간': cube['Period'].astype(str), '일수': cube['Days']})
+    for col, name in (('Start_Asset', '시작 자산'), ('End_Asset', '종료 자산'), ('Net_Flow', '순입출금')):
+        view[name] = cube[col].round(0).astype('int64')
+    for col in ('TWR', 'MWR') + BENCHMARKS + ('Excess_SPY',):
+        view[f'{col}(%)'] = (cube[col] * 100).round(2)
+    return view.reset_index(drop=True)
+
+
+def cube_period(cube: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    수익률 큐브에서 한 기간을 조회합니다. ('2025-03' 월 / '2025Q1' 분기 / '2025' 연도)
+
+    Raises:
+        KeyError: 큐브에 없는 기간일 경우
+    """
+    label = period.strip().upper()
+    freq = 'Y' if len(label) == 4 else ('Q' if 'Q' in label else 'M')
+    rows = cube[(cube['Freq'] == freq) & (cube['Period'].astype(str) == label)]
+    if rows.empty:
+        raise KeyError(f"수익률 큐브에 없는 기간: '{period}'")
+    return _cube_view(rows)
+
+
+def cube_table(cube: pd.DataFrame, freq: str = 'M', year: int = None) -> pd.DataFrame:
+    """수익률 큐브의 주기별 표 (freq: M/Q/Y, year를 지정하면 해당 연도만)"""
+    if freq not in ('M', 'Q', 'Y'):
+        raise ValueError(f"지원하지 않는 주기: '{freq}' (M/Q/Y)")
+    rows = cube[cube['Freq'] == freq]
+    if year is not None:
+        rows = rows[rows['Period'].astype(str).str.startswith(str(year))]
+    return _cube_view(rows)
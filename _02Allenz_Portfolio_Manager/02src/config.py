@@ -1,6 +1,8 @@
 """
 @Title: Global Configuration
 @Description: 프로젝트 전반의 파일 경로, 원본/정제 파일명 매핑, 공통 상수를 관리하는 모듈
+              경로와 ISIN 매핑은 처음 접근할 때 초기화되며(Lazy), 환경 변수/CLI 인자로 재정의할 수 있습니다.
+              import 시점에는 디렉토리 생성이나 파일 읽기를 하지 않습니다.
 @Author: Allen & Gemini
 @Date: 2026-02-12
 """
@@ -8,31 +10,27 @@
 # 1. Imports
 import os
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Dict, Optional
 
-# 2. Path Configuration (경로 설정)
+# 2. Path Configuration (정적 경로)
 # SRC_DIR: config.py가 위치한 현재 폴더 (02src)
 SRC_DIR = Path(__file__).resolve().parent
 
 # BASE_DIR: 프로젝트 최상위 루트 폴더 (Allenz_Portfolio_Manager)
 BASE_DIR = SRC_DIR.parent
 
-# 데이터 저장소 경로
-DATA_DIR = BASE_DIR / "01DATA"
-RAW_DIR = DATA_DIR / "raw"
-PROCESSED_DIR = DATA_DIR / "processed"
+# 환경 변수 재정의 키 (CLI 인자는 configure()를 통해 같은 환경 변수로 전달되어 자식 프로세스에도 상속됨)
+ENV_DATA_DIR = 'ALLENZ_DATA_DIR'
+ENV_LOG_DIR = 'ALLENZ_LOG_DIR'
+ENV_ISIN_MAPPING = 'ALLENZ_ISIN_MAPPING'
+ENV_QUOTE_SOURCE = 'ALLENZ_QUOTE_SOURCE'   # 실시간 재평가 시세 소스: 'yfinance' 또는 'file:<CSV 경로>'
+ENV_LOT_METHOD = 'ALLENZ_LOT_METHOD'       # 세무 로트 방식: 'fifo' / 'average' / 'specific'
+ENV_INCOME_TREATMENT = 'ALLENZ_INCOME_TREATMENT'  # 배당/이자 처리: 'return'(수익에 포함) / 'flow'(외부 입금으로 처리)
+ENV_TIMELINE_MODE = 'ALLENZ_TIMELINE_MODE'         # 일별 시계열 날짜 축: 'calendar'(모든 날짜) / 'business'(거래소 거래일 + 흐름일)
 
-# 3. Directory Initialization (디렉토리 초기화)
-# 데이터 폴더가 없으면 자동으로 생성
-if not RAW_DIR.exists():
-    RAW_DIR.mkdir(parents=True, exist_ok=True)
-    print(f"🚀 [Config] Raw Data 폴더 생성됨: {RAW_DIR}")
-
-if not PROCESSED_DIR.exists():
-    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    print(f"🚀 [Config] Processed Data 폴더 생성됨: {PROCESSED_DIR}")
-
-# 4. File Name Mapping (파일명 매핑 상수)
+# 3. File Name Mapping (파일명 매핑 상수)
 # 사용자가 다운로드한 HTS 원본 파일명 (변경 시 여기만 수정)
 RAW_FILES = {
     'transaction': '1750.csv',       # 거래 내역 (HTS 1750 화면)
@@ -49,22 +47,183 @@ PROCESSED_FILES = {
     'ledger': '04Daily_Asset_Ledger.csv',            # 일별 자산 원장 (시계열)
     'performance': '05Performance_Data.csv',         # 성과 지표 (TWR/MWR/MDD)
     'benchmark': '06Benchmark_Data.csv',             # 시장 지수 데이터
-    'timeline': '07Historical_Holdings.csv'          # 종목별 보유수량 타임라인 (타임머신용)
+    'timeline': '07Historical_Holdings.csv',         # 종목별 보유수량 타임라인 (타임머신용)
+    'digest': '08Report_Digest.json',                # AI 리포트용 기간별 요약 (토큰 예산 적용)
+    'returns_cube': '09Period_Returns.csv',          # 월/분기/연도별 수익률 큐브
+    'tax_lots': '10Tax_Lots.csv',                    # 미청산 매수 로트 + 미실현손익
+    'realized': '11Realized_PnL.csv',                # 매도 로트별 실현손익 (현지 통화 / 원화)
+    'positions': '12Position_History.csv',           # 종목별 일별 원가/평균단가/미실현손익 (long 포맷)
+    'prices': '13Price_Matrix.csv',                  # 종목별 일별 원화 환산 종가 (Wide, what-if 시뮬레이션용)
+    'what_if_paths': '14WhatIf_Paths.csv',           # 전략 변형별 일별 자산 경로 (Wide)
+    'what_if_summary': '15WhatIf_Summary.csv',       # 전략 변형별 성과 지표 (TWR/CAGR/변동성/MDD/비용)
+    'fx_rates': '16FX_Rates.csv',                    # 일별 원화 환율 (USD, JPY - 1단위당 원)
+    'risk_cov': '17Risk_Covariance.csv',             # 보유 종목 + 벤치마크 원화 수익률 공분산 행렬 (연율화)
+    'risk_contrib': '18Risk_Contribution.csv',       # 종목별 위험 기여도 + 최적화 목표 비중 (Risk Parity / 평균-분산)
+    'income': '19Income_Ledger.csv',                 # 배당/원천징수/예탁금이용료/RP이자 분류 원장 (원화 환산)
+    'income_monthly': '20Income_Monthly.csv',        # 월별 분류별 수익 + 최근 12개월(TTM) 합계/수익률
+    'income_yield': '21Income_Yield.csv',            # 종목별 배당 합계 + 취득원가 대비 수익률(Yield on Cost)
+    'currency_ledger': '22Currency_Ledger.csv',      # 통화별(KRW/USD/JPY) 주식/현금 하위 원장 + 현지/환율 손익 (long 포맷)
+    'fx_attribution': '23FX_Attribution.csv',        # 일별/누적 수익률 분해 (현지 시장 / 환율 / 기타)
+    'drawdown_episodes': '24Drawdown_Episodes.csv',  # 포트폴리오/벤치마크별 낙폭 구간 (고점/저점/회복일, 깊이, 기간) 순위
+    'drawdown_curves': '25Drawdown_Curves.csv'       # 시계열별 누적 고점/낙폭/고점일/회복일 배열 (long 포맷, 기간 재계산용)
 }
 
-# 5. Global Constants (공통 상수)
+# 파이프라인 의존성 매니페스트 파일명 (PROCESSED_DIR 하위)
+PIPELINE_MANIFEST_NAME = "pipeline_manifest.json"
+
+# 세무 로트 증분 처리 상태 파일명 (PROCESSED_DIR 하위)
+TAX_LOT_STATE_NAME = "tax_lot_state.json"
+
+# 리스크 모델(공분산) 증분 갱신 상태 파일명 (PROCESSED_DIR 하위)
+RISK_STATE_NAME = "risk_state.json"
+
+# 4. Global Constants (공통 상수)
 # 파일 인코딩
 ENCODING_KR = 'cp949'      # HTS 다운로드 원본 (한글 윈도우 표준)
 ENCODING_STD = 'utf-8-sig' # 내부 처리용 표준 (Excel 호환)
 
-# --- [Tickers Mapping (Temporary JSON)] ---
-# 향후 자동화 전까지 수동 매핑(ISIN -> Ticker)을 분리하여 관리합니다.
-ISIN_MAPPING_FILE = SRC_DIR / "isin_mapping.json"
-ISIN_TO_TICKER = {}
 
-if ISIN_MAPPING_FILE.exists():
+# 5. Lazy Settings (지연 초기화 설정 객체)
+@dataclass
+class Settings:
+    """
+    실행 환경에 따라 달라지는 경로 설정. get_settings()로 처음 접근할 때 생성됩니다.
+
+    Attributes:
+        data_dir: 데이터 저장소 루트 (raw/processed 상위)
+        log_dir: 실행 로그 / 프로파일 리포트 저장 경로
+        isin_mapping_file: ISIN -> Ticker 수동 매핑 JSON 경로
+        quote_source: 실시간 재평가 시세 소스 ('yfinance' 또는 'file:<CSV 경로>')
+        lot_method: 세무 로트 방식 ('fifo' / 'average' / 'specific')
+        income_treatment: 배당/이자의 TWR 처리 ('return': 운용 수익으로 포함, 'flow': 외부 입금으로 보고 제외)
+        timeline_mode: 원장/타임머신 날짜 축 ('calendar': 모든 날짜, 'business': KRX/NYSE/TSE 거래일 + 흐름일)
+    """
+    data_dir: Path = BASE_DIR / "01DATA"
+    log_dir: Path = BASE_DIR / "logs"
+    isin_mapping_file: Path = SRC_DIR / "isin_mapping.json"
+    quote_source: str = 'yfinance'
+    lot_method: str = 'fifo'
+    income_treatment: str = 'return'
+    timeline_mode: str = 'calendar'
+    _isin_to_ticker: Optional[Dict[str, str]] = field(default=None, repr=False)
+
+    @property
+    def raw_dir(self) -> Path:
+        return self.data_dir / "raw"
+
+    @property
+    def processed_dir(self) -> Path:
+        return self.data_dir / "processed"
+
+    @property
+    def reference_dir(self) -> Path:
+        return self.data_dir / "reference"
+
+    @property
+    def pipeline_manifest(self) -> Path:
+        return self.processed_dir / PIPELINE_MANIFEST_NAME
+
+    @property
+    def isin_to_ticker(self) -> Dict[str, str]:
+        """ISIN -> Ticker 매핑 (처음 접근할 때 JSON을 읽음)"""
+        if self._isin_to_ticker is None:
+            self._isin_to_ticker = _load_isin_mapping(self.isin_mapping_file)
+        return self._isin_to_ticker
+
+
+_settings: Optional[Settings] = None
+
+
+def _load_isin_mapping(path: Path) -> Dict[str, str]:
+    # --- [Tickers Mapping (Temporary JSON)] ---
+    # 향후 자동화 전까지 수동 매핑(ISIN -> Ticker)을 분리하여 관리합니다.
+    if not path.exists():
+        return {}
     try:
-        with open(ISIN_MAPPING_FILE, 'r', encoding='utf-8') as f:
-            ISIN_TO_TICKER = json.load(f)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except Exception as e:
-        print(f"⚠️ [Config] isin_mapping.json 로드 실패: {e}")
\ No newline at end of file
+        print(f"⚠️ [Config] isin_mapping.json 로드 실패: {e}")
+        return {}
+
+
+def get_settings() -> Settings:
+    """설정 객체를 반환합니다. 최초 호출 시 환경 변수 재정의를 반영하여 생성합니다."""
+    global _settings
+    if _settings is None:
+        overrides = {}
+        if os.environ.get(ENV_DATA_DIR):
+            overrides['data_dir'] = Path(os.environ[ENV_DATA_DIR]).expanduser().resolve()
+        if os.environ.get(ENV_LOG_DIR):
+            overrides['log_dir'] = Path(os.environ[ENV_LOG_DIR]).expanduser().resolve()
+        if os.environ.get(ENV_ISIN_MAPPING):
+            overrides['isin_mapping_file'] = Path(os.environ[ENV_ISIN_MAPPING]).expanduser().resolve()
+        if os.environ.get(ENV_QUOTE_SOURCE):
+            overrides['quote_source'] = os.environ[ENV_QUOTE_SOURCE]
+        if os.environ.get(ENV_LOT_METHOD):
+            overrides['lot_method'] = os.environ[ENV_LOT_METHOD]
+        if os.environ.get(ENV_INCOME_TREATMENT):
+            overrides['income_treatment'] = os.environ[ENV_INCOME_TREATMENT]
+        if os.environ.get(ENV_TIMELINE_MODE):
+            overrides['timeline_mode'] = os.environ[ENV_TIMELINE_MODE]
+        _settings = Settings(**overrides)
+    return _settings
+
+
+def configure(data_dir: Optional[Path] = None, log_dir: Optional[Path] = None,
+              isin_mapping_file: Optional[Path] = None) -> Settings:
+    """
+    CLI 인자 등으로 설정을 재정의합니다. 환경 변수에도 기록하여 파이프라인 자식 프로세스가 같은 설정을 사용합니다.
+
+    Returns:
+        Settings: 재생성된 설정 객체
+    """
+    global _settings
+    for env_key, value in ((ENV_DATA_DIR, data_dir), (ENV_LOG_DIR, log_dir), (ENV_ISIN_MAPPING, isin_mapping_file)):
+        if value is not None:
+            os.environ[env_key] = str(Path(value).expanduser().resolve())
+    _settings = None
+    return get_settings()
+
+
+def ensure_dirs() -> None:
+    """데이터 폴더가 없으면 생성합니다. (쓰기 작업을 하는 진입점에서 호출)"""
+    settings = get_settings()
+    for label, path in (("Raw Data", settings.raw_dir), ("Processed Data", settings.processed_dir)):
+        if not path.exists():
+            path.mkdir(parents=True, exist_ok=True)
+            print(f"🚀 [Config] {label} 폴더 생성됨: {path}")
+
+
+def subprocess_env() -> Dict[str, str]:
+    """
+    자식 파이썬 프로세스용 환경 변수를 반환합니다.
+    02src를 PYTHONPATH에 추가하여 'python -m engines.ledger' 형태의 패키지 실행이 가능하게 합니다.
+    """
+    env = os.environ.copy()
+    paths = [str(SRC_DIR)] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p]
+    env['PYTHONPATH'] = os.pathsep.join(dict.fromkeys(paths))
+    return env
+
+
+# 기존 모듈 상수(config.PROCESSED_DIR 등) 호환용 지연 속성 (PEP 562)
+_LAZY_ATTRS = {
+    'DATA_DIR': lambda s: s.data_dir,
+    'RAW_DIR': lambda s: s.raw_dir,
+    'PROCESSED_DIR': lambda s: s.processed_dir,
+    'REFERENCE_DIR': lambda s: s.reference_dir,
+    'LOG_DIR': lambda s: s.log_dir,
+    'PIPELINE_MANIFEST': lambda s: s.pipeline_manifest,
+    'ISIN_MAPPING_FILE': lambda s: s.isin_mapping_file,
+    'ISIN_TO_TICKER': lambda s: s.isin_to_ticker,
+    'QUOTE_SOURCE': lambda s: s.quote_source,
+    'LOT_METHOD': lambda s: s.lot_method,
+    'INCOME_TREATMENT': lambda s: s.income_treatment,
+    'TIMELINE_MODE': lambda s: s.timeline_mode,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name](get_settings())
+    raise AttributeError(f"module 'config' has no attribute '{name}'")
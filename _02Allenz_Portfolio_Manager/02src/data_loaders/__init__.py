@@ -0,0 +1,5 @@
+"""
+@Title: Data Loaders Package
+@Description: [Layer 1] HTS 원본 파싱 및 CSV 입출력 (Data Access Layer)
+@Author: Allen & Gemini
+"""
@@ -7,18 +7,10 @@
 
 # 1. Imports
 import os
-import sys
 import pandas as pd
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-# 상위(02src) 디렉토리의 config.py를 참조하기 위한 경로 설정
-# (단독 실행 및 패키지 실행 모두 호환되도록 설정)
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
-
 import config
 
 # 2. Constants
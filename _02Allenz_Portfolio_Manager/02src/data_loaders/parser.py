@@ -8,24 +8,13 @@
 # 1. Imports
 import csv
 import re
-import sys
 import pandas as pd
 import io as sys_io
-from pathlib import Path
 from typing import List, Dict, Optional, Any
 
-# 상위 디렉토리 참조 설정
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
-
 import config
 
-try:
-    from data_loaders import io as local_io
-except ImportError:
-    import io as local_io
+from data_loaders import io as local_io
 
 # 2. Constants
 MODULE_TAG = "[Parser]"
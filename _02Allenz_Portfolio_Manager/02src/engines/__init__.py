@@ -0,0 +1,5 @@
+"""
+@Title: Engines Package
+@Description: [Layer 2] 원장/성과/벤치마크/타임머신 계산 엔진 (Business Logic Layer)
+@Author: Allen & Gemini
+"""
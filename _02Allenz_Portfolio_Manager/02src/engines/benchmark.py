@@ -5,22 +5,10 @@
 """
 
 # 1. Imports
-import sys
 import pandas as pd
-import yfinance as yf
-from pathlib import Path
-
-# 상위 디렉토리(02src) 참조 설정
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
 
 import config
-try:
-    from data_loaders import io as local_io
-except ImportError:
-    import io as local_io
+from data_loaders import io as local_io
 
 # 2. Constants
 MODULE_TAG = "[Benchmark]"
@@ -36,6 +24,9 @@ def _fetch_yahoo_data(ticker: str, start_date: str, end_date: str) -> pd.Series:
     yfinance를 통해 특정 종목의 수정 종가를 수집합니다.
     안정성을 위해 download 대신 Ticker.history()를 사용합니다.
     """
+    # yfinance는 네트워크 수집 시에만 필요하므로 지연 로드
+    import yfinance as yf
+
     # yfinance는 end_date 당일을 제외하므로 하루를 더해줍니다.
     end_date_dt = pd.to_datetime(end_date) + pd.Timedelta(days=1)
 
@@ -0,0 +1,221 @@
+"""
+@Title: Multi-Currency Sub-Ledger Engine (Local Market vs Currency Effect)
+@Description: 단일 원화 원장(04/07)을 통화별(KRW/USD/JPY) 주식·현금 하위 원장(22)으로 나누고 일별 환율(16)로 원화 환산합니다.
+              외화 현금은 거래 내역의 통화별 잔고('최종금액')와 외화RP 원금으로 복원하고, 원화 현금은 07 현금의 나머지로 두어 합계를 원장과 맞춥니다.
+              포트폴리오 일별 수익률(05)을 현지 시장 수익률 / 환율 효과 / 기타(보간·배당·비용)로 분해(23)합니다.
+              모든 통화를 날짜 x 통화 행렬 한 번의 배열 연산으로 계산합니다. (통화별 반복 없음)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+from engines.tax_lots import TRADE_PATTERN
+
+# 2. Constants
+MODULE_TAG = "[Currency]"
+CURRENCIES = ('KRW', 'USD', 'JPY')   # 행렬 열 순서 (KRW 환율 = 1)
+FOREIGN = list(CURRENCIES[1:])       # 16FX_Rates 컬럼
+CASH = 'Cash'
+
+# 외화RP 매수/매도 (예수금 <-> RP 원금 이동, RP는 같은 통화의 현금성 자산으로 포함)
+RP_PATTERN = r'외화RP매[수도]'
+# 첫 거래 행의 잔고 증감 방향 (기초 잔고 역산용)
+INFLOW_PATTERN = r'입금|매도|배당금|분배금'
+
+LEDGER_COLUMNS = ['Date', 'Currency', 'FX', 'Securities_Local', 'Cash_Local', 'Total_Local',
+                  'Securities_KRW', 'Cash_KRW', 'Total_KRW', 'Weight', 'Local_PnL_KRW', 'FX_PnL_KRW']
+ATTRIBUTION_COLUMNS = ['Date', 'Portfolio_Return', 'Local_Return', 'Currency_Return', 'Other_Return',
+                       'Cum_Portfolio', 'Cum_Local', 'Cum_Currency', 'Cum_Other']
+
+
+# 3. Helper Functions
+def ticker_currency(ticker: str) -> str:
+    """종목 통화 (야후 티커 접미사 기준: .T = 엔화, .KS/.KQ = 원화, 그 외 달러)"""
+    if ticker.endswith('.T'):
+        return 'JPY'
+    if ticker.endswith(('.KS', '.KQ')):
+        return 'KRW'
+    return 'USD'
+
+
+def transaction_currency(df_txn: pd.DataFrame) -> pd.Series:
+    """
+    거래 행별 통화. 주식 매매는 '통화' 컬럼, 자금 이동(환전/외화RP/해외배당/외국납부세액)은 '종목번호'에 통화가 기록됩니다.
+    ('기타가환전차액입금'처럼 '통화'만 외화인 행은 원화 예수금 변동)
+    """
+    trade = df_txn['구분'].str.contains(TRADE_PATTERN, na=False)
+    code = df_txn['종목번호'].where(df_txn['종목번호'].isin(FOREIGN))
+    return df_txn['통화'].where(trade & df_txn['통화'].isin(FOREIGN), code).fillna('KRW')
+
+
+def foreign_cash(df_txn: pd.DataFrame, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    외화 예수금 + 외화RP 원금의 일별 잔고를 복원합니다. (현지 통화, index x FOREIGN)
+
+    - 예수금: 통화별 '최종금액'(거래 직후 해당 통화 잔고)의 일별 마지막 값. 첫 거래 이전은 첫 행에서 역산한 기초 잔고
+    - 외화RP 원금: 매수출금 - 매도입금 누적. 만기 이자로 음수가 되지 않도록 0에서 반사 (S = X - min(0, cummin X))
+    """
+    df = df_txn.assign(Date=pd.to_datetime(df_txn['일자']).dt.normalize(), Currency=transaction_currency(df_txn))
+    df = df[df['Currency'].isin(FOREIGN)].sort_values('Date', kind='stable')
+    days = index.union(pd.DatetimeIndex(df['Date'].unique()))
+
+    balance = df.groupby(['Date', 'Currency'])['최종금액'].last().unstack('Currency')
+    first = df.groupby('Currency').head(1).set_index('Currency')
+    sign = np.where(first['구분'].str.contains(INFLOW_PATTERN), 1.0, -1.0)
+    opening = first['최종금액'] - sign * first['변동금액'].abs()
+    deposit = (balance.reindex(index=days, columns=FOREIGN).ffill()
+               .fillna(opening.reindex(FOREIGN)).fillna(0.0))
+
+    rp = df[df['구분'].str.contains(RP_PATTERN, na=False)]
+    signed = np.where(rp['구분'].str.contains('매수'), 1.0, -1.0) * rp['거래대금'].abs()
+    net = (pd.Series(signed, index=rp.index).groupby([rp['Date'], rp['Currency']]).sum()
+           .unstack('Currency').reindex(index=days, columns=FOREIGN).fillna(0.0).cumsum())
+    principal = net - np.minimum(net.cummin(), 0.0)
+    return (deposit + principal).reindex(index)
+
+
+def stack_long(index: pd.DatetimeIndex, arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """날짜 x 통화 행렬들을 (Date, Currency) long 포맷으로 펼칩니다."""
+    n_days, n_cur = len(index), len(CURRENCIES)
+    frame = {'Date': np.repeat(index.to_numpy(), n_cur), 'Currency': np.tile(CURRENCIES, n_days)}
+    frame.update({name: values.ravel() for name, values in arrays.items()})
+    return pd.DataFrame(frame)
+
+
+# 4. Main Logic
+def build_sub_ledgers(df_value: pd.DataFrame, df_price: pd.DataFrame, df_fx: pd.DataFrame,
+                      cash_foreign: pd.DataFrame, daily_return: pd.Series):
+    """
+    통화별 하위 원장과 수익률 분해를 계산합니다. (모든 입력은 Date 인덱스 wide 포맷, 행렬 연산)
+
+    - 종목 수량 = 원화 평가금액(07) / 원화 종가(13), 현지 종가 = 원화 종가 / 종목 통화 환율
+    - 통화 c의 현지 시장 손익 = Σ 전일 수량 x 현지 종가 변화 (매매/환전은 손익 없이 통화 안에서 자산만 이동)
+    - 원화 손익 분해: 현지 효과 = 현지 손익 x 전일 환율, 환율 효과 = (전일 현지 잔고 + 현지 손익) x 환율 변화
+    - 포트폴리오: Local = Σ 현지 효과 / 전일 총자산, (1 + Local)(1 + Currency) = 1 + (Σ 현지 + 환율 효과) / 전일 총자산,
+      나머지(원장 보간, 배당/이자, 비용)는 (1 + TWR) / (1 + Local + FX) - 1
+
+    Args:
+        df_value (pd.DataFrame): 07 종목별 원화 평가금액 + Cash
+        df_price (pd.DataFrame): 13 종목별 원화 환산 종가
+        df_fx (pd.DataFrame): 16 일별 환율 (USD, JPY)
+        cash_foreign (pd.DataFrame): 외화 현금 잔고 (현지 통화, FOREIGN 컬럼)
+        daily_return (pd.Series): 05 일별 TWR 수익률
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (LEDGER_COLUMNS, ATTRIBUTION_COLUMNS)
+    """
+    index = df_value.index
+    tickers = [t for t in df_value.columns if t != CASH and t in df_price.columns]
+    onehot = np.array([[ticker_currency(t) == c for c in CURRENCIES] for t in tickers], dtype=float).reshape(-1, len(CURRENCIES))
+
+    fx = np.column_stack([np.ones(len(index)), df_fx.reindex(index).ffill().bfill()[FOREIGN].to_numpy(dtype=float)])
+    value = df_value[tickers].fillna(0.0).to_numpy(dtype=float)
+    price_krw = df_price.reindex(index)[tickers].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        qty = np.where(price_krw > 0, value / price_krw, 0.0)
+        price_local = np.nan_to_num(price_krw / (fx @ onehot.T))
+
+    # --- 통화별 주식 / 현금 (현지 통화, T x C) ---
+    securities = (qty * price_local) @ onehot
+    cash = np.zeros_like(securities)
+    cash[:, 1:] = cash_foreign.reindex(index)[FOREIGN].fillna(0.0).to_numpy(dtype=float)
+    cash[:, 0] = df_value[CASH].fillna(0.0).to_numpy(dtype=float) - (cash[:, 1:] * fx[:, 1:]).sum(axis=1)
+    total = securities + cash
+    total_krw = total * fx
+
+    # --- 현지 시장 손익 / 환율 효과 (원화, T x C, 첫날 0) ---
+    local_pnl = np.zeros_like(total)
+    local_pnl[1:] = (qty[:-1] * np.diff(price_local, axis=0)) @ onehot
+    local_krw = np.zeros_like(total)
+    fx_krw = np.zeros_like(total)
+    local_krw[1:] = local_pnl[1:] * fx[:-1]
+    fx_krw[1:] = (total[:-1] + local_pnl[1:]) * np.diff(fx, axis=0)
+
+    portfolio = total_krw.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = total_krw / portfolio[:, None]
+        base = np.concatenate([[np.nan], portfolio[:-1]])
+        local_ret = np.nan_to_num(local_krw.sum(axis=1) / base)
+        market_ret = np.nan_to_num((local_krw + fx_krw).sum(axis=1) / base)
+    twr = daily_return.reindex(index).fillna(0.0).to_numpy(dtype=float)
+
+    ledger = stack_long(index, {
+        'FX': fx, 'Securities_Local': securities, 'Cash_Local': cash, 'Total_Local': total,
+        'Securities_KRW': securities * fx, 'Cash_KRW': cash * fx, 'Total_KRW': total_krw, 'Weight': weight,
+        'Local_PnL_KRW': local_krw, 'FX_PnL_KRW': fx_krw,
+    })
+
+    attribution = pd.DataFrame({
+        'Date': index, 'Portfolio_Return': twr, 'Local_Return': local_ret,
+        'Currency_Return': (1 + market_ret) / (1 + local_ret) - 1,
+        'Other_Return': (1 + twr) / (1 + market_ret) - 1,
+    })
+    for col, cum in (('Portfolio_Return', 'Cum_Portfolio'), ('Local_Return', 'Cum_Local'),
+                     ('Currency_Return', 'Cum_Currency'), ('Other_Return', 'Cum_Other')):
+        attribution[cum] = (1 + attribution[col]).cumprod() - 1
+    return ledger[LEDGER_COLUMNS], attribution[ATTRIBUTION_COLUMNS]
+
+
+def generate_currency_ledgers() -> Dict[str, pd.DataFrame]:
+    """
+    다중 통화 원장 메인 함수
+    Input: 07Historical_Holdings.csv, 13Price_Matrix.csv, 16FX_Rates.csv, 00Transaction_History.csv, 05Performance_Data.csv
+    Output: 22Currency_Ledger.csv (일별 통화별 주식/현금/환산액/손익 분해), 23FX_Attribution.csv (일별·누적 수익률 분해)
+    """
+    print(f"🚀 {MODULE_TAG} 통화별 하위 원장 생성 시작...")
+
+    paths = {key: config.PROCESSED_DIR / config.PROCESSED_FILES[key]
+             for key in ('timeline', 'prices', 'fx_rates', 'transaction', 'performance')}
+    missing = [p.name for p in paths.values() if not p.exists()]
+    if missing:
+        print(f"❌ {MODULE_TAG} 입력 파일이 없습니다: {', '.join(missing)}")
+        return {}
+
+    frames = {}
+    for key in ('timeline', 'prices', 'fx_rates', 'performance'):
+        df = local_io.load_csv(paths[key])
+        df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+        frames[key] = df.set_index('Date').sort_index()
+    # 시세/환율 수집이 실패한 경우 NaN 원장과 '기타'로만 채운 분해를 저장하지 않음
+    no_fx = [c for c in FOREIGN if not (frames['fx_rates'].reindex(columns=[c]).to_numpy(dtype=float) > 0).any()]
+    if not (frames['prices'].to_numpy(dtype=float) > 0).any() or no_fx:
+        source = f"환율(16) {', '.join(no_fx)}" if no_fx else "가격 행렬(13)"
+        print(f"⚠️ {MODULE_TAG} {source}에 유효한 값이 없어 통화별 원장을 건너뜁니다. (history.py 시세 수집 결과를 확인하세요)")
+        return {}
+
+    df_value = frames['timeline']
+    if CASH not in df_value.columns:
+        df_value[CASH] = 0.0
+
+    cash_foreign = foreign_cash(local_io.load_csv(paths['transaction']), df_value.index)
+    ledger, attribution = build_sub_ledgers(df_value, frames['prices'], frames['fx_rates'], cash_foreign,
+                                            frames['performance']['Daily_Return'])
+
+    out_ledger = ledger.assign(Date=ledger['Date'].dt.strftime('%Y-%m-%d'))
+    out_attr = attribution.assign(Date=attribution['Date'].dt.strftime('%Y-%m-%d'))
+    local_io.save_csv(out_ledger, config.PROCESSED_DIR / config.PROCESSED_FILES['currency_ledger'])
+    local_io.save_csv(out_attr, config.PROCESSED_DIR / config.PROCESSED_FILES['fx_attribution'])
+
+    krw_cash = ledger.loc[ledger['Currency'] == 'KRW', 'Cash_Local']
+    if (krw_cash < 0).any():
+        print(f"⚠️ {MODULE_TAG} 원화 현금(07 현금 - 외화 현금)이 음수인 날 {int((krw_cash < 0).sum())}일 "
+              f"(최저 {krw_cash.min():,.0f}원) - 원장 보간/시세 차이를 확인하세요.")
+    last = ledger[ledger['Date'] == ledger['Date'].max()].set_index('Currency')
+    mix = ', '.join(f"{c} {last.at[c, 'Weight'] * 100:.1f}%" for c in CURRENCIES)
+    final = attribution.iloc[-1]
+    print(f"✅ {MODULE_TAG} 통화 비중 {mix} / 누적 TWR {final['Cum_Portfolio'] * 100:+.2f}% = "
+          f"현지 시장 {final['Cum_Local'] * 100:+.2f}% x 환율 {final['Cum_Currency'] * 100:+.2f}% x "
+          f"기타 {final['Cum_Other'] * 100:+.2f}%")
+    return {'ledger': ledger, 'attribution': attribution}
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    generate_currency_ledgers()
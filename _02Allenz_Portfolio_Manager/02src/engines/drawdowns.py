@@ -0,0 +1,215 @@
+"""
+@Title: Drawdown Episode Engine
+@Description: 포트폴리오(05 일별 수익률)와 벤치마크(06 가격)의 낙폭 구간(고점 -> 저점 -> 회복)을 한 번의 선형 연산으로 추출합니다.
+              시계열별 누적 고점(Running Peak)/고점일/회복일 배열을 낙폭 곡선(25)으로 저장하고, 구간 목록을 깊이 순위로 저장(24)합니다.
+              사용자 선택 기간의 재계산은 저장된 배열을 재사용하고, 시작일이 물려 있는 첫 수면 아래 구간만 다시 누적 최대를 구합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+
+# 2. Constants
+MODULE_TAG = "[Drawdowns]"
+PORTFOLIO = 'Portfolio'
+BENCHMARKS = ('SPY', 'QQQ', 'IWM')
+
+CURVE_COLUMNS = ['Date', 'Series', 'Wealth', 'Peak', 'Drawdown', 'Peak_Date', 'Recovery_Date']
+EPISODE_COLUMNS = ['Series', 'Rank', 'Peak_Date', 'Trough_Date', 'Recovery_Date', 'Depth',
+                   'Decline_Days', 'Recovery_Days', 'Duration_Days', 'Recovered']
+
+
+# 3. Helper Functions
+def _peak_dates(dates: pd.Series, at_peak: pd.Series) -> pd.Series:
+    """각 날짜의 누적 고점일 (고점인 날짜를 앞으로 채움)"""
+    return dates.where(at_peak).ffill()
+
+
+def _recovery_dates(dates: pd.Series, at_peak: pd.Series) -> pd.Series:
+    """각 날짜 이후(당일 포함) 처음 고점을 회복한 날짜 (끝까지 회복하지 못하면 NaT)"""
+    return dates.where(at_peak).bfill()
+
+
+def drawdown_curve(dates, wealth) -> pd.DataFrame:
+    """
+    누적 가치 시계열의 낙폭 곡선을 계산합니다. (누적 최대 1회 + 앞/뒤 채움 1회씩, 모두 선형)
+
+    Args:
+        dates: 날짜 (오름차순)
+        wealth: 누적 가치 지수 또는 가격 (결측 없음)
+
+    Returns:
+        pd.DataFrame: [Date, Wealth, Peak, Drawdown, Peak_Date, Recovery_Date]
+    """
+    curve = pd.DataFrame({'Date': pd.to_datetime(pd.Series(dates)).to_numpy(),
+                          'Wealth': np.asarray(wealth, dtype=float)})
+    curve['Peak'] = curve['Wealth'].cummax()
+    curve['Drawdown'] = curve['Wealth'] / curve['Peak'] - 1
+    at_peak = curve['Wealth'] >= curve['Peak']
+    curve['Peak_Date'] = _peak_dates(curve['Date'], at_peak)
+    curve['Recovery_Date'] = _recovery_dates(curve['Date'], at_peak)
+    return curve
+
+
+def window_curve(curve: pd.DataFrame, start, end) -> pd.DataFrame:
+    """
+    기간 [start, end]의 낙폭 곡선을 저장된 전체 곡선에서 파생합니다.
+
+    기간 고점은 시작일이 속한 수면 아래 구간이 끝나는 날(전체 곡선의 Recovery_Date)부터 전체 누적 고점과 같으므로,
+    그 이전 구간만 기간 내 누적 최대를 다시 구하고 나머지는 Peak/Peak_Date/Recovery_Date를 그대로 사용합니다.
+    (기간 종료일 이후의 회복일은 미회복(NaT)으로 처리)
+
+    Args:
+        curve (pd.DataFrame): 한 시계열의 drawdown_curve 결과 (Date 오름차순)
+    """
+    dates = curve['Date']
+    window = curve.loc[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))].copy()
+    if window.empty:
+        return window
+
+    rejoin = window['Recovery_Date'].iloc[0]
+    head = window['Date'] < rejoin if pd.notna(rejoin) else pd.Series(True, index=window.index)
+    if head.any():
+        part = window.loc[head]
+        peak = part['Wealth'].cummax()
+        at_peak = part['Wealth'] >= peak
+        window.loc[head, 'Peak'] = peak
+        window.loc[head, 'Drawdown'] = part['Wealth'] / peak - 1
+        window.loc[head, 'Peak_Date'] = _peak_dates(part['Date'], at_peak)
+        window.loc[head, 'Recovery_Date'] = _recovery_dates(part['Date'], at_peak).fillna(rejoin)
+
+    window['Recovery_Date'] = window['Recovery_Date'].where(window['Recovery_Date'] <= pd.Timestamp(end))
+    return window
+
+
+# 4. Main Logic
+def extract_episodes(curve: pd.DataFrame) -> pd.DataFrame:
+    """
+    낙폭 곡선에서 낙폭 구간을 추출하고 깊이 순(가장 깊은 구간 = 1위)으로 정렬합니다.
+    수면 아래(Drawdown < 0) 날짜를 고점일로 묶는 그룹 연산 1회 - 구간 루프 없음
+
+    - Decline_Days: 고점 -> 저점 (달력일)
+    - Recovery_Days: 저점 -> 회복 (미회복이면 NaN)
+    - Duration_Days: 고점 -> 회복 (미회복이면 고점 -> 마지막 날짜, 진행 중인 구간)
+
+    Returns:
+        pd.DataFrame: EPISODE_COLUMNS (Series 제외 - 호출자가 채움)
+    """
+    underwater = curve.loc[curve['Drawdown'] < 0]
+    if underwater.empty:
+        return pd.DataFrame(columns=EPISODE_COLUMNS[1:])
+
+    grouped = underwater.groupby('Peak_Date', sort=True)
+    trough = underwater.loc[grouped['Drawdown'].idxmin()]
+    episodes = pd.DataFrame({
+        'Peak_Date': trough['Peak_Date'].to_numpy(),
+        'Trough_Date': trough['Date'].to_numpy(),
+        'Recovery_Date': grouped['Recovery_Date'].first().to_numpy(),
+        'Depth': trough['Drawdown'].to_numpy(),
+    })
+    last_date = curve['Date'].iloc[-1]
+    episodes['Decline_Days'] = (episodes['Trough_Date'] - episodes['Peak_Date']).dt.days
+    episodes['Recovery_Days'] = (episodes['Recovery_Date'] - episodes['Trough_Date']).dt.days
+    episodes['Duration_Days'] = (episodes['Recovery_Date'].fillna(last_date) - episodes['Peak_Date']).dt.days
+    episodes['Recovered'] = episodes['Recovery_Date'].notna()
+
+    episodes = episodes.sort_values(['Depth', 'Peak_Date']).reset_index(drop=True)
+    episodes.insert(0, 'Rank', np.arange(1, len(episodes) + 1))
+    return episodes
+
+
+def compare_episodes(episodes: pd.DataFrame, top: int = 5) -> pd.DataFrame:
+    """
+    시계열별 상위 낙폭 구간을 순위 기준으로 나란히 비교하는 표를 만듭니다.
+
+    Args:
+        episodes (pd.DataFrame): Series 컬럼이 포함된 낙폭 구간 목록 (24 또는 기간 재계산 결과)
+        top (int): 시계열별 상위 순위 수
+
+    Returns:
+        pd.DataFrame: 인덱스 Rank, 컬럼 (지표, 시계열) MultiIndex - Depth / Peak_Date / Duration_Days / Recovered
+    """
+    ranked = episodes[episodes['Rank'] <= top]
+    series = list(dict.fromkeys(ranked['Series']))
+    table = ranked.pivot(index='Rank', columns='Series',
+                         values=['Depth', 'Peak_Date', 'Duration_Days', 'Recovered'])
+    return table.reindex(columns=series, level=1)
+
+
+def build_curves(df_perf: pd.DataFrame, df_bench: Optional[pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    포트폴리오 + 벤치마크별 낙폭 곡선을 계산합니다.
+    포트폴리오는 일별 수익률 연쇄(metrics.py의 Wealth Index와 동일), 벤치마크는 가격 자체를 사용합니다.
+
+    Returns:
+        Dict[str, pd.DataFrame]: {시계열 이름: drawdown_curve 결과}
+    """
+    perf = df_perf.sort_values('Date')
+    curves = {PORTFOLIO: drawdown_curve(perf['Date'], (1 + perf['Daily_Return'].fillna(0.0)).cumprod())}
+    if df_bench is not None and not df_bench.empty:
+        bench = df_bench.sort_values('Date')
+        for ticker in BENCHMARKS:
+            if ticker in bench.columns:
+                prices = bench[['Date', ticker]].dropna()
+                if not prices.empty:
+                    curves[ticker] = drawdown_curve(prices['Date'], prices[ticker])
+    return curves
+
+
+def generate_drawdown_report() -> Dict[str, pd.DataFrame]:
+    """
+    낙폭 구간 분석 메인 함수
+    Input: 05Performance_Data.csv, 06Benchmark_Data.csv (없으면 포트폴리오만)
+    Output: 24Drawdown_Episodes.csv (시계열별 낙폭 구간 순위), 25Drawdown_Curves.csv (누적 고점/고점일/회복일 배열 - long 포맷)
+    """
+    print(f"🚀 {MODULE_TAG} 낙폭 구간 분석 시작...")
+
+    path_perf = config.PROCESSED_DIR / config.PROCESSED_FILES['performance']
+    path_bench = config.PROCESSED_DIR / config.PROCESSED_FILES['benchmark']
+    if not path_perf.exists():
+        print(f"❌ {MODULE_TAG} 성과 파일(05)이 없습니다. metrics.py를 먼저 실행하세요.")
+        return {}
+
+    df_perf = local_io.load_csv(path_perf)
+    df_perf['Date'] = pd.to_datetime(df_perf['Date'])
+    df_bench = None
+    if path_bench.exists():
+        df_bench = local_io.load_csv(path_bench)
+        df_bench['Date'] = pd.to_datetime(df_bench['Date'])
+    else:
+        print(f"⚠️ {MODULE_TAG} 벤치마크 파일(06)이 없어 포트폴리오만 분석합니다.")
+
+    curves = build_curves(df_perf, df_bench)
+    episodes = pd.concat([extract_episodes(c).assign(Series=name) for name, c in curves.items()],
+                         ignore_index=True)[EPISODE_COLUMNS]
+    curve_long = pd.concat([c.assign(Series=name) for name, c in curves.items()], ignore_index=True)[CURVE_COLUMNS]
+
+    date_fmt = lambda s: s.dt.strftime('%Y-%m-%d')
+    out_episodes = episodes.assign(**{c: date_fmt(episodes[c]) for c in ('Peak_Date', 'Trough_Date', 'Recovery_Date')})
+    out_curves = curve_long.assign(**{c: date_fmt(curve_long[c]) for c in ('Date', 'Peak_Date', 'Recovery_Date')})
+    local_io.save_csv(out_episodes, config.PROCESSED_DIR / config.PROCESSED_FILES['drawdown_episodes'])
+    local_io.save_csv(out_curves, config.PROCESSED_DIR / config.PROCESSED_FILES['drawdown_curves'])
+
+    for name in curves:
+        worst = episodes[(episodes['Series'] == name) & (episodes['Rank'] == 1)]
+        if worst.empty:
+            print(f"   - {name}: 낙폭 없음")
+            continue
+        w = worst.iloc[0]
+        status = f"회복 {w['Recovery_Date']:%Y-%m-%d}" if w['Recovered'] else "미회복"
+        print(f"   - {name}: 구간 {int((episodes['Series'] == name).sum())}개, 최대 {w['Depth'] * 100:.2f}% "
+              f"({w['Peak_Date']:%Y-%m-%d} -> {w['Trough_Date']:%Y-%m-%d}, {status}, {int(w['Duration_Days'])}일)")
+    print(f"✅ {MODULE_TAG} 낙폭 구간 {len(episodes)}개 저장 완료")
+    return {'episodes': episodes, 'curves': curve_long}
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    generate_drawdown_report()
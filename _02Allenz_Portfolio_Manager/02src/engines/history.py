@@ -1,26 +1,19 @@
 """
 @Title: Time Machine Engine (Historical Holdings & Valuation)
 @Description: 과거 모든 날짜의 종목별 평가금액과 '현금(Cash)'을 역산하여 완벽한 포트폴리오 스냅샷(Wide Format)을 복원합니다.
+              같은 수량/주가/환율 행렬로 종목별 일별 원가·미실현손익 시계열(12, long 포맷)과
+              원화 환산 종가 행렬(13, what-if 시뮬레이터 입력)과 일별 환율(16)도 함께 저장합니다.
 @Author: Allen & Gemini
 """
 
 # 1. Imports
-import sys
 import pandas as pd
-import yfinance as yf
-from pathlib import Path
-
-# 상위 디렉토리(02src) 참조 설정
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
 
 import config
-try:
-    from data_loaders import io as local_io
-except ImportError:
-    import io as local_io
+from data_loaders import io as local_io
+from engines.currency import ticker_currency
+from engines.positions import build_position_history
+from engines.timeline import build_timeline, carry_forward
 
 # 2. Constants
 MODULE_TAG = "[TimeMachine]"
@@ -28,6 +21,9 @@ MODULE_TAG = "[TimeMachine]"
 # 3. Helper Functions
 def _fetch_price_series(ticker: str, start_date: str, end_date: str) -> pd.Series:
     """특정 티커의 과거 수정 종가를 가져옵니다."""
+    # yfinance는 네트워크 수집 시에만 필요하므로 지연 로드
+    import yfinance as yf
+
     try:
         stock = yf.Ticker(ticker)
         end_dt = (pd.to_datetime(end_date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
@@ -39,6 +35,13 @@ def _fetch_price_series(ticker: str, start_date: str, end_date: str) -> pd.Serie
         print(f"⚠️ {MODULE_TAG} {ticker} 가격 수집 에러: {e}")
         return pd.Series(dtype='float64')
 
+def _ledger_dates() -> pd.DatetimeIndex:
+    """원장(04)의 날짜 축 (영업일 모드에서 07이 04/05와 같은 날짜를 갖도록 포함)"""
+    path = config.PROCESSED_DIR / config.PROCESSED_FILES['ledger']
+    if not path.exists():
+        return pd.DatetimeIndex([])
+    return pd.DatetimeIndex(pd.to_datetime(local_io.load_csv(path, usecols=['Date'])['Date']))
+
 # 4. Main Logic
 def generate_timeline():
     print(f"🚀 {MODULE_TAG} 타임머신 데이터(Wide Format 역산 + 현금) 생성 시작...")
@@ -87,7 +90,10 @@ def generate_timeline():
     start_date = change_wide.index.min() if not change_wide.empty else (pd.Timestamp.today() - pd.Timedelta(days=30))
     today = pd.Timestamp.today().normalize()
 
-    reversed_dates = pd.date_range(start=start_date, end=today, freq='D')[::-1]
+    # 날짜 축 (ALLENZ_TIMELINE_MODE=business면 휴장일 제외, 빠진 날짜의 거래는 다음 날짜로 이월)
+    timeline = build_timeline(start_date, today, extra_dates=_ledger_dates())
+    change_wide = change_wide.groupby(carry_forward(change_wide.index, timeline)).sum()
+    reversed_dates = timeline[::-1]
 
     running_holdings = current_holdings.copy()
     history_qty = []
@@ -132,11 +138,10 @@ def generate_timeline():
     fx_jpy_raw.index = pd.to_datetime(fx_jpy_raw.index).tz_localize(None)
     fx_jpy = pd.DataFrame(index=df_qty_wide.index).join(fx_jpy_raw.rename('JPY'), how='left').ffill().bfill()['JPY']
 
-    # ⭐️ 주식 평가액 계산
-    df_value_wide = pd.DataFrame(index=df_qty_wide.index)
-    for ticker in all_tickers:
-        fx_rate = fx_jpy if ticker.endswith('.T') else fx_usd
-        df_value_wide[ticker] = df_qty_wide[ticker] * df_prices[ticker] * fx_rate
+    # ⭐️ 주식 평가액 계산 (종목별 환율 행렬: 일본 종목은 JPY, 국내 종목은 1, 그 외 USD)
+    fx_by_currency = {'KRW': pd.Series(1.0, index=df_qty_wide.index), 'USD': fx_usd, 'JPY': fx_jpy}
+    df_fx_wide = pd.DataFrame({t: fx_by_currency[ticker_currency(t)] for t in all_tickers}, index=df_qty_wide.index)
+    df_value_wide = df_qty_wide[all_tickers] * df_prices[all_tickers] * df_fx_wide
 
     # --- 5. ⭐️ 현금(Cash) 비중 역산 ⭐️ ---
     ledger_file = config.PROCESSED_DIR / "04Daily_Asset_Ledger.csv"
@@ -167,6 +172,19 @@ def generate_timeline():
     save_path = config.PROCESSED_DIR / "07Historical_Holdings.csv"
     local_io.save_csv(df_value_wide.reset_index(), save_path)
 
+    # --- 7. 종목별 일별 원가/손익 시계열 (같은 수량/주가/환율 행렬 사용, long 포맷) ---
+    df_trades = df_stocks.assign(수량=df_stocks['수량'].abs())
+    df_positions = build_position_history(df_trades, df_qty_wide[all_tickers], df_prices[all_tickers], df_fx_wide)
+    local_io.save_csv(df_positions, config.PROCESSED_DIR / config.PROCESSED_FILES['positions'])
+
+    # --- 8. 원화 환산 종가 행렬 (시세가 없는 종목은 0) ---
+    df_price_krw = df_prices[all_tickers] * df_fx_wide
+    local_io.save_csv(df_price_krw.reset_index(), config.PROCESSED_DIR / config.PROCESSED_FILES['prices'])
+
+    # --- 9. 일별 원화 환율 (벤치마크 원화 환산 등) ---
+    df_fx = pd.DataFrame({'USD': fx_usd, 'JPY': fx_jpy}).rename_axis('Date')
+    local_io.save_csv(df_fx.reset_index(), config.PROCESSED_DIR / config.PROCESSED_FILES['fx_rates'])
+
     print(f"✅ {MODULE_TAG} 타임머신 DB({save_path.name}) 최종 저장 완료")
 
 if __name__ == "__main__":
@@ -0,0 +1,262 @@
+"""
+@Title: Income Engine (Dividends / Withholding Tax / Interest)
+@Description: 거래 내역(00)의 배당금, 원천징수세, 예탁금이용료, 외화RP 이자를 한 번의 벡터 연산으로 분류하여 원화 환산 원장(19)을 만들고,
+              월별/최근 12개월(TTM) 수익표(20)와 종목별 배당 수익률 - 취득원가 대비(Yield on Cost) / 현재 평가금액 대비 - (21)을 산출합니다.
+              배당/이자 행은 원장(ledger.py)에서 외부 자금 흐름과 분리되어 TWR에 운용 수익으로 반영됩니다. (config.INCOME_TREATMENT)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import re
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+from engines.tax_lots import FX_QUOTE_UNIT, asof_fx, fx_observations
+
+# 2. Constants
+MODULE_TAG = "[Income]"
+CATEGORIES = ('Dividend', 'Withholding_Tax', 'Deposit_Interest', 'RP_Interest')
+TREATMENTS = ('return', 'flow')  # 원장의 배당/이자 처리 (ALLENZ_INCOME_TREATMENT)
+TTM_MONTHS = 12
+
+# 외화RP 이자는 원천징수 행만 기록되므로 세율로 세전 이자를 역산 (이자소득세 14% + 지방소득세 1.4%)
+RP_TAX_RATE = 0.154
+
+# '구분' 분류 패턴 (해외배당금/ETF분배금, 외국납부세액/배당세/추징세금(배당), 예탁금이용료, 외화RP원천징수)
+DIVIDEND_PATTERN = r'배당금|분배금'
+TAX_PATTERN = r'외국납부세액|배당세|추징세금\(배당\)'
+DEPOSIT_PATTERN = r'예탁금이용료|이자입금'
+RP_TAX_PATTERN = r'RP원천징수'
+INCOME_PATTERN = '|'.join((DIVIDEND_PATTERN, TAX_PATTERN, DEPOSIT_PATTERN, RP_TAX_PATTERN))
+
+# 종목번호가 종목 코드인 행 (ISIN 또는 국내 단축코드) - 해외배당금은 종목번호에 통화가 들어 있어 종목명으로 찾음
+CODE_PATTERN = r'^(?:[A-Z]{2}[A-Z0-9]{9}\d|A\d{6})$'
+# HTS 배당 종목명의 통화 접미사 ('워리어 멧 콜(미국달러)', '트레져팩토리(일본엔(100))', 깨진 글자 '스테이?미국달러)')
+NAME_SUFFIX = re.compile(r'[\s(?]*(?:미국달러|일본엔\(100\))\)?$')
+
+LEDGER_COLUMNS = ['Date', 'Month', 'Category', '구분', 'ISIN', 'Ticker', '종목명', 'Currency',
+                  'Amount_Local', 'FX', 'Amount_KRW']
+MONTHLY_COLUMNS = ['Month', *CATEGORIES, 'Net_Income', 'TTM_Dividend', 'TTM_Net_Income', 'Avg_Asset', 'TTM_Yield_Pct']
+YIELD_COLUMNS = ['ISIN', 'Ticker', '종목명', 'Dividend_KRW', 'Tax_KRW', 'Net_KRW', 'TTM_Dividend_KRW', 'TTM_Net_KRW',
+                 'Payments', 'Last_Paid', 'Cost_KRW', 'Value_KRW', 'Yield_On_Cost_Pct', 'Current_Yield_Pct']
+
+
+# 3. Helper Functions
+def income_mask(df_txn: pd.DataFrame) -> pd.Series:
+    """배당/원천징수/이자 행 여부 (원장의 외부 자금 흐름 계산에서 분리할 행)"""
+    return df_txn['구분'].fillna('').str.contains(INCOME_PATTERN)
+
+
+def clean_name(names: pd.Series) -> pd.Series:
+    """종목명의 통화 접미사를 떼고 공백을 정리합니다."""
+    return names.fillna('').astype(str).str.replace(NAME_SUFFIX, '', regex=True).str.strip()
+
+
+def name_index(df_txn: pd.DataFrame, df_holdings: pd.DataFrame) -> Dict[str, str]:
+    """종목명 -> ISIN 사전 (거래 내역의 종목 코드 행 + 보유 현황, 통화 접미사 제거)"""
+    coded = df_txn[df_txn['종목번호'].fillna('').str.match(CODE_PATTERN)]
+    pairs = [pd.Series(coded['종목번호'].to_numpy(), index=clean_name(coded['종목명']).to_numpy())]
+    if not df_holdings.empty and {'종목코드', '종목명'} <= set(df_holdings.columns):
+        pairs.append(pd.Series(df_holdings['종목코드'].to_numpy(), index=clean_name(df_holdings['종목명']).to_numpy()))
+    index = pd.concat(pairs)
+    index = index[index.index != '']
+    return index[~index.index.duplicated(keep='last')].to_dict()
+
+
+def resolve_isin(names: pd.Series, index: Dict[str, str]) -> pd.Series:
+    """
+    정리된 종목명을 ISIN으로 변환합니다. 정확히 일치하지 않으면 한쪽이 다른 쪽의 접두어인 이름 중
+    후보가 하나뿐인 경우만 사용합니다. (HTS 배당 종목명은 잘린 형태: '컴포트 시스템스 US' -> '컴포트 시스템스 USA')
+    """
+    lookup = {}
+    for name in names.dropna().unique():
+        if name in index:
+            lookup[name] = index[name]
+            continue
+        candidates = {isin for known, isin in index.items() if known.startswith(name) or name.startswith(known)}
+        lookup[name] = candidates.pop() if len(candidates) == 1 else np.nan
+    return names.map(lookup)
+
+
+def classify_income(df_txn: pd.DataFrame, df_holdings: pd.DataFrame) -> pd.DataFrame:
+    """
+    거래 내역에서 수익 행을 분류하여 원화 환산 원장을 만듭니다. (행 루프 없는 벡터 연산)
+
+    - Dividend: 세전 배당금/분배금 (거래대금, 해외배당은 현지 통화)
+    - Withholding_Tax: 외국납부세액/배당세/추징세금(배당)은 음수, 적요에 '환급'이 있으면 양수.
+      국내 분배금/외화RP처럼 세금이 제세금 컬럼에만 있는 행은 별도의 세금 행으로 분리
+    - Deposit_Interest: 예탁금이용료
+    - RP_Interest: 외화RP원천징수 세액 / RP_TAX_RATE (세전 이자 역산)
+
+    Returns:
+        pd.DataFrame: LEDGER_COLUMNS (일자 오름차순)
+    """
+    src = df_txn[income_mask(df_txn)]
+    kind = src['구분'].fillna('')
+    is_div = kind.str.contains(DIVIDEND_PATTERN).to_numpy()
+    is_tax = kind.str.contains(TAX_PATTERN).to_numpy()
+    is_rp = kind.str.contains(RP_TAX_PATTERN).to_numpy()
+    refund = src['적요'].fillna('').str.contains('환급').to_numpy()
+    gross = pd.to_numeric(src['거래대금'], errors='coerce').fillna(0).abs().to_numpy()
+    withheld = pd.to_numeric(src['제세금'], errors='coerce').fillna(0).abs().to_numpy()
+
+    category = np.select([is_div, is_tax, is_rp], ['Dividend', 'Withholding_Tax', 'RP_Interest'], 'Deposit_Interest')
+    amount = np.select([is_tax, is_rp], [np.where(refund, gross, -gross), gross / RP_TAX_RATE], gross)
+
+    code = src['종목번호'].fillna('').astype(str)
+    records = pd.DataFrame({
+        'Date': pd.to_datetime(src['일자']).to_numpy(),
+        'Category': category,
+        '구분': kind.to_numpy(),
+        'Code': code.to_numpy(),
+        '종목명': src['종목명'].to_numpy(),
+        'Currency': code.where(code.isin(list(FX_QUOTE_UNIT)), 'KRW').to_numpy(),
+        'Amount_Local': amount,
+    })
+    # 제세금으로만 기록된 원천징수 (배당/분배금, RP 이자) -> 세금 행 추가
+    split = (is_div | is_rp) & (withheld > 0)
+    taxes = records[split].assign(Category='Withholding_Tax', Amount_Local=-withheld[split])
+    records = pd.concat([records, taxes]).sort_values('Date', kind='stable').reset_index(drop=True)
+
+    records['FX'] = asof_fx(records, fx_observations(df_txn))
+    records['Amount_KRW'] = records['Amount_Local'] * records['FX']
+
+    # 종목 귀속: 종목번호가 종목 코드면 그대로, 아니면(해외배당 = 통화 코드) 종목명으로 조회. 이자는 종목 없음
+    coded = records['Code'].str.match(CODE_PATTERN)
+    by_name = resolve_isin(clean_name(records['종목명']), name_index(df_txn, df_holdings))
+    records['ISIN'] = records['Code'].where(coded, by_name).where(records['Category'] != 'Deposit_Interest')
+    records.loc[records['구분'].str.contains(RP_TAX_PATTERN), 'ISIN'] = np.nan
+    records['Ticker'] = records['ISIN'].map(config.ISIN_TO_TICKER)
+    records['Month'] = records['Date'].dt.strftime('%Y-%m')
+    return records[LEDGER_COLUMNS]
+
+
+def monthly_income(ledger: pd.DataFrame, df_perf: pd.DataFrame) -> pd.DataFrame:
+    """
+    월 x 분류 수익표와 최근 12개월(TTM) 합계를 계산합니다.
+    TTM_Yield_Pct = TTM 순수익 / 최근 12개월 월평균 자산 (05의 Calculated_Asset, 성과 데이터가 없으면 NaN)
+    """
+    table = ledger.pivot_table(index='Month', columns='Category', values='Amount_KRW', aggfunc='sum')
+    avg_asset = pd.Series(dtype=float)
+    if not df_perf.empty:
+        dates = pd.to_datetime(df_perf['Date'])
+        avg_asset = df_perf['Calculated_Asset'].groupby(dates.dt.strftime('%Y-%m').to_numpy()).mean()
+
+    # 수익이 없는 달도 0으로 채워 TTM 창이 달력 기준 12개월이 되도록 함
+    months = table.index.union(avg_asset.index)
+    if len(months):
+        months = pd.period_range(min(months), max(months), freq='M').strftime('%Y-%m')
+    table = table.reindex(index=months, columns=list(CATEGORIES)).fillna(0.0)
+    table.index.name = 'Month'
+
+    table['Net_Income'] = table[list(CATEGORIES)].sum(axis=1)
+    table['TTM_Dividend'] = table['Dividend'].rolling(TTM_MONTHS, min_periods=1).sum()
+    table['TTM_Net_Income'] = table['Net_Income'].rolling(TTM_MONTHS, min_periods=1).sum()
+    table['Avg_Asset'] = avg_asset.reindex(table.index)
+    ttm_asset = table['Avg_Asset'].rolling(TTM_MONTHS, min_periods=1).mean()
+    table['TTM_Yield_Pct'] = table['TTM_Net_Income'] / ttm_asset.where(ttm_asset > 0) * 100
+    return table.reset_index()[MONTHLY_COLUMNS]
+
+
+def yield_table(ledger: pd.DataFrame, df_lots: pd.DataFrame, as_of: pd.Timestamp) -> pd.DataFrame:
+    """
+    종목별 배당 합계와 수익률을 계산합니다. (TTM = as_of 기준 최근 12개월)
+
+    - Yield_On_Cost_Pct: TTM 순배당 / 미청산 로트 취득원가 (원화, 원가 미상 로트가 있는 종목은 NaN)
+    - Current_Yield_Pct: TTM 순배당 / 현재 평가금액
+    """
+    stock = ledger[ledger['ISIN'].notna() & ledger['Category'].isin(['Dividend', 'Withholding_Tax'])]
+    if stock.empty:
+        return pd.DataFrame(columns=YIELD_COLUMNS)
+
+    ttm = stock['Date'] > as_of - pd.DateOffset(months=TTM_MONTHS)
+    is_div = stock['Category'] == 'Dividend'
+    parts = pd.DataFrame({
+        'ISIN': stock['ISIN'],
+        'Dividend_KRW': stock['Amount_KRW'].where(is_div, 0.0),
+        'Tax_KRW': stock['Amount_KRW'].where(~is_div, 0.0),
+        'Net_KRW': stock['Amount_KRW'],
+        'TTM_Dividend_KRW': stock['Amount_KRW'].where(is_div & ttm, 0.0),
+        'TTM_Net_KRW': stock['Amount_KRW'].where(ttm, 0.0),
+        'Payments': is_div.astype(int),
+        'Last_Paid': stock['Date'].where(is_div),
+    })
+    table = parts.groupby('ISIN').agg({
+        'Dividend_KRW': 'sum', 'Tax_KRW': 'sum', 'Net_KRW': 'sum', 'TTM_Dividend_KRW': 'sum',
+        'TTM_Net_KRW': 'sum', 'Payments': 'sum', 'Last_Paid': 'max',
+    })
+    table['Last_Paid'] = table['Last_Paid'].dt.strftime('%Y-%m-%d')
+
+    if not df_lots.empty:
+        lots = df_lots.groupby('ISIN')
+        all_known = lots['Basis_Known'].agg(lambda s: (s.astype(str) == 'True').all())
+        table['Cost_KRW'] = lots['Cost_KRW'].sum().where(all_known).reindex(table.index)
+        table['Value_KRW'] = df_lots.groupby('ISIN')['Value_KRW'].sum().reindex(table.index)
+    else:
+        table['Cost_KRW'] = table['Value_KRW'] = np.nan
+    table['Yield_On_Cost_Pct'] = table['TTM_Net_KRW'] / table['Cost_KRW'].where(table['Cost_KRW'] > 0) * 100
+    table['Current_Yield_Pct'] = table['TTM_Net_KRW'] / table['Value_KRW'].where(table['Value_KRW'] > 0) * 100
+
+    names = stock.dropna(subset=['종목명']).drop_duplicates('ISIN', keep='last').set_index('ISIN')['종목명']
+    table = table.reset_index()
+    table['Ticker'] = table['ISIN'].map(config.ISIN_TO_TICKER)
+    table['종목명'] = clean_name(table['ISIN'].map(names))
+    return table.sort_values('TTM_Net_KRW', ascending=False)[YIELD_COLUMNS]
+
+
+def _load_optional(key: str) -> pd.DataFrame:
+    path = config.PROCESSED_DIR / config.PROCESSED_FILES[key]
+    return local_io.load_csv(path) if path.exists() else pd.DataFrame()
+
+
+# 4. Main Logic
+def generate_income_report() -> Dict[str, pd.DataFrame]:
+    """
+    수익 엔진 메인 함수
+    Input: 00Transaction_History.csv, 02Portfolio_Holdings.csv (종목명 조회), 05Performance_Data.csv (TTM 수익률),
+           10Tax_Lots.csv (취득원가/평가금액)
+    Output: 19Income_Ledger.csv, 20Income_Monthly.csv, 21Income_Yield.csv
+    """
+    print(f"🚀 {MODULE_TAG} 배당/이자 수익 분석 시작...")
+
+    path_txn = config.PROCESSED_DIR / config.PROCESSED_FILES['transaction']
+    if not path_txn.exists():
+        print(f"❌ {MODULE_TAG} 거래 내역 파일(00)이 없습니다.")
+        return {}
+
+    df_txn = local_io.load_csv(path_txn)
+    ledger = classify_income(df_txn, _load_optional('holdings'))
+    df_perf = _load_optional('performance')
+    monthly = monthly_income(ledger, df_perf)
+
+    as_of = pd.to_datetime(df_txn['일자']).max()
+    if not df_perf.empty:
+        as_of = max(as_of, pd.to_datetime(df_perf['Date']).max())
+    yields = yield_table(ledger, _load_optional('tax_lots'), as_of)
+
+    out = ledger.assign(Date=ledger['Date'].dt.strftime('%Y-%m-%d'))
+    local_io.save_csv(out, config.PROCESSED_DIR / config.PROCESSED_FILES['income'])
+    local_io.save_csv(monthly, config.PROCESSED_DIR / config.PROCESSED_FILES['income_monthly'])
+    local_io.save_csv(yields, config.PROCESSED_DIR / config.PROCESSED_FILES['income_yield'])
+
+    unresolved = (ledger['Category'].isin(['Dividend', 'Withholding_Tax']) & ledger['ISIN'].isna()
+                  & ~ledger['구분'].str.contains(RP_TAX_PATTERN))
+    if unresolved.any():
+        names = ', '.join(clean_name(ledger.loc[unresolved, '종목명']).unique()[:5])
+        print(f"⚠️ {MODULE_TAG} 종목을 찾지 못한 배당/세금 {int(unresolved.sum())}건: {names}")
+    totals = ledger.groupby('Category')['Amount_KRW'].sum()
+    print(f"✅ {MODULE_TAG} 수익 {len(ledger)}건 / 배당 {totals.get('Dividend', 0):,.0f}원, "
+          f"세금 {totals.get('Withholding_Tax', 0):,.0f}원, 이자 "
+          f"{totals.get('Deposit_Interest', 0) + totals.get('RP_Interest', 0):,.0f}원 "
+          f"(TTM 순수익 {monthly['TTM_Net_Income'].iloc[-1] if len(monthly) else 0:,.0f}원)")
+    return {'ledger': ledger, 'monthly': monthly, 'yield': yields}
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    generate_income_report()
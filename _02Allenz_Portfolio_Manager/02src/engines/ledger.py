@@ -7,22 +7,13 @@
 """
 
 # 1. Imports
-import sys
 import pandas as pd
 import numpy as np
-from pathlib import Path
-
-# 상위 디렉토리 참조 설정
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
 
 import config
-try:
-    from data_loaders import io as local_io
-except ImportError:
-    import io as local_io
+from data_loaders import io as local_io
+from engines.income import TREATMENTS, income_mask
+from engines.timeline import build_timeline, compress_ledger
 
 # 2. Constants
 MODULE_TAG = "[Ledger]"
@@ -35,8 +26,13 @@ def _calculate_net_flow(df_tx: pd.DataFrame) -> pd.Series:
     if df_tx.empty:
         return pd.Series(dtype=float)
 
-    # 데이터 복사
+    # 데이터 복사 (배당/이자/원천징수는 운용 수익이므로 기본적으로 외부 흐름에서 제외 - INCOME_TREATMENT='flow'면 기존 방식)
+    treatment = config.INCOME_TREATMENT
+    if treatment not in TREATMENTS:
+        raise ValueError(f"{MODULE_TAG} 지원하지 않는 배당/이자 처리 방식: '{treatment}' ({'/'.join(TREATMENTS)})")
     df = df_tx.copy()
+    if treatment == 'return' and '구분' in df.columns:
+        df = df[~income_mask(df)]
 
     # 날짜 처리 ('일자' 컬럼이 없으면 'Date' 확인)
     if '일자' in df.columns:
@@ -192,7 +188,12 @@ def create_daily_ledger() -> pd.DataFrame:
             running_asset += flow
             ledger.loc[day, 'Calculated_Asset'] = running_asset
 
-    # 6. 저장
+    # 6. 날짜 축 압축 (business 모드: 거래일 + 흐름일과 그 전날 + 앵커일만 유지, 보간은 달력 기준이므로 TWR 불변)
+    timeline = build_timeline(ledger.index[0], ledger.index[-1],
+                              flow_dates=ledger.index[ledger['External_Flow'] != 0], extra_dates=anchor_dates)
+    ledger = compress_ledger(ledger, timeline)
+
+    # 7. 저장
     ledger = ledger.reset_index()
     ledger['Calculated_Asset'] = ledger['Calculated_Asset'].round(0)
 
@@ -0,0 +1,211 @@
+"""
+@Title: Live Quote Engine (Intraday Revaluation)
+@Description: 보유 종목과 환율의 현재 시세를 한 번의 배치 요청으로 수집하여 TTL 캐시에 보관하고,
+              마지막 HTS 내보내기 기준의 통합 포트폴리오(03)를 현재가/현재환율로 재평가합니다. (평가금액/수익률/보유비중 벡터 연산)
+              시세 소스는 교체 가능하며(yfinance / 로컬 CSV), 오프라인에서는 CSV 파일을 대체 소스로 사용합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import time
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Protocol
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+
+# 2. Constants
+MODULE_TAG = "[LiveQuotes]"
+DEFAULT_TTL_SEC = 60.0
+FX_TICKERS = {'USD': 'USDKRW=X', 'JPY': 'JPYKRW=X'}
+CASH_CODE = 'CASH'
+
+
+# 3. Helper Functions (Quote Sources)
+class QuoteSource(Protocol):
+    """시세 소스 인터페이스: 심볼 목록을 받아 {심볼: 현재가}를 한 번에 반환합니다. (조회 실패 심볼은 생략)"""
+    name: str
+
+    def fetch(self, symbols: Iterable[str]) -> Dict[str, float]:
+        ...
+
+
+class YFinanceQuoteSource:
+    """yfinance 배치 다운로드(한 번의 요청)로 최근 종가/장중가를 가져옵니다."""
+    name = 'yfinance'
+
+    def fetch(self, symbols: Iterable[str]) -> Dict[str, float]:
+        # yfinance는 실시간 재평가를 켤 때만 필요하므로 지연 로드
+        import yfinance as yf
+
+        symbols = sorted(set(symbols))
+        if not symbols:
+            return {}
+        try:
+            data = yf.download(symbols, period='5d', interval='1d', progress=False, auto_adjust=False, threads=True)
+        except Exception as e:
+            print(f"⚠️ {MODULE_TAG} yfinance 배치 조회 실패: {e}")
+            return {}
+        if data is None or data.empty or 'Close' not in data.columns.get_level_values(0):
+            return {}
+
+        close = data['Close']
+        if isinstance(close, pd.Series):
+            close = close.to_frame(symbols[0])
+        last = close.ffill().iloc[-1].dropna()
+        return {str(k): float(v) for k, v in last.items()}
+
+
+@dataclass
+class FileQuoteSource:
+    """
+    로컬 CSV 시세 파일 (오프라인 대체 소스). 컬럼: Symbol, Price
+
+    Attributes:
+        path: 시세 CSV 경로 (갱신 시마다 다시 읽음)
+    """
+    path: Path
+    name: str = 'file'
+
+    def fetch(self, symbols: Iterable[str]) -> Dict[str, float]:
+        if not Path(self.path).exists():
+            print(f"⚠️ {MODULE_TAG} 시세 파일이 없습니다: {self.path}")
+            return {}
+        df = local_io.load_csv(self.path)
+        prices = pd.to_numeric(df['Price'], errors='coerce')
+        quotes = dict(zip(df['Symbol'].astype(str), prices))
+        wanted = set(symbols)
+        return {k: float(v) for k, v in quotes.items() if k in wanted and pd.notna(v)}
+
+
+def quote_source_from_config(spec: Optional[str] = None) -> QuoteSource:
+    """
+    설정 문자열로 시세 소스를 생성합니다.
+
+    Args:
+        spec (str, optional): 'yfinance' 또는 'file:<CSV 경로>' (None이면 config.QUOTE_SOURCE)
+    """
+    spec = spec or config.QUOTE_SOURCE
+    if spec.startswith('file:'):
+        path = Path(spec[len('file:'):]).expanduser()
+        return FileQuoteSource(path if path.is_absolute() else config.BASE_DIR / path)
+    if spec == 'yfinance':
+        return YFinanceQuoteSource()
+    raise ValueError(f"{MODULE_TAG} 알 수 없는 시세 소스: {spec}")
+
+
+# 4. Main Logic
+@dataclass(frozen=True)
+class QuoteSnapshot:
+    """한 번의 배치 조회 결과 (모든 세션이 공유하는 읽기 전용 스냅샷)"""
+    prices: Dict[str, float]
+    fetched_at: datetime
+    source: str
+    symbols: frozenset = field(default_factory=frozenset)
+
+
+class QuoteCache:
+    """
+    TTL 시세 캐시. 만료되었거나 요청 심볼이 스냅샷에 없을 때만 소스를 한 번 배치 조회합니다.
+
+    Attributes:
+        source: 시세 소스
+        ttl_sec: 스냅샷 유효 시간 (초)
+    """
+
+    def __init__(self, source: QuoteSource, ttl_sec: float = DEFAULT_TTL_SEC):
+        self.source = source
+        self.ttl_sec = ttl_sec
+        self._snapshot: Optional[QuoteSnapshot] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self, symbols: Iterable[str], force: bool = False) -> QuoteSnapshot:
+        """요청 심볼을 포함하는 유효한 스냅샷을 반환합니다. (동시 요청은 한 번의 조회를 공유)"""
+        wanted = frozenset(symbols)
+        with self._lock:
+            current = self._snapshot
+            fresh = current is not None and time.monotonic() < self._expires_at and wanted <= current.symbols
+            if fresh and not force:
+                return current
+
+            # 이전 스냅샷의 심볼까지 합쳐 조회 (세션마다 보유 목록이 같아 대부분 한 번으로 충분)
+            request = wanted | (current.symbols if current else frozenset())
+            start_time = time.time()
+            prices = self.source.fetch(request)
+            print(f"ℹ️ {MODULE_TAG} {self.source.name} 시세 {len(prices)}/{len(request)}건 조회 ({time.time() - start_time:.2f}초)")
+
+            self._snapshot = QuoteSnapshot(prices, datetime.now(), self.source.name, request)
+            self._expires_at = time.monotonic() + self.ttl_sec
+            return self._snapshot
+
+
+def holding_symbols(df_full: pd.DataFrame, isin_to_ticker: Optional[Dict[str, str]] = None) -> pd.Series:
+    """종목코드(ISIN)를 시세 심볼로 매핑합니다. (매핑이 없으면 NaN)"""
+    mapping = config.ISIN_TO_TICKER if isin_to_ticker is None else isin_to_ticker
+    return df_full['종목코드'].map(mapping)
+
+
+def required_symbols(df_full: pd.DataFrame) -> set:
+    """재평가에 필요한 시세 심볼 (보유 종목 + 환율)"""
+    return set(holding_symbols(df_full).dropna()) | set(FX_TICKERS.values())
+
+
+def revalue_portfolio(df_full: pd.DataFrame, snapshot: QuoteSnapshot) -> pd.DataFrame:
+    """
+    통합 포트폴리오를 현재 시세/환율로 재평가합니다. 시세가 없는 종목과 현금은 HTS 기준 값을 유지합니다.
+
+    Args:
+        df_full (pd.DataFrame): 03Full_Portfolio (종목코드, 잔고수량, 매입금액, 현재가, 평가금액, 현재환율 포함)
+        snapshot (QuoteSnapshot): 시세 스냅샷
+
+    Returns:
+        pd.DataFrame: 재평가된 복사본 ('재평가' 컬럼: 현재 시세 반영 여부)
+    """
+    df = df_full.copy()
+    symbols = holding_symbols(df)
+    price = pd.to_numeric(symbols.map(snapshot.prices), errors='coerce').to_numpy(dtype=float)
+
+    # 통화 판정: 일본 종목(.T)은 JPY, HTS 현재환율이 있으면 USD, 그 외는 원화 (history.py와 동일한 규칙)
+    hts_fx = pd.to_numeric(df.get('현재환율'), errors='coerce').fillna(0).to_numpy(dtype=float)
+    is_jpy = symbols.fillna('').str.endswith('.T').to_numpy()
+    is_foreign = is_jpy | (hts_fx > 0)
+    live_fx = np.where(is_jpy, snapshot.prices.get(FX_TICKERS['JPY'], np.nan), snapshot.prices.get(FX_TICKERS['USD'], np.nan))
+    fx = np.where(is_foreign, np.where(np.isnan(live_fx), hts_fx, live_fx), 1.0)
+
+    qty = pd.to_numeric(df['잔고수량'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    cost = pd.to_numeric(df['매입금액'], errors='coerce').to_numpy(dtype=float)
+    repriced = ~np.isnan(price) & (df['종목코드'] != CASH_CODE).to_numpy() & (fx > 0)
+
+    value = pd.to_numeric(df['평가금액'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    value = np.where(repriced, qty * price * fx, value)
+
+    df['현재가'] = np.where(repriced, price, pd.to_numeric(df['현재가'], errors='coerce'))
+    df['현재환율'] = np.where(repriced & is_foreign, fx, hts_fx)
+    df['평가금액'] = value
+    returns = np.divide(value, cost, out=np.full_like(value, np.nan), where=cost > 0)
+    df['수익률'] = np.where(repriced, ((returns - 1) * 100).round(2), pd.to_numeric(df['수익률'], errors='coerce'))
+    total = value.sum()
+    if total > 0:
+        df['보유비중'] = (value / total * 100).round(2)
+    df['재평가'] = repriced
+    return df
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    path_full = config.PROCESSED_DIR / config.PROCESSED_FILES['full_portfolio']
+    df_full = local_io.load_csv(path_full)
+    cache = QuoteCache(quote_source_from_config())
+    snap = cache.snapshot(required_symbols(df_full))
+    df_live = revalue_portfolio(df_full, snap)
+    print(f"ℹ️ {MODULE_TAG} 재평가 종목: {int(df_live['재평가'].sum())}/{len(df_live) - 1}")
+    print(f"ℹ️ HTS 기준 총 자산: {pd.to_numeric(df_full['평가금액'], errors='coerce').sum():,.0f}")
+    print(f"ℹ️ 현재 시세 총 자산: {df_live['평가금액'].sum():,.0f}")
@@ -6,24 +6,11 @@
 """
 
 # 1. Imports
-import sys
 import pandas as pd
 import numpy as np
-from pathlib import Path
-from scipy import optimize  # MWR(XIRR) 계산용
-
-# 상위 디렉토리 참조 설정
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
 
 import config
-
-try:
-    from data_loaders import io as local_io
-except ImportError:
-    import io as local_io
+from data_loaders import io as local_io
 
 # 2. Constants
 MODULE_TAG = "[Metrics]"
@@ -35,6 +22,8 @@ def _calculate_xirr(cash_flows: list, dates: list) -> float:
     비정기적 현금흐름에 대한 내부수익률(XIRR) 계산
     scipy.optimize.newton을 사용하여 해를 찾음
     """
+    # scipy는 XIRR 계산 시에만 필요하므로 지연 로드 (모듈 import 비용 절감)
+    from scipy import optimize
     if len(cash_flows) != len(dates):
         return None
 
@@ -0,0 +1,133 @@
+"""
+@Title: Position History Engine (Daily Cost Basis & Unrealized P&L)
+@Description: 타임머신 엔진(history.py)이 만든 일별 수량/주가/환율 행렬과 거래 내역으로부터
+              종목별 일별 취득원가, 평균단가, 평가금액, 미실현손익, 종목 수익률을 계산하여 long 포맷(12)으로 저장합니다.
+              이동평균법(HTS 평균단가와 같은 방식) 원가를 날짜 루프 없이 전 종목 행렬의 누적 곱/누적 합으로 계산합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+
+from engines.timeline import carry_forward
+
+# 2. Constants
+MODULE_TAG = "[Positions]"
+QTY_EPS = 1e-9
+
+POSITION_COLUMNS = ['Date', 'Ticker', 'Qty', 'Price_Local', 'FX', 'Avg_Price_Local', 'Cost_Local', 'Cost_KRW',
+                    'Value_Local', 'Value_KRW', 'Unrealized_Local', 'Unrealized_KRW', 'Return_Local_Pct', 'Return_Pct']
+
+
+# 3. Helper Functions
+def _segment_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    열별 누적 합을 구간 시작(starts=True) 행마다 새로 시작합니다. (values, starts: 날짜 x 종목 행렬, 첫 행은 항상 시작)
+    전체 누적 합에서 빼는 방식은 크기가 다른 구간 사이에서 정밀도를 잃으므로 구간별로 직접 누적합니다.
+    """
+    segment_ids = np.cumsum(starts.ravel(order='F'))
+    flat = pd.Series(values.ravel(order='F')).groupby(segment_ids).cumsum().to_numpy()
+    return flat.reshape(values.shape, order='F')
+
+
+def _moving_average_cost(retain: np.ndarray, added: np.ndarray) -> np.ndarray:
+    """
+    이동평균법 원가 점화식 C[t] = retain[t] * C[t-1] + added[t]를 전 종목에 대해 한 번에 풉니다.
+
+    - retain: 당일 매도 후 남는 수량 비율 (전량 매도/미보유 = 0, 그날부터 새 구간)
+    - added: 당일 매수 원가
+    구간 안에서 P[t] = Π retain 이라 하면 C[t] = P[t] * Σ added[k] / P[k] (누적 곱/누적 합, 로그 공간)
+    """
+    starts = retain <= 0
+    starts[0] = True
+    log_retain = np.where(starts, 0.0, np.log(np.where(starts, 1.0, retain)))
+    p = np.exp(_segment_cumsum(log_retain, starts))  # 구간 시작 행은 log retain = 0 -> P = 1
+    return p * _segment_cumsum(added / p, starts)
+
+
+def trade_matrices(trades: pd.DataFrame, index: pd.DatetimeIndex, tickers, fx_wide: pd.DataFrame):
+    """
+    거래 내역을 날짜 x 종목 행렬(매수 수량/매도 수량/매수 원가 현지·원화)로 집계합니다.
+    같은 날 매수와 매도가 모두 있으면 매도를 먼저 반영합니다. (일 단위 근사)
+    index에 없는 날짜(영업일 모드에서 빠진 휴장일)의 거래는 다음 날짜로 이월합니다.
+
+    Args:
+        trades (pd.DataFrame): [일자, Ticker, 구분, 수량, 거래대금, 수수료, 제세금]
+        fx_wide (pd.DataFrame): 날짜 x 종목 환율 (원화 종목은 1)
+    """
+    is_sell = trades['구분'].str.contains('매도')
+    cost = trades['거래대금'] + trades['수수료'].fillna(0) + trades['제세금'].fillna(0)
+    events = pd.DataFrame({
+        'Date': carry_forward(trades['일자'], index), 'Ticker': trades['Ticker'],
+        'buy_qty': trades['수량'].where(~is_sell, 0.0), 'sell_qty': trades['수량'].where(is_sell, 0.0),
+        'buy_cost': cost.where(~is_sell, 0.0),
+    }).groupby(['Date', 'Ticker']).sum()
+
+    def wide(col: str) -> np.ndarray:
+        return (events[col].unstack('Ticker').reindex(index=index, columns=tickers)
+                .fillna(0.0).to_numpy(dtype=float))
+
+    buy_cost = wide('buy_cost')
+    return wide('buy_qty'), wide('sell_qty'), buy_cost, buy_cost * fx_wide.to_numpy(dtype=float)
+
+
+# 4. Main Logic
+def build_position_history(trades: pd.DataFrame, qty_wide: pd.DataFrame, price_wide: pd.DataFrame,
+                           fx_wide: pd.DataFrame) -> pd.DataFrame:
+    """
+    종목별 일별 원가/손익 시계열을 계산합니다. (날짜 x 종목 행렬 연산, 보유 중인 날만 long 포맷으로 반환)
+
+    - 원가는 이동평균법: 매수 시 원가 가산, 매도 시 평균단가 x 매도 수량만큼 차감 (원화 원가는 매수일 환율)
+    - 거래 내역 시작 이전부터 보유한 수량(기초 잔고)은 첫날 평가금액을 취득원가로 간주
+    - Return_Pct: 원화 기준 (환율 효과 포함), Return_Local_Pct: 현지 통화 기준
+
+    Args:
+        trades (pd.DataFrame): 주식 매매 내역 (일자, Ticker, 구분, 수량, 거래대금, 수수료, 제세금)
+        qty_wide (pd.DataFrame): 날짜 x 종목 보유 수량 (history.py 역산 결과, 장 마감 기준)
+        price_wide (pd.DataFrame): 날짜 x 종목 현지 통화 종가
+        fx_wide (pd.DataFrame): 날짜 x 종목 원화 환율
+
+    Returns:
+        pd.DataFrame: POSITION_COLUMNS (Date, Ticker 오름차순)
+    """
+    index, tickers = qty_wide.index, list(qty_wide.columns)
+    price_wide = price_wide.reindex(index=index, columns=tickers)
+    fx_wide = fx_wide.reindex(index=index, columns=tickers)
+    qty = qty_wide.to_numpy(dtype=float).clip(min=0)
+    price = price_wide.to_numpy(dtype=float)
+    fx = fx_wide.to_numpy(dtype=float)
+
+    buy_qty, sell_qty, buy_local, buy_krw = trade_matrices(trades, index, tickers, fx_wide)
+
+    # 전일 보유 수량 (첫날은 당일 거래를 되돌린 기초 잔고)
+    prev_qty = np.vstack([qty[:1] - buy_qty[:1] + sell_qty[:1], qty[:-1]]).clip(min=0)
+    retain = np.where(prev_qty > QTY_EPS, ((prev_qty - sell_qty) / np.where(prev_qty > QTY_EPS, prev_qty, 1.0)).clip(0, 1), 0.0)
+
+    # 기초 잔고는 첫날 평가금액을 원가로 두고 첫날 유지 비율을 적용 (첫 행이 항상 구간 시작)
+    opening_local = np.nan_to_num(prev_qty[0] * price[0])
+    buy_local[0] += retain[0] * opening_local
+    buy_krw[0] += retain[0] * np.nan_to_num(opening_local * fx[0])
+
+    cost_local = _moving_average_cost(retain, buy_local)
+    cost_krw = _moving_average_cost(retain, buy_krw)
+
+    held = qty > QTY_EPS
+    value_local = qty * price
+    value_krw = value_local * fx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_price = np.where(held, cost_local / qty, np.nan)
+        ret_local = np.where(held & (cost_local > 0), (value_local / cost_local - 1) * 100, np.nan)
+        ret_krw = np.where(held & (cost_krw > 0), (value_krw / cost_krw - 1) * 100, np.nan)
+
+    rows, cols = np.nonzero(held)
+    result = pd.DataFrame({
+        'Date': index[rows], 'Ticker': np.asarray(tickers, dtype=object)[cols],
+        'Qty': qty[rows, cols], 'Price_Local': price[rows, cols], 'FX': fx[rows, cols],
+        'Avg_Price_Local': avg_price[rows, cols], 'Cost_Local': cost_local[rows, cols], 'Cost_KRW': cost_krw[rows, cols],
+        'Value_Local': value_local[rows, cols], 'Value_KRW': value_krw[rows, cols],
+        'Unrealized_Local': (value_local - cost_local)[rows, cols], 'Unrealized_KRW': (value_krw - cost_krw)[rows, cols],
+        'Return_Local_Pct': ret_local[rows, cols], 'Return_Pct': ret_krw[rows, cols],
+    })
+    return result[POSITION_COLUMNS]
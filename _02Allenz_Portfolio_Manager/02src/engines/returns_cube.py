@@ -0,0 +1,144 @@
+"""
+@Title: Period Returns Cube Engine
+@Description: 성과 데이터(05)와 벤치마크(06)로부터 월/분기/연도별 수익률 큐브(09)를 한 번의 그룹 연산으로 생성합니다.
+              기간별 포트폴리오 TWR, MWR(Modified Dietz), 입출금, 기초/기말 자산, 벤치마크 수익률, 초과 수익을 담아
+              대시보드(달력 히트맵)와 AI 도구가 일별 데이터를 다시 계산하지 않고 조회만 하도록 합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+
+# 2. Constants
+MODULE_TAG = "[ReturnsCube]"
+BENCHMARKS = ('SPY', 'QQQ', 'IWM')
+
+# 집계 주기 (큐브 Freq 값 -> pandas Period 주기)
+FREQS = {'M': 'M', 'Q': 'Q', 'Y': 'Y'}
+
+CUBE_COLUMNS = ['Freq', 'Period', 'Start', 'End', 'Days', 'Start_Asset', 'End_Asset', 'Inflow', 'Outflow', 'Net_Flow',
+                'TWR', 'MWR'] + list(BENCHMARKS) + ['Excess_SPY']
+
+
+# 3. Helper Functions
+def _prepare_daily(df_perf: pd.DataFrame, df_bench: pd.DataFrame) -> pd.DataFrame:
+    """
+    일별 데이터에 기간 집계용 보조 컬럼을 추가합니다.
+    - Prev_Asset: 전일 자산 (첫날은 당일 자산 - 당일 유입액, metrics.py와 동일)
+    - 벤치마크 가격은 성과 날짜 기준으로 정렬 후 직전 값으로 채움 (휴장일)
+    """
+    daily = df_perf[['Date', 'Daily_Return', 'External_Flow', 'Calculated_Asset']].copy()
+    daily['Date'] = pd.to_datetime(daily['Date'])
+    daily = daily.sort_values('Date').reset_index(drop=True)
+    daily['Daily_Return'] = daily['Daily_Return'].fillna(0.0)
+    daily['External_Flow'] = daily['External_Flow'].fillna(0.0)
+    daily['Prev_Asset'] = daily['Calculated_Asset'].shift(1)
+    daily.loc[0, 'Prev_Asset'] = daily.loc[0, 'Calculated_Asset'] - daily.loc[0, 'External_Flow']
+
+    if df_bench is not None and not df_bench.empty:
+        bench = df_bench[['Date'] + [t for t in BENCHMARKS if t in df_bench.columns]].copy()
+        bench['Date'] = pd.to_datetime(bench['Date'])
+        daily = pd.merge_asof(daily, bench.sort_values('Date'), on='Date', direction='backward')
+    for ticker in BENCHMARKS:
+        if ticker not in daily.columns:
+            daily[ticker] = np.nan
+    daily[list(BENCHMARKS)] = daily[list(BENCHMARKS)].ffill()
+    return daily
+
+
+# 4. Main Logic
+def build_cube(df_perf: pd.DataFrame, df_bench: pd.DataFrame) -> pd.DataFrame:
+    """
+    월/분기/연도별 수익률 큐브를 계산합니다. (주기별 groupby 1회, 기간 루프 없음)
+
+    - TWR: 기간 내 일별 수익률의 연쇄 곱 (각 일별 수익률은 전일 종가 -> 당일 종가 구간)
+    - MWR: Modified Dietz (기간 수익률, 비연율) = (기말 - 기초 - 순유입) / (기초 + Σ 가중 유입),
+           가중치 = 유입일부터 기간 말까지 남은 일수 / 기간 일수 (유입은 장 시작 전으로 간주)
+    - 벤치마크: 기간 말 가격 / 직전 기간 말 가격 - 1 (첫 기간은 첫 가격 대비)
+
+    Returns:
+        pd.DataFrame: CUBE_COLUMNS (수익률은 소수, 예: 0.0123 = 1.23%)
+    """
+    daily = _prepare_daily(df_perf, df_bench)
+    if daily.empty:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+
+    daily['Growth'] = 1.0 + daily['Daily_Return']
+    daily['Inflow'] = daily['External_Flow'].clip(lower=0)
+    daily['Outflow'] = daily['External_Flow'].clip(upper=0)
+
+    # 벤치마크 기준가: 전일 가격 (첫날은 당일 가격)
+    for ticker in BENCHMARKS:
+        daily[f'{ticker}_Prev'] = daily[ticker].shift(1).fillna(daily[ticker])
+
+    frames = []
+    for freq, pandas_freq in FREQS.items():
+        period = daily['Date'].dt.to_period(pandas_freq)
+        grouped = daily.groupby(period, sort=True)
+
+        start, end = grouped['Date'].transform('min'), grouped['Date'].transform('max')
+        span = (end - start).dt.days + 1
+        weight = ((end - daily['Date']).dt.days + 1) / span
+        daily['Weighted_Flow'] = daily['External_Flow'] * weight
+
+        agg = grouped.agg(
+            Start=('Date', 'min'), End=('Date', 'max'), Days=('Date', 'size'),
+            Start_Asset=('Prev_Asset', 'first'), End_Asset=('Calculated_Asset', 'last'),
+            Inflow=('Inflow', 'sum'), Outflow=('Outflow', 'sum'), Net_Flow=('External_Flow', 'sum'),
+            Growth=('Growth', 'prod'), Weighted_Flow=('Weighted_Flow', 'sum'),
+            **{f'{t}_Base': (f'{t}_Prev', 'first') for t in BENCHMARKS},
+            **{f'{t}_Last': (t, 'last') for t in BENCHMARKS},
+        )
+
+        agg['TWR'] = agg['Growth'] - 1
+        dietz_base = agg['Start_Asset'] + agg['Weighted_Flow']
+        gain = agg['End_Asset'] - agg['Start_Asset'] - agg['Net_Flow']
+        agg['MWR'] = np.where(dietz_base.abs() > 0, gain / dietz_base.where(dietz_base.abs() > 0, 1.0), np.nan)
+        for ticker in BENCHMARKS:
+            agg[ticker] = agg[f'{ticker}_Last'] / agg[f'{ticker}_Base'] - 1
+        agg['Excess_SPY'] = agg['TWR'] - agg['SPY']
+
+        agg['Freq'] = freq
+        agg['Period'] = agg.index.astype(str)
+        frames.append(agg.reset_index(drop=True))
+
+    cube = pd.concat(frames, ignore_index=True)[CUBE_COLUMNS]
+    cube['Start'] = cube['Start'].dt.strftime('%Y-%m-%d')
+    cube['End'] = cube['End'].dt.strftime('%Y-%m-%d')
+    return cube
+
+
+def generate_returns_cube() -> pd.DataFrame:
+    """
+    수익률 큐브 생성 메인 함수
+    Input: 05Performance_Data.csv, 06Benchmark_Data.csv (없으면 벤치마크 컬럼 공란)
+    Output: 09Period_Returns.csv
+    """
+    print(f"🚀 {MODULE_TAG} 기간 수익률 큐브(월/분기/연) 생성 시작...")
+
+    path_perf = config.PROCESSED_DIR / config.PROCESSED_FILES['performance']
+    if not path_perf.exists():
+        print(f"❌ {MODULE_TAG} 성과 파일(05)이 없습니다. metrics.py를 먼저 실행하세요.")
+        return pd.DataFrame()
+
+    df_perf = local_io.load_csv(path_perf)
+    path_bench = config.PROCESSED_DIR / config.PROCESSED_FILES['benchmark']
+    df_bench = local_io.load_csv(path_bench) if path_bench.exists() else pd.DataFrame()
+
+    cube = build_cube(df_perf, df_bench)
+    save_path = config.PROCESSED_DIR / config.PROCESSED_FILES['returns_cube']
+    local_io.save_csv(cube, save_path)
+
+    counts = cube['Freq'].value_counts().reindex(list(FREQS), fill_value=0)
+    print(f"✅ {MODULE_TAG} 큐브 저장 완료: 월 {counts['M']} / 분기 {counts['Q']} / 연 {counts['Y']}개 기간")
+    return cube
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    generate_returns_cube()
@@ -0,0 +1,341 @@
+"""
+@Title: Risk Model Engine (Incremental Covariance & Risk Decomposition)
+@Description: 보유 이력 종목(13)과 벤치마크(06 x 16 환율)의 일별 원화 수익률 공분산을 지수가중(EW) 또는 이동창(rolling)으로 유지합니다.
+              공분산 상태를 종가가 확정된 날짜까지 저장해 두고 새 거래일만 반영(증분 갱신)하며, 과거 가격이 바뀌면(수정주가 등) 전체 재계산합니다.
+              최신 공분산으로 종목별 한계 위험/위험 기여도, 분산 비율과 Risk Parity / 평균-분산 목표 비중(scipy)을 계산하여
+              대시보드가 재계산 없이 위험 분해를 표시하도록 저장합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import argparse
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+
+# 2. Constants
+MODULE_TAG = "[Risk]"
+STATE_VERSION = 1
+MODES = ('ewm', 'rolling')
+DEFAULT_HALFLIFE = 60       # EW 반감기 (거래일)
+DEFAULT_WINDOW = 120        # 이동창 길이 (거래일)
+TRADING_DAYS = 252          # 연율화 (휴장일은 관측에서 제외하므로 거래일 기준)
+BENCHMARKS = ('SPY', 'QQQ', 'IWM')  # 06은 달러 가격 -> 16 USD 환율로 원화 환산
+CASH = 'Cash'
+
+# 평균-분산 최적화 설정 (기대수익률 = EW 평균 수익률 연율화)
+RISK_AVERSION = 3.0
+MAX_WEIGHT = 0.4            # 종목당 상한 (주식 슬리브 기준, 종목 수가 적으면 1/n까지 완화)
+
+RISK_COLUMNS = ['As_Of', 'Ticker', 'Weight', 'Volatility', 'Marginal_Risk', 'Risk_Contribution',
+                'Risk_Contribution_Pct', 'Beta_SPY', 'W_Risk_Parity', 'W_Mean_Variance']
+
+
+class CovarianceState:
+    """
+    일별 수익률 공분산의 증분 상태
+
+    - ewm: d = r - mean, mean += a*d, cov = (1-a) * (cov + a * d d^T)  (a = 1 - 0.5^(1/halflife))
+    - rolling: 최근 window개 수익률의 합/외적 합을 더하고 빼서 유지 (표본 공분산)
+    """
+
+    def __init__(self, assets: List[str], mode: str = 'ewm', param: int = DEFAULT_HALFLIFE):
+        n = len(assets)
+        self.assets = list(assets)
+        self.mode = mode
+        self.param = int(param)
+        self.n_obs = 0
+        self.mean = np.zeros(n)
+        self.cov = np.zeros((n, n))
+        self.window: List[np.ndarray] = []
+        self.sum = np.zeros(n)
+        self.outer = np.zeros((n, n))
+
+    @property
+    def alpha(self) -> float:
+        return 1.0 - 0.5 ** (1.0 / self.param)
+
+    def update(self, r: np.ndarray) -> None:
+        """거래일 하루의 수익률 벡터를 반영합니다. (O(N^2))"""
+        self.n_obs += 1
+        if self.mode == 'ewm':
+            if self.n_obs == 1:
+                self.mean = r.copy()
+                return
+            d = r - self.mean
+            a = self.alpha
+            self.mean += a * d
+            self.cov = (1.0 - a) * (self.cov + a * np.outer(d, d))
+            return
+
+        self.window.append(r)
+        self.sum += r
+        self.outer += np.outer(r, r)
+        if len(self.window) > self.param:
+            old = self.window.pop(0)
+            self.sum -= old
+            self.outer -= np.outer(old, old)
+        n = len(self.window)
+        self.mean = self.sum / n
+        self.cov = (self.outer - n * np.outer(self.mean, self.mean)) / (n - 1) if n > 1 else np.zeros_like(self.outer)
+
+    def to_state(self) -> Dict:
+        state = {'assets': self.assets, 'mode': self.mode, 'param': self.param, 'n_obs': self.n_obs,
+                 'mean': self.mean.tolist(), 'cov': self.cov.tolist()}
+        if self.mode == 'rolling':
+            state['window'] = [r.tolist() for r in self.window]
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'CovarianceState':
+        obj = cls(state['assets'], state['mode'], state['param'])
+        obj.n_obs = state['n_obs']
+        obj.mean = np.array(state['mean'], dtype=float)
+        obj.cov = np.array(state['cov'], dtype=float).reshape(len(obj.assets), len(obj.assets))
+        for r in state.get('window', []):
+            r = np.array(r, dtype=float)
+            obj.window.append(r)
+            obj.sum += r
+            obj.outer += np.outer(r, r)
+        return obj
+
+
+# 3. Helper Functions
+def prices_digest(prices: pd.DataFrame) -> str:
+    """가격 행렬 지문 (증분 갱신 시 이미 반영한 구간이 그대로인지 확인, 부동소수 표기 차이는 반올림으로 무시)"""
+    digest = hashlib.sha256(','.join(prices.columns).encode('utf-8'))
+    digest.update(prices.index.strftime('%Y-%m-%d').str.cat().encode('utf-8'))
+    digest.update(np.round(np.nan_to_num(prices.to_numpy(dtype=float)), 6).tobytes())
+    return digest.hexdigest()
+
+
+def asset_prices(df_prices: pd.DataFrame, df_bench: pd.DataFrame, df_fx: pd.DataFrame) -> pd.DataFrame:
+    """
+    종목 원화 종가(13)에 벤치마크 원화 가격(06 달러 가격 x 16 USD 환율)을 붙인 자산 가격 행렬 (날짜 x 자산)
+    """
+    prices = df_prices.copy()
+    if df_bench.empty or df_fx.empty:
+        return prices
+    usd = df_fx['USD'].reindex(prices.index).ffill().bfill()
+    bench = df_bench.reindex(columns=[t for t in BENCHMARKS if t in df_bench.columns])
+    bench = bench.reindex(prices.index.union(bench.index)).ffill().bfill().reindex(prices.index)
+    return prices.join(bench.mul(usd, axis=0))
+
+
+def settled_date(prices: pd.DataFrame, today: Optional[date] = None) -> Optional[pd.Timestamp]:
+    """
+    종가가 확정된 마지막 날짜를 반환합니다. (증분 상태는 이 날짜까지만 저장)
+    history.py가 13을 오늘까지 앞 값으로 채우므로, 오늘 행(장중 값)과 전일과 같은 꼬리 행(아직 종가가 없는 날)은 제외합니다.
+    """
+    past = prices.loc[prices.index < pd.Timestamp(today or date.today()).normalize()]
+    if past.empty:
+        return None
+    values = past.to_numpy(dtype=float)
+    changed = np.flatnonzero((~np.isclose(values[1:], values[:-1], equal_nan=True)).any(axis=1))
+    return past.index[changed[-1] + 1] if len(changed) else past.index[0]
+
+
+def daily_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    일별 단순 수익률 (가격이 없거나 0인 날은 0). 전 자산 가격이 그대로인 날(주말/휴장일)은 관측에서 제외합니다.
+    """
+    values = prices.to_numpy(dtype=float)
+    prev = np.vstack([values[:1], values[:-1]])
+    valid = np.isfinite(values) & np.isfinite(prev) & (values > 0) & (prev > 0)
+    returns = np.where(valid, values / np.where(valid, prev, 1.0) - 1.0, 0.0)
+    returns = pd.DataFrame(returns, index=prices.index, columns=prices.columns).iloc[1:]
+    return returns[(returns != 0).any(axis=1)]
+
+
+def current_weights(df_timeline: pd.DataFrame, assets: List[str]) -> pd.Series:
+    """타임머신(07) 마지막 날 평가금액 비중 (자산 + Cash, 합계 1)"""
+    last = df_timeline.iloc[-1].reindex(assets + [CASH]).fillna(0.0).clip(lower=0)
+    total = last.sum()
+    return last / total if total > 0 else last
+
+
+def risk_parity_weights(cov: np.ndarray) -> np.ndarray:
+    """
+    위험 기여도가 같은 비중 (long-only, 합계 1).
+    볼록 문제 min 0.5 w'Σw - (1/n) Σ log w_i 의 해를 정규화하면 위험 기여도가 균등해집니다.
+    """
+    # scipy는 최적화 시에만 필요하므로 지연 로드 (모듈 import 비용 절감)
+    from scipy import optimize
+
+    n = len(cov)
+    budget = np.full(n, 1.0 / n)
+    x0 = 1.0 / np.sqrt(np.diag(cov))
+    result = optimize.minimize(
+        lambda w: 0.5 * w @ cov @ w - budget @ np.log(w), x0 / x0.sum(),
+        jac=lambda w: cov @ w - budget / w, method='L-BFGS-B', bounds=[(1e-12, None)] * n,
+    )
+    return result.x / result.x.sum()
+
+
+def mean_variance_weights(mu: np.ndarray, cov: np.ndarray, risk_aversion: float = RISK_AVERSION,
+                          max_weight: float = MAX_WEIGHT) -> np.ndarray:
+    """평균-분산 효용 max w'μ - (δ/2) w'Σw (long-only, 합계 1, 종목당 상한)"""
+    from scipy import optimize
+
+    n = len(mu)
+    upper = max(max_weight, 1.0 / n)
+    result = optimize.minimize(
+        lambda w: -(w @ mu) + 0.5 * risk_aversion * w @ cov @ w, np.full(n, 1.0 / n),
+        jac=lambda w: -mu + risk_aversion * cov @ w, method='SLSQP', bounds=[(0.0, upper)] * n,
+        constraints=[{'type': 'eq', 'fun': lambda w: w.sum() - 1.0, 'jac': lambda w: np.ones_like(w)}],
+    )
+    return np.clip(result.x, 0.0, None) / np.clip(result.x, 0.0, None).sum()
+
+
+# 4. Main Logic
+def risk_decomposition(state: CovarianceState, weights: pd.Series, as_of: pd.Timestamp) -> pd.DataFrame:
+    """
+    최신 공분산(연율화)으로 보유 종목별 위험 지표와 최적화 목표 비중을 계산합니다.
+
+    - Marginal_Risk: ∂σp/∂w_i = (Σw)_i / σp,  Risk_Contribution: w_i x Marginal_Risk (합계 = σp)
+    - 분산 비율 = Σ w_i σ_i / σp (대시보드에서 Weight, Volatility, Risk_Contribution 열로 계산)
+    - 목표 비중은 현재 주식 비중 안에서만 재배분 (현금 비중 유지, 분산이 0인 종목 제외)
+
+    Returns:
+        pd.DataFrame: RISK_COLUMNS (보유 종목 + Cash 행, 비중/기여도는 총자산 대비)
+    """
+    assets = state.assets
+    cov = state.cov * TRADING_DAYS
+    mu = state.mean * TRADING_DAYS
+    w = weights.reindex(assets).fillna(0.0).to_numpy()
+    vol = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+
+    sigma = float(np.sqrt(max(w @ cov @ w, 0.0)))
+    marginal = cov @ w / sigma if sigma > 0 else np.zeros(len(assets))
+    spy = assets.index('SPY') if 'SPY' in assets else None
+    beta = cov[:, spy] / cov[spy, spy] if spy is not None and cov[spy, spy] > 0 else np.full(len(assets), np.nan)
+
+    held = np.flatnonzero((w > 0) & (vol > 0))
+    invested = w[held].sum()
+    w_rp, w_mv = np.zeros(len(assets)), np.zeros(len(assets))
+    if len(held) >= 2:
+        sub_cov = cov[np.ix_(held, held)]
+        w_rp[held] = risk_parity_weights(sub_cov) * invested
+        w_mv[held] = mean_variance_weights(mu[held], sub_cov) * invested
+    else:
+        w_rp[held] = w_mv[held] = w[held]
+
+    rows = w > 0
+    table = pd.DataFrame({
+        'Ticker': np.asarray(assets)[rows], 'Weight': w[rows], 'Volatility': vol[rows],
+        'Marginal_Risk': marginal[rows], 'Risk_Contribution': (w * marginal)[rows],
+        'Risk_Contribution_Pct': (w * marginal / sigma)[rows] if sigma > 0 else 0.0,
+        'Beta_SPY': beta[rows], 'W_Risk_Parity': w_rp[rows], 'W_Mean_Variance': w_mv[rows],
+    })
+    cash = float(weights.get(CASH, 0.0))
+    table.loc[len(table)] = {'Ticker': CASH, 'Weight': cash, 'Volatility': 0.0, 'Marginal_Risk': 0.0,
+                             'Risk_Contribution': 0.0, 'Risk_Contribution_Pct': 0.0, 'Beta_SPY': 0.0,
+                             'W_Risk_Parity': cash, 'W_Mean_Variance': cash}
+    table['As_Of'] = as_of.strftime('%Y-%m-%d')
+    return table.sort_values('Weight', ascending=False)[RISK_COLUMNS]
+
+
+def generate_risk_model(mode: str = 'ewm', param: Optional[int] = None, full: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    리스크 모델 메인 함수
+    Input: 13Price_Matrix.csv, 06Benchmark_Data.csv, 16FX_Rates.csv, 07Historical_Holdings.csv (현재 비중)
+    Output: 17Risk_Covariance.csv (연율화 공분산), 18Risk_Contribution.csv (위험 기여도 + 목표 비중), risk_state.json (증분 상태)
+
+    Args:
+        mode (str): 'ewm' (지수가중) / 'rolling' (이동창)
+        param (int): EW 반감기 또는 이동창 길이 (거래일, 기본값: 60 / 120)
+        full (bool): True면 저장된 상태를 무시하고 전체 재계산
+    """
+    param = int(param or (DEFAULT_HALFLIFE if mode == 'ewm' else DEFAULT_WINDOW))
+    print(f"🚀 {MODULE_TAG} 리스크 모델 갱신 시작 ({mode}, {param}거래일)...")
+
+    paths = {k: config.PROCESSED_DIR / config.PROCESSED_FILES[k] for k in ('prices', 'timeline', 'benchmark', 'fx_rates')}
+    if not paths['prices'].exists() or not paths['timeline'].exists():
+        print(f"❌ {MODULE_TAG} 가격 행렬(13) 또는 타임머신(07) 파일이 없습니다. history.py를 먼저 실행하세요.")
+        return {}
+
+    def load(key: str) -> pd.DataFrame:
+        if not paths[key].exists():
+            return pd.DataFrame()
+        df = local_io.load_csv(paths[key])
+        df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+        return df.set_index('Date').sort_index()
+
+    df_prices = load('prices')
+    if not (df_prices.to_numpy(dtype=float) > 0).any():
+        print(f"⚠️ {MODULE_TAG} 가격 행렬(13)에 유효한 종가가 없어 리스크 모델을 건너뜁니다. (history.py 시세 수집 결과를 확인하세요)")
+        return {}
+    prices = asset_prices(df_prices, load('benchmark'), load('fx_rates'))
+    assets = list(prices.columns)
+    settled = settled_date(prices)
+
+    # --- 1. 증분 가능 여부 판정: 방식/자산이 같고, 이미 반영한 날짜까지의 가격이 그대로여야 함 ---
+    path_state = config.PROCESSED_DIR / config.RISK_STATE_NAME
+    state = None
+    if not full and path_state.exists():
+        with open(path_state, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    start = None
+    if (state and settled is not None and state.get('version') == STATE_VERSION and state['model']['mode'] == mode
+            and state['model']['param'] == param and state['model']['assets'] == assets):
+        last = pd.Timestamp(state['last_date'])
+        if last in prices.index and last <= settled and prices_digest(prices.loc[:last]) == state['prices_sha']:
+            start = last
+    if start is not None:
+        model = CovarianceState.from_state(state['model'])
+        window = prices.loc[start:]
+        print(f"ℹ️ {MODULE_TAG} 저장된 공분산 상태 사용: {start:%Y-%m-%d}까지 반영됨, 이후 {len(window) - 1}일 처리")
+    else:
+        if state:
+            print(f"ℹ️ {MODULE_TAG} 과거 가격 또는 설정이 바뀌어 전체 재계산합니다.")
+        model = CovarianceState(assets, mode, param)
+        window = prices
+
+    # --- 2. 새 거래일만 반영 (일 수에 선형, 하루 O(N^2)) ---
+    # 종가가 확정된 날짜까지 반영한 상태를 저장하고, 이후 행(오늘 장중 값/앞 값 채움)은 결과 계산에만 사용
+    stored = window.loc[:settled] if settled is not None else window.iloc[:0]
+    for r in daily_returns(stored).to_numpy():
+        model.update(r)
+    saved_state = model.to_state()
+    for r in daily_returns(window.loc[stored.index[-1]:] if len(stored) else window).to_numpy():
+        model.update(r)
+
+    # --- 3. 위험 분해 + 저장 ---
+    weights = current_weights(load('timeline'), assets)
+    df_contrib = risk_decomposition(model, weights, prices.index[-1])
+    df_cov = pd.DataFrame(model.cov * TRADING_DAYS, index=pd.Index(assets, name='Ticker'), columns=assets)
+
+    local_io.save_csv(df_cov.reset_index(), config.PROCESSED_DIR / config.PROCESSED_FILES['risk_cov'])
+    local_io.save_csv(df_contrib, config.PROCESSED_DIR / config.PROCESSED_FILES['risk_contrib'])
+    if settled is not None:
+        with open(path_state, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': STATE_VERSION, 'last_date': settled.strftime('%Y-%m-%d'),
+                'prices_sha': prices_digest(prices.loc[:settled]), 'updated_at': datetime.now().isoformat(timespec='seconds'),
+                'model': saved_state,
+            }, f)
+
+    sigma = df_contrib['Risk_Contribution'].sum()
+    diversification = (df_contrib['Weight'] * df_contrib['Volatility']).sum() / sigma if sigma > 0 else np.nan
+    print(f"✅ {MODULE_TAG} 공분산 {len(assets)}개 자산 ({model.n_obs}거래일 관측) / "
+          f"포트폴리오 변동성 {sigma:.2%}, 분산 비율 {diversification:.2f}")
+    return {'covariance': df_cov, 'contribution': df_contrib}
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="리스크 모델 (공분산 증분 갱신 / 위험 기여도 / 목표 비중 최적화)")
+    parser.add_argument('--mode', choices=MODES, default='ewm', help="공분산 방식 (기본값: ewm)")
+    parser.add_argument('--param', type=int, default=None, help="EW 반감기 또는 이동창 길이 (거래일)")
+    parser.add_argument('--full', action='store_true', help="저장된 공분산 상태를 무시하고 전체 재계산")
+    args = parser.parse_args()
+    generate_risk_model(args.mode, args.param, args.full)
@@ -0,0 +1,479 @@
+"""
+@Title: What-If Strategy Simulator
+@Description: 실제 입출금 일정(05)과 원화 환산 종가 행렬(13) 위에서 대안 매매 규칙을 재생하여
+              전략 변형별 일별 자산 경로(14)와 성과 지표(15)를 계산합니다.
+              규칙은 설정 파일(what_if.json)에 선언하며, 리스트로 적은 값은 조합(grid)으로 펼쳐 여러 변형을 만듭니다.
+              목표 비중 리밸런싱 변형은 날짜 루프 한 번에 전 변형을 (변형 x 종목) 배열로 묶어 계산하고,
+              '그 종목을 팔지/사지 않았다면' 재생 변형은 실제 자산 경로에 제외한 거래의 평가손익을 행렬곱으로 더합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import argparse
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+from engines.positions import trade_matrices
+from engines.tax_lots import TRADE_PATTERN
+
+# 2. Constants
+MODULE_TAG = "[Simulator]"
+DEFAULT_SPEC_FILE = config.SRC_DIR / "what_if.json"
+ACTUAL = 'Actual'
+CASH = 'Cash'
+
+# 달력 리밸런싱 주기 (rebalance 값 -> pandas Period 주기). 그 외: 'none', 'band:<허용 이탈폭>'
+CALENDAR_RULES = {'M': 'M', 'Q': 'Q', 'Y': 'Y'}
+WEIGHT_PRESETS = ('initial', 'current', 'equal')
+DROP_SIDES = ('sells', 'buys', 'all')
+
+# 리스트로 적으면 조합으로 펼치는 목표 비중 규칙 키 (기본값)
+GRID_DEFAULTS = {'weights': 'initial', 'rebalance': 'none', 'cost_bps': None}
+
+SUMMARY_COLUMNS = ['Strategy', 'Kind', 'Weights', 'Rebalance', 'Cost_bps', 'Start_Asset', 'Final_Asset', 'Min_Asset', 'Net_Flow',
+                   'Profit', 'TWR', 'CAGR', 'Volatility', 'MDD', 'Excess_TWR', 'Rebalances', 'Cost_KRW']
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """
+    전략 변형 1개 (설정 파일의 규칙을 조합으로 펼친 결과)
+
+    Attributes:
+        name: 결과 컬럼명
+        kind: 'target' (목표 비중 리밸런싱) / 'replay' (실제 거래 재생 + 일부 거래 제외)
+        weights: 'initial'(시작일 비중) / 'current'(최근 비중) / 'equal'(현재 보유 종목 동일 비중)
+                 또는 ((종목, 비중), ...) - Cash 포함 가능, 합계로 정규화
+        rebalance: 'none' / 'M' / 'Q' / 'Y' / 'band:<허용 이탈폭, 예: 0.05>'
+        cost_bps: 리밸런싱 거래대금 대비 비용 (bp)
+        drop: replay에서 제외할 거래 ('sells' / 'buys' / 'all')
+        tickers: replay에서 거래를 제외할 종목
+    """
+    name: str
+    kind: str
+    weights: Union[str, Tuple[Tuple[str, float], ...]] = 'initial'
+    rebalance: str = 'none'
+    cost_bps: float = 0.0
+    drop: str = 'sells'
+    tickers: Tuple[str, ...] = ()
+
+    @property
+    def weights_label(self) -> str:
+        if isinstance(self.weights, str):
+            return self.weights
+        return "+".join(f"{t}{w:g}" for t, w in self.weights)
+
+
+# 3. Helper Functions
+def _label(key: str, value) -> str:
+    """조합 변형 이름에 붙일 값 표기"""
+    if isinstance(value, dict):
+        return "+".join(f"{t}{w:g}" for t, w in value.items())
+    if key == 'cost_bps':
+        return f"{float(value):g}bp"
+    return str(value)
+
+
+def load_spec(path: Optional[Path] = None) -> Dict:
+    """전략 설정 파일(JSON)을 읽습니다."""
+    path = Path(path) if path else DEFAULT_SPEC_FILE
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def expand_strategies(spec: Dict, traded: Dict[str, List[str]]) -> List[Strategy]:
+    """
+    설정 규칙을 전략 변형 목록으로 펼칩니다.
+
+    - 목표 비중 규칙: weights / rebalance / cost_bps 중 리스트 값의 모든 조합 (이름 = name_값_값)
+    - 재생 규칙(replay): tickers가 'each'면 해당 거래가 있는 종목마다 1개, 'all'이면 전 종목 1개, 리스트면 지정 종목
+
+    Args:
+        spec (Dict): {'cost_bps': 기본 비용, 'strategies': [규칙, ...]}
+        traded (Dict[str, List[str]]): {'sells' / 'buys' / 'all': 시뮬레이션 기간에 해당 거래가 있는 종목}
+    """
+    default_cost = float(spec.get('cost_bps', 0.0))
+    strategies: List[Strategy] = []
+
+    for rule in spec.get('strategies', []):
+        name = rule['name']
+        if rule.get('replay'):
+            drop = rule.get('drop', 'sells')
+            if drop not in DROP_SIDES:
+                raise ValueError(f"{name}: drop은 {DROP_SIDES} 중 하나여야 합니다. (입력: {drop})")
+            tickers = rule.get('tickers', 'all')
+            if tickers == 'each':
+                strategies += [Strategy(f"{name}_{t}", 'replay', drop=drop, tickers=(t,)) for t in traded[drop]]
+            else:
+                selected = traded[drop] if tickers == 'all' else tickers
+                strategies.append(Strategy(name, 'replay', drop=drop, tickers=tuple(selected)))
+            continue
+
+        params = {k: rule.get(k, default_cost if default is None else default) for k, default in GRID_DEFAULTS.items()}
+        varying = [k for k, v in params.items() if isinstance(v, list)]
+        choices = [v if isinstance(v, list) else [v] for v in params.values()]
+        for combo in itertools.product(*choices):
+            values = dict(zip(params, combo))
+            suffix = "_".join(_label(k, values[k]) for k in varying)
+            weights = values['weights']
+            strategies.append(Strategy(
+                name=f"{name}_{suffix}" if suffix else name, kind='target',
+                weights=tuple(weights.items()) if isinstance(weights, dict) else weights,
+                rebalance=str(values['rebalance']), cost_bps=float(values['cost_bps']),
+            ))
+
+    names = [s.name for s in strategies]
+    duplicated = sorted({n for n in names if names.count(n) > 1} | ({ACTUAL} & set(names)))
+    if duplicated:
+        raise ValueError(f"전략 이름이 중복되었습니다: {duplicated}")
+    return strategies
+
+
+def target_weights(strategies: List[Strategy], tickers: List[str], df_timeline: pd.DataFrame) -> np.ndarray:
+    """
+    목표 비중 행렬을 만듭니다. (변형 x (종목 + 현금), 마지막 열 = 현금, 행 합 = 1)
+    'initial' / 'current'는 타임머신(07)의 첫날 / 마지막 날 평가금액 비중(현금 포함)입니다.
+    """
+    columns = tickers + [CASH]
+    values = df_timeline.reindex(columns=columns).fillna(0.0).clip(lower=0)
+    presets = {
+        'initial': values.iloc[0].to_numpy(dtype=float),
+        'current': values.iloc[-1].to_numpy(dtype=float),
+        'equal': np.append((values.iloc[-1, :len(tickers)] > 0).to_numpy(dtype=float), 0.0),
+    }
+
+    rows = []
+    for s in strategies:
+        if isinstance(s.weights, str):
+            if s.weights not in presets:
+                raise ValueError(f"{s.name}: weights는 {WEIGHT_PRESETS} 또는 {{종목: 비중}}이어야 합니다. (입력: {s.weights})")
+            row = presets[s.weights]
+        else:
+            unknown = [t for t, _ in s.weights if t not in columns]
+            if unknown:
+                raise ValueError(f"{s.name}: 가격 행렬에 없는 종목입니다: {unknown}")
+            row = pd.Series(dict(s.weights), dtype=float).reindex(columns, fill_value=0.0).to_numpy()
+        if row.sum() <= 0:
+            raise ValueError(f"{s.name}: 목표 비중 합계가 0입니다.")
+        rows.append(row / row.sum())
+    return np.array(rows, dtype=float).reshape(len(strategies), len(columns))
+
+
+def rebalance_rules(strategies: List[Strategy], index: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    달력 리밸런싱 일정(변형 x 날짜, 새 기간의 첫 거래일 = True, 첫날 제외)과 비중 이탈 허용폭(변형, 없으면 inf)
+    """
+    period_starts = {}
+    for rule, freq in CALENDAR_RULES.items():
+        period = index.to_period(freq)
+        period_starts[rule] = np.r_[False, np.asarray(period[1:] != period[:-1])]
+
+    calendar = np.zeros((len(strategies), len(index)), dtype=bool)
+    bands = np.full(len(strategies), np.inf)
+    for i, s in enumerate(strategies):
+        if s.rebalance in period_starts:
+            calendar[i] = period_starts[s.rebalance]
+        elif s.rebalance.startswith('band:'):
+            bands[i] = float(s.rebalance.split(':', 1)[1])
+        elif s.rebalance != 'none':
+            raise ValueError(f"{s.name}: rebalance는 none / M / Q / Y / band:<폭> 중 하나여야 합니다. (입력: {s.rebalance})")
+    return calendar, bands
+
+
+# 4. Main Logic
+def simulate_targets(prices: np.ndarray, flows: np.ndarray, start_asset: float, weights: np.ndarray,
+                     calendar: np.ndarray, bands: np.ndarray, cost_bps: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    목표 비중 전략 변형 전체를 날짜 루프 한 번으로 동시에 계산합니다. (날짜마다 변형 x 종목 배열 연산)
+
+    - 첫날: 기초 자산(첫날 유입 포함)을 목표 비중대로 매수
+    - 입금: 목표 비중대로 매수 / 출금: 현재 보유 비율대로 매도 (비용 없음)
+    - 리밸런싱: 달력 일정이거나 비중 이탈(종목/현금 중 최대)이 허용폭을 넘으면 목표 비중으로 재배분,
+      주식 거래대금 x cost_bps만큼 자산에서 차감
+    - 가격이 없는 날(0/결측)의 종목 목표 비중은 현금으로 보유
+
+    Args:
+        prices (np.ndarray): 날짜 x 종목 원화 종가 (T x N)
+        flows (np.ndarray): 일별 외부 입출금 (T)
+        start_asset (float): 첫날 자산
+        weights (np.ndarray): 변형 x (종목 + 현금) 목표 비중 (V x N+1)
+        calendar (np.ndarray): 변형 x 날짜 달력 리밸런싱 일정 (V x T)
+        bands (np.ndarray): 변형별 비중 이탈 허용폭 (V, 없으면 inf)
+        cost_bps (np.ndarray): 변형별 거래 비용 (V, bp)
+
+    Returns:
+        Dict[str, np.ndarray]: {'asset': 날짜 x 변형 자산 경로, 'rebalances': 변형별 리밸런싱 횟수, 'cost': 변형별 누적 비용}
+    """
+    n_days, n_tickers = prices.shape
+    n_variants = weights.shape[0]
+    valid = np.isfinite(prices) & (prices > 0)
+    marks = np.where(valid, prices, 0.0)
+    divisor = np.where(valid, prices, 1.0)
+    stock_weights = weights[:, :n_tickers]
+    rate = np.asarray(cost_bps, dtype=float) / 1e4
+
+    def allocate(t: int, amount: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """변형별 금액을 t일의 유효 목표 비중으로 나눈 (수량, 현금)"""
+        w = stock_weights * valid[t]
+        return w * amount[:, None] / divisor[t], (1.0 - w.sum(axis=1)) * amount
+
+    asset = np.empty((n_days, n_variants))
+    rebalances = np.zeros(n_variants, dtype=int)
+    cost = np.zeros(n_variants)
+
+    units, cash = allocate(0, np.full(n_variants, float(start_asset)))
+    asset[0] = units @ marks[0] + cash
+
+    for t in range(1, n_days):
+        flow = flows[t]
+        if flow > 0:
+            add_units, add_cash = allocate(t, np.full(n_variants, flow))
+            units, cash = units + add_units, cash + add_cash
+        elif flow < 0:
+            value = units @ marks[t] + cash
+            scale = np.clip(1.0 + flow / np.where(value > 0, value, np.inf), 0.0, None)
+            units, cash = units * scale[:, None], cash * scale
+
+        value = units @ marks[t] + cash
+        base = np.where(value > 0, value, 1.0)
+        w = stock_weights * valid[t]
+        drift = np.maximum(np.abs(units * marks[t] / base[:, None] - w).max(axis=1, initial=0.0),
+                           np.abs(cash / base - (1.0 - w.sum(axis=1))))
+        due = (calendar[:, t] | (drift > bands)) & (value > 0)
+
+        if due.any():
+            new_units, _ = allocate(t, value)
+            fee = np.abs(new_units - units) @ marks[t] * rate
+            new_units, new_cash = allocate(t, value - fee)
+            units = np.where(due[:, None], new_units, units)
+            cash = np.where(due, new_cash, cash)
+            rebalances += due
+            cost += np.where(due, fee, 0.0)
+
+        asset[t] = units @ marks[t] + cash
+
+    return {'asset': asset, 'rebalances': rebalances, 'cost': cost}
+
+
+def replay_overlays(prices: np.ndarray, buy_qty: np.ndarray, sell_qty: np.ndarray, start_qty: np.ndarray,
+                    drop_sells: np.ndarray, drop_buys: np.ndarray) -> np.ndarray:
+    """
+    실제 거래 재생 변형의 실제 자산 대비 차이를 계산합니다. (날짜 x 변형, 날짜 루프 없음)
+
+    거래 평가손익 G(q) = 누적 수량 x 당일 가격 - Σ(수량 x 거래일 가격) 라 하면
+    제외한 순거래(제외 매수 - 제외 매도)에 대해 실제 자산과의 차이는 -G(제외 매수 - 제외 매도) 입니다. (G는 수량에 선형)
+    - 매수를 제외한 종목은 보유 수량이 줄기만 하므로, 매도는 반사실 보유 수량 max(시작 수량 - 누적 매도, 0)까지만 체결하고
+      보유하지 않은 수량의 매도(와 그 대금)는 함께 제외합니다. (공매도 없음)
+    - 체결가 대신 거래일 종가(13)를 사용하며, 제외한 거래 대금은 현금(수익 0)에서 빠지거나 남은 것으로 봅니다.
+      (제외한 매도 대금으로 산 다른 종목은 그대로이므로 현금이 음수가 될 수 있음 - path_metrics에서 판정)
+
+    Args:
+        buy_qty, sell_qty (np.ndarray): 날짜 x 종목 매수/매도 수량
+        start_qty (np.ndarray): 종목별 시작 수량 (첫날 거래 전)
+        drop_sells, drop_buys (np.ndarray): 변형 x 종목 제외 여부 (0/1)
+    """
+    marks = np.where(np.isfinite(prices) & (prices > 0), prices, 0.0)
+
+    def trade_gain(qty: np.ndarray) -> np.ndarray:
+        return np.cumsum(qty, axis=0) * marks - np.cumsum(qty * marks, axis=0)
+
+    # 매수가 없을 때 체결 가능한 매도 = 반사실 보유 수량의 감소분, 나머지는 보유하지 않은 수량의 매도
+    held = np.maximum(start_qty - np.cumsum(sell_qty, axis=0), 0.0)
+    executable = -np.diff(held, axis=0, prepend=np.asarray(start_qty, dtype=float)[None, :])
+    uncovered_sells = sell_qty - executable
+    capped = drop_buys * (1.0 - drop_sells)
+
+    return (-trade_gain(buy_qty) @ drop_buys.T + trade_gain(sell_qty) @ drop_sells.T
+            + trade_gain(uncovered_sells) @ capped.T)
+
+
+def path_metrics(asset: np.ndarray, flows: np.ndarray, index: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+    """
+    자산 경로(날짜 x 변형)별 성과 지표. 일별 수익률은 metrics.py와 같은 방식
+    (r = 당일 자산 / (전일 자산 + 당일 유입) - 1, 첫날 0)
+    자산이 하루라도 0 이하인 경로는 TWR/CAGR/변동성/MDD를 NaN으로 둡니다. (Min_Asset으로 확인)
+    """
+    prev = np.vstack([asset[:1] - flows[0], asset[:-1]])
+    denominator = prev + flows[:, None]
+    returns = np.where(denominator > 0, asset / np.where(denominator > 0, denominator, 1.0) - 1.0, 0.0)
+    returns[0] = 0.0
+
+    wealth = np.cumprod(1.0 + returns, axis=0)
+    years = max((index[-1] - index[0]).days, 1) / 365.0
+    with np.errstate(invalid='ignore'):
+        cagr = np.where(wealth[-1] > 0, np.power(np.clip(wealth[-1], 0, None), 1.0 / years) - 1.0, -1.0)
+    # 연율화는 관측 빈도 기준 (달력 모드 365회/년, 영업일 모드는 거래일 수)
+    periods_per_year = (len(index) - 1) / years
+    volatility = returns[1:].std(axis=0, ddof=1) * np.sqrt(periods_per_year) if len(index) > 2 else np.full(asset.shape[1], np.nan)
+    drawdown = wealth / np.maximum.accumulate(wealth, axis=0) - 1.0
+
+    # 자산이 0 이하로 내려간 경로는 일별 수익률 연쇄가 정의되지 않으므로 수익률 지표를 비움 (NaN)
+    solvent = (asset > 0).all(axis=0)
+    net_flow = flows[1:].sum()
+    return {
+        'Start_Asset': asset[0], 'Final_Asset': asset[-1], 'Min_Asset': asset.min(axis=0),
+        'Net_Flow': np.full(asset.shape[1], net_flow), 'Profit': asset[-1] - asset[0] - net_flow,
+        'TWR': np.where(solvent, wealth[-1] - 1.0, np.nan), 'CAGR': np.where(solvent, cagr, np.nan),
+        'Volatility': np.where(solvent, volatility, np.nan), 'MDD': np.where(solvent, drawdown.min(axis=0), np.nan),
+    }
+
+
+def load_inputs() -> Optional[Dict]:
+    """
+    시뮬레이션 입력을 성과 데이터(05) 날짜 기준으로 정렬합니다.
+    Returns:
+        {'index', 'flows', 'actual', 'tickers', 'prices', 'timeline', 'buy_qty', 'sell_qty', 'start_qty'} (입력 파일이 없으면 None)
+    """
+    paths = {k: config.PROCESSED_DIR / config.PROCESSED_FILES[k] for k in ('performance', 'timeline', 'prices', 'transaction')}
+    missing = [p.name for p in paths.values() if not p.exists()]
+    if missing:
+        print(f"❌ {MODULE_TAG} 입력 파일이 없습니다: {missing} (metrics.py / history.py를 먼저 실행하세요)")
+        return None
+
+    df_perf = local_io.load_csv(paths['performance'])
+    df_perf['Date'] = pd.to_datetime(df_perf['Date']).dt.normalize()
+    df_perf = df_perf.sort_values('Date').set_index('Date')
+    index = df_perf.index
+
+    def aligned(key: str) -> pd.DataFrame:
+        df = local_io.load_csv(paths[key])
+        df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+        return df.set_index('Date').sort_index().reindex(index).ffill().bfill()
+
+    df_prices = aligned('prices')
+    df_timeline = aligned('timeline')
+    tickers = list(df_prices.columns)
+
+    df_txn = local_io.load_csv(paths['transaction'])
+    df_txn['일자'] = pd.to_datetime(df_txn['일자'])
+    trades = df_txn[df_txn['구분'].str.contains(TRADE_PATTERN, na=False)].copy()
+    trades['Ticker'] = trades['종목번호'].map(config.ISIN_TO_TICKER)
+    trades = trades[trades['Ticker'].isin(tickers)]
+    ones = pd.DataFrame(1.0, index=index, columns=tickers)
+    buy_qty, sell_qty, _, _ = trade_matrices(trades, index, tickers, ones)
+
+    # 시작 수량 = 첫날 평가금액(07) / 첫날 종가(13) - 첫날 순매수 (replay 변형의 매도 한도)
+    prices = df_prices.to_numpy(dtype=float)
+    first_value = df_timeline.reindex(columns=tickers).iloc[0].fillna(0.0).to_numpy(dtype=float)
+    priced = np.isfinite(prices[0]) & (prices[0] > 0)
+    start_qty = np.where(priced, first_value / np.where(priced, prices[0], 1.0), 0.0)
+    start_qty = np.maximum(start_qty - buy_qty[0] + sell_qty[0], 0.0)
+
+    return {
+        'index': index,
+        'flows': df_perf['External_Flow'].fillna(0.0).to_numpy(dtype=float),
+        'actual': df_perf['Calculated_Asset'].to_numpy(dtype=float),
+        'tickers': tickers,
+        'prices': prices,
+        'timeline': df_timeline,
+        'buy_qty': buy_qty,
+        'sell_qty': sell_qty,
+        'start_qty': start_qty,
+    }
+
+
+def run_strategies(strategies: List[Strategy], inputs: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    전략 변형 전체를 계산합니다. (목표 비중 변형은 한 번의 배치 루프, 재생 변형은 행렬곱 한 번)
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (일별 자산 경로 - Date + Actual + 변형명, SUMMARY_COLUMNS 요약)
+    """
+    index, flows, actual, tickers = inputs['index'], inputs['flows'], inputs['actual'], inputs['tickers']
+    targets = [s for s in strategies if s.kind == 'target']
+    replays = [s for s in strategies if s.kind == 'replay']
+    paths = {ACTUAL: actual}
+    extra = {}
+
+    if targets:
+        calendar, bands = rebalance_rules(targets, index)
+        result = simulate_targets(inputs['prices'], flows, actual[0], target_weights(targets, tickers, inputs['timeline']),
+                                  calendar, bands, np.array([s.cost_bps for s in targets]))
+        for i, s in enumerate(targets):
+            paths[s.name] = result['asset'][:, i]
+            extra[s.name] = {'Rebalances': result['rebalances'][i], 'Cost_KRW': result['cost'][i]}
+
+    if replays:
+        position = {t: i for i, t in enumerate(tickers)}
+        drop_sells = np.zeros((len(replays), len(tickers)))
+        drop_buys = np.zeros((len(replays), len(tickers)))
+        for i, s in enumerate(replays):
+            cols = [position[t] for t in s.tickers if t in position]
+            drop_sells[i, cols] = float(s.drop in ('sells', 'all'))
+            drop_buys[i, cols] = float(s.drop in ('buys', 'all'))
+        delta = replay_overlays(inputs['prices'], inputs['buy_qty'], inputs['sell_qty'], inputs['start_qty'],
+                                drop_sells, drop_buys)
+        for i, s in enumerate(replays):
+            paths[s.name] = actual + delta[:, i]
+
+    df_paths = pd.DataFrame(paths, index=index)
+    metrics = path_metrics(df_paths.to_numpy(), flows, index)
+    summary = pd.DataFrame(metrics, index=df_paths.columns)
+    summary['Excess_TWR'] = summary['TWR'] - summary.loc[ACTUAL, 'TWR']
+
+    described = {ACTUAL: {'Kind': 'actual'}}
+    for s in strategies:
+        described[s.name] = {'Kind': s.kind, 'Weights': s.weights_label if s.kind == 'target' else "",
+                             'Rebalance': s.rebalance if s.kind == 'target' else f"drop {s.drop}: {','.join(s.tickers)}",
+                             'Cost_bps': s.cost_bps if s.kind == 'target' else np.nan, **extra.get(s.name, {})}
+    summary = summary.join(pd.DataFrame.from_dict(described, orient='index'))
+    summary = summary.rename_axis('Strategy').reset_index().reindex(columns=SUMMARY_COLUMNS)
+
+    return df_paths.rename_axis('Date').reset_index(), summary
+
+
+def run_simulation(spec_path: Optional[Path] = None, top: int = 10) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    What-if 시뮬레이션 메인 함수
+    Input: 05Performance_Data.csv, 07Historical_Holdings.csv, 13Price_Matrix.csv, 00Transaction_History.csv, what_if.json
+    Output: 14WhatIf_Paths.csv, 15WhatIf_Summary.csv
+    """
+    print(f"🚀 {MODULE_TAG} What-if 전략 시뮬레이션 시작...")
+    inputs = load_inputs()
+    if inputs is None:
+        return pd.DataFrame(), pd.DataFrame()
+
+    prices = inputs['prices']
+    if not (np.isfinite(prices) & (prices > 0)).any():
+        print(f"⚠️ {MODULE_TAG} 가격 행렬(13)에 유효한 종가가 없어 시뮬레이션을 건너뜁니다. (history.py 시세 수집 결과를 확인하세요)")
+        return pd.DataFrame(), pd.DataFrame()
+
+    sold = [t for t, q in zip(inputs['tickers'], inputs['sell_qty'].sum(axis=0)) if q > 0]
+    bought = [t for t, q in zip(inputs['tickers'], inputs['buy_qty'].sum(axis=0)) if q > 0]
+    traded = {'sells': sold, 'buys': bought, 'all': [t for t in inputs['tickers'] if t in set(sold) | set(bought)]}
+    strategies = expand_strategies(load_spec(spec_path), traded)
+
+    start_time = time.perf_counter()
+    df_paths, summary = run_strategies(strategies, inputs)
+    elapsed = time.perf_counter() - start_time
+
+    local_io.save_csv(df_paths, config.PROCESSED_DIR / config.PROCESSED_FILES['what_if_paths'])
+    local_io.save_csv(summary, config.PROCESSED_DIR / config.PROCESSED_FILES['what_if_summary'])
+
+    print(f"✅ {MODULE_TAG} {len(strategies)}개 변형 x {len(inputs['index'])}일 시뮬레이션 완료 ({elapsed:.2f}초)")
+    insolvent = summary.loc[summary['Min_Asset'] <= 0, 'Strategy'].tolist()
+    if insolvent:
+        print(f"⚠️ {MODULE_TAG} 자산이 0 이하로 내려간 변형 {len(insolvent)}개는 수익률 지표를 비웠습니다: {', '.join(insolvent)}")
+    ranked = summary.sort_values('TWR', ascending=False).head(top)
+    for _, row in ranked.iterrows():
+        print(f"   {row['Strategy']:<32} TWR {row['TWR']:+.2%} | MDD {row['MDD']:.2%} | 기말 {row['Final_Asset']:,.0f}원")
+    return df_paths, summary
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="What-if 리밸런싱/전략 재생 시뮬레이션")
+    parser.add_argument('--spec', type=Path, default=None, help="전략 설정 JSON (기본값: 02src/what_if.json)")
+    parser.add_argument('--top', type=int, default=10, help="콘솔에 출력할 상위 변형 수 (TWR 기준)")
+    args = parser.parse_args()
+    run_simulation(args.spec, args.top)
@@ -0,0 +1,403 @@
+"""
+@Title: Tax Lot Engine (FIFO / Average Cost / Specific ID)
+@Description: 거래 내역(00)을 종목별 매수 로트 큐로 처리하여 매도 시 실현손익(11)과 미청산 로트별 미실현손익(10)을 산출합니다.
+              현지 통화와 원화를 모두 계산하며, 원화 환산은 거래일 환율(증권사 환전/외화RP 기록의 체결 환율)을 사용합니다.
+              처리한 로트 상태를 저장하여 다음 실행 시 새로 추가된 거래만 처리합니다. (기존 거래가 바뀌면 전체 재계산)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import argparse
+import hashlib
+import json
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loaders import io as local_io
+
+# 2. Constants
+MODULE_TAG = "[TaxLots]"
+METHODS = ('fifo', 'average', 'specific')
+STATE_VERSION = 1
+QTY_EPS = 1e-9
+
+# 주식 매매 행 (외화RP매수출금 등 '매수/매도'가 들어간 자금 이동은 제외)
+TRADE_PATTERN = r'해외주식매[수도]|장내_매[수도]'
+# 체결 환율이 기록된 자금 이동 행 (가격 컬럼 = 환율)
+FX_PATTERN = r'환전|외화RP'
+FX_QUOTE_UNIT = {'USD': 1.0, 'JPY': 100.0}  # HTS 엔화 환율은 100엔 기준
+
+# 특정 로트 지정(Specific ID) 파일 (DATA_DIR 하위): {매도 Trade_ID: {Lot_ID: 수량}}
+SELECTIONS_NAME = "lot_selections.json"
+
+REALIZED_COLUMNS = ['Sale_ID', 'Date', 'ISIN', 'Ticker', '종목명', 'Currency', 'Method', 'Lot_ID', 'Open_Date',
+                    'Holding_Days', 'Qty', 'Proceeds_Local', 'Cost_Local', 'PnL_Local', 'Sale_FX',
+                    'Proceeds_KRW', 'Cost_KRW', 'PnL_KRW']
+LOT_COLUMNS = ['Lot_ID', 'ISIN', 'Ticker', '종목명', 'Currency', 'Method', 'Open_Date', 'Qty', 'Unit_Cost_Local',
+               'Cost_Local', 'Cost_KRW', 'Price_Local', 'FX_Now', 'Value_Local', 'Value_KRW',
+               'Unrealized_Local', 'Unrealized_KRW', 'Basis_Known']
+
+
+@dataclass
+class Lot:
+    """
+    매수 로트 한 건 (부분 매도 시 수량/원가가 비례 감소)
+
+    Attributes:
+        lot_id: 로트 식별자 (매수 Trade_ID, 평균법은 '<ISIN>-AVG', 기초 잔고는 '<ISIN>-OPEN')
+        open_date: 매수일 (기초 잔고는 None)
+        cost_local / cost_krw: 남은 수량의 취득원가 (수수료 포함, 기초 잔고는 NaN = 원가 미상)
+    """
+    lot_id: str
+    isin: str
+    currency: str
+    open_date: Optional[str]
+    qty: float
+    cost_local: float
+    cost_krw: float
+
+    def take(self, qty: float) -> 'Lot':
+        """qty만큼 떼어낸 로트를 반환하고 자신은 남은 수량으로 줄어듭니다."""
+        ratio = qty / self.qty
+        part = Lot(self.lot_id, self.isin, self.currency, self.open_date, qty,
+                   self.cost_local * ratio, self.cost_krw * ratio)
+        self.qty -= qty
+        self.cost_local -= part.cost_local
+        self.cost_krw -= part.cost_krw
+        return part
+
+
+# 3. Helper Functions
+def fx_observations(df_txn: pd.DataFrame) -> pd.DataFrame:
+    """
+    거래 내역의 환전/외화RP 행에서 일자별 체결 환율(원/현지통화 1단위)을 추출합니다.
+
+    Returns:
+        pd.DataFrame: [Date, Currency, FX] (일자+통화별 평균)
+    """
+    mask = (df_txn['구분'].str.contains(FX_PATTERN, na=False) & df_txn['종목번호'].isin(list(FX_QUOTE_UNIT))
+            & (pd.to_numeric(df_txn['가격'], errors='coerce') > 0))
+    obs = pd.DataFrame({
+        'Date': pd.to_datetime(df_txn.loc[mask, '일자']),
+        'Currency': df_txn.loc[mask, '종목번호'],
+        'FX': pd.to_numeric(df_txn.loc[mask, '가격']) / df_txn.loc[mask, '종목번호'].map(FX_QUOTE_UNIT),
+    })
+    return obs.groupby(['Date', 'Currency'], as_index=False)['FX'].mean().sort_values('Date')
+
+
+def asof_fx(frame: pd.DataFrame, fx: pd.DataFrame) -> pd.Series:
+    """
+    [Date, Currency] 행별 원화 환율을 구합니다. (원화는 1)
+    일자 이전 마지막 체결 환율을 쓰고 첫 환전 이전 행만 이후 첫 환율을 사용 - 거래가 뒤에 추가되어도 기존 행의 환율은 불변
+    """
+    rates = pd.Series(1.0, index=frame.index)
+    foreign = frame['Currency'] != 'KRW'
+    if foreign.any() and not fx.empty:
+        left = frame.loc[foreign, ['Date', 'Currency']].reset_index().sort_values('Date')
+        backward = pd.merge_asof(left, fx, on='Date', by='Currency', direction='backward').set_index('index')['FX']
+        forward = pd.merge_asof(left, fx, on='Date', by='Currency', direction='forward').set_index('index')['FX']
+        rates[foreign] = backward.fillna(forward)
+    return rates
+
+
+def prepare_trades(df_txn: pd.DataFrame) -> pd.DataFrame:
+    """
+    거래 내역을 로트 처리용 표로 변환합니다. (벡터 연산, 일자 오름차순 + 같은 날은 원본 순서 유지)
+
+    - Amount_Local: 매수는 거래대금 + 수수료 + 제세금(취득원가), 매도는 거래대금 - 수수료 - 제세금(순매도금액)
+    - FX: 원화 거래는 1, 외화 거래는 거래일 이전 마지막 증권사 체결 환율
+    - Trade_ID: 'YYYYMMDD-<ISIN>-<같은 날 순번>' (원본이 뒤에 추가되기만 하면 안정적)
+
+    Returns:
+        pd.DataFrame: [Trade_ID, Date, ISIN, 종목명, Currency, Side, Qty, Amount_Local, FX]
+    """
+    mask = (df_txn['구분'].str.contains(TRADE_PATTERN, na=False) & df_txn['종목번호'].notna()
+            & (pd.to_numeric(df_txn['수량'], errors='coerce') > 0))
+    src = df_txn[mask]
+    fees = src['수수료'].fillna(0) + src['제세금'].fillna(0)
+    is_sell = src['구분'].str.contains('매도').to_numpy()
+
+    trades = pd.DataFrame({
+        'Date': pd.to_datetime(src['일자']).to_numpy(),
+        'ISIN': src['종목번호'].to_numpy(),
+        '종목명': src['종목명'].to_numpy(),
+        'Currency': src['통화'].where(src['통화'].isin(list(FX_QUOTE_UNIT)), 'KRW').to_numpy(),
+        'Side': np.where(is_sell, 'SELL', 'BUY'),
+        'Qty': src['수량'].astype(float).to_numpy(),
+        'Amount_Local': np.where(is_sell, src['거래대금'] - fees, src['거래대금'] + fees),
+    }).sort_values('Date', kind='stable').reset_index(drop=True)
+    trades['Trade_ID'] = (trades['Date'].dt.strftime('%Y%m%d') + '-' + trades['ISIN'] + '-'
+                          + trades.groupby(['Date', 'ISIN']).cumcount().add(1).astype(str))
+
+    trades['FX'] = asof_fx(trades, fx_observations(df_txn))
+    return trades[['Trade_ID', 'Date', 'ISIN', '종목명', 'Currency', 'Side', 'Qty', 'Amount_Local', 'FX']]
+
+
+def opening_positions(trades: pd.DataFrame, df_holdings: pd.DataFrame) -> Dict[str, float]:
+    """
+    거래 내역 시작 이전부터 보유하던 수량을 역산합니다. (현재 잔고 - 기간 순매수, history.py와 같은 앵커링)
+    기초 잔고의 취득원가는 기록이 없으므로 원가 미상(NaN) 로트가 됩니다.
+    """
+    signed = np.where(trades['Side'] == 'SELL', -trades['Qty'], trades['Qty'])
+    net = pd.Series(signed, index=trades['ISIN']).groupby(level=0).sum()
+    current = pd.Series(dtype=float)
+    if not df_holdings.empty and '종목코드' in df_holdings.columns:
+        current = df_holdings.groupby('종목코드')['잔고수량'].sum().astype(float)
+    opening = current.reindex(net.index.union(current.index), fill_value=0.0) - net.reindex(
+        net.index.union(current.index), fill_value=0.0)
+    return {isin: qty for isin, qty in opening.items() if qty > QTY_EPS}
+
+
+def trades_digest(trades: pd.DataFrame) -> str:
+    """처리한 거래 구간의 지문 (기존 거래가 수정/삭제되었는지 확인용)"""
+    canonical = trades[['Trade_ID', 'Side', 'Qty', 'Amount_Local', 'FX']].round(6).to_csv(index=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_selections() -> Dict[str, Dict[str, float]]:
+    """특정 로트 지정 파일을 읽습니다. (없으면 빈 사전 - 지정되지 않은 매도는 FIFO)"""
+    path = config.DATA_DIR / SELECTIONS_NAME
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# 4. Main Logic
+class LotBook:
+    """
+    종목별 로트 장부. 로트는 매수 순서를 유지하는 dict(Lot_ID -> Lot)에 보관하여
+    FIFO 차감(맨 앞 로트)과 특정 로트 차감(ID 조회)이 모두 O(1)입니다. (전체 처리량은 거래 수에 선형)
+
+    - fifo: 가장 오래된 로트부터 차감
+    - average: 매수를 종목별 단일 평균 로트에 합산 (기초 잔고 로트는 별도로 먼저 차감)
+    - specific: lot_selections.json에 지정된 로트를 먼저 차감하고, 나머지는 FIFO
+    """
+
+    def __init__(self, method: str = 'fifo', selections: Optional[Dict[str, Dict[str, float]]] = None):
+        if method not in METHODS:
+            raise ValueError(f"{MODULE_TAG} 지원하지 않는 로트 방식: '{method}' ({'/'.join(METHODS)})")
+        self.method = method
+        self.selections = selections or {}
+        self.books: Dict[str, Dict[str, Lot]] = {}
+        self.unmatched_qty = 0.0
+
+    def open(self, lot: Lot) -> None:
+        book = self.books.setdefault(lot.isin, {})
+        if self.method == 'average' and lot.open_date is not None:
+            pooled = book.get(f"{lot.isin}-AVG")
+            if pooled is not None:
+                pooled.qty += lot.qty
+                pooled.cost_local += lot.cost_local
+                pooled.cost_krw += lot.cost_krw
+                return
+            lot = Lot(f"{lot.isin}-AVG", lot.isin, lot.currency, lot.open_date, lot.qty, lot.cost_local, lot.cost_krw)
+        book[lot.lot_id] = lot
+
+    def _relieve(self, book: Dict[str, Lot], sale_id: str, qty: float) -> List[Lot]:
+        """매도 수량만큼 로트를 차감하여 떼어낸 조각 목록을 반환합니다."""
+        parts = []
+        if self.method == 'specific':
+            for lot_id, want in self.selections.get(sale_id, {}).items():
+                lot = book.get(lot_id)
+                if lot is None or qty <= QTY_EPS:
+                    if lot is None:
+                        print(f"⚠️ {MODULE_TAG} {sale_id}: 지정한 로트 {lot_id}가 없어 FIFO로 처리합니다.")
+                    continue
+                part = lot.take(min(float(want), lot.qty, qty))
+                parts.append(part)
+                qty -= part.qty
+                if lot.qty <= QTY_EPS:
+                    del book[lot_id]
+
+        while qty > QTY_EPS and book:
+            lot_id, lot = next(iter(book.items()))
+            part = lot.take(min(lot.qty, qty))
+            parts.append(part)
+            qty -= part.qty
+            if lot.qty <= QTY_EPS:
+                del book[lot_id]
+        if qty > QTY_EPS:
+            # 보유 기록보다 많이 매도한 경우 (원본 누락 등) 원가 미상으로 처리
+            self.unmatched_qty += qty
+            parts.append(Lot(f"{sale_id}-UNMATCHED", '', '', None, qty, np.nan, np.nan))
+        return parts
+
+    def apply(self, trade) -> List[dict]:
+        """
+        거래 한 건을 장부에 반영합니다.
+
+        Returns:
+            List[dict]: 매도인 경우 차감된 로트별 실현손익 행 (매수는 빈 목록)
+        """
+        if trade.Side == 'BUY':
+            self.open(Lot(trade.Trade_ID, trade.ISIN, trade.Currency, trade.Date.strftime('%Y-%m-%d'),
+                          trade.Qty, trade.Amount_Local, trade.Amount_Local * trade.FX))
+            return []
+
+        rows = []
+        for part in self._relieve(self.books.setdefault(trade.ISIN, {}), trade.Trade_ID, trade.Qty):
+            proceeds = trade.Amount_Local * part.qty / trade.Qty
+            rows.append({
+                'Sale_ID': trade.Trade_ID, 'Date': trade.Date.strftime('%Y-%m-%d'), 'ISIN': trade.ISIN,
+                '종목명': trade.종목명, 'Currency': trade.Currency, 'Method': self.method,
+                'Lot_ID': part.lot_id, 'Open_Date': part.open_date,
+                'Holding_Days': (trade.Date - pd.Timestamp(part.open_date)).days if part.open_date else np.nan,
+                'Qty': part.qty, 'Proceeds_Local': proceeds, 'Cost_Local': part.cost_local,
+                'PnL_Local': proceeds - part.cost_local, 'Sale_FX': trade.FX,
+                'Proceeds_KRW': proceeds * trade.FX, 'Cost_KRW': part.cost_krw,
+                'PnL_KRW': proceeds * trade.FX - part.cost_krw,
+            })
+        return rows
+
+    def lots(self) -> List[Lot]:
+        return [lot for book in self.books.values() for lot in book.values()]
+
+    # --- 상태 저장/복원 (증분 처리용) ---
+    def to_state(self) -> List[dict]:
+        return [asdict(lot) for lot in self.lots()]
+
+    @classmethod
+    def from_state(cls, method: str, lots: List[dict], selections=None) -> 'LotBook':
+        book = cls(method, selections)
+        for item in lots:
+            lot = Lot(**item)
+            book.books.setdefault(lot.isin, {})[lot.lot_id] = lot
+        return book
+
+
+def valuation_table(df_full: pd.DataFrame) -> pd.DataFrame:
+    """
+    통합 포트폴리오(03)에서 종목별 현재가(현지 통화)와 현재 환율을 계산합니다.
+    HTS 현재가는 반올림되어 있으므로 평가금액 / (수량 x 환율)로 역산합니다.
+    """
+    df = df_full[df_full['종목코드'] != 'CASH']
+    fx = pd.to_numeric(df['현재환율'], errors='coerce').where(lambda s: s > 0, 1.0)
+    qty = pd.to_numeric(df['잔고수량'], errors='coerce')
+    return pd.DataFrame({
+        'ISIN': df['종목코드'].to_numpy(),
+        'Price_Local': (pd.to_numeric(df['평가금액'], errors='coerce') / (qty * fx)).to_numpy(),
+        'FX_Now': fx.to_numpy(),
+    }).drop_duplicates('ISIN')
+
+
+def lot_report(book: LotBook, df_full: pd.DataFrame, names: Dict[str, str]) -> pd.DataFrame:
+    """미청산 로트별 평가금액과 미실현손익 (현지 통화 / 원화). 시세가 없는 로트는 평가 컬럼이 NaN입니다."""
+    lots = pd.DataFrame(book.to_state(), columns=['lot_id', 'isin', 'currency', 'open_date', 'qty', 'cost_local', 'cost_krw'])
+    lots = lots[lots['qty'] > QTY_EPS]
+    report = pd.DataFrame({
+        'Lot_ID': lots['lot_id'], 'ISIN': lots['isin'], 'Currency': lots['currency'], 'Method': book.method,
+        'Open_Date': lots['open_date'], 'Qty': lots['qty'],
+        'Cost_Local': lots['cost_local'].astype(float), 'Cost_KRW': lots['cost_krw'].astype(float),
+    }).merge(valuation_table(df_full), on='ISIN', how='left')
+
+    report['Ticker'] = report['ISIN'].map(config.ISIN_TO_TICKER)
+    report['종목명'] = report['ISIN'].map(names)
+    report['Unit_Cost_Local'] = report['Cost_Local'] / report['Qty']
+    report['Value_Local'] = report['Qty'] * report['Price_Local']
+    report['Value_KRW'] = report['Value_Local'] * report['FX_Now']
+    report['Unrealized_Local'] = report['Value_Local'] - report['Cost_Local']
+    report['Unrealized_KRW'] = report['Value_KRW'] - report['Cost_KRW']
+    report['Basis_Known'] = report['Cost_Local'].notna()
+    return report[LOT_COLUMNS]
+
+
+def generate_tax_lots(method: Optional[str] = None, full: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    로트 엔진 메인 함수
+    Input: 00Transaction_History.csv, 02Portfolio_Holdings.csv (기초 잔고 앵커), 03Full_Portfolio.csv (현재가/환율)
+    Output: 10Tax_Lots.csv (미청산 로트 + 미실현손익), 11Realized_PnL.csv (실현손익), tax_lot_state.json (증분 상태)
+
+    Args:
+        method (str): 'fifo' / 'average' / 'specific' (기본값: config.LOT_METHOD)
+        full (bool): True면 저장된 상태를 무시하고 전체 거래를 다시 처리
+    """
+    method = method or config.LOT_METHOD
+    print(f"🚀 {MODULE_TAG} 세무 로트 처리 시작 (방식: {method})...")
+
+    path_txn = config.PROCESSED_DIR / config.PROCESSED_FILES['transaction']
+    if not path_txn.exists():
+        print(f"❌ {MODULE_TAG} 거래 내역 파일(00)이 없습니다.")
+        return {}
+
+    df_txn = local_io.load_csv(path_txn)
+    trades = prepare_trades(df_txn)
+    selections = load_selections() if method == 'specific' else {}
+    selections_sha = hashlib.sha256(json.dumps(selections, sort_keys=True).encode('utf-8')).hexdigest()
+
+    path_state = config.PROCESSED_DIR / config.TAX_LOT_STATE_NAME
+    path_realized = config.PROCESSED_DIR / config.PROCESSED_FILES['realized']
+    state = None
+    if not full and path_state.exists() and path_realized.exists():
+        with open(path_state, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    # --- 1. 증분 가능 여부 판정: 방식/지정 파일이 같고, 이미 처리한 거래 구간이 그대로여야 함 ---
+    processed = 0
+    if (state and state.get('version') == STATE_VERSION and state['method'] == method
+            and state['selections_sha'] == selections_sha and state['processed'] <= len(trades)
+            and trades_digest(trades.iloc[:state['processed']]) == state['trades_sha']):
+        processed = state['processed']
+        book = LotBook.from_state(method, state['lots'], selections)
+        df_realized_prev = local_io.load_csv(path_realized)
+        print(f"ℹ️ {MODULE_TAG} 저장된 로트 상태 사용: 기존 {processed}건 건너뜀, 신규 {len(trades) - processed}건 처리")
+    else:
+        if state:
+            print(f"ℹ️ {MODULE_TAG} 기존 거래 또는 설정이 바뀌어 전체 재계산합니다.")
+        book = LotBook(method, selections)
+        path_holdings = config.PROCESSED_DIR / config.PROCESSED_FILES['holdings']
+        df_holdings = local_io.load_csv(path_holdings) if path_holdings.exists() else pd.DataFrame()
+        currencies = trades.drop_duplicates('ISIN', keep='last').set_index('ISIN')['Currency']
+        for isin, qty in opening_positions(trades, df_holdings).items():
+            book.open(Lot(f"{isin}-OPEN", isin, currencies.get(isin, 'KRW'), None, qty, np.nan, np.nan))
+        df_realized_prev = pd.DataFrame(columns=REALIZED_COLUMNS)
+
+    # --- 2. 신규 거래 처리 (거래 수에 선형) ---
+    new_rows = []
+    for trade in trades.iloc[processed:].itertuples(index=False):
+        new_rows.extend(book.apply(trade))
+    df_new = pd.DataFrame(new_rows, columns=[c for c in REALIZED_COLUMNS if c != 'Ticker'])
+    df_new.insert(3, 'Ticker', df_new['ISIN'].map(config.ISIN_TO_TICKER))
+    parts = [df for df in (df_realized_prev, df_new) if len(df)]
+    df_realized = pd.concat(parts, ignore_index=True) if parts else df_new
+
+    # --- 3. 미청산 로트 평가 (03 현재가/환율) ---
+    path_full = config.PROCESSED_DIR / config.PROCESSED_FILES['full_portfolio']
+    df_full = local_io.load_csv(path_full) if path_full.exists() else pd.DataFrame(
+        columns=['종목코드', '잔고수량', '평가금액', '현재환율'])
+    names = trades.drop_duplicates('ISIN', keep='last').set_index('ISIN')['종목명'].to_dict()
+    names.update(df_full.set_index('종목코드')['종목명'].to_dict() if '종목명' in df_full.columns else {})
+    df_lots = lot_report(book, df_full, names)
+
+    # --- 4. 저장 ---
+    local_io.save_csv(df_realized, path_realized)
+    local_io.save_csv(df_lots, config.PROCESSED_DIR / config.PROCESSED_FILES['tax_lots'])
+    with open(path_state, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': STATE_VERSION, 'method': method, 'selections_sha': selections_sha,
+            'processed': len(trades), 'trades_sha': trades_digest(trades),
+            'updated_at': datetime.now().isoformat(timespec='seconds'), 'lots': book.to_state(),
+        }, f, ensure_ascii=False, indent=1)
+
+    if book.unmatched_qty > QTY_EPS:
+        print(f"⚠️ {MODULE_TAG} 보유 기록을 초과한 매도 수량 {book.unmatched_qty:,.4f}주는 원가 미상으로 처리했습니다.")
+    known = df_realized['Cost_KRW'].notna()
+    print(f"✅ {MODULE_TAG} 실현손익 {df_realized.loc[known, 'PnL_KRW'].sum():,.0f}원 "
+          f"({len(df_realized)}건, 원가 미상 {int((~known).sum())}건) / "
+          f"미청산 로트 {len(df_lots)}개, 미실현손익 {df_lots['Unrealized_KRW'].sum():,.0f}원 (원가 확인분)")
+    return {'realized': df_realized, 'lots': df_lots}
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="세무 로트 & 실현/미실현손익 계산")
+    parser.add_argument('--method', choices=METHODS, default=None, help="로트 방식 (기본값: ALLENZ_LOT_METHOD 또는 fifo)")
+    parser.add_argument('--full', action='store_true', help="저장된 로트 상태를 무시하고 전체 재계산")
+    args = parser.parse_args()
+    generate_tax_lots(args.method, args.full)
@@ -0,0 +1,97 @@
+"""
+@Title: Timeline Calendar (Calendar / Business-Day Mode)
+@Description: 원장(04)·타임머신(07) 등 일별 시계열의 날짜 축을 만듭니다.
+              'calendar' 모드는 모든 날짜, 'business' 모드는 KRX/NYSE/TSE 거래일 합집합 + 자금 흐름일(+ 그 전날) + 지정일만 사용하여
+              주말/휴장일의 중복 행을 없앱니다. (ALLENZ_TIMELINE_MODE)
+              흐름일 전날을 함께 남기므로 빠진 날짜 구간 다음 날에는 흐름이 없고, 압축된 일별 수익률의 연결(TWR)이 달력 모드와 같습니다.
+              빠진 날짜의 거래는 다음 날짜로 이월합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+
+# 2. Constants
+MODULE_TAG = "[Timeline]"
+MODES = ('calendar', 'business')
+EXCHANGES = ('XKRX', 'XNYS', 'XTKS')  # exchange_calendars 거래소 코드 (한국/미국/일본)
+
+
+# 3. Helper Functions
+def trading_days(start, end) -> pd.DatetimeIndex:
+    """
+    KRX/NYSE/TSE 거래일의 합집합을 반환합니다.
+    exchange_calendars는 선택 의존성 (pip install -e ".[calendar]") - 없거나 달력 범위 밖이면 평일로 근사합니다.
+    """
+    weekdays = pd.bdate_range(start, end)
+    try:
+        import exchange_calendars as xcals
+    except ImportError:
+        return weekdays
+
+    days = pd.DatetimeIndex([])
+    for code in EXCHANGES:
+        try:
+            sessions = pd.DatetimeIndex(xcals.get_calendar(code).sessions_in_range(start, end))
+        except Exception as e:
+            print(f"⚠️ {MODULE_TAG} {code} 거래일 조회 실패 - 평일로 대체합니다: {e}")
+            sessions = weekdays
+        days = days.union(sessions.tz_localize(None) if sessions.tz is not None else sessions)
+    return days
+
+
+# 4. Main Logic
+def build_timeline(start, end, flow_dates: Iterable = (), extra_dates: Iterable = (),
+                   mode: Optional[str] = None) -> pd.DatetimeIndex:
+    """
+    일별 시계열의 날짜 축을 만듭니다. (start, end는 항상 포함)
+
+    Args:
+        flow_dates: 외부 자금 흐름일 (business 모드에서 그 날과 전날을 유지 - 수익률 연결이 달력 모드와 같도록)
+        extra_dates: 추가로 유지할 날짜 (자산 앵커일, 다른 산출물의 날짜 축 등)
+        mode (str): 'calendar' / 'business' (기본값: config.TIMELINE_MODE)
+    """
+    mode = mode or config.TIMELINE_MODE
+    if mode not in MODES:
+        raise ValueError(f"{MODULE_TAG} 지원하지 않는 날짜 모드: '{mode}' ({'/'.join(MODES)})")
+    full = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+    if mode == 'calendar' or full.empty:
+        return full
+
+    flows = pd.DatetimeIndex(list(flow_dates)).normalize()
+    keep = (trading_days(full[0], full[-1]).union(flows).union(flows - pd.Timedelta(days=1))
+            .union(pd.DatetimeIndex(list(extra_dates)).normalize()).union(full[[0, -1]]))
+    return full.intersection(keep)
+
+
+def carry_forward(dates, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """
+    날짜를 index의 같은 날 또는 다음 날짜로 옮깁니다. (빠진 휴장일의 거래/흐름 이월)
+    index 범위 밖의 날짜는 NaT (reindex와 같이 집계에서 제외)
+    """
+    dates = pd.DatetimeIndex(dates).normalize()
+    if index.empty:
+        return pd.DatetimeIndex([pd.NaT] * len(dates))
+    carried = index[np.minimum(index.searchsorted(dates), len(index) - 1)]
+    return carried.where((dates >= index[0]) & (dates <= index[-1]))
+
+
+def compress_ledger(ledger: pd.DataFrame, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    달력 일별 원장을 index 날짜로 압축합니다. 자산/앵커는 해당 날짜 값, 외부 흐름은 빠진 날짜분을 다음 날짜로 합산합니다.
+
+    Args:
+        ledger (pd.DataFrame): Date 인덱스, [Anchor_Asset, External_Flow, Calculated_Asset]
+    """
+    if len(index) == len(ledger.index):
+        return ledger
+    compressed = ledger.reindex(index)
+    compressed['External_Flow'] = ledger['External_Flow'].groupby(carry_forward(ledger.index, index)).sum()
+    compressed.index.name = ledger.index.name
+    return compressed
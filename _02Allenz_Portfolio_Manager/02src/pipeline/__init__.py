@@ -0,0 +1,5 @@
+"""
+@Title: Pipeline Package
+@Description: update.py 증분 실행을 위한 단계 그래프, 매니페스트, 실행기, 프로파일러, 감시 데몬
+@Author: Allen & Gemini
+"""
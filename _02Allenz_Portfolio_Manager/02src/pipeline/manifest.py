@@ -0,0 +1,193 @@
+"""
+@Title: Pipeline Manifest
+@Description: 아티팩트 파일의 해시(fingerprint)와 단계별 실행 기록(입력 해시, 코드 버전, 출력 해시)을 JSON 매니페스트로 관리합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Any
+
+import config
+
+# 2. Constants
+MODULE_TAG = "[Manifest]"
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+
+# 3. Helper Functions
+def _relative_key(path: Path) -> str:
+    """매니페스트 키로 사용할 프로젝트 루트 기준 상대 경로(posix)를 반환합니다."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(config.BASE_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _sha256_file(path: Path) -> str:
+    """파일 내용을 청크 단위로 읽어 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# 4. Main Logic
+class PipelineManifest:
+    """
+    파이프라인 매니페스트 (config.PIPELINE_MANIFEST)
+
+    구조:
+        files:  {상대경로: {size, mtime_ns, sha256}}  - 해시 캐시 (크기/수정시각이 같으면 재해시 생략)
+        stages: {단계명: {signature, outputs, finished_at, elapsed}}
+        data_version: 전체 출력 아티팩트 해시로부터 유도한 데이터 버전 토큰
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else config.PIPELINE_MANIFEST
+        self.data: Dict[str, Any] = {
+            'version': MANIFEST_VERSION,
+            'files': {},
+            'stages': {},
+            'data_version': None,
+            'updated_at': None
+        }
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "PipelineManifest":
+        """매니페스트를 로드합니다. 없거나 손상된 경우 빈 매니페스트를 반환합니다."""
+        manifest = cls(path)
+        if not manifest.path.exists():
+            return manifest
+
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            if loaded.get('version') == MANIFEST_VERSION:
+                manifest.data.update(loaded)
+            else:
+                print(f"⚠️ {MODULE_TAG} 매니페스트 버전이 달라 초기화합니다.")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {MODULE_TAG} 매니페스트 로드 실패, 초기화합니다: {e}")
+        return manifest
+
+    def save(self) -> None:
+        """임시 파일에 기록한 뒤 교체하여 원자적으로 저장합니다."""
+        self.data['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def fingerprint(self, path: Path) -> Optional[str]:
+        """
+        파일의 SHA-256 해시를 반환합니다. 크기와 수정시각이 캐시와 같으면 파일을 다시 읽지 않습니다.
+
+        Returns:
+            Optional[str]: 해시 문자열 (파일이 없으면 None)
+        """
+        path = Path(path)
+        key = _relative_key(path)
+        files = self.data['files']
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            files.pop(key, None)
+            return None
+
+        cached = files.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+
+        sha = _sha256_file(path)
+        files[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+        return sha
+
+    def fingerprints(self, paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        """여러 파일의 해시를 {상대경로: 해시} 형태로 반환합니다."""
+        return {_relative_key(p): self.fingerprint(p) for p in paths}
+
+    def stage_record(self, name: str) -> Optional[Dict[str, Any]]:
+        """단계의 마지막 성공 실행 기록을 반환합니다."""
+        return self.data['stages'].get(name)
+
+    def record_stage(self, name: str, signature: Dict[str, Any], outputs: Iterable[Path], elapsed: float) -> None:
+        """단계 실행 성공 후 입력 시그니처와 출력 해시를 기록하고 데이터 버전을 갱신합니다."""
+        self.data['stages'][name] = {
+            'signature': signature,
+            'outputs': self.fingerprints(outputs),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'elapsed': round(elapsed, 3)
+        }
+        self._refresh_data_version()
+
+    def _refresh_data_version(self) -> None:
+        """모든 단계의 출력 해시를 합쳐 데이터 버전 토큰을 계산합니다."""
+        digest = hashlib.sha256()
+        for stage_name in sorted(self.data['stages']):
+            outputs = self.data['stages'][stage_name]['outputs']
+            for key in sorted(outputs):
+                digest.update(f"{key}={outputs[key]};".encode('utf-8'))
+        self.data['data_version'] = digest.hexdigest()[:12]
+
+    @property
+    def data_version(self) -> Optional[str]:
+        return self.data.get('data_version')
+
+
+def read_data_version(path: Optional[Path] = None) -> Optional[str]:
+    """매니페스트 파일에서 데이터 버전 토큰만 가볍게 읽어옵니다. (대시보드/AI 캐시 무효화용)"""
+    try:
+        with open(path or config.PIPELINE_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f).get('data_version')
+    except (OSError, ValueError):
+        return None
+
+
+def read_artifact_tokens(paths: Iterable[Path], path: Optional[Path] = None) -> Dict[str, str]:
+    """
+    아티팩트별 버전 토큰을 해시 재계산 없이 반환합니다. (대시보드 아티팩트 단위 캐시 키)
+    매니페스트에 기록된 크기/수정시각이 현재 파일과 같으면 기록된 해시를, 다르면(파이프라인 외부 수정) 크기/수정시각을 토큰으로 사용합니다.
+
+    Returns:
+        Dict[str, str]: {상대경로: 토큰} (파일이 없으면 'missing')
+    """
+    try:
+        with open(path or config.PIPELINE_MANIFEST, 'r', encoding='utf-8') as f:
+            files = json.load(f).get('files', {})
+    except (OSError, ValueError):
+        files = {}
+
+    tokens = {}
+    for file_path in paths:
+        key = _relative_key(file_path)
+        try:
+            stat = Path(file_path).stat()
+        except FileNotFoundError:
+            tokens[key] = 'missing'
+            continue
+        cached = files.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            tokens[key] = cached['sha256'][:16]
+        else:
+            tokens[key] = f"stat:{stat.st_size}:{stat.st_mtime_ns}"
+    return tokens
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    manifest = PipelineManifest.load()
+    print(f"ℹ️ {MODULE_TAG} 매니페스트: {manifest.path}")
+    print(f"ℹ️ 데이터 버전: {manifest.data_version}")
+    for stage_name, record in manifest.data['stages'].items():
+        print(f"ℹ️ {stage_name}: {record['finished_at']} ({record['elapsed']:.2f}초)")
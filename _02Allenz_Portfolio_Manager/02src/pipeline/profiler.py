@@ -0,0 +1,316 @@
+"""
+@Title: Pipeline Stage Profiler
+@Description: 파이프라인 단계를 계측 하에 실행하여 Wall/CPU 시간, 메모리 피크, 아티팩트별 행/바이트 수,
+              yfinance 네트워크 호출, cProfile 핫스팟을 JSON으로 기록하고 두 실행 결과를 비교합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import sys
+import json
+import time
+import runpy
+import pstats
+import cProfile
+import argparse
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import config
+from pipeline.stages import Stage, get_stage
+
+# 2. Constants
+MODULE_TAG = "[Profiler]"
+DEFAULT_TOP_N = 20
+MB = 1024 * 1024
+
+# 비교 리포트에 출력할 단계별 지표 (키, 표시명, 단위)
+COMPARE_FIELDS = [
+    ('wall_sec', 'Wall', 's'),
+    ('cpu_sec', 'CPU', 's'),
+    ('peak_rss_mb', 'Peak RSS', 'MB'),
+    ('tracemalloc_peak_mb', 'Py Heap Peak', 'MB'),
+    ('rows_in', 'Rows In', ''),
+    ('rows_out', 'Rows Out', ''),
+    ('bytes_read', 'Bytes Read', 'B'),
+    ('bytes_written', 'Bytes Written', 'B'),
+    ('network_calls', 'Net Calls', ''),
+    ('network_sec', 'Net Time', 's'),
+]
+
+
+# 3. Helper Functions
+def _artifact_key(path: Any) -> str:
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(config.BASE_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _file_size(path: Any) -> int:
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 상주 메모리(RSS)를 MB 단위로 반환합니다. (Unix: resource, Windows: psutil)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 Byte 단위
+        return round(peak / (MB if sys.platform == 'darwin' else 1024), 2)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        mem = psutil.Process().memory_info()
+        return round(getattr(mem, 'peak_wset', mem.rss) / MB, 2)
+    except ImportError:
+        return None
+
+
+class _StageRecorder:
+    """local_io 입출력과 yfinance 호출을 가로채 아티팩트/네트워크 사용량을 집계합니다."""
+
+    def __init__(self):
+        self.artifacts: Dict[str, Dict[str, int]] = {}
+        self.network = {'calls': 0, 'seconds': 0.0, 'tickers': []}
+
+    def _artifact(self, path: Any) -> Dict[str, int]:
+        return self.artifacts.setdefault(
+            _artifact_key(path), {'rows_in': 0, 'rows_out': 0, 'bytes_read': 0, 'bytes_written': 0}
+        )
+
+    def instrument_io(self) -> None:
+        from data_loaders import io as local_io
+
+        original_load, original_save = local_io.load_csv, local_io.save_csv
+
+        def load_csv(file_path, *args, **kwargs):
+            df = original_load(file_path, *args, **kwargs)
+            stats = self._artifact(file_path)
+            stats['rows_in'] += len(df)
+            stats['bytes_read'] += _file_size(file_path)
+            return df
+
+        def save_csv(df, file_path, *args, **kwargs):
+            original_save(df, file_path, *args, **kwargs)
+            stats = self._artifact(file_path)
+            stats['rows_out'] += len(df)
+            stats['bytes_written'] += _file_size(file_path)
+
+        local_io.load_csv, local_io.save_csv = load_csv, save_csv
+
+    def instrument_yfinance(self) -> None:
+        import yfinance as yf
+
+        original_history = yf.Ticker.history
+        network = self.network
+
+        def history(ticker_self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_history(ticker_self, *args, **kwargs)
+            finally:
+                network['calls'] += 1
+                network['seconds'] += time.perf_counter() - start
+                network['tickers'].append(getattr(ticker_self, 'ticker', '?'))
+
+        yf.Ticker.history = history
+
+    def record_raw_inputs(self, stage: Stage) -> None:
+        """local_io를 거치지 않고 직접 읽는 원본(raw) 입력 파일의 크기를 반영합니다."""
+        for path in stage.inputs:
+            key = _artifact_key(path)
+            if key not in self.artifacts and Path(path).exists():
+                self._artifact(path)['bytes_read'] += _file_size(path)
+
+
+def _hot_functions(profiler: cProfile.Profile, top_n: int) -> List[Dict[str, Any]]:
+    """누적 시간(cumtime) 기준 상위 N개 함수를 요약합니다."""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            'function': f"{Path(filename).name}:{line}({func})",
+            'ncalls': nc,
+            'tottime': round(tt, 4),
+            'cumtime': round(ct, 4)
+        })
+    rows.sort(key=lambda r: r['cumtime'], reverse=True)
+    return rows[:top_n]
+
+
+# 4. Main Logic
+def profile_stage(stage: Stage, cprofile_path: Optional[Path] = None, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    현재 프로세스에서 단계 스크립트를 계측 하에 실행합니다. (update.py가 단계별 자식 프로세스로 호출)
+
+    Args:
+        stage (Stage): 실행할 단계
+        cprofile_path (Optional[Path]): 지정 시 cProfile 결과(.prof) 저장 및 핫스팟 요약 포함
+        top_n (int): 핫스팟 요약 함수 개수
+
+    Returns:
+        Dict[str, Any]: 단계 프로파일 레코드
+    """
+    recorder = _StageRecorder()
+    recorder.instrument_io()
+    if stage.market_data:
+        recorder.instrument_yfinance()
+
+    profiler = cProfile.Profile() if cprofile_path else None
+
+    tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler:
+        profiler.enable()
+    try:
+        runpy.run_path(str(stage.script), run_name="__main__")
+    finally:
+        if profiler:
+            profiler.disable()
+        wall_sec = time.perf_counter() - wall_start
+        cpu_sec = time.process_time() - cpu_start
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    recorder.record_raw_inputs(stage)
+    artifacts = recorder.artifacts
+
+    record = {
+        'stage': stage.name,
+        'wall_sec': round(wall_sec, 4),
+        'cpu_sec': round(cpu_sec, 4),
+        'peak_rss_mb': _peak_rss_mb(),
+        'tracemalloc_peak_mb': round(heap_peak / MB, 2),
+        'rows_in': sum(a['rows_in'] for a in artifacts.values()),
+        'rows_out': sum(a['rows_out'] for a in artifacts.values()),
+        'bytes_read': sum(a['bytes_read'] for a in artifacts.values()),
+        'bytes_written': sum(a['bytes_written'] for a in artifacts.values()),
+        'network_calls': recorder.network['calls'],
+        'network_sec': round(recorder.network['seconds'], 4),
+        'network_tickers': recorder.network['tickers'],
+        'artifacts': artifacts,
+    }
+
+    if profiler:
+        cprofile_path = Path(cprofile_path)
+        cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(cprofile_path))
+        record['cprofile_dump'] = _artifact_key(cprofile_path)
+        record['hot_functions'] = _hot_functions(profiler, top_n)
+
+    return record
+
+
+def profile_command(stage: Stage, out_path: Path, cprofile_dir: Optional[Path] = None, top_n: int = DEFAULT_TOP_N) -> List[str]:
+    """단계를 계측 모드로 실행하기 위한 자식 프로세스 명령어를 생성합니다."""
+    cmd = [sys.executable, '-m', 'pipeline.profiler', stage.name, '--out', str(out_path), '--top', str(top_n)]
+    if cprofile_dir:
+        cmd += ['--cprofile', str(Path(cprofile_dir) / f"{stage.name}.prof")]
+    return cmd
+
+
+def new_report_path(now: Optional[datetime] = None) -> Path:
+    """logs/ 아래 타임스탬프가 붙은 프로파일 리포트 경로를 반환합니다."""
+    stamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    return config.LOG_DIR / f"pipeline_profile_{stamp}.json"
+
+
+def save_report(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 {MODULE_TAG} 프로파일 리포트 저장: {path}")
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _format_value(value: Optional[float], unit: str) -> str:
+    if value is None:
+        return '-'
+    if unit == 'B':
+        return f"{value / 1024:,.1f}KB"
+    if unit == 's':
+        return f"{value:.3f}s"
+    if unit == 'MB':
+        return f"{value:,.1f}MB"
+    return f"{value:,.0f}"
+
+
+def compare_reports(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    두 프로파일 리포트의 단계별 지표 차이를 계산합니다.
+
+    Returns:
+        List[Dict[str, Any]]: [{stage, field, old, new, delta, pct}] (양쪽 모두 실행된 단계 기준)
+    """
+    rows = []
+    old_stages, new_stages = old.get('stages', {}), new.get('stages', {})
+    for stage_name in new_stages:
+        before, after = old_stages.get(stage_name, {}), new_stages[stage_name]
+        if before.get('skipped') or after.get('skipped'):
+            continue
+        for field, _, _ in COMPARE_FIELDS:
+            a, b = before.get(field), after.get(field)
+            if a is None or b is None:
+                continue
+            delta = b - a
+            rows.append({
+                'stage': stage_name, 'field': field, 'old': a, 'new': b, 'delta': delta,
+                'pct': (delta / a * 100) if a else None
+            })
+    return rows
+
+
+def print_comparison(old_path: Path, new_path: Path) -> None:
+    """두 프로파일 리포트를 비교하여 단계/지표별 변화량과 핫스팟 변화를 출력합니다."""
+    old, new = load_report(old_path), load_report(new_path)
+    print(f"ℹ️ {MODULE_TAG} 비교: {Path(old_path).name} → {Path(new_path).name}")
+    print(f"ℹ️ 총 소요 시간: {old.get('total_wall_sec', 0):.2f}s → {new.get('total_wall_sec', 0):.2f}s")
+
+    units = {field: (label, unit) for field, label, unit in COMPARE_FIELDS}
+    current_stage = None
+    for row in compare_reports(old, new):
+        if row['stage'] != current_stage:
+            current_stage = row['stage']
+            print(f"\n{'=' * 60}\n[{current_stage}]")
+        label, unit = units[row['field']]
+        pct = f"{row['pct']:+.1f}%" if row['pct'] is not None else "n/a"
+        print(f"  {label:<14} {_format_value(row['old'], unit):>12} → {_format_value(row['new'], unit):>12}  ({pct})")
+
+    # 핫스팟 변화 (양쪽 모두 cProfile이 있는 단계)
+    for stage_name, after in new.get('stages', {}).items():
+        before = old.get('stages', {}).get(stage_name, {})
+        if 'hot_functions' not in after or 'hot_functions' not in before:
+            continue
+        prev = {f['function']: f['cumtime'] for f in before['hot_functions']}
+        print(f"\n🔥 [{stage_name}] Hot functions (cumtime)")
+        for func in after['hot_functions'][:10]:
+            was = prev.get(func['function'])
+            was_str = f"{was:.3f}s" if was is not None else "new"
+            print(f"  {func['cumtime']:>8.3f}s (was {was_str:>8})  {func['function']}")
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파이프라인 단계 계측 실행기 (update.py --profile 내부용)")
+    parser.add_argument('stage', help="실행할 단계명")
+    parser.add_argument('--out', required=True, help="단계 프로파일 레코드(JSON) 저장 경로")
+    parser.add_argument('--cprofile', default=None, help="cProfile 덤프(.prof) 저장 경로")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_N, help="핫스팟 요약 함수 개수")
+    args = parser.parse_args()
+
+    stage_record = profile_stage(get_stage(args.stage), Path(args.cprofile) if args.cprofile else None, args.top)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(stage_record, f, ensure_ascii=False)
@@ -0,0 +1,87 @@
+"""
+@Title: Incremental Pipeline Runner
+@Description: 매니페스트 기준으로 변경된 단계만 위상 순서대로 실행합니다. 실행 방식(자식 프로세스 / 현재 인터프리터)은 호출자가 주입합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import sys
+import time
+import runpy
+from typing import Callable, Iterable, List
+
+from pipeline.manifest import PipelineManifest
+from pipeline.stages import STAGES, Stage, stage_signature, stale_reason
+
+# 2. Constants
+MODULE_TAG = "[Runner]"
+
+# 단계 실행 함수: Stage를 받아 실행 후 소요 시간(초)을 반환하고, 실패 시 예외를 발생시킴
+StageExecutor = Callable[[Stage], float]
+
+
+class StageFailedError(RuntimeError):
+    """단계 실행 실패 (이후 단계는 실행하지 않음)"""
+
+
+# 3. Main Logic
+def stage_command(stage: Stage) -> List[str]:
+    """단계를 자식 프로세스로 실행하기 위한 명령어를 반환합니다."""
+    return [sys.executable, '-m', stage.module]
+
+
+def run_in_process(stage: Stage) -> float:
+    """
+    현재 인터프리터에서 단계 스크립트를 __main__으로 실행합니다.
+    pandas/yfinance 등 무거운 모듈이 이미 로드된 상태(warm)라면 import 비용 없이 실행됩니다.
+    """
+    print(f"🚀 [Step: {stage.label}] 실행 중... (in-process)")
+    start_time = time.time()
+    try:
+        runpy.run_path(str(stage.script), run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise StageFailedError(f"{stage.name} 종료 코드 {e.code}") from e
+    except Exception as e:
+        raise StageFailedError(f"{stage.name}: {e}") from e
+
+    elapsed = time.time() - start_time
+    print(f"✅ [Success] {stage.label} 완료 ({elapsed:.2f}초)")
+    return elapsed
+
+
+def run_incremental(manifest: PipelineManifest, execute: StageExecutor, forced: Iterable[str] = ()) -> List[str]:
+    """
+    입력/코드가 바뀐 단계만 순서대로 실행하고 매니페스트를 갱신합니다.
+
+    Args:
+        manifest (PipelineManifest): 실행 기록 매니페스트 (단계 성공 시마다 저장)
+        execute (StageExecutor): 단계 실행 함수
+        forced (Iterable[str]): 변경 여부와 무관하게 실행할 단계명
+
+    Returns:
+        List[str]: 실행된 단계명 목록
+    """
+    forced = set(forced)
+    executed = []
+
+    for stage in STAGES:
+        if not stage.script.exists():
+            raise StageFailedError(f"파일이 존재하지 않습니다: {stage.script}")
+
+        # 실행 전 입력 시그니처 계산 (상위 단계가 방금 갱신한 출력 해시 반영)
+        signature = stage_signature(stage, manifest)
+        reason = "강제 실행(--force)" if stage.name in forced else stale_reason(stage, manifest, signature)
+        if reason is None:
+            print(f"ℹ️ [Skip] {stage.label} - 입력/코드 변경 없음")
+            continue
+
+        print(f"\nℹ️ [{stage.name}] 재실행 사유: {reason}")
+        elapsed = execute(stage)
+        manifest.record_stage(stage.name, signature, stage.outputs, elapsed)
+        manifest.save()
+        executed.append(stage.name)
+
+    manifest.save()
+    return executed
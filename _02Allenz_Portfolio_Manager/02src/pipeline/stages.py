@@ -0,0 +1,283 @@
+"""
+@Title: Pipeline Stage Graph
+@Description: 파이프라인 단계의 입력/출력 아티팩트와 코드 의존성을 선언하고, 매니페스트와 비교하여 재실행이 필요한 단계를 판정합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import hashlib
+from datetime import date, timedelta
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+import config
+from pipeline.manifest import PipelineManifest
+
+# 2. Constants
+MODULE_TAG = "[Pipeline]"
+
+# 모든 단계가 공유하는 코드 파일 (변경 시 전 단계의 코드 버전이 바뀜)
+SHARED_CODE_FILES = (
+    config.SRC_DIR / "config.py",
+    config.SRC_DIR / "data_loaders" / "io.py",
+)
+
+
+# 3. Stage Definition
+@dataclass(frozen=True)
+class Stage:
+    """
+    파이프라인 단계 선언
+
+    Attributes:
+        name: 단계 식별자 (--force 인자로 사용)
+        label: 콘솔 출력용 이름
+        module: 실행할 모듈 (python -m 으로 실행)
+        input_keys: 단계가 읽는 아티팩트 키 ('raw:<RAW_FILES 키>' 또는 PROCESSED_FILES 키)
+        output_keys: 단계가 생성하는 아티팩트 키
+        market_data: yfinance 시세에 의존하는지 여부 (True면 거래일이 바뀔 때 재실행)
+        extra_code: 단계 스크립트 외에 결과에 영향을 주는 코드 파일 (SRC_DIR 기준 상대 경로)
+        settings: 결과에 영향을 주는 config 설정 (환경 변수로 재정의 가능한 지연 속성명, 값이 바뀌면 재실행)
+        data_files: 아티팩트 외에 단계가 읽는 사용자 데이터 파일 (DATA_DIR 기준 상대 경로, 입력과 같이 해시 - 없어도 됨)
+    """
+    name: str
+    label: str
+    module: str
+    input_keys: Tuple[str, ...]
+    output_keys: Tuple[str, ...]
+    market_data: bool = False
+    extra_code: Tuple[str, ...] = ()
+    settings: Tuple[str, ...] = ()
+    data_files: Tuple[str, ...] = ()
+
+    @property
+    def script(self) -> Path:
+        return config.SRC_DIR.joinpath(*self.module.split('.')).with_suffix('.py')
+
+    @property
+    def inputs(self) -> Tuple[Path, ...]:
+        return tuple(artifact_path(k) for k in self.input_keys)
+
+    @property
+    def data_paths(self) -> Tuple[Path, ...]:
+        # 데이터 폴더는 재정의될 수 있으므로 호출 시점에 해석
+        return tuple(config.DATA_DIR / p for p in self.data_files)
+
+    @property
+    def outputs(self) -> Tuple[Path, ...]:
+        return tuple(artifact_path(k) for k in self.output_keys)
+
+    @property
+    def code_files(self) -> Tuple[Path, ...]:
+        # ISIN 매핑은 경로가 재정의될 수 있으므로 호출 시점에 해석
+        extra = tuple(config.SRC_DIR / p for p in self.extra_code)
+        return (self.script,) + extra + SHARED_CODE_FILES + (config.ISIN_MAPPING_FILE,)
+
+
+def artifact_path(key: str) -> Path:
+    """아티팩트 키를 현재 설정 기준의 파일 경로로 변환합니다. (경로는 호출 시점에 지연 해석)"""
+    if key.startswith('raw:'):
+        return config.RAW_DIR / config.RAW_FILES[key[4:]]
+    return config.PROCESSED_DIR / config.PROCESSED_FILES[key]
+
+
+# 실행 순서 = 위상 정렬 순서 (앞 단계의 출력이 뒤 단계의 입력)
+STAGES: List[Stage] = [
+    Stage(
+        name='parser',
+        label="1. 데이터 파싱 (HTS -> CSV)",
+        module='data_loaders.parser',
+        input_keys=('raw:transaction', 'raw:asset_summary', 'raw:holdings'),
+        output_keys=('transaction', 'asset', 'holdings')
+    ),
+    Stage(
+        name='ledger',
+        label="2. 자산 원장 생성 (Ledger)",
+        module='engines.ledger',
+        input_keys=('asset', 'transaction', 'holdings'),
+        output_keys=('ledger', 'full_portfolio'),
+        extra_code=('engines/income.py', 'engines/timeline.py'),
+        settings=('INCOME_TREATMENT', 'TIMELINE_MODE')
+    ),
+    Stage(
+        name='metrics',
+        label="3. 성과 지표 산출 (Metrics)",
+        module='engines.metrics',
+        input_keys=('ledger',),
+        output_keys=('performance',)
+    ),
+    Stage(
+        name='benchmark',
+        label="4. 벤치마크 수집 (SPY/QQQ)",
+        module='engines.benchmark',
+        input_keys=('performance',),
+        output_keys=('benchmark',),
+        market_data=True
+    ),
+    Stage(
+        name='history',
+        label="5. 타임머신 역산 (Historical Holdings)",
+        module='engines.history',
+        input_keys=('transaction', 'holdings', 'ledger'),
+        output_keys=('timeline', 'positions', 'prices', 'fx_rates'),
+        market_data=True,
+        extra_code=('engines/positions.py', 'engines/currency.py', 'engines/timeline.py'),
+        settings=('TIMELINE_MODE',)
+    ),
+    Stage(
+        name='cube',
+        label="6. 기간 수익률 큐브 (월/분기/연)",
+        module='engines.returns_cube',
+        input_keys=('performance', 'benchmark'),
+        output_keys=('returns_cube',)
+    ),
+    Stage(
+        name='digest',
+        label="7. AI 리포트 요약 (Digest)",
+        module='ai.digest',
+        input_keys=('performance', 'benchmark', 'timeline', 'full_portfolio'),
+        output_keys=('digest',),
+        extra_code=('ai/queries.py', 'ai/data_store.py', 'ai/llm.py')
+    ),
+    Stage(
+        name='lots',
+        label="8. 세무 로트 & 실현손익 (Tax Lots)",
+        module='engines.tax_lots',
+        input_keys=('transaction', 'holdings', 'full_portfolio'),
+        output_keys=('tax_lots', 'realized'),
+        settings=('LOT_METHOD',),
+        data_files=('lot_selections.json',)
+    ),
+    Stage(
+        name='whatif',
+        label="9. What-if 전략 시뮬레이션 (Simulator)",
+        module='engines.simulator',
+        input_keys=('performance', 'timeline', 'prices', 'transaction'),
+        output_keys=('what_if_paths', 'what_if_summary'),
+        extra_code=('what_if.json', 'engines/positions.py', 'engines/timeline.py', 'engines/tax_lots.py')
+    ),
+    Stage(
+        name='risk',
+        label="10. 리스크 모델 (공분산/위험 기여도/최적화)",
+        module='engines.risk',
+        input_keys=('prices', 'fx_rates', 'benchmark', 'timeline'),
+        output_keys=('risk_cov', 'risk_contrib')
+    ),
+    Stage(
+        name='income',
+        label="11. 배당/이자 수익 (Income)",
+        module='engines.income',
+        input_keys=('transaction', 'holdings', 'performance', 'tax_lots'),
+        output_keys=('income', 'income_monthly', 'income_yield'),
+        extra_code=('engines/tax_lots.py',)
+    ),
+    Stage(
+        name='currency',
+        label="12. 통화별 원장 & 환율 효과 분해 (Currency)",
+        module='engines.currency',
+        input_keys=('timeline', 'prices', 'fx_rates', 'transaction', 'performance'),
+        output_keys=('currency_ledger', 'fx_attribution'),
+        extra_code=('engines/tax_lots.py',)
+    ),
+    Stage(
+        name='drawdown',
+        label="13. 낙폭 구간 분석 (Drawdowns)",
+        module='engines.drawdowns',
+        input_keys=('performance', 'benchmark'),
+        output_keys=('drawdown_episodes', 'drawdown_curves')
+    ),
+]
+
+STAGE_NAMES = [s.name for s in STAGES]
+
+
+# 4. Main Logic
+def market_date(today: Optional[date] = None) -> str:
+    """
+    시세 갱신 기준일을 반환합니다. 주말은 직전 금요일로 간주하여 불필요한 재수집을 막습니다.
+    """
+    d = today or date.today()
+    while d.weekday() >= 5:
+        d -= timedelta(days=1)
+    return d.isoformat()
+
+
+def code_version(stage: Stage, manifest: PipelineManifest) -> str:
+    """단계 스크립트와 공유 코드 파일 해시를 합친 코드 버전을 계산합니다."""
+    digest = hashlib.sha256()
+    for key, sha in sorted(manifest.fingerprints(stage.code_files).items()):
+        digest.update(f"{key}={sha};".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def stage_signature(stage: Stage, manifest: PipelineManifest) -> Dict[str, Any]:
+    """
+    단계의 현재 입력 시그니처(입력·데이터 파일 해시 + 코드 버전 + 설정값 + 시세 기준일)를 계산합니다.
+    """
+    signature = {
+        'code': code_version(stage, manifest),
+        'inputs': manifest.fingerprints(stage.inputs + stage.data_paths)
+    }
+    if stage.settings:
+        signature['settings'] = {name: getattr(config, name) for name in stage.settings}
+    if stage.market_data:
+        signature['market_date'] = market_date()
+    return signature
+
+
+def stale_reason(stage: Stage, manifest: PipelineManifest, signature: Dict[str, Any]) -> Optional[str]:
+    """
+    단계를 재실행해야 하는 이유를 반환합니다. 최신 상태이면 None을 반환합니다.
+    """
+    record = manifest.stage_record(stage.name)
+    if record is None:
+        return "실행 기록 없음"
+
+    previous = record['signature']
+    if previous.get('code') != signature['code']:
+        return "코드 변경"
+    changed = [Path(k).name for k, v in signature['inputs'].items() if previous['inputs'].get(k) != v]
+    if changed:
+        return f"입력 변경: {', '.join(changed)}"
+    settings = signature.get('settings', {})
+    changed = [f"{k}={v}" for k, v in settings.items() if previous.get('settings', {}).get(k) != v]
+    if changed:
+        return f"설정 변경: {', '.join(changed)}"
+    if previous.get('market_date') != signature.get('market_date'):
+        return f"시세 기준일 변경: {signature.get('market_date')}"
+
+    # 출력물이 삭제되었거나 외부에서 수정된 경우
+    current_outputs = manifest.fingerprints(stage.outputs)
+    if current_outputs != record['outputs']:
+        return "출력 누락/변경"
+    return None
+
+
+def downstream_of(stage_names: List[str]) -> List[str]:
+    """지정된 단계와 그 출력을 (직·간접적으로) 입력으로 사용하는 하위 단계 목록을 반환합니다."""
+    affected = set(stage_names)
+    produced = {k for s in STAGES if s.name in affected for k in s.output_keys}
+    for stage in STAGES:
+        if stage.name in affected:
+            continue
+        if produced.intersection(stage.input_keys):
+            affected.add(stage.name)
+            produced.update(stage.output_keys)
+    return [s.name for s in STAGES if s.name in affected]
+
+
+def get_stage(name: str) -> Stage:
+    for stage in STAGES:
+        if stage.name == name:
+            return stage
+    raise KeyError(f"{MODULE_TAG} 알 수 없는 단계: {name}")
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    manifest = PipelineManifest.load()
+    for stage in STAGES:
+        reason = stale_reason(stage, manifest, stage_signature(stage, manifest))
+        print(f"ℹ️ {stage.name:<10} {'재실행 필요: ' + reason if reason else '최신 상태'}")
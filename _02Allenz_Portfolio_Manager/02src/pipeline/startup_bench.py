@@ -0,0 +1,168 @@
+"""
+@Title: Startup Import Benchmark
+@Description: 각 진입점 모듈을 새 인터프리터에서 import하여 import 시간(중앙값)을 측정하고,
+              시간 예산 초과 및 금지된 무거운 모듈(pandas/scipy/yfinance 등)의 조기 로드를 검사합니다.
+              위반이 있으면 종료 코드 1을 반환합니다. (사용: python -m pipeline.startup_bench)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+# 2. Constants
+MODULE_TAG = "[Startup Bench]"
+DEFAULT_RUNS = 5
+
+# 파이프라인 제어 경로(계획/매니페스트 확인)에서는 데이터 처리 라이브러리를 로드하지 않아야 함
+PIPELINE_FORBIDDEN = ('pandas', 'numpy', 'scipy', 'yfinance', 'watchdog')
+
+# 측정용 자식 프로세스 코드: import 소요 시간과 로드된 금지 모듈 목록을 JSON으로 출력
+_PROBE_CODE = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+forbidden = {forbidden!r}
+print(json.dumps({{'sec': elapsed, 'loaded': [m for m in forbidden if m in sys.modules]}}))
+"""
+
+
+@dataclass(frozen=True)
+class EntryPoint:
+    """
+    import 예산 선언
+
+    Attributes:
+        module: 측정할 모듈 (새 인터프리터에서 import)
+        budget_sec: import 시간 예산 (중앙값 기준)
+        forbidden: import 직후 sys.modules에 있으면 안 되는 모듈
+        requires: 설치되지 않았으면 측정을 건너뛸 선택 의존성
+    """
+    module: str
+    budget_sec: float
+    forbidden: Tuple[str, ...] = ()
+    requires: Optional[str] = None
+
+
+ENTRY_POINTS: List[EntryPoint] = [
+    EntryPoint('config', 0.05, PIPELINE_FORBIDDEN),
+    EntryPoint('pipeline.stages', 0.10, PIPELINE_FORBIDDEN),
+    EntryPoint('pipeline.runner', 0.10, PIPELINE_FORBIDDEN),
+    EntryPoint('pipeline.profiler', 0.15, PIPELINE_FORBIDDEN),
+    EntryPoint('update', 0.20, PIPELINE_FORBIDDEN),
+    EntryPoint('data_loaders.parser', 1.00, ('scipy', 'yfinance')),
+    EntryPoint('engines.ledger', 1.00, ('scipy', 'yfinance')),
+    EntryPoint('engines.metrics', 1.00, ('scipy', 'yfinance')),
+    EntryPoint('engines.benchmark', 1.00, ('scipy', 'yfinance')),
+    EntryPoint('engines.history', 1.00, ('scipy', 'yfinance')),
+    EntryPoint('ui.app', 3.00, ('scipy', 'yfinance'), requires='streamlit'),
+    EntryPoint('ai.mcp_server', 1.50, ('pandas', 'scipy', 'yfinance'), requires='mcp'),
+]
+
+
+# 3. Helper Functions
+def _probe_env() -> Dict[str, str]:
+    """02src와 프로젝트 루트(update.py)를 PYTHONPATH에 포함한 자식 프로세스 환경."""
+    env = config.subprocess_env()
+    env['PYTHONPATH'] = os.pathsep.join([env['PYTHONPATH'], str(config.BASE_DIR)])
+    return env
+
+
+def _is_installed(module: str) -> bool:
+    import importlib.util
+    return importlib.util.find_spec(module) is not None
+
+
+def measure(entry: EntryPoint, runs: int = DEFAULT_RUNS) -> Dict[str, object]:
+    """
+    진입점을 새 인터프리터에서 runs회 import하여 중앙값 시간과 금지 모듈 로드 여부를 측정합니다.
+
+    Returns:
+        Dict: {'module', 'median_sec', 'budget_sec', 'loaded', 'violations'}
+    """
+    code = _PROBE_CODE.format(module=entry.module, forbidden=entry.forbidden)
+    env = _probe_env()
+    timings, loaded = [], set()
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, '-c', code], env=env, cwd=str(config.BASE_DIR),
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            return {'module': entry.module, 'median_sec': None, 'budget_sec': entry.budget_sec,
+                    'loaded': [], 'violations': [f"import 실패: {error}"]}
+        # 모듈이 import 중 출력한 로그 이후 마지막 줄이 측정 결과
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(result['sec'])
+        loaded.update(result['loaded'])
+
+    median_sec = statistics.median(timings)
+    violations = []
+    if median_sec > entry.budget_sec:
+        violations.append(f"예산 초과 {median_sec:.3f}s > {entry.budget_sec:.3f}s")
+    if loaded:
+        violations.append(f"금지 모듈 로드: {', '.join(sorted(loaded))}")
+    return {'module': entry.module, 'median_sec': round(median_sec, 4), 'budget_sec': entry.budget_sec,
+            'loaded': sorted(loaded), 'violations': violations}
+
+
+# 4. Main Logic
+def run_bench(runs: int = DEFAULT_RUNS, scale: float = 1.0, only: Optional[List[str]] = None) -> List[Dict[str, object]]:
+    """
+    모든 진입점의 import 예산을 검사하고 결과 표를 출력합니다.
+
+    Args:
+        runs (int): 진입점별 반복 측정 횟수
+        scale (float): 느린 머신용 예산 배율 (예: 2.0이면 예산 2배)
+        only (List[str], optional): 측정할 모듈 이름 목록 (None이면 전체)
+
+    Returns:
+        List[Dict]: 진입점별 측정 결과 (건너뛴 항목 제외)
+    """
+    results = []
+    print(f"🚀 {MODULE_TAG} 진입점 import 시간 측정 (중앙값 / {runs}회, 예산 배율 x{scale:g})")
+    print(f"{'Module':<22}{'Median':>10}{'Budget':>10}  Status")
+    for entry in ENTRY_POINTS:
+        if only and entry.module not in only:
+            continue
+        if entry.requires and not _is_installed(entry.requires):
+            print(f"{entry.module:<22}{'-':>10}{'-':>10}  ℹ️ 건너뜀 ({entry.requires} 미설치)")
+            continue
+
+        scaled = EntryPoint(entry.module, entry.budget_sec * scale, entry.forbidden, entry.requires)
+        result = measure(scaled, runs)
+        median = f"{result['median_sec']:.3f}s" if result['median_sec'] is not None else '-'
+        status = "❌ " + "; ".join(result['violations']) if result['violations'] else "✅"
+        print(f"{entry.module:<22}{median:>10}{scaled.budget_sec:>9.3f}s  {status}")
+        results.append(result)
+    return results
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="진입점 import 시간 예산 검사")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="진입점별 반복 측정 횟수 (기본 5)")
+    parser.add_argument('--scale', type=float, default=1.0, help="예산 배율 (느린 머신/CI용)")
+    parser.add_argument('--only', nargs='*', default=None, help="측정할 모듈만 지정")
+    parser.add_argument('--json', default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    bench_results = run_bench(args.runs, args.scale, args.only)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(bench_results, f, ensure_ascii=False, indent=2)
+
+    failed = [r['module'] for r in bench_results if r['violations']]
+    if failed:
+        print(f"❌ {MODULE_TAG} 예산 위반: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"✅ {MODULE_TAG} 모든 진입점이 예산 내에 있습니다.")
@@ -0,0 +1,176 @@
+"""
+@Title: Raw Folder Watch Daemon
+@Description: 01DATA/raw 폴더를 감시하다가 HTS 원본 파일이 저장되면 (디바운스 후) 영향을 받는 단계만 증분 실행하고
+              새 데이터 버전을 매니페스트에 게시합니다. 무거운 서드파티 모듈을 미리 import한 warm 인터프리터에서 실행하며,
+              프로젝트 모듈(엔진/로더/AI)은 실행마다 모듈 캐시에서 내려 수정된 코드를 다시 로드합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import sys
+import time
+import queue
+import threading
+import importlib
+from pathlib import Path
+from typing import Optional, Set
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+
+import config
+from pipeline.manifest import PipelineManifest
+from pipeline.stages import STAGES
+from pipeline.runner import run_incremental, run_in_process, StageFailedError
+
+# 2. Constants
+MODULE_TAG = "[Watcher]"
+DEFAULT_DEBOUNCE_SEC = 3.0
+
+# warm-up 대상 서드파티 모듈 (프로젝트 모듈은 단계 선언에서 가져옴 - 실행 전마다 새로 로드)
+WARM_MODULES = ['pandas', 'numpy', 'scipy.optimize', 'yfinance']
+
+# 실행 전 캐시에서 내리지 않는 프로젝트 모듈 (감시 데몬 자신과 설정 객체)
+RESIDENT_PREFIXES = ('config', 'pipeline')
+
+
+# 3. Helper Functions
+def _project_modules() -> list:
+    """sys.modules에 로드된 프로젝트(SRC_DIR 아래) 모듈 중 단계 실행 전에 다시 로드해야 하는 모듈명 목록"""
+    src = str(config.SRC_DIR.resolve())
+    names = []
+    for name, module in list(sys.modules.items()):
+        # __init__.py가 없는 네임스페이스 패키지는 __file__ 대신 __path__로 판별 (하위 모듈 속성을 들고 있으므로 함께 내림)
+        path = getattr(module, '__file__', None) or next(iter(getattr(module, '__path__', None) or []), None)
+        if path and str(Path(path).resolve()).startswith(src) and name.split('.')[0] not in RESIDENT_PREFIXES:
+            names.append(name)
+    return names
+
+
+def evict_project_modules() -> int:
+    """
+    엔진/로더 등 프로젝트 모듈을 모듈 캐시에서 내립니다. (runpy는 단계 스크립트만 새로 실행하므로,
+    스크립트가 import하는 모듈이 수정되어도 이전 코드가 실행되고 매니페스트에는 새 코드 해시가 기록되는 문제 방지)
+
+    Returns:
+        int: 내린 모듈 수
+    """
+    names = _project_modules()
+    for name in names:
+        sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    return len(names)
+
+
+class _DebouncedRawHandler(FileSystemEventHandler):
+    """
+    HTS 원본 파일 이벤트를 모았다가 마지막 이벤트 후 debounce_sec 동안 조용하면 한 번에 배치로 전달합니다.
+    (HTS 내보내기는 한 파일에 대해 created/modified 이벤트가 연속으로 발생함)
+    """
+
+    def __init__(self, batches: "queue.Queue[Set[str]]", debounce_sec: float):
+        super().__init__()
+        self.batches = batches
+        self.debounce_sec = debounce_sec
+        self.watched_names = set(config.RAW_FILES.values())
+        self._pending: Set[str] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory or event.event_type not in ('created', 'modified', 'moved'):
+            return
+        path = getattr(event, 'dest_path', None) or event.src_path
+        name = Path(path).name
+        if name not in self.watched_names:
+            return
+
+        with self._lock:
+            self._pending.add(name)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_sec, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, set()
+            self._timer = None
+        if batch:
+            self.batches.put(batch)
+
+
+def warm_up() -> None:
+    """무거운 의존성과 단계 모듈(의 서드파티 import)을 미리 로드하여 이후 단계 실행 시 cold start 비용을 없앱니다."""
+    start_time = time.time()
+    for module_name in WARM_MODULES + [s.module for s in STAGES]:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"⚠️ {MODULE_TAG} {module_name} 사전 로드 실패: {e}")
+    print(f"✅ {MODULE_TAG} 엔진 warm-up 완료 ({time.time() - start_time:.2f}초)")
+
+
+def refresh(changed: Set[str]) -> None:
+    """변경된 원본 파일 배치에 대해 증분 파이프라인을 실행하고 새 데이터 버전을 게시합니다."""
+    print(f"\n{'=' * 60}")
+    print(f"📂 {MODULE_TAG} 원본 변경 감지: {', '.join(sorted(changed))}")
+
+    # warm-up/이전 실행에서 캐시된 프로젝트 모듈을 내려 수정된 코드가 그대로 반영되게 함 (서드파티 모듈은 유지)
+    evict_project_modules()
+    start_time = time.time()
+    manifest = PipelineManifest.load()
+    previous_version = manifest.data_version
+    try:
+        executed = run_incremental(manifest, run_in_process)
+    except StageFailedError as e:
+        print(f"❌ {MODULE_TAG} 파이프라인 실패, 다음 변경을 기다립니다: {e}")
+        return
+
+    elapsed = time.time() - start_time
+    if manifest.data_version != previous_version:
+        print(f"✅ {MODULE_TAG} 새 데이터 버전 게시: {previous_version} → {manifest.data_version}")
+    else:
+        print(f"ℹ️ {MODULE_TAG} 출력 변경 없음 (데이터 버전 {manifest.data_version})")
+    print(f"⏱️ 실행 단계: {', '.join(executed) or '없음'} ({elapsed:.2f}초)")
+
+
+# 4. Main Logic
+def run_watch(debounce_sec: float = DEFAULT_DEBOUNCE_SEC) -> None:
+    """
+    raw 폴더 감시 데몬을 실행합니다. (Ctrl+C로 종료)
+
+    Args:
+        debounce_sec (float): 마지막 파일 이벤트 후 파이프라인을 시작하기까지의 대기 시간
+    """
+    config.ensure_dirs()
+    print(f"🚀 {MODULE_TAG} 감시 시작: {config.RAW_DIR} (debounce {debounce_sec:.1f}초)")
+    warm_up()
+
+    batches: "queue.Queue[Set[str]]" = queue.Queue()
+    observer = Observer()
+    observer.schedule(_DebouncedRawHandler(batches, debounce_sec), str(config.RAW_DIR), recursive=False)
+    observer.start()
+
+    try:
+        while True:
+            try:
+                changed = batches.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            # 실행 중 쌓인 후속 배치는 한 번에 합쳐서 처리
+            while not batches.empty():
+                changed |= batches.get_nowait()
+            refresh(changed)
+    except KeyboardInterrupt:
+        print(f"\nℹ️ {MODULE_TAG} 감시 종료")
+    finally:
+        observer.stop()
+        observer.join()
+
+
+# 5. Execution Block
+if __name__ == "__main__":
+    run_watch()
@@ -0,0 +1,5 @@
+"""
+@Title: UI Package
+@Description: [Layer 3] Streamlit 대시보드 (Presentation Layer)
+@Author: Allen & Gemini
+"""
@@ -1,81 +1,76 @@
 """
 @Title: Portfolio Manager Main UI
 @Description: Streamlit 대시보드의 메인 실행 파일. 좌측 메뉴 렌더링 및 페이지 전환을 담당합니다.
+              각 페이지는 처음 이동할 때 자신이 선언한 아티팩트(PAGE_DATA)만 지연 로드합니다.
+              기간 분석 프리셋은 파이프라인 데이터 버전 감시 스레드가 페이지 방문과 무관하게 미리 계산합니다.
 @Author: Allen & Gemini
 """
 
 # 1. Imports
-import sys
-import pandas as pd
-import streamlit as st
-from pathlib import Path
-
-# 상위 디렉토리(02src) 참조 설정
-CURRENT_DIR = Path(__file__).resolve().parent
-SRC_DIR = CURRENT_DIR.parent
-if str(SRC_DIR) not in sys.path:
-    sys.path.append(str(SRC_DIR))
+import importlib
+from types import ModuleType
 
-import config
-from data_loaders import io as local_io
+import streamlit as st
 
-# 우리가 만든 UI 컴포넌트 3대장 불러오기
-from components import portfolio, analytics, history_tab
+from pipeline.manifest import read_data_version
+from ui import data_cache
+from ui.period_analytics import PERIOD_CACHE
 
 # 2. Constants & Page Config
-st.set_page_config(
+# set_page_config는 import 부작용이 되지 않도록 main()에서 호출 (진입점: 프로젝트 루트의 main.py)
+PAGE_CONFIG = dict(
     page_title="Allenz Portfolio",
     page_icon="📈",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# 3. Helper Functions (Data Loader)
-@st.cache_data
-def load_all_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """모든 정제된 데이터를 로드하고 날짜 형식을 맞춥니다."""
-    df_perf = local_io.load_csv(config.PROCESSED_DIR / "05Performance_Data.csv")
-    df_bench = local_io.load_csv(config.PROCESSED_DIR / "06Benchmark_Data.csv")
-    df_full = local_io.load_csv(config.PROCESSED_DIR / "03Full_Portfolio.csv")
-    df_history = local_io.load_csv(config.PROCESSED_DIR / "07Historical_Holdings.csv") # [NEW] 타임머신 데이터
-
-    # 날짜 컬럼 Datetime 변환
-    if not df_perf.empty:
-        df_perf['Date'] = pd.to_datetime(df_perf['Date'])
-    if not df_bench.empty:
-        df_bench['Date'] = pd.to_datetime(df_bench['Date'])
-    if not df_history.empty and 'Date' in df_history.columns:
-        df_history['Date'] = pd.to_datetime(df_history['Date'])
-
-    return df_perf, df_bench, df_full, df_history
+# 메뉴 -> UI 컴포넌트 모듈 (선택된 페이지의 모듈만 import)
+PAGES = {
+    "🏠 내 포트폴리오 (Current)": "ui.components.portfolio",
+    "📈 성과 분석 & 벤치마크 (Metrics)": "ui.components.analytics",
+    "🕰️ 포트폴리오 스냅샷 (Historical Holdings)": "ui.components.history_tab",  # [NEW] 3번째 탭
+}
+
+
+# 3. Helper Functions (Page Loader)
+def load_page(menu: str) -> ModuleType:
+    """메뉴에 해당하는 UI 컴포넌트 모듈을 반환합니다. (처음 이동할 때 import)"""
+    return importlib.import_module(PAGES[menu])
+
+
+def render_with_placeholder(page: ModuleType) -> None:
+    """
+    페이지 데이터를 로드하는 동안 플레이스홀더를 표시한 뒤 페이지를 렌더링합니다.
+    캐시된 데이터라면 플레이스홀더는 즉시 사라집니다.
+    """
+    placeholder = st.empty()
+    with placeholder.container():
+        st.info("⏳ 데이터를 불러오는 중입니다...")
+    frames = data_cache.load_page_data(page.PAGE_DATA)
+    placeholder.empty()
+    page.render_page(**frames)
+
 
 # 4. Main Logic
 def main():
     """메인 라우팅 로직"""
-    df_perf, df_bench, df_full, df_history = load_all_data()
+    st.set_page_config(**PAGE_CONFIG)
+
+    # 파이프라인이 새 데이터 버전을 게시하면 기간 분석 프리셋을 즉시 미리 계산 (서버 프로세스당 1회 시작)
+    PERIOD_CACHE.watch_pipeline()
 
     # --- Sidebar: Navigation Menu ---
     st.sidebar.title("🧭 Navigation")
-    menu = st.sidebar.radio(
-        "메뉴 이동",
-        [
-            "🏠 내 포트폴리오 (Current)",
-            "📈 성과 분석 & 벤치마크 (Metrics)",
-            "🕰️ 포트폴리오 스냅샷 (Historical Holdings)" # [NEW] 3번째 탭
-        ]
-    )
+    menu = st.sidebar.radio("메뉴 이동", list(PAGES))
 
     st.sidebar.markdown("---")
     st.sidebar.caption("Allenz Portfolio Manager v1.0.0")
+    st.sidebar.caption(f"데이터 버전: {read_data_version() or '-'}")
 
     # --- Page Routing ---
-    if menu == "🏠 내 포트폴리오 (Current)":
-        portfolio.render_page(df_full)
-    elif menu == "📈 성과 분석 & 벤치마크 (Metrics)":
-        analytics.render_page(df_perf, df_bench)
-    elif menu == "🕰️ 포트폴리오 스냅샷 (Historical Holdings)":
-        history_tab.render_page(df_history)
+    render_with_placeholder(load_page(menu))
 
 # 5. Execution Block
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
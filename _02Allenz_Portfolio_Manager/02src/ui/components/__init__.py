@@ -0,0 +1,5 @@
+"""
+@Title: UI Components Package
+@Description: 대시보드 페이지별 렌더링 컴포넌트
+@Author: Allen & Gemini
+"""
@@ -1,6 +1,8 @@
 """
 @Title: Analytics Component
 @Description: 성과 분석 및 벤치마크 비교 화면을 렌더링합니다. (동적 리베이싱 포함)
+              위험 분해 탭은 리스크 엔진(17/18)이 미리 계산한 공분산과 위험 기여도를 그대로 표시합니다.
+              낙폭 탭의 구간 표는 저장된 낙폭 곡선(25)의 누적 고점 배열을 재사용하여 선택 기간만 다시 계산합니다.
 @Author: Allen & Gemini
 """
 
@@ -8,104 +10,199 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
-from scipy import optimize
+
+from engines.drawdowns import compare_episodes, extract_episodes, window_curve
+from ui.data_cache import ArtifactRequest
+from ui.period_analytics import BENCHMARKS, PERIOD_CACHE, PRESET_WINDOWS, load_period_data, preset_range
+from ui.downsample import DEFAULT_CHART_WIDTH_PX, aggregate_buckets, downsample_line
 
 # 1. Constants
 MODULE_TAG = "[UI: Analytics]"
+BAR_MIN_WIDTH_PX = 4  # 입출금 막대 하나가 차지할 최소 픽셀 (구간 합계로 집계)
+
+# 페이지가 사용하는 데이터 선언 (render_page 인자명 -> 아티팩트/컬럼)
+# 성과/벤치마크(PERIOD_DATA)는 기간 캐시 키와 같은 토큰으로 읽어야 하므로 render_page에서 load_period_data()로 로드
+PAGE_DATA = {
+    'df_cube': ArtifactRequest('returns_cube', ('Freq', 'Period', 'TWR', 'MWR', 'SPY', 'Excess_SPY'), optional=True),
+    'df_risk': ArtifactRequest('risk_contrib', optional=True),
+    'df_cov': ArtifactRequest('risk_cov', optional=True),
+    'df_dd': ArtifactRequest('drawdown_curves', ('Date', 'Series', 'Wealth', 'Peak', 'Drawdown', 'Peak_Date', 'Recovery_Date'),
+                             optional=True),
+}
+
+# 달력 히트맵 지표 (라벨 -> 큐브 컬럼)
+CALENDAR_METRICS = {'TWR': 'TWR', 'MWR': 'MWR', '초과 수익 (vs SPY)': 'Excess_SPY', 'S&P 500 (SPY)': 'SPY'}
+MONTH_LABELS = [f"{m}월" for m in range(1, 13)]
+
+# 낙폭 구간 비교 (시계열별 상위 순위 수, 시계열 표시명)
+EPISODE_TOP_N = 5
+SERIES_LABELS = {'Portfolio': '내 포트폴리오', 'SPY': 'S&P 500 (SPY)', 'QQQ': 'Nasdaq 100 (QQQ)', 'IWM': 'Russell 2000 (IWM)'}
+
+# 위험 분해 비교 비중 (라벨 -> 18 컬럼)
+RISK_WEIGHTS = {'현재 비중': 'Weight', 'Risk Parity': 'W_Risk_Parity', '평균-분산': 'W_Mean_Variance'}
 
 # 2. Helper Functions
-def _calculate_xirr(cash_flows: list, dates: list) -> float:
-    """선택된 기간에 대한 내부수익률(XIRR)을 동적으로 계산합니다."""
-    if len(cash_flows) < 2: return 0.0
-    def xnpv(rate, flows, dates):
-        if rate <= -1.0: return float('inf')
-        min_date = min(dates)
-        return sum([cf / (1 + rate) ** ((d - min_date).days / 365.0) for cf, d in zip(flows, dates)])
-    try:
-        return optimize.newton(lambda r: xnpv(r, cash_flows, dates), 0.1)
-    except:
-        return 0.0
-
-def _rebase_data(df_perf: pd.DataFrame, df_bench: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp):
-    """선택된 기간에 맞춰 수익률을 0%부터 다시 계산(Rebasing)합니다."""
-    # 1. 기간 필터링
-    mask_perf = (df_perf['Date'] >= start_date) & (df_perf['Date'] <= end_date)
-    p_df = df_perf.loc[mask_perf].copy()
-
-    mask_bench = (df_bench['Date'] >= start_date) & (df_bench['Date'] <= end_date)
-    b_df = df_bench.loc[mask_bench].copy()
-
-    if p_df.empty or b_df.empty:
-        return p_df, b_df
-
-    # 2. 내 포트폴리오 리베이싱 (TWR & MDD)
-    # 시작일의 Daily_Return을 0으로 간주하여 해당 기간의 누적 수익률 재계산
-    p_df['Period_TWR'] = (1 + p_df['Daily_Return']).cumprod() - 1
-
-    wealth_index = (1 + p_df['Daily_Return']).cumprod()
-    peak_index = wealth_index.cummax()
-    p_df['Period_Drawdown'] = (wealth_index - peak_index) / peak_index
-
-    # 3. 벤치마크 리베이싱
-    first_spy = b_df['SPY'].iloc[0]
-    first_qqq = b_df['QQQ'].iloc[0]
-    first_iwm = b_df['IWM'].iloc[0]
-
-    b_df['SPY_TWR'] = (b_df['SPY'] / first_spy) - 1
-    b_df['QQQ_TWR'] = (b_df['QQQ'] / first_qqq) - 1
-    b_df['IWM_TWR'] = (b_df['IWM'] / first_iwm) - 1
-
-    return p_df, b_df
+def _calendar_matrix(df_cube: pd.DataFrame, column: str) -> pd.DataFrame:
+    """수익률 큐브(09)를 연도 x 월(+연간) 행렬로 변환합니다. (값은 %, 데이터가 없는 달은 NaN)"""
+    periods = df_cube['Period'].astype(str)
+    months = df_cube[df_cube['Freq'] == 'M']
+    matrix = pd.DataFrame({
+        'Year': periods[months.index].str[:4],
+        'Month': periods[months.index].str[5:7].astype(int),
+        'Value': months[column] * 100,
+    }).pivot(index='Year', columns='Month', values='Value').reindex(columns=range(1, 13))
+    matrix.columns = MONTH_LABELS
+
+    years = df_cube[df_cube['Freq'] == 'Y']
+    matrix['연간'] = pd.Series((years[column] * 100).to_numpy(), index=periods[years.index].to_numpy())
+    return matrix.sort_index(ascending=False)
+
+def _portfolio_vol(df_cov: pd.DataFrame, weights: pd.Series) -> float:
+    """비중 벡터의 연율화 변동성 sqrt(w'Σw) (공분산에 없는 자산 = 현금, 위험 0)"""
+    cov = df_cov.set_index('Ticker')
+    w = weights.reindex(cov.index).fillna(0.0).to_numpy()
+    return float(np.sqrt(max(w @ cov.to_numpy() @ w, 0.0)))
+
+def _correlation(df_cov: pd.DataFrame, tickers) -> pd.DataFrame:
+    """공분산(17)에서 지정 자산의 상관계수 행렬을 계산합니다."""
+    cov = df_cov.set_index('Ticker').loc[tickers, tickers]
+    std = np.sqrt(np.diag(cov.to_numpy()))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return cov / np.outer(std, std)
+
+def _render_calendar(df_cube: pd.DataFrame):
+    """월별 수익률 탭: 큐브(09)의 연도 x 월 히트맵"""
+    metric = st.radio("표시 지표", list(CALENDAR_METRICS), horizontal=True)
+    matrix = _calendar_matrix(df_cube, CALENDAR_METRICS[metric])
+    bound = max(float(np.nanmax(np.abs(matrix.to_numpy()))), 0.01) if matrix.notna().any().any() else 1.0
+
+    fig4 = go.Figure(go.Heatmap(
+        z=matrix.to_numpy(), x=matrix.columns, y=matrix.index,
+        text=matrix.map(lambda v: '' if pd.isna(v) else f"{v:+.1f}%").to_numpy(), texttemplate='%{text}',
+        colorscale='RdYlGn', zmid=0, zmin=-bound, zmax=bound, xgap=2, ygap=2,
+        hovertemplate='%{y} %{x}: %{z:.2f}%<extra></extra>', colorbar=dict(title='%'),
+    ))
+    fig4.update_layout(height=120 + 45 * len(matrix), margin=dict(l=0, r=0, t=30, b=0), yaxis=dict(type='category'))
+    st.plotly_chart(fig4, use_container_width=True)
+
+def _render_risk(df_risk: pd.DataFrame, df_cov: pd.DataFrame):
+    """위험 분해 탭: 변동성/분산 비율 KPI, 비중 vs 위험 기여도, 목표 비중 비교, 상관계수"""
+    st.subheader(f"종목별 위험 기여도 (기준일 {df_risk['As_Of'].iloc[0]})")
+    risky = df_risk[df_risk['Ticker'] != 'Cash']
+    sigma = df_risk['Risk_Contribution'].sum()
+    diversification = (df_risk['Weight'] * df_risk['Volatility']).sum() / sigma if sigma > 0 else np.nan
+
+    weights = {label: df_risk.set_index('Ticker')[col] for label, col in RISK_WEIGHTS.items()}
+    cols = st.columns(4)
+    cols[0].metric("📉 포트폴리오 변동성 (연율)", f"{sigma * 100:.2f}%")
+    cols[1].metric("🧩 분산 비율", f"{diversification:.2f}", help="Σ(비중 x 종목 변동성) / 포트폴리오 변동성 (1이면 분산 효과 없음)")
+    cols[2].metric("⚖️ Risk Parity 변동성", f"{_portfolio_vol(df_cov, weights['Risk Parity']) * 100:.2f}%")
+    cols[3].metric("🎯 평균-분산 변동성", f"{_portfolio_vol(df_cov, weights['평균-분산']) * 100:.2f}%")
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=risky['Ticker'], y=risky['Weight'] * 100, name='비중 (%)', marker_color='#3498db'))
+    fig.add_trace(go.Bar(x=risky['Ticker'], y=risky['Risk_Contribution_Pct'] * 100, name='위험 기여도 (%)', marker_color='#e74c3c'))
+    fig.update_layout(barmode='group', height=380, yaxis_title="%", margin=dict(l=0, r=0, t=30, b=0))
+    st.plotly_chart(fig, use_container_width=True)
+
+    table = df_risk.set_index('Ticker')[['Weight', 'Volatility', 'Marginal_Risk', 'Risk_Contribution_Pct', 'Beta_SPY',
+                                         'W_Risk_Parity', 'W_Mean_Variance']]
+    table.columns = ['비중', '변동성', '한계 위험', '위험 기여도', '베타(SPY)', 'Risk Parity 목표', '평균-분산 목표']
+    pct_cols = ['비중', '변동성', '위험 기여도', 'Risk Parity 목표', '평균-분산 목표']
+    st.dataframe(table.style.format({**{c: '{:.1%}' for c in pct_cols}, '한계 위험': '{:.3f}', '베타(SPY)': '{:.2f}'}),
+                 use_container_width=True)
+
+    corr = _correlation(df_cov, list(risky['Ticker']) + [t for t in BENCHMARKS if t in set(df_cov['Ticker'])])
+    fig_corr = go.Figure(go.Heatmap(z=corr.to_numpy(), x=corr.columns, y=corr.index, colorscale='RdBu_r', zmin=-1, zmax=1,
+                                    hovertemplate='%{y} / %{x}: %{z:.2f}<extra></extra>'))
+    fig_corr.update_layout(title="상관계수 (보유 종목 + 벤치마크, 원화 수익률)", height=120 + 28 * len(corr),
+                           margin=dict(l=0, r=0, t=40, b=0))
+    st.plotly_chart(fig_corr, use_container_width=True)
+
+def _render_episodes(df_dd: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp):
+    """낙폭 탭: 선택 기간의 시계열별 낙폭 구간 순위 비교 (저장된 누적 고점 배열 재사용)"""
+    episodes = pd.concat([extract_episodes(window_curve(curve, start_date, end_date)).assign(Series=name)
+                          for name, curve in df_dd.groupby('Series', sort=False)], ignore_index=True)
+    if episodes.empty:
+        st.info("선택한 기간에 낙폭 구간이 없습니다.")
+        return
+
+    st.subheader(f"낙폭 구간 비교 (시계열별 상위 {EPISODE_TOP_N}개)")
+    table = compare_episodes(episodes, EPISODE_TOP_N)
+    view = pd.DataFrame(index=table.index)
+    for series in table.columns.get_level_values(1).unique():
+        label = SERIES_LABELS.get(series, series)
+        view[f"{label} 낙폭"] = table[('Depth', series)].map(lambda v: '' if pd.isna(v) else f"{v * 100:.2f}%")
+        view[f"{label} 고점일"] = table[('Peak_Date', series)].map(lambda v: '' if pd.isna(v) else f"{v:%Y-%m-%d}")
+        view[f"{label} 기간"] = [
+            '' if pd.isna(days) else f"{int(days)}일" + ('' if done else ' (진행 중)')
+            for days, done in zip(table[('Duration_Days', series)], table[('Recovered', series)])
+        ]
+    st.dataframe(view, use_container_width=True)
+
+    series = st.selectbox("구간 상세", list(dict.fromkeys(episodes['Series'])), format_func=lambda s: SERIES_LABELS.get(s, s))
+    detail = episodes[episodes['Series'] == series].set_index('Rank')[
+        ['Peak_Date', 'Trough_Date', 'Recovery_Date', 'Depth', 'Decline_Days', 'Recovery_Days', 'Duration_Days']]
+    detail.columns = ['고점일', '저점일', '회복일', '낙폭', '하락 일수', '회복 일수', '전체 일수']
+    st.dataframe(detail.style.format({'낙폭': '{:.2%}', '고점일': '{:%Y-%m-%d}', '저점일': '{:%Y-%m-%d}',
+                                      '회복일': lambda v: '미회복' if pd.isna(v) else f"{v:%Y-%m-%d}",
+                                      '회복 일수': lambda v: '-' if pd.isna(v) else f"{int(v)}"}),
+                 use_container_width=True)
 
 # 3. Main Logic
-def render_page(df_perf: pd.DataFrame, df_bench: pd.DataFrame):
+def render_page(df_cube: pd.DataFrame, df_risk: pd.DataFrame, df_cov: pd.DataFrame, df_dd: pd.DataFrame):
     """성과 분석 화면 렌더링"""
     st.header("📈 성과 분석 & 벤치마크")
     st.markdown("---")
 
+    data_version, period_frames = load_period_data()
+    df_perf, df_bench = period_frames['df_perf'], period_frames['df_bench']
     if df_perf.empty or df_bench.empty:
         st.warning("데이터가 부족합니다. 파이프라인 엔진을 먼저 실행해 주세요.")
         return
 
+    # 새 데이터 버전이면 프리셋 기간(YTD/1Y/3Y/5Y/전체)을 백그라운드에서 미리 계산
+    # (보통은 app.py의 파이프라인 감시 스레드가 이미 계산해 두었으므로 즉시 반환)
+    PERIOD_CACHE.warm_presets(data_version, df_perf, df_bench)
+
     # --- [Top] 컨트롤 패널 ---
     min_date = df_perf['Date'].min().date()
     max_date = df_perf['Date'].max().date()
 
-    col_date, _ = st.columns([1, 2])
+    col_preset, col_date, _ = st.columns([1.2, 1, 0.8])
+    with col_preset:
+        preset = st.radio("⏱️ 기간 프리셋", list(PRESET_WINDOWS) + ["직접 선택"], index=len(PRESET_WINDOWS) - 1, horizontal=True)
     with col_date:
         selected_dates = st.date_input(
             "📅 분석 기간 선택",
             [min_date, max_date],
             min_value=min_date,
-            max_value=max_date
+            max_value=max_date,
+            disabled=preset != "직접 선택"
         )
 
-    if len(selected_dates) != 2:
+    if preset != "직접 선택":
+        start_date, end_date = preset_range(preset, df_perf['Date'].min(), df_perf['Date'].max())
+    elif len(selected_dates) != 2:
         st.info("종료일을 선택해 주세요.")
         return
+    else:
+        start_date, end_date = pd.to_datetime(selected_dates[0]), pd.to_datetime(selected_dates[1])
 
-    start_date, end_date = pd.to_datetime(selected_dates[0]), pd.to_datetime(selected_dates[1])
+    # 차트 해상도: 기간의 일수가 차트 폭(픽셀)보다 많으면 형태 보존 다운샘플링 (짧은 기간은 자동으로 원본 해상도)
+    full_resolution = st.toggle("🔍 원본 해상도로 보기 (모든 일별 포인트 전송)", value=False)
+    max_points = np.iinfo(np.int64).max if full_resolution else DEFAULT_CHART_WIDTH_PX
 
-    # 데이터 리베이싱 (선택 기간에 맞춤)
-    p_df, b_df = _rebase_data(df_perf, df_bench, start_date, end_date)
+    # 데이터 리베이싱 + KPI (선택 기간에 맞춤, 같은 기간은 세션 간 공유 캐시에서 재사용)
+    period = PERIOD_CACHE.get_or_compute(data_version, df_perf, df_bench, start_date, end_date, BENCHMARKS)
 
-    if p_df.empty:
+    if period is None:
         st.warning("선택한 기간에 데이터가 없습니다.")
         return
 
     # --- [Middle] 4대 KPI 카드 ---
-    # 지표 계산
-    period_twr = p_df['Period_TWR'].iloc[-1] * 100
-    period_mdd = p_df['Period_Drawdown'].min() * 100
-    period_spy = b_df['SPY_TWR'].iloc[-1] * 100
-    alpha = period_twr - period_spy
-
-    # MWR(XIRR) 계산용 현금흐름
-    flows = (-p_df['External_Flow']).tolist()
-    dates = p_df['Date'].tolist()
-    flows[0] = -p_df.iloc[0]['Calculated_Asset'] # 시작 자산
-    flows[-1] = p_df.iloc[-1]['Calculated_Asset'] # 종료 자산
-    period_mwr = _calculate_xirr(flows, dates) * 100
+    p_df, df_merged = period.p_df, period.merged
+    period_twr, period_mwr, period_mdd, alpha = period.twr, period.mwr, period.mdd, period.alpha
 
     st.markdown("### 📊 구간 성과 요약")
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
@@ -122,20 +219,20 @@ def render_page(df_perf: pd.DataFrame, df_bench: pd.DataFrame):
 
     st.markdown("---")
 
-    # --- [Bottom] 심층 분석 차트 (3분할 탭) ---
-    tab1, tab2, tab3 = st.tabs(["📊 자산 & 현금 흐름", "🥊 벤치마크 비교", "🌊 리스크 (Drawdown)"])
-
-    # 병합된 데이터를 기준으로 차트를 그림
-    df_merged = pd.merge(p_df, b_df, on='Date', how='left')
+    # --- [Bottom] 심층 분석 차트 (5분할 탭) ---
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 자산 & 현금 흐름", "🥊 벤치마크 비교", "🌊 리스크 (Drawdown)", "🗓️ 월별 수익률", "⚖️ 위험 분해"])
 
+    # 병합된 데이터(df_merged)를 기준으로 차트를 그림
     with tab1:
         st.subheader("순자산 성장 추이 및 입출금")
         fig1 = go.Figure()
         # 자산 면적 차트
-        fig1.add_trace(go.Scatter(x=p_df['Date'], y=p_df['Calculated_Asset'], fill='tozeroy',
+        asset_line = downsample_line(p_df, 'Date', 'Calculated_Asset', max_points)
+        fig1.add_trace(go.Scatter(x=asset_line['Date'], y=asset_line['Calculated_Asset'], fill='tozeroy',
                                   mode='lines', name='순자산', line=dict(color='#3498db')))
-        # 현금 흐름 막대 차트 (보조 축 사용 없이 크기 스케일만 맞춤)
-        fig1.add_trace(go.Bar(x=p_df['Date'], y=p_df['External_Flow'], name='입출금(Flow)', marker_color='#f1c40f'))
+        # 현금 흐름 막대 차트 (보조 축 사용 없이 크기 스케일만 맞춤, 긴 기간은 구간 합계로 집계하여 총액 보존)
+        flow_x, flow_y = aggregate_buckets(p_df, 'Date', 'External_Flow', max(1, max_points // BAR_MIN_WIDTH_PX))
+        fig1.add_trace(go.Bar(x=flow_x, y=flow_y, name='입출금(Flow)', marker_color='#f1c40f'))
         fig1.update_layout(height=400, hovermode='x unified', margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig1, use_container_width=True)
 
@@ -143,16 +240,15 @@ def render_page(df_perf: pd.DataFrame, df_bench: pd.DataFrame):
         st.subheader("내 포트폴리오 vs 시장 지수")
 
         fig2 = go.Figure()
-        # 내 포트폴리오 (두꺼운 선)
-        fig2.add_trace(go.Scatter(x=df_merged['Date'], y=df_merged['Period_TWR']*100,
-                                  mode='lines', name='내 포트폴리오', line=dict(color='#2ecc71', width=3)))
-        # 벤치마크 (얇은 선)
-        fig2.add_trace(go.Scatter(x=df_merged['Date'], y=df_merged['SPY_TWR']*100,
-                                  mode='lines', name='S&P 500 (SPY)', line=dict(color='#95a5a6', width=1.5)))
-        fig2.add_trace(go.Scatter(x=df_merged['Date'], y=df_merged['QQQ_TWR']*100,
-                                  mode='lines', name='Nasdaq 100 (QQQ)', line=dict(color='#f39c12', width=1.5)))
-        fig2.add_trace(go.Scatter(x=df_merged['Date'], y=df_merged['IWM_TWR']*100,
-                                  mode='lines', name='Russell 2000 (IWM)', line=dict(color='#9b59b6', width=1.5)))
+        # 내 포트폴리오 (두꺼운 선) + 벤치마크 (얇은 선), 시계열별로 LTTB 다운샘플링
+        for col, name, line in [
+            ('Period_TWR', '내 포트폴리오', dict(color='#2ecc71', width=3)),
+            ('SPY_TWR', 'S&P 500 (SPY)', dict(color='#95a5a6', width=1.5)),
+            ('QQQ_TWR', 'Nasdaq 100 (QQQ)', dict(color='#f39c12', width=1.5)),
+            ('IWM_TWR', 'Russell 2000 (IWM)', dict(color='#9b59b6', width=1.5)),
+        ]:
+            series = downsample_line(df_merged, 'Date', col, max_points)
+            fig2.add_trace(go.Scatter(x=series['Date'], y=series[col]*100, mode='lines', name=name, line=line))
 
         fig2.update_layout(height=450, hovermode='x unified', yaxis_title="수익률 (%)", margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig2, use_container_width=True)
@@ -160,7 +256,29 @@ def render_page(df_perf: pd.DataFrame, df_bench: pd.DataFrame):
     with tab3:
         st.subheader("구간 내 최대 낙폭 분석")
         fig3 = go.Figure()
-        fig3.add_trace(go.Scatter(x=p_df['Date'], y=p_df['Period_Drawdown']*100, fill='tozeroy',
+        # 낙폭은 최저점(MDD)이 사라지지 않도록 구간별 min/max 다운샘플링
+        drawdown = downsample_line(p_df, 'Date', 'Period_Drawdown', max_points, method='minmax')
+        fig3.add_trace(go.Scatter(x=drawdown['Date'], y=drawdown['Period_Drawdown']*100, fill='tozeroy',
                                   mode='lines', name='Drawdown', line=dict(color='#e74c3c')))
         fig3.update_layout(height=400, hovermode='x unified', yaxis_title="낙폭 (%)", margin=dict(l=0, r=0, t=30, b=0))
-        st.plotly_chart(fig3, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig3, use_container_width=True)
+
+        if df_dd.empty:
+            st.info("낙폭 구간 데이터(25)가 없습니다. 파이프라인(update.py)을 실행해 주세요.")
+        else:
+            _render_episodes(df_dd, start_date, end_date)
+
+    with tab4:
+        st.subheader("월별 / 연간 수익률 달력")
+        # 선택 기간과 무관하게 파이프라인이 미리 계산한 큐브(09)를 그대로 표시
+        if df_cube.empty:
+            st.info("수익률 큐브(09)가 없습니다. 파이프라인(update.py)을 실행해 주세요.")
+        else:
+            _render_calendar(df_cube)
+
+    with tab5:
+        # 선택 기간과 무관하게 리스크 엔진이 미리 계산한 최신 공분산/위험 기여도(17/18)를 표시
+        if df_risk.empty or df_cov.empty:
+            st.info("리스크 모델(17/18)이 없습니다. 파이프라인(update.py)을 실행해 주세요.")
+        else:
+            _render_risk(df_risk, df_cov)
@@ -1,25 +1,146 @@
 """
 @Title: Historical Portfolio Snapshot Component
 @Description: 과거 특정 일자의 포트폴리오 비중(주식+현금)을 슬라이더와 도넛 차트로 시각화합니다.
+              선택한 날짜 기준 종목별 평균단가/원가/미실현손익과 종목별 손익 추이를 함께 보여줍니다. (12 long 포맷)
+              재생 모드는 기간 전체의 상위 N + 기타 비중을 Plotly 애니메이션 프레임으로 한 번에 전송하여 브라우저에서 재생합니다.
 @Author: Allen & Gemini
 """
 
+from typing import Dict
+
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
+
+from ui.data_cache import ArtifactRequest
+from ui.snapshot_index import SnapshotIndex, OTHERS_LABEL, index_positions
+
+# 1. Constants
+MODULE_TAG = "[UI: History]"
+MODE_SNAPSHOT = "📅 날짜 선택"
+MODE_PLAYBACK = "▶️ 재생 (Playback)"
+PLAYBACK_TOP_N = 6            # 상위 6개 + 기타 (_00TEST/TEST.py와 동일)
+PLAYBACK_MAX_FRAMES = 120     # 장기 구간은 프레임을 균등 추출하여 전송 용량 제한
+PLAYBACK_FRAME_MS = 300
+OTHERS_COLOR = '#D3D3D3'      # 기타(Others) 고정 색상 (LightGray)
+
+# 페이지가 사용하는 데이터 선언 (종목이 컬럼인 wide 포맷 -> 날짜별 스냅샷 인덱스로 변환하여 캐시)
+PAGE_DATA = {
+    'snapshots': ArtifactRequest('timeline', derive=SnapshotIndex.from_wide),
+    'positions': ArtifactRequest('positions', derive=index_positions, optional=True),
+}
+
+
+# 2. Helper Functions
+def _asset_colors(snapshots: SnapshotIndex) -> Dict[str, str]:
+    """자산별 고정 색상 매핑 (프레임이 바뀌어도 같은 종목은 같은 색)"""
+    palette = px.colors.qualitative.Alphabet
+    colors = {name: palette[i % len(palette)] for i, name in enumerate(snapshots.asset_names)}
+    colors[OTHERS_LABEL] = OTHERS_COLOR
+    return colors
+
+
+def _build_playback_figure(snapshots: SnapshotIndex, start_date, end_date) -> go.Figure:
+    """
+    기간 내 상위 N + 기타 비중 시계열을 애니메이션 프레임으로 구성합니다. (재생/스크럽은 서버 재실행 없이 브라우저에서 처리)
+    """
+    positions = snapshots.sample_positions(start_date, end_date, PLAYBACK_MAX_FRAMES)
+    series = snapshots.top_n_series(positions, PLAYBACK_TOP_N)
+    colors = _asset_colors(snapshots)
+
+    frames = []
+    for frame_date, group in series.groupby('Date', sort=True):
+        label = frame_date.strftime('%Y-%m-%d')
+        total = snapshots.totals[snapshots.position(frame_date.date())]
+        pie = go.Pie(
+            labels=group['자산명'], values=group['평가금액'], hole=0.4, sort=False,
+            marker=dict(colors=[colors.get(name, '#999999') for name in group['자산명']]),
+            textposition='inside', textinfo='percent+label'
+        )
+        frames.append(go.Frame(data=[pie], name=label,
+                               layout=go.Layout(title_text=f"{label} · 총 평가 자산 ₩ {total:,.0f}")))
+
+    fig = go.Figure(data=frames[0].data, frames=frames, layout=frames[0].layout)
+    slider_steps = [dict(method='animate', label=fr.name,
+                         args=[[fr.name], dict(mode='immediate', frame=dict(duration=0, redraw=True), transition=dict(duration=0))])
+                    for fr in frames]
+    fig.update_layout(
+        height=520, showlegend=False, margin=dict(t=40, b=0, l=0, r=0),
+        updatemenus=[dict(
+            type='buttons', direction='left', x=0, y=-0.05, xanchor='left', yanchor='top',
+            buttons=[
+                dict(label='▶ 재생', method='animate',
+                     args=[None, dict(frame=dict(duration=PLAYBACK_FRAME_MS, redraw=True), fromcurrent=True, transition=dict(duration=0))]),
+                dict(label='⏸ 정지', method='animate',
+                     args=[[None], dict(mode='immediate', frame=dict(duration=0, redraw=False), transition=dict(duration=0))]),
+            ]
+        )],
+        sliders=[dict(active=0, x=0.15, len=0.85, y=-0.02, currentvalue=dict(prefix='📅 '), steps=slider_steps)]
+    )
+    return fig
 
 
-def render_page(df_history: pd.DataFrame):
-    st.header("🕰️ 포트폴리오 스냅샷 (Historical Holdings)")
-    st.markdown("---")
+def _render_playback(snapshots: SnapshotIndex) -> None:
+    """기간을 선택하면 상위 N + 기타 비중 애니메이션을 한 번에 전송합니다."""
+    st.markdown("#### ▶️ 기간 재생")
+    start_date, end_date = st.slider(
+        "재생할 기간을 선택하세요:",
+        min_value=snapshots.min_date,
+        max_value=snapshots.max_date,
+        value=(snapshots.min_date, snapshots.max_date),
+        format="YYYY-MM-DD"
+    )
+    if len(snapshots.sample_positions(start_date, end_date, PLAYBACK_MAX_FRAMES)) == 0:
+        st.info("선택한 기간에 스냅샷이 없습니다.")
+        return
 
-    if df_history.empty:
-        st.warning("타임머신 데이터가 없습니다. 먼저 엔진(history.py)을 실행해 주세요.")
+    st.caption(f"상위 {PLAYBACK_TOP_N}개 + {OTHERS_LABEL} · 최대 {PLAYBACK_MAX_FRAMES}프레임 (장기 구간은 균등 추출)")
+    st.plotly_chart(_build_playback_figure(snapshots, start_date, end_date), use_container_width=True)
+
+
+def _render_position_pnl(positions: pd.DataFrame, selected_date) -> None:
+    """선택한 날짜의 종목별 평균단가/원가/미실현손익 표와 선택 종목의 원가 vs 평가금액 추이"""
+    st.markdown("---")
+    st.subheader(f"💹 종목별 손익 ({selected_date})")
+    if positions.empty:
+        st.info("종목별 손익 데이터(12)가 없습니다. 파이프라인(update.py)을 실행해 주세요.")
         return
 
+    day_key = pd.Timestamp(selected_date)
+    day = positions.xs(day_key, level='Date') if day_key in positions.index.levels[1] else positions.iloc[0:0]
+    if day.empty:
+        st.info("해당 날짜에 보유 중인 종목이 없습니다.")
+    else:
+        table = day.sort_values('Value_KRW', ascending=False).reset_index()[
+            ['Ticker', 'Qty', 'Avg_Price_Local', 'Price_Local', 'Cost_KRW', 'Value_KRW', 'Unrealized_KRW', 'Return_Pct']]
+        table.columns = ['종목', '수량', '평균단가', '종가', '원가(원)', '평가금액(원)', '미실현손익(원)', '수익률(%)']
+        st.dataframe(table.style.format({
+            '수량': '{:,.0f}', '평균단가': '{:,.2f}', '종가': '{:,.2f}', '원가(원)': '₩ {:,.0f}',
+            '평가금액(원)': '₩ {:,.0f}', '미실현손익(원)': '₩ {:+,.0f}', '수익률(%)': '{:+.2f}%'
+        }), use_container_width=True, hide_index=True)
+
+    # 종목 선택 -> (Ticker, Date) 인덱스에서 해당 종목 구간만 슬라이스
+    tickers = list(day.sort_values('Value_KRW', ascending=False).index) if not day.empty else []
+    tickers += [t for t in positions.index.levels[0] if t not in tickers]
+    ticker = st.selectbox("손익 추이를 볼 종목", tickers)
+    series = positions.loc[ticker].reset_index()
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=series['Date'], y=series['Cost_KRW'], mode='lines', name='원가',
+                             line=dict(color='#95a5a6', dash='dot')))
+    fig.add_trace(go.Scatter(x=series['Date'], y=series['Value_KRW'], mode='lines', name='평가금액',
+                             line=dict(color='#3498db', width=2)))
+    fig.add_vline(x=day_key, line_dash='dash', line_color='#e74c3c')
+    fig.update_layout(height=360, hovermode='x unified', yaxis_title="원 (KRW)", margin=dict(l=0, r=0, t=30, b=0))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def _render_snapshot(snapshots: SnapshotIndex, positions: pd.DataFrame) -> None:
+    """슬라이더로 선택한 단일 날짜의 스냅샷을 렌더링합니다."""
     # 1. 날짜 슬라이더 위젯 설정
-    min_date = df_history['Date'].min().date()
-    max_date = df_history['Date'].max().date()
+    min_date = snapshots.min_date
+    max_date = snapshots.max_date
 
     st.markdown("#### 📅 스냅샷 날짜 선택")
     selected_date = st.slider(
@@ -29,35 +150,26 @@ def render_page(df_history: pd.DataFrame):
         value=max_date,  # 기본값은 가장 최근 날짜
         format="YYYY-MM-DD"
     )
+    # 영업일 모드(ALLENZ_TIMELINE_MODE=business)에서는 주말/휴장일 행이 없으므로 직전 날짜의 스냅샷을 표시
+    resolved_date = snapshots.asof(selected_date)
+    if resolved_date != selected_date:
+        st.caption(f"ℹ️ {selected_date} 데이터가 없어 직전 날짜({resolved_date})의 스냅샷을 표시합니다.")
+        selected_date = resolved_date
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # 2. 선택된 날짜의 데이터 추출 및 변환 (Wide -> Long)
-    # 선택된 날짜와 일치하는 행 1개 추출
-    day_row = df_history[df_history['Date'].dt.date == selected_date]
+    # 2. 선택된 날짜의 스냅샷 조회 (미리 계산된 인덱스에서 O(1) 슬라이스)
+    # 평가액이 0보다 큰 자산만, 평가금액 내림차순, 비중(%) 계산 완료 상태
+    plot_df = snapshots.snapshot(selected_date)
 
-    if day_row.empty:
+    if plot_df is None:
         st.info("해당 날짜의 데이터가 존재하지 않습니다.")
         return
 
-    # 'Date' 컬럼 제외하고 Series로 변환
-    day_data = day_row.drop(columns=['Date']).iloc[0]
-
-    # 평가액이 0보다 큰 자산만 필터링 (보유하지 않았던 종목 숨김)
-    day_data = day_data[day_data > 0].sort_values(ascending=False)
-
-    if day_data.empty:
+    if plot_df.empty:
         st.warning("해당 날짜에는 보유 중인 자산이 없습니다.")
         return
 
-    # 시각화를 위해 DataFrame으로 변환
-    plot_df = pd.DataFrame({
-        '자산명': day_data.index,
-        '평가금액': day_data.values
-    })
-
-    # 비중(%) 계산
-    total_asset = plot_df['평가금액'].sum()
-    plot_df['비중'] = (plot_df['평가금액'] / total_asset) * 100
+    total_asset = snapshots.total(selected_date)
 
     # 3. 화면 분할 렌더링 (차트 & 요약)
     col1, col2 = st.columns([1.5, 1])
@@ -96,4 +208,24 @@ def render_page(df_history: pd.DataFrame):
         '평가금액': '₩ {:,.0f}',
         '비중': '{:.2f}%'
     })
-    st.dataframe(styled_df, use_container_width=True, hide_index=True)
\ No newline at end of file
+    st.dataframe(styled_df, use_container_width=True, hide_index=True)
+
+    # 5. 종목별 원가/손익 (선택 날짜 기준)
+    _render_position_pnl(positions, selected_date)
+
+
+# 3. Main Logic
+def render_page(snapshots: SnapshotIndex, positions: pd.DataFrame):
+    st.header("🕰️ 포트폴리오 스냅샷 (Historical Holdings)")
+    st.markdown("---")
+
+    if snapshots.empty:
+        st.warning("타임머신 데이터가 없습니다. 먼저 엔진(history.py)을 실행해 주세요.")
+        return
+
+    mode = st.radio("보기 모드", [MODE_SNAPSHOT, MODE_PLAYBACK], horizontal=True, label_visibility='collapsed')
+    if mode == MODE_PLAYBACK:
+        _render_playback(snapshots)
+    else:
+        _render_snapshot(snapshots, positions)
+
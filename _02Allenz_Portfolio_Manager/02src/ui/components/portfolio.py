@@ -8,9 +8,22 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 
+import config
+from engines import live_quotes
+from ui.data_cache import ArtifactRequest
+
 # 1. Constants
 MODULE_TAG = "[UI: Portfolio]"
 
+# 페이지가 사용하는 데이터 선언 (render_page 인자명 -> 아티팩트/컬럼)
+PAGE_DATA = {
+    'df_full': ArtifactRequest('full_portfolio', ('종목코드', '종목명', '구분', '잔고수량', '평균단가', '매입금액',
+                                                  '현재가', '평가금액', '수익률', '보유비중', '현재환율')),
+}
+
+# 실시간 재평가 시세 유효 시간 (초) - 모든 세션이 같은 스냅샷을 공유
+QUOTE_TTL_SEC = 60
+
 # 2. Helper Functions
 def _color_returns(val):
     """수익률에 따라 초록색(양수)과 빨간색(음수) 색상을 적용하는 스타일 함수"""
@@ -26,6 +39,23 @@ def _color_returns(val):
     except ValueError:
         return ''
 
+@st.cache_resource(show_spinner=False)
+def _quote_cache(source_spec: str) -> live_quotes.QuoteCache:
+    """서버 프로세스 전역 시세 캐시 (세션 간 공유, 소스 설정별 1개)"""
+    return live_quotes.QuoteCache(live_quotes.quote_source_from_config(source_spec), ttl_sec=QUOTE_TTL_SEC)
+
+
+def _revalue_intraday(df_full: pd.DataFrame):
+    """공유 시세 캐시로 포트폴리오를 재평가합니다. (실패 시 None - HTS 기준 화면 유지)"""
+    try:
+        cache = _quote_cache(config.QUOTE_SOURCE)
+        snapshot = cache.snapshot(live_quotes.required_symbols(df_full))
+    except Exception as e:
+        st.warning(f"⚠️ 실시간 시세 조회 실패 - HTS 기준으로 표시합니다. ({e})")
+        return None
+    return live_quotes.revalue_portfolio(df_full, snapshot), snapshot
+
+
 # 3. Main Logic
 def render_page(df_full: pd.DataFrame):
     """내 포트폴리오 화면 렌더링"""
@@ -37,8 +67,22 @@ def render_page(df_full: pd.DataFrame):
         return
 
     # --- [Top] 최상단 요약 ---
-    total_asset = df_full['평가금액'].sum()
-    st.metric(label="💰 총 평가 자산 (Net Asset)", value=f"₩ {total_asset:,.0f}")
+    hts_total = df_full['평가금액'].sum()
+    live = st.toggle("⚡ 실시간 재평가 (Intraday)", value=False,
+                     help=f"마지막 HTS 내보내기 이후의 시세/환율로 평가금액·수익률·비중을 다시 계산합니다. (시세 {QUOTE_TTL_SEC}초 캐시)")
+
+    revalued = _revalue_intraday(df_full) if live else None
+    if revalued is not None:
+        df_full, snapshot = revalued
+        total_asset = df_full['평가금액'].sum()
+        st.metric(label="💰 총 평가 자산 (Intraday)", value=f"₩ {total_asset:,.0f}",
+                  delta=f"{total_asset - hts_total:,.0f} (HTS 대비)")
+        st.caption(f"시세 소스: {snapshot.source} · 조회 시각: {snapshot.fetched_at:%Y-%m-%d %H:%M:%S} · "
+                   f"재평가 {int(df_full['재평가'].sum())}/{int((df_full['종목코드'] != live_quotes.CASH_CODE).sum())} 종목 "
+                   "(시세가 없는 종목/현금은 HTS 기준)")
+    else:
+        total_asset = hts_total
+        st.metric(label="💰 총 평가 자산 (Net Asset)", value=f"₩ {total_asset:,.0f}")
     st.markdown("<br>", unsafe_allow_html=True)
 
     # --- [Middle] 자산 배분 시각화 ---
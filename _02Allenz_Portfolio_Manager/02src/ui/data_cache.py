@@ -0,0 +1,126 @@
+"""
+@Title: Dashboard Data Cache
+@Description: 대시보드용 정제 데이터(03/05/06/07)를 아티팩트 단위로 캐시합니다.
+              캐시 키는 파이프라인 매니페스트의 아티팩트 해시(버전 토큰)이므로, 파이프라인이 다시 쓴 파일만 새로 로드됩니다.
+              파싱된 DataFrame은 st.cache_resource로 모든 세션이 공유합니다. (세션별 복사 없음 - 읽기 전용으로 사용)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+import config
+from data_loaders import io as local_io
+from pipeline.manifest import read_artifact_tokens
+
+# 2. Constants
+MODULE_TAG = "[UI: DataCache]"
+
+# 대시보드가 사용하는 아티팩트 (PROCESSED_FILES 키 -> datetime 변환 컬럼)
+DASHBOARD_ARTIFACTS: Dict[str, Tuple[str, ...]] = {
+    'full_portfolio': (),
+    'performance': ('Date',),
+    'benchmark': ('Date',),
+    'timeline': ('Date',),
+    'returns_cube': (),
+    'positions': ('Date',),
+    'risk_cov': (),
+    'risk_contrib': (),
+    'drawdown_curves': ('Date', 'Peak_Date', 'Recovery_Date'),
+}
+
+# 아티팩트당 현재 버전 + 직전 버전 정도만 유지 (버전 교체 중인 세션 대비)
+MAX_CACHED_VERSIONS = 2 * len(DASHBOARD_ARTIFACTS)
+
+
+@dataclass(frozen=True)
+class ArtifactRequest:
+    """
+    페이지가 필요로 하는 아티팩트 선언 (각 컴포넌트의 PAGE_DATA에서 사용)
+
+    Attributes:
+        key: PROCESSED_FILES 키
+        columns: 읽을 컬럼 (None이면 전체 - 종목이 컬럼인 wide 포맷 등)
+        derive: 로드한 DataFrame으로부터 파생 구조(인덱스 등)를 만드는 함수 (데이터 버전당 1회 실행, 결과를 공유 캐시)
+        optional: 파일이 없어도 되는 아티팩트 (없으면 빈 DataFrame 전달 - 나중에 추가된 파이프라인 단계의 출력 등)
+    """
+    key: str
+    columns: Optional[Tuple[str, ...]] = None
+    derive: Optional[Callable[[pd.DataFrame], Any]] = None
+    optional: bool = False
+
+
+# 3. Helper Functions
+def _artifact_path(key: str):
+    return config.PROCESSED_DIR / config.PROCESSED_FILES[key]
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _load_artifact_version(key: str, token: str, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """
+    아티팩트 한 개를 로드하고 날짜 컬럼을 변환합니다. (key, token, columns) 조합별로 한 번만 실행됩니다.
+
+    Args:
+        key (str): PROCESSED_FILES 키
+        token (str): 아티팩트 버전 토큰 (캐시 키 용도로만 사용)
+        columns (Tuple[str, ...], optional): 읽을 컬럼 (없는 컬럼은 무시)
+    """
+    kwargs = {'usecols': lambda c: c in columns} if columns else {}
+    df = local_io.load_csv(_artifact_path(key), **kwargs)
+    for col in DASHBOARD_ARTIFACTS.get(key, ()):
+        if not df.empty and col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+
+@st.cache_resource(max_entries=MAX_CACHED_VERSIONS, show_spinner=False)
+def _derive_version(key: str, token: str, columns: Optional[Tuple[str, ...]], derive_name: str,
+                    _derive: Callable[[pd.DataFrame], Any]) -> Any:
+    """파생 구조를 (아티팩트 버전, 파생 함수)별로 한 번만 생성합니다. (_derive는 해시 대상에서 제외, 이름으로 식별)"""
+    return _derive(_load_artifact_version(key, token, columns))
+
+
+def _resolve(request: ArtifactRequest, token: str) -> Any:
+    if request.optional and token == 'missing':
+        return pd.DataFrame(columns=list(request.columns or ()))
+    if request.derive is None:
+        return _load_artifact_version(request.key, token, request.columns)
+    derive_name = f"{request.derive.__module__}.{request.derive.__qualname__}"
+    return _derive_version(request.key, token, request.columns, derive_name, request.derive)
+
+
+# 4. Main Logic
+def artifact_tokens(keys: Iterable[str]) -> Dict[str, str]:
+    """아티팩트 키별 현재 버전 토큰을 반환합니다. (stat + 매니페스트 조회만 수행, 해시 재계산 없음)"""
+    keys = list(dict.fromkeys(keys))
+    tokens = read_artifact_tokens([_artifact_path(k) for k in keys])
+    return dict(zip(keys, tokens.values()))
+
+
+def load_artifact(key: str, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """
+    현재 버전의 아티팩트를 반환합니다. 버전이 바뀌지 않았다면 공유 캐시에서 즉시 반환합니다.
+    반환된 DataFrame은 세션 간 공유 객체이므로 수정하지 말고, 변형이 필요하면 copy() 후 사용합니다.
+    """
+    return _load_artifact_version(key, artifact_tokens([key])[key], columns)
+
+
+def load_page_data(requests: Dict[str, ArtifactRequest], tokens: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    페이지가 선언한 아티팩트만 한 번의 매니페스트 조회로 로드합니다.
+
+    Args:
+        requests (Dict[str, ArtifactRequest]): {render_page 인자명: 아티팩트 선언}
+        tokens (Dict[str, str], optional): 이미 조회한 아티팩트 버전 토큰 (같은 토큰으로 캐시 키를 만드는 호출자용)
+
+    Returns:
+        Dict[str, Any]: {render_page 인자명: DataFrame 또는 파생 구조}
+    """
+    tokens = tokens or artifact_tokens(r.key for r in requests.values())
+    return {arg: _resolve(r, tokens[r.key]) for arg, r in requests.items()}
+
@@ -0,0 +1,134 @@
+"""
+@Title: Chart Downsampling
+@Description: 긴 일별 시계열을 차트 픽셀 폭에 맞게 줄이는 형태 보존 다운샘플링 유틸리티.
+              LTTB(Largest-Triangle-Three-Buckets), 구간별 min/max 추출, 구간별 합계 집계(현금흐름 총액 보존)를 제공합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# 2. Constants
+MODULE_TAG = "[UI: Downsample]"
+
+# wide 레이아웃 차트의 대략적인 플롯 영역 폭 (픽셀당 1포인트 이상은 화면에서 구분되지 않음)
+DEFAULT_CHART_WIDTH_PX = 1200
+
+
+# 3. Helper Functions
+def _bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    """길이 n의 구간을 n_buckets개의 연속 구간으로 나누는 경계 인덱스 (길이 n_buckets + 1)"""
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+
+def _as_float_x(x: pd.Series) -> np.ndarray:
+    """날짜/숫자 x축을 면적 계산용 실수 배열로 변환합니다."""
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.to_numpy(dtype='datetime64[ns]').astype(np.int64) / 8.64e13  # 일 단위
+    return x.to_numpy(dtype=float)
+
+
+# 4. Main Logic
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    LTTB 알고리즘으로 시각적 형태를 보존하는 n_out개 포인트의 인덱스를 선택합니다. (첫/마지막 포인트 포함)
+
+    Args:
+        x (np.ndarray): 오름차순 x 좌표 (실수)
+        y (np.ndarray): y 값 (NaN 없음)
+        n_out (int): 목표 포인트 수
+
+    Returns:
+        np.ndarray: 선택된 원본 인덱스 (오름차순)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 첫/마지막 포인트를 제외한 구간을 n_out - 2개 버킷으로 분할
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64), n)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        # 다음 버킷의 평균점 (마지막 버킷은 마지막 포인트)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # 이전 선택점(a) - 후보 - 다음 버킷 평균점이 이루는 삼각형 넓이가 최대인 후보 선택
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    구간별 최솟값/최댓값 인덱스를 선택합니다. (낙폭처럼 극값이 중요한 시계열용, 양 끝 포함 최대 2 * n_buckets + 2 포인트)
+    """
+    n = len(y)
+    if 2 * n_buckets >= n or n_buckets < 1:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, n_buckets)
+    starts = edges[:-1]
+    bucket_ids = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # 버킷별 argmin/argmax: 버킷 번호로 안정 정렬 후 각 버킷의 첫 원소 선택
+    order_min = np.lexsort((y, bucket_ids))
+    order_max = np.lexsort((-y, bucket_ids))
+    idx_min = order_min[starts]
+    idx_max = order_max[starts]
+    return np.unique(np.concatenate(([0, n - 1], idx_min, idx_max)))
+
+
+def downsample_line(df: pd.DataFrame, x_col: str, y_col: str, max_points: int = DEFAULT_CHART_WIDTH_PX,
+                    method: str = 'lttb') -> pd.DataFrame:
+    """
+    선 차트용 시계열을 max_points 이하로 줄입니다. 포인트 수가 이미 적으면(짧은 기간) 원본을 그대로 반환합니다.
+
+    Args:
+        df (pd.DataFrame): 원본 데이터 (x 오름차순)
+        x_col (str): x 컬럼 (날짜)
+        y_col (str): y 컬럼
+        max_points (int): 최대 포인트 수 (차트 픽셀 폭)
+        method (str): 'lttb' 또는 'minmax'
+
+    Returns:
+        pd.DataFrame: [x_col, y_col] 다운샘플 결과
+    """
+    data = df[[x_col, y_col]].dropna()
+    if len(data) <= max_points:
+        return data
+
+    y = data[y_col].to_numpy(dtype=float)
+    if method == 'minmax':
+        # 버킷별 2포인트 + 양 끝 포인트가 상한을 넘지 않도록 버킷 수 결정
+        idx = minmax_indices(y, (max_points - 2) // 2)
+    else:
+        # LTTB는 버킷 내 극값을 놓칠 수 있으므로 전체 최고/최저점은 항상 포함
+        idx = np.union1d(lttb_indices(_as_float_x(data[x_col]), y, max_points - 2), [np.argmax(y), np.argmin(y)])
+    return data.iloc[idx]
+
+
+def aggregate_buckets(df: pd.DataFrame, x_col: str, y_col: str,
+                      max_points: int = DEFAULT_CHART_WIDTH_PX) -> Tuple[pd.Series, np.ndarray]:
+    """
+    막대 차트용 값(입출금 등)을 연속 구간별 합계로 집계합니다. 전체 합계는 보존됩니다.
+
+    Returns:
+        Tuple[pd.Series, np.ndarray]: (구간 시작 x, 구간 합계)
+    """
+    data = df[[x_col, y_col]]
+    values = data[y_col].fillna(0).to_numpy(dtype=float)
+    if len(data) <= max_points:
+        return data[x_col], values
+
+    starts = _bucket_edges(len(data), max_points)[:-1]
+    return data[x_col].iloc[starts], np.add.reduceat(values, starts)
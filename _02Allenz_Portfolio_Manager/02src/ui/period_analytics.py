@@ -0,0 +1,265 @@
+"""
+@Title: Period Analytics Cache
+@Description: 분석 기간별 리베이싱 시계열과 KPI(TWR/MWR/MDD/초과수익)를 계산하고, 세션 간 공유되는 크기 제한 LRU 캐시에 보관합니다.
+              캐시 키는 (데이터 버전, 시작일, 종료일, 벤치마크 목록)이며, 새 데이터 버전이 감지되면 프리셋 기간(YTD/1Y/3Y/5Y/전체)을 백그라운드에서 미리 계산합니다.
+              대시보드 서버는 파이프라인 매니페스트의 데이터 버전을 감시하여, 파이프라인/watcher 실행 직후 (페이지 방문 전에) 프리셋을 갱신합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from pipeline.manifest import read_data_version
+from ui import data_cache
+from ui.data_cache import ArtifactRequest
+
+# 2. Constants
+MODULE_TAG = "[UI: PeriodAnalytics]"
+BENCHMARKS: Tuple[str, ...] = ('SPY', 'QQQ', 'IWM')
+MAX_CACHED_PERIODS = 64
+REFRESH_POLL_SEC = 5.0  # 매니페스트 데이터 버전 확인 주기 (파이프라인 실행 감지)
+
+# 기간 분석 입력 아티팩트 (analytics 페이지와 파이프라인 감시 스레드가 같은 선언/버전 키를 공유)
+PERIOD_DATA = {
+    'df_perf': ArtifactRequest('performance', ('Date', 'Daily_Return', 'External_Flow', 'Calculated_Asset')),
+    'df_bench': ArtifactRequest('benchmark', ('Date',) + BENCHMARKS),
+}
+
+# 프리셋 기간 (표시명 -> 종료일 기준 시작일 계산)
+PRESET_WINDOWS = {
+    'YTD': lambda end: pd.Timestamp(year=end.year, month=1, day=1),
+    '1Y': lambda end: end - pd.DateOffset(years=1),
+    '3Y': lambda end: end - pd.DateOffset(years=3),
+    '5Y': lambda end: end - pd.DateOffset(years=5),
+    '전체': lambda end: pd.Timestamp.min,
+}
+
+PeriodKey = Tuple[str, pd.Timestamp, pd.Timestamp, Tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class PeriodResult:
+    """
+    기간 분석 결과 (캐시 공유 객체 - 읽기 전용으로 사용)
+
+    Attributes:
+        p_df: 리베이싱된 포트폴리오 시계열 (Period_TWR, Period_Drawdown 포함)
+        b_df: 리베이싱된 벤치마크 시계열 (<티커>_TWR 포함)
+        merged: 포트폴리오 + 벤치마크 병합 시계열 (벤치마크 비교 차트용)
+        twr, mwr, mdd, benchmark_twr, alpha: 기간 KPI (%)
+    """
+    p_df: pd.DataFrame
+    b_df: pd.DataFrame
+    merged: pd.DataFrame
+    twr: float
+    mwr: float
+    mdd: float
+    benchmark_twr: float
+    alpha: float
+
+
+# 3. Helper Functions
+def calculate_xirr(cash_flows: list, dates: list) -> float:
+    """선택된 기간에 대한 내부수익률(XIRR)을 동적으로 계산합니다."""
+    if len(cash_flows) < 2: return 0.0
+    # scipy는 MWR 계산 시에만 필요하므로 지연 로드 (대시보드 초기 로딩 시간 절감)
+    from scipy import optimize
+    def xnpv(rate, flows, dates):
+        if rate <= -1.0: return float('inf')
+        min_date = min(dates)
+        return sum([cf / (1 + rate) ** ((d - min_date).days / 365.0) for cf, d in zip(flows, dates)])
+    try:
+        return optimize.newton(lambda r: xnpv(r, cash_flows, dates), 0.1)
+    except:
+        return 0.0
+
+
+def rebase_data(df_perf: pd.DataFrame, df_bench: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp,
+                benchmarks: Tuple[str, ...] = BENCHMARKS) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """선택된 기간에 맞춰 수익률을 0%부터 다시 계산(Rebasing)합니다."""
+    # 1. 기간 필터링
+    mask_perf = (df_perf['Date'] >= start_date) & (df_perf['Date'] <= end_date)
+    p_df = df_perf.loc[mask_perf].copy()
+
+    mask_bench = (df_bench['Date'] >= start_date) & (df_bench['Date'] <= end_date)
+    b_df = df_bench.loc[mask_bench].copy()
+
+    if p_df.empty or b_df.empty:
+        return p_df, b_df
+
+    # 2. 내 포트폴리오 리베이싱 (TWR & MDD)
+    # 시작일의 Daily_Return을 0으로 간주하여 해당 기간의 누적 수익률 재계산
+    wealth_index = (1 + p_df['Daily_Return']).cumprod()
+    p_df['Period_TWR'] = wealth_index - 1
+
+    peak_index = wealth_index.cummax()
+    p_df['Period_Drawdown'] = (wealth_index - peak_index) / peak_index
+
+    # 3. 벤치마크 리베이싱
+    for ticker in benchmarks:
+        b_df[f'{ticker}_TWR'] = (b_df[ticker] / b_df[ticker].iloc[0]) - 1
+
+    return p_df, b_df
+
+
+def compute_period(df_perf: pd.DataFrame, df_bench: pd.DataFrame, start_date: pd.Timestamp, end_date: pd.Timestamp,
+                   benchmarks: Tuple[str, ...] = BENCHMARKS) -> Optional[PeriodResult]:
+    """
+    기간 리베이싱 + 벤치마크 병합 + KPI를 계산합니다. (기간 내 데이터가 없으면 None)
+    초과수익(alpha)은 첫 번째 벤치마크 대비로 계산합니다.
+    """
+    p_df, b_df = rebase_data(df_perf, df_bench, start_date, end_date, benchmarks)
+    if p_df.empty or b_df.empty:
+        return None
+
+    twr = p_df['Period_TWR'].iloc[-1] * 100
+    mdd = p_df['Period_Drawdown'].min() * 100
+    benchmark_twr = b_df[f'{benchmarks[0]}_TWR'].iloc[-1] * 100
+
+    # MWR(XIRR) 계산용 현금흐름
+    flows = (-p_df['External_Flow']).tolist()
+    dates = p_df['Date'].tolist()
+    flows[0] = -p_df.iloc[0]['Calculated_Asset'] # 시작 자산
+    flows[-1] = p_df.iloc[-1]['Calculated_Asset'] # 종료 자산
+    mwr = calculate_xirr(flows, dates) * 100
+
+    merged = pd.merge(p_df, b_df, on='Date', how='left')
+    return PeriodResult(p_df, b_df, merged, twr, mwr, mdd, benchmark_twr, twr - benchmark_twr)
+
+
+def preset_range(preset: str, min_date: pd.Timestamp, max_date: pd.Timestamp) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """프리셋 기간의 (시작일, 종료일)을 데이터 범위 안으로 잘라 반환합니다."""
+    start = PRESET_WINDOWS[preset](max_date)
+    return max(start, min_date), max_date
+
+
+def load_period_data() -> Tuple[str, Dict[str, pd.DataFrame]]:
+    """
+    기간 분석 입력(PERIOD_DATA)과 캐시 키용 데이터 버전을 같은 아티팩트 토큰으로 만듭니다.
+    (토큰을 따로 읽으면 그 사이 파이프라인이 05/06을 갱신했을 때 이전 데이터 결과가 새 버전 키로 캐시됨)
+
+    Returns:
+        Tuple[str, Dict[str, pd.DataFrame]]: (데이터 버전 - 성과/벤치마크 토큰 조합, {df_perf, df_bench})
+    """
+    tokens = data_cache.artifact_tokens(r.key for r in PERIOD_DATA.values())
+    return '|'.join(tokens.values()), data_cache.load_page_data(PERIOD_DATA, tokens)
+
+
+# 4. Main Logic
+class PeriodCache:
+    """
+    기간 분석 결과 LRU 캐시 (스레드 안전, 세션 간 공유)
+
+    Attributes:
+        max_entries: 보관할 최대 기간 결과 수 (초과 시 가장 오래 사용하지 않은 결과부터 제거)
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_PERIODS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[PeriodKey, Optional[PeriodResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed_versions = set()
+        self._watcher: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: PeriodKey):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: PeriodKey, result: Optional[PeriodResult]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, data_version: str, df_perf: pd.DataFrame, df_bench: pd.DataFrame,
+                       start_date: pd.Timestamp, end_date: pd.Timestamp,
+                       benchmarks: Tuple[str, ...] = BENCHMARKS) -> Optional[PeriodResult]:
+        """캐시된 기간 결과를 반환하고, 없으면 계산하여 저장합니다."""
+        key = (data_version, pd.Timestamp(start_date), pd.Timestamp(end_date), tuple(benchmarks))
+        found, result = self.get(key)
+        if found:
+            return result
+        result = compute_period(df_perf, df_bench, key[1], key[2], key[3])
+        self.put(key, result)
+        return result
+
+    def warm_presets(self, data_version: str, df_perf: pd.DataFrame, df_bench: pd.DataFrame,
+                     benchmarks: Tuple[str, ...] = BENCHMARKS) -> Optional[threading.Thread]:
+        """
+        새 데이터 버전의 프리셋 기간을 백그라운드 스레드에서 미리 계산합니다. (버전당 1회)
+
+        Returns:
+            Optional[threading.Thread]: 시작된 스레드 (이미 처리한 버전이면 None)
+        """
+        with self._lock:
+            if data_version in self._warmed_versions or df_perf.empty:
+                return None
+            self._warmed_versions.add(data_version)
+
+        min_date, max_date = df_perf['Date'].min(), df_perf['Date'].max()
+
+        def _run():
+            for preset in PRESET_WINDOWS:
+                start, end = preset_range(preset, min_date, max_date)
+                try:
+                    self.get_or_compute(data_version, df_perf, df_bench, start, end, benchmarks)
+                except Exception as e:
+                    print(f"⚠️ {MODULE_TAG} 프리셋 {preset} 사전 계산 실패: {e}")
+
+        thread = threading.Thread(target=_run, name=f"period-presets-{data_version}", daemon=True)
+        thread.start()
+        return thread
+
+    def watch_pipeline(self, poll_sec: float = REFRESH_POLL_SEC) -> Optional[threading.Thread]:
+        """
+        매니페스트 데이터 버전을 주기적으로 확인하여, 파이프라인이 새 버전을 게시하면 프리셋 기간을 바로 미리 계산합니다.
+        (서버 프로세스당 1회 시작 - 이후 호출은 무시)
+
+        Returns:
+            Optional[threading.Thread]: 시작된 감시 스레드 (이미 실행 중이면 None)
+        """
+        with self._lock:
+            if self._watcher is not None:
+                return None
+            self._watcher = threading.Thread(target=self._watch, args=(poll_sec,), name="period-pipeline-watch", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def _watch(self, poll_sec: float) -> None:
+        seen = None
+        while True:
+            version = read_data_version()
+            if version is not None and version != seen:
+                seen = version
+                try:
+                    data_version, frames = load_period_data()
+                    if not frames['df_perf'].empty and not frames['df_bench'].empty:
+                        thread = self.warm_presets(data_version, frames['df_perf'], frames['df_bench'])
+                        if thread is not None:
+                            thread.join()
+                except Exception as e:
+                    print(f"⚠️ {MODULE_TAG} 데이터 버전 {version} 프리셋 갱신 실패: {e}")
+            time.sleep(poll_sec)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# 서버 프로세스 전역 캐시 (모든 세션이 공유)
+PERIOD_CACHE = PeriodCache()
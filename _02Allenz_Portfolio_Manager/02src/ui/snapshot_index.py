@@ -0,0 +1,180 @@
+"""
+@Title: Historical Snapshot Index
+@Description: 타임머신 데이터(07, 날짜 x 자산 wide 포맷)를 날짜별 위치 배열 + 0이 아닌 보유 자산만 담은 long 포맷 테이블로 변환합니다.
+              자산은 날짜별로 평가금액 내림차순 정렬되고 비중(%)이 미리 계산되어 있어, 특정 날짜 조회는 배열 슬라이스 한 번(O(1))입니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 2. Constants
+MODULE_TAG = "[UI: SnapshotIndex]"
+OTHERS_LABEL = '기타(Others)'
+
+
+# 3. Main Logic
+@dataclass(frozen=True)
+class SnapshotIndex:
+    """
+    날짜별 스냅샷 인덱스 (CSR 형태)
+
+    Attributes:
+        dates: 스냅샷 날짜 (datetime64[D], 오름차순)
+        offsets: 날짜 i의 보유 자산은 long 테이블의 [offsets[i], offsets[i+1]) 구간
+        asset_codes: long 테이블 행별 자산 코드 (asset_names 인덱스)
+        values: long 테이블 행별 평가금액
+        weights: long 테이블 행별 비중(%)
+        totals: 날짜별 총 평가 자산
+        asset_names: 자산명 사전
+    """
+    dates: np.ndarray
+    offsets: np.ndarray
+    asset_codes: np.ndarray
+    values: np.ndarray
+    weights: np.ndarray
+    totals: np.ndarray
+    asset_names: np.ndarray
+    _positions: Dict[date, int] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_wide(cls, df_history: pd.DataFrame, date_col: str = 'Date') -> "SnapshotIndex":
+        """
+        wide 포맷 타임머신 데이터로부터 인덱스를 생성합니다. (데이터 버전당 1회)
+
+        Args:
+            df_history (pd.DataFrame): Date + 자산별 평가금액 컬럼
+            date_col (str): 날짜 컬럼명
+        """
+        df = df_history.dropna(subset=[date_col]).sort_values(date_col).drop_duplicates(subset=[date_col], keep='first')
+        asset_names = np.array([c for c in df.columns if c != date_col], dtype=object)
+        matrix = df[list(asset_names)].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=0.0)
+        dates = pd.to_datetime(df[date_col]).to_numpy(dtype='datetime64[D]')
+
+        # 평가금액 > 0인 자산만 남기고, 날짜(행)별로 평가금액 내림차순 정렬
+        held = matrix > 0
+        order = np.argsort(np.where(held, -matrix, np.inf), axis=1, kind='stable')
+        sorted_values = np.take_along_axis(matrix, order, axis=1)
+        counts = held.sum(axis=1)
+        keep = np.arange(matrix.shape[1]) < counts[:, None]
+
+        values = sorted_values[keep]
+        asset_codes = order[keep].astype(np.int32)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        totals = np.where(held, matrix, 0.0).sum(axis=1)
+
+        # 행별 합계를 long 테이블 길이로 펼쳐 비중 계산
+        row_totals = np.repeat(totals, counts)
+        weights = np.divide(values * 100, row_totals, out=np.zeros_like(values), where=row_totals > 0)
+
+        positions = {d: i for i, d in enumerate(dates.tolist())}
+        return cls(dates, offsets, asset_codes, values, weights, totals, asset_names, positions)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.dates) == 0
+
+    @property
+    def min_date(self) -> date:
+        return self.dates[0].item()
+
+    @property
+    def max_date(self) -> date:
+        return self.dates[-1].item()
+
+    def position(self, snapshot_date: date) -> Optional[int]:
+        """날짜의 행 위치를 반환합니다. (없으면 None)"""
+        return self._positions.get(snapshot_date)
+
+    def asof(self, snapshot_date: date) -> date:
+        """날짜 이하의 마지막 스냅샷 날짜를 반환합니다. (영업일 모드에서 빠진 주말/휴장일 -> 직전 날짜, 범위 앞이면 첫 날짜)"""
+        pos = np.searchsorted(self.dates, np.datetime64(snapshot_date, 'D'), side='right') - 1
+        return self.dates[max(pos, 0)].item()
+
+    def total(self, snapshot_date: date) -> float:
+        pos = self.position(snapshot_date)
+        return float(self.totals[pos]) if pos is not None else 0.0
+
+    def snapshot(self, snapshot_date: date) -> Optional[pd.DataFrame]:
+        """
+        특정 날짜의 보유 자산(평가금액 내림차순)을 반환합니다.
+
+        Returns:
+            Optional[pd.DataFrame]: ['자산명', '평가금액', '비중'] (날짜가 없으면 None, 보유 자산이 없으면 빈 DataFrame)
+        """
+        pos = self.position(snapshot_date)
+        if pos is None:
+            return None
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+        return pd.DataFrame({
+            '자산명': self.asset_names[self.asset_codes[start:end]],
+            '평가금액': self.values[start:end],
+            '비중': self.weights[start:end]
+        })
+
+    def sample_positions(self, start_date: date, end_date: date, max_frames: int) -> np.ndarray:
+        """
+        기간 내 스냅샷 위치를 최대 max_frames개로 균등 추출합니다. (시작/종료일 포함, 장기 구간의 애니메이션 용량 제한)
+        """
+        lo = np.searchsorted(self.dates, np.datetime64(start_date, 'D'), side='left')
+        hi = np.searchsorted(self.dates, np.datetime64(end_date, 'D'), side='right')
+        if hi - lo <= max_frames:
+            return np.arange(lo, hi)
+        return np.unique(np.linspace(lo, hi - 1, max_frames).round().astype(np.int64))
+
+    def top_n_series(self, positions: np.ndarray, top_n: int = 6) -> pd.DataFrame:
+        """
+        날짜별 상위 N개 자산 + 나머지를 '기타(Others)'로 묶은 long 포맷 시계열을 생성합니다.
+        (보유 자산이 N+1개 이하인 날은 그대로 표시 - 기타 1개만 만드는 것은 의미가 없으므로)
+
+        Args:
+            positions (np.ndarray): 스냅샷 위치 (sample_positions 결과)
+            top_n (int): 개별 표시할 상위 자산 수
+
+        Returns:
+            pd.DataFrame: ['Date', '자산명', '평가금액', '비중'] (날짜 내 평가금액 내림차순, 기타는 마지막)
+        """
+        starts, ends = self.offsets[positions], self.offsets[positions + 1]
+        counts = ends - starts
+        limits = np.where(counts > top_n + 1, top_n, counts)
+
+        # 선택된 날짜들의 long 테이블 구간을 펼쳐 날짜 내 순위 계산
+        frame_ids = np.repeat(np.arange(len(positions)), counts)
+        ranks = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = np.repeat(starts, counts) + ranks
+        is_top = ranks < np.repeat(limits, counts)
+
+        top = pd.DataFrame({
+            'frame': frame_ids[is_top],
+            '자산명': self.asset_names[self.asset_codes[rows[is_top]]],
+            '평가금액': self.values[rows[is_top]],
+            '비중': self.weights[rows[is_top]]
+        })
+
+        rest = ~is_top
+        n_frames = len(positions)
+        others = pd.DataFrame({
+            'frame': np.arange(n_frames),
+            '자산명': OTHERS_LABEL,
+            '평가금액': np.bincount(frame_ids[rest], weights=self.values[rows[rest]], minlength=n_frames),
+            '비중': np.bincount(frame_ids[rest], weights=self.weights[rows[rest]], minlength=n_frames)
+        })
+        others = others[counts > top_n + 1]
+
+        series = pd.concat([top, others], ignore_index=True).sort_values('frame', kind='stable')
+        series.insert(0, 'Date', self.dates[positions][series['frame'].to_numpy()])
+        return series.drop(columns=['frame']).reset_index(drop=True)
+
+
+def index_positions(df_positions: pd.DataFrame) -> pd.DataFrame:
+    """종목별 원가/손익 시계열(12, long 포맷)을 (Ticker, Date) 정렬 인덱스로 변환합니다. (종목 구간/날짜 조회가 이진 탐색)"""
+    return df_positions.set_index(['Ticker', 'Date']).sort_index()
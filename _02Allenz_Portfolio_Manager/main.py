@@ -0,0 +1,19 @@
+"""
+@Title: Dashboard Launcher
+@Description: Streamlit 대시보드 진입점. 'streamlit run main.py'로 실행합니다.
+@Author: Allen & Gemini
+"""
+
+import sys
+from pathlib import Path
+
+# 진입점 부트스트랩: 'pip install -e .'로 설치하지 않은 체크아웃에서도 02src 패키지를 찾을 수 있게 함
+SRC_DIR = Path(__file__).resolve().parent / "02src"
+try:
+    import config  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(SRC_DIR))
+
+from ui.app import main
+
+main()
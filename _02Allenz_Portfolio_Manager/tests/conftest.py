@@ -0,0 +1,53 @@
+"""
+@Title: Shared Test Fixtures
+@Description: 임시 데이터 폴더(ALLENZ_DATA_DIR)와, 저장소에 포함된 정제 데이터(01DATA/processed)를 복사하여 파이프라인 엔진을 실제 데이터로 실행하는 fixture를 제공합니다.
+              환경 변수와 지연 설정(config._settings)은 테스트가 끝나면 원래대로 돌아갑니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import shutil
+
+import pytest
+
+import config
+
+# 2. Constants
+REPO_PROCESSED = config.BASE_DIR / "01DATA" / "processed"
+
+
+# 3. Fixtures
+@pytest.fixture
+def processed_dir(tmp_path, monkeypatch):
+    """
+    빈 임시 데이터 폴더의 processed 경로 (ALLENZ_DATA_DIR로 지정, 설정 객체는 다음 접근 시 재생성)
+    """
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    monkeypatch.setenv(config.ENV_DATA_DIR, str(tmp_path))
+    monkeypatch.setattr(config, '_settings', None)
+    return processed
+
+
+@pytest.fixture
+def data_dir(processed_dir, monkeypatch):
+    """
+    정제 데이터 00~02를 복사한 임시 데이터 폴더
+
+    Returns:
+        Callable[..., Path]: set_env(**환경 변수) -> 데이터 폴더. 호출할 때마다 설정 객체를 다시 읽게 합니다.
+    """
+    for key in ('transaction', 'asset', 'holdings'):
+        name = config.PROCESSED_FILES[key]
+        if not (REPO_PROCESSED / name).exists():
+            pytest.skip(f"저장소 정제 데이터 없음: {name}")
+        shutil.copy(REPO_PROCESSED / name, processed_dir / name)
+
+    def set_env(**env):
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        monkeypatch.setattr(config, '_settings', None)
+        return processed_dir.parent
+
+    return set_env
@@ -0,0 +1,83 @@
+"""
+@Title: Report Agent Tests
+@Description: 로컬 가짜 모델(FakeLLMClient)로 리포트 일괄 생성의 응답 캐시(두 번째 실행은 전부 'cached', 새 생성 없음)와
+              PDF 업로드 캐시의 만료 처리, --from/--to 범위 검증을 확인합니다. (MCP 서버는 임시 데이터 폴더로 실제 실행)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import asyncio
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('mcp')
+
+import config  # noqa: E402
+from ai import agent, llm  # noqa: E402
+from ai.llm import FakeLLMClient, UploadCache  # noqa: E402
+
+# 2. Constants
+REPO_DATA = config.BASE_DIR / "01DATA"
+
+
+# 3. Fixtures
+@pytest.fixture
+def report_env(processed_dir, tmp_path, monkeypatch):
+    """저장소 정제 데이터/레퍼런스 PDF를 복사한 데이터 폴더 + 임시 출력/캐시 폴더"""
+    reference = REPO_DATA / "reference"
+    if not reference.exists() or not (REPO_DATA / "processed").exists():
+        pytest.skip("저장소 데이터/레퍼런스 PDF 없음")
+    for csv in (REPO_DATA / "processed").glob("*.csv"):
+        shutil.copy(csv, processed_dir / csv.name)
+    shutil.copytree(reference, processed_dir.parent / "reference")
+
+    output = tmp_path / "03Output"
+    monkeypatch.setattr(agent, 'ROOT_DIR', tmp_path)
+    monkeypatch.setattr(agent, 'OUTPUT_DIR', output)
+    monkeypatch.setattr(agent, 'CACHE_DIR', output / ".ai_cache")
+    return output
+
+
+# 4. Tests
+def test_second_run_reuses_cached_reports(report_env):
+    client = FakeLLMClient()
+    periods = agent.month_periods('2025-02', '2025-03')
+
+    first = asyncio.run(agent.generate_reports(periods, client, concurrency=2))
+    assert first == {'2025-02': 'generated', '2025-03': 'generated'}
+    assert len(client.generations) == 2 and len(client.uploads) == 2
+
+    second = asyncio.run(agent.generate_reports(periods, client, concurrency=2))
+    assert second == {'2025-02': 'cached', '2025-03': 'cached'}
+    assert len(client.generations) == 2 and len(client.uploads) == 2
+    assert all(p.output_file.read_text(encoding='utf-8').startswith('# Fake Report') for p in periods)
+
+
+def test_upload_cache_expires_after_ttl(tmp_path, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(llm, 'time', SimpleNamespace(time=lambda: clock[0], sleep=lambda sec: None))
+    pdf = tmp_path / "ref.pdf"
+    pdf.write_bytes(b"%PDF-1.4 test")
+    client = FakeLLMClient()
+    cache = UploadCache(tmp_path / "uploads.json", ttl_sec=60)
+
+    first = cache.get_or_upload(client, pdf)
+    clock[0] += 59
+    assert UploadCache(tmp_path / "uploads.json", ttl_sec=60).get_or_upload(client, pdf) == first  # 파일에서 다시 읽어도 재사용
+    assert len(client.uploads) == 1
+
+    clock[0] += 2
+    assert cache.get_or_upload(client, pdf) != first
+    assert len(client.uploads) == 2
+
+
+def test_parse_args_rejects_reversed_range(capsys):
+    assert agent.parse_args(['--from', '2025-3']).last_month == '2025-03'
+    with pytest.raises(SystemExit):
+        agent.parse_args(['--from', '2025-05', '--to', '2025-03'])
+    with pytest.raises(SystemExit):
+        agent.parse_args(['--from', '2025/05'])
+    assert agent.month_periods('2025-05', '2025-03') == []
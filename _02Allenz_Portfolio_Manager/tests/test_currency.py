@@ -0,0 +1,69 @@
+"""
+@Title: Currency Sub-Ledger Tests
+@Description: 통화별 하위 원장(build_sub_ledgers)의 손익 분해를 손 계산과 비교합니다.
+              (흐름이 없으면 현지 효과 + 환율 효과 = 원화 잔고 변화, 달러 종목 하나면 환율 수익률 = 환율 변화율)
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+from engines.currency import build_sub_ledgers, generate_currency_ledgers
+
+# 2. Constants
+INDEX = pd.date_range('2025-01-02', periods=4)
+PRICE_LOCAL = np.array([100.0, 110.0, 105.0, 105.0])
+USD_KRW = np.array([1000.0, 1100.0, 1200.0, 1150.0])
+QTY = 10.0
+
+
+# 3. Helper Functions
+def usd_inputs(usd_cash: float = 0.0):
+    """달러 종목 AAA 10주 + 달러 현금 (원화 현금 0, 매매/입출금 없음)"""
+    price_krw = PRICE_LOCAL * USD_KRW
+    df_value = pd.DataFrame({'AAA': QTY * price_krw, 'Cash': usd_cash * USD_KRW}, index=INDEX)
+    df_price = pd.DataFrame({'AAA': price_krw}, index=INDEX)
+    df_fx = pd.DataFrame({'USD': USD_KRW, 'JPY': 9.0}, index=INDEX)
+    cash_foreign = pd.DataFrame({'USD': usd_cash, 'JPY': 0.0}, index=INDEX)
+    total = df_value.sum(axis=1)
+    daily_return = (total / total.shift(1) - 1).fillna(0.0)
+    return df_value, df_price, df_fx, cash_foreign, daily_return
+
+
+# 4. Tests
+def test_effects_sum_to_krw_change_without_flows():
+    ledger, _ = build_sub_ledgers(*usd_inputs(usd_cash=50.0))
+    usd = ledger[ledger['Currency'] == 'USD'].set_index('Date')
+
+    assert usd['Total_Local'].tolist() == pytest.approx(QTY * PRICE_LOCAL + 50.0)
+    np.testing.assert_allclose((usd['Local_PnL_KRW'] + usd['FX_PnL_KRW']).iloc[1:],
+                               usd['Total_KRW'].diff().iloc[1:], rtol=1e-12)
+    assert ledger.loc[ledger['Currency'] == 'KRW', 'Total_KRW'].abs().max() == pytest.approx(0.0, abs=1e-6)
+    assert usd['Weight'].tolist() == pytest.approx([1.0] * len(INDEX))
+
+
+def test_single_usd_position_splits_local_and_currency_return():
+    _, attribution = build_sub_ledgers(*usd_inputs())
+
+    np.testing.assert_allclose(attribution['Local_Return'].iloc[1:], PRICE_LOCAL[1:] / PRICE_LOCAL[:-1] - 1)
+    np.testing.assert_allclose(attribution['Currency_Return'].iloc[1:], USD_KRW[1:] / USD_KRW[:-1] - 1)
+    np.testing.assert_allclose(attribution['Other_Return'], 0.0, atol=1e-12)
+    final = attribution.iloc[-1]
+    assert 1 + final['Cum_Portfolio'] == pytest.approx((1 + final['Cum_Local']) * (1 + final['Cum_Currency']))
+
+
+def test_missing_fx_rates_are_skipped(processed_dir):
+    df_value, df_price, df_fx, _, daily_return = usd_inputs()
+    frames = {'timeline': df_value, 'prices': df_price, 'fx_rates': df_fx.assign(USD=np.nan),
+              'performance': daily_return.rename('Daily_Return').to_frame()}
+    for key, frame in frames.items():
+        frame.rename_axis('Date').reset_index().to_csv(processed_dir / config.PROCESSED_FILES[key], index=False)
+    pd.DataFrame(columns=['일자', '구분', '종목번호', '통화']).to_csv(
+        processed_dir / config.PROCESSED_FILES['transaction'], index=False)
+
+    assert generate_currency_ledgers() == {}
+    assert not (processed_dir / config.PROCESSED_FILES['currency_ledger']).exists()
@@ -0,0 +1,65 @@
+"""
+@Title: Chart Downsampling Tests
+@Description: LTTB / 구간별 min·max 다운샘플링이 포인트 상한을 지키면서 첫·마지막 포인트와 극값을 보존하는지, 막대 집계가 합계를 보존하는지 검증합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from ui.downsample import aggregate_buckets, downsample_line, lttb_indices, minmax_indices
+
+
+# 2. Fixtures
+@pytest.fixture
+def series() -> pd.DataFrame:
+    """5000일 랜덤 워크 + 하루짜리 급락/급등 스파이크"""
+    rng = np.random.default_rng(42)
+    y = np.cumsum(rng.normal(0, 1, 5000))
+    y[1234] -= 200
+    y[3210] += 200
+    return pd.DataFrame({'Date': pd.date_range('2010-01-01', periods=5000, freq='D'), 'Value': y})
+
+
+# 3. Tests
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_keeps_endpoints_and_extremes(series, method):
+    out = downsample_line(series, 'Date', 'Value', max_points=300, method=method)
+    assert len(out) <= 300
+    assert out.index.is_monotonic_increasing
+    assert out.index[0] == 0 and out.index[-1] == len(series) - 1
+    # 하루짜리 스파이크도 사라지지 않음
+    assert {1234, 3210} <= set(out.index)
+    assert out['Value'].min() == series['Value'].min()
+    assert out['Value'].max() == series['Value'].max()
+
+
+def test_short_series_is_returned_unchanged(series):
+    short = series.head(100)
+    pd.testing.assert_frame_equal(downsample_line(short, 'Date', 'Value', max_points=300), short)
+
+
+def test_lttb_picks_the_peak_of_each_bucket():
+    x = np.arange(9, dtype=float)
+    y = np.array([0, 0, 5, 0, 0, 0, -5, 0, 0], dtype=float)
+    idx = lttb_indices(x, y, 4)
+    assert idx.tolist() == [0, 2, 6, 8]
+
+
+def test_minmax_returns_bucket_extremes():
+    y = np.array([3, 1, 2, 9, 8, 7, 4, 6, 5, 0], dtype=float)
+    idx = minmax_indices(y, 2)
+    # 버킷 [0, 5): min 1, max 9 / [5, 10): min 0, max 7 + 양 끝
+    assert idx.tolist() == [0, 1, 3, 5, 9]
+
+
+def test_aggregate_buckets_preserves_total():
+    df = pd.DataFrame({'Date': pd.date_range('2020-01-01', periods=1000, freq='D'),
+                       'Flow': np.where(np.arange(1000) % 37 == 0, 1_000_000.0, np.nan)})
+    starts, sums = aggregate_buckets(df, 'Date', 'Flow', max_points=100)
+    assert len(starts) == len(sums) == 100
+    assert starts.iloc[0] == df['Date'].iloc[0]
+    assert sums.sum() == pytest.approx(df['Flow'].sum())
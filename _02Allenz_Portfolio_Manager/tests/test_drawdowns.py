@@ -0,0 +1,54 @@
+"""
+@Title: Drawdown Episode Tests
+@Description: 낙폭 구간 추출(extract_episodes)을 손 계산과 비교하고, 저장된 곡선을 재사용한 기간 재계산(window_curve)이 기간 데이터로 새로 계산한 결과와 같은지 확인합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from engines.drawdowns import drawdown_curve, extract_episodes, window_curve
+
+# 2. Constants
+DATES = pd.date_range('2025-01-01', periods=7)
+WEALTH = [1.0, 1.2, 0.9, 1.0, 1.3, 1.1, 1.2]
+
+
+# 3. Tests
+def test_extract_episodes_ranks_by_depth():
+    episodes = extract_episodes(drawdown_curve(DATES, WEALTH))
+    assert len(episodes) == 2
+
+    worst, last = episodes.iloc[0], episodes.iloc[1]
+    assert worst['Rank'] == 1
+    assert worst['Depth'] == pytest.approx(-0.25)
+    assert (worst['Peak_Date'], worst['Trough_Date'], worst['Recovery_Date']) == (DATES[1], DATES[2], DATES[4])
+    assert (worst['Decline_Days'], worst['Recovery_Days'], worst['Duration_Days']) == (1, 2, 3)
+    assert worst['Recovered']
+
+    assert last['Depth'] == pytest.approx(1.1 / 1.3 - 1)
+    assert last['Peak_Date'] == DATES[4] and pd.isna(last['Recovery_Date'])
+    assert not last['Recovered'] and last['Duration_Days'] == 2
+
+
+def test_extract_episodes_without_drawdown():
+    assert extract_episodes(drawdown_curve(DATES[:3], [1.0, 1.1, 1.2])).empty
+
+
+def test_window_curve_matches_fresh_curve():
+    """저장된 곡선에서 파생한 기간 곡선 = 기간 데이터만으로 새로 계산한 곡선 (모든 시작/종료 조합)"""
+    rng = np.random.default_rng(11)
+    dates = pd.date_range('2025-01-01', periods=20)
+    wealth = np.cumprod(1 + rng.normal(0, 0.03, size=len(dates)))
+    full = drawdown_curve(dates, wealth)
+    columns = ['Date', 'Wealth', 'Peak', 'Drawdown', 'Peak_Date', 'Recovery_Date']
+
+    for i in range(len(dates)):
+        for j in range(i, len(dates)):
+            derived = window_curve(full, dates[i], dates[j]).reset_index(drop=True)
+            fresh = drawdown_curve(dates[i:j + 1], wealth[i:j + 1])
+            pd.testing.assert_frame_equal(derived[columns], fresh[columns], check_dtype=False)
+            pd.testing.assert_frame_equal(extract_episodes(derived), extract_episodes(fresh), check_dtype=False)
@@ -0,0 +1,86 @@
+"""
+@Title: Income Engine Tests
+@Description: 배당/이자 행 분류(classify_income)의 부호 규칙(환급, RP 세전 역산, 제세금 분리)과
+              원장 외부 흐름(_calculate_net_flow)의 INCOME_TREATMENT별 처리('return' / 'flow')를 손으로 만든 거래 행으로 검증합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import pandas as pd
+import pytest
+
+import config
+from engines.income import RP_TAX_RATE, classify_income, income_mask
+from engines.ledger import _calculate_net_flow
+
+# 2. Constants
+COLUMNS = ['일자', '구분', '적요', '종목번호', '종목명', '통화', '거래대금', '제세금', '변동금액', '가격']
+ROWS = [
+    ('2025/01/02', '환전출금', None, 'USD', None, 'KRW', 0.0, 0.0, 0.0, 1400.0),              # 환율 관측 (1달러 = 1400원)
+    ('2025/01/03', '은행이체입금', '입금', None, '신한증권오픈뱅킹', '신한증권오픈뱅킹', 1_000_000.0, 0.0, 1_000_000.0, 0.0),
+    ('2025/01/03', '외화RP원천징수', None, '2610', '외화RP수시_온라인', 'KRW', 154.0, 154.0, 154.0, 0.0),
+    ('2025/03/04', '해외배당금', None, 'USD', 'AAA CORP(미국달러)', 'KRW', 10.0, 0.0, 10.0, 0.0),
+    ('2025/03/04', '외국납부세액', None, 'USD', 'AAA CORP(미국달러)', 'KRW', 1.5, 0.0, 1.5, 0.0),
+    ('2025/04/22', '추징세금(배당)', '환급', 'US0000000001', 'AAA CORP', 'KRW', 500.0, 500.0, 500.0, 0.0),
+    ('2025/06/02', '예탁금이용료', None, None, None, 'KRW', 68.0, 0.0, 68.0, 0.0),
+    ('2025/06/11', '은행이체출금', '출금', None, '본인', '본인', 150_000.0, 0.0, 150_000.0, 0.0),
+    ('2025/07/02', 'ETF분배금', None, 'A466940', 'TIGER 은행고배당', 'KRW', 12_036.0, 1_840.0, 10_196.0, 0.0),
+]
+
+
+# 3. Helper Functions
+def transactions() -> pd.DataFrame:
+    return pd.DataFrame(ROWS, columns=COLUMNS)
+
+
+def set_treatment(monkeypatch, treatment: str) -> None:
+    monkeypatch.setenv(config.ENV_INCOME_TREATMENT, treatment)
+    monkeypatch.setattr(config, '_settings', None)
+
+
+# 4. Tests
+def test_income_mask_selects_income_rows_only():
+    assert income_mask(transactions()).tolist() == [False, False, True, True, True, True, True, False, True]
+
+
+def test_classify_income_sign_rules():
+    ledger = classify_income(transactions(), pd.DataFrame())
+    rows = list(zip(ledger['구분'], ledger['Category'], ledger['Amount_Local'].round(6), ledger['Amount_KRW'].round(6)))
+
+    assert rows == [
+        ('외화RP원천징수', 'RP_Interest', round(154.0 / RP_TAX_RATE, 6), round(154.0 / RP_TAX_RATE, 6)),  # 세액 / 세율 = 세전 이자
+        ('외화RP원천징수', 'Withholding_Tax', -154.0, -154.0),     # 제세금 -> 별도 세금 행
+        ('해외배당금', 'Dividend', 10.0, 14_000.0),                # 현지 통화, 직전 환전 환율로 환산
+        ('외국납부세액', 'Withholding_Tax', -1.5, -2_100.0),
+        ('추징세금(배당)', 'Withholding_Tax', 500.0, 500.0),        # 적요 '환급' -> 양수
+        ('예탁금이용료', 'Deposit_Interest', 68.0, 68.0),
+        ('ETF분배금', 'Dividend', 12_036.0, 12_036.0),              # 세전 분배금
+        ('ETF분배금', 'Withholding_Tax', -1_840.0, -1_840.0),
+    ]
+    assert ledger.loc[ledger['Category'] == 'Deposit_Interest', 'ISIN'].isna().all()
+    assert ledger.loc[ledger['구분'] == 'ETF분배금', 'ISIN'].eq('A466940').all()
+
+
+def test_return_treatment_keeps_only_external_flows(monkeypatch):
+    set_treatment(monkeypatch, 'return')
+    flows = _calculate_net_flow(transactions())
+    assert flows[flows != 0].to_dict() == {pd.Timestamp('2025-01-03'): 1_000_000.0, pd.Timestamp('2025-06-11'): -150_000.0}
+
+
+def test_flow_treatment_counts_income_as_external(monkeypatch):
+    """'flow'는 기존 키워드 규칙 그대로 (배당/세금 키워드가 있는 행만 흐름, 예탁금이용료/ETF분배금은 0)"""
+    set_treatment(monkeypatch, 'flow')
+    flows = _calculate_net_flow(transactions())
+    assert flows[flows != 0].to_dict() == pytest.approx({
+        pd.Timestamp('2025-01-03'): 1_000_000.0,
+        pd.Timestamp('2025-03-04'): 10.0 - 1.5,      # 해외배당금 입금 - 외국납부세액
+        pd.Timestamp('2025-04-22'): 500.0,           # 추징세금(배당) 환급 - '배당' 키워드로 입금
+        pd.Timestamp('2025-06-11'): -150_000.0,
+    })
+
+
+def test_unknown_treatment_raises(monkeypatch):
+    set_treatment(monkeypatch, 'gross')
+    with pytest.raises(ValueError):
+        _calculate_net_flow(transactions())
@@ -0,0 +1,67 @@
+"""
+@Title: Live Quote Cache Tests
+@Description: TTL 시세 캐시가 만료 전에는 소스를 다시 조회하지 않고, 만료/새 심볼/강제 갱신일 때만 한 번 배치 조회하는지 가짜 시계와 가짜 소스로 검증합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from engines import live_quotes
+from engines.live_quotes import QuoteCache
+
+
+# 2. Fixtures
+class FakeSource:
+    """조회 요청을 기록하고 심볼별 고정 가격을 반환하는 가짜 시세 소스"""
+    name = 'fake'
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, symbols):
+        symbols = sorted(symbols)
+        self.requests.append(symbols)
+        return {s: 100.0 + len(self.requests) for s in symbols}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {'t': 1000.0}
+    monkeypatch.setattr(live_quotes, 'time', SimpleNamespace(monotonic=lambda: now['t'], time=time.time))
+    return now
+
+
+# 3. Tests
+def test_snapshot_is_reused_until_ttl_expires(clock):
+    source = FakeSource()
+    cache = QuoteCache(source, ttl_sec=60)
+
+    first = cache.snapshot(['AAPL', 'USDKRW=X'])
+    clock['t'] += 59
+    assert cache.snapshot(['AAPL']) is first
+    assert len(source.requests) == 1
+
+    clock['t'] += 1
+    second = cache.snapshot(['AAPL'])
+    assert second is not first
+    # 만료 후 재조회는 이전 스냅샷의 심볼까지 함께 요청
+    assert source.requests[-1] == ['AAPL', 'USDKRW=X']
+    assert second.prices['AAPL'] == 102.0
+
+
+def test_new_symbol_or_force_refetches(clock):
+    source = FakeSource()
+    cache = QuoteCache(source, ttl_sec=60)
+    cache.snapshot(['AAPL'])
+
+    snap = cache.snapshot(['AAPL', 'MSFT'])
+    assert source.requests[-1] == ['AAPL', 'MSFT']
+    assert snap.symbols == frozenset({'AAPL', 'MSFT'})
+
+    cache.snapshot(['MSFT'], force=True)
+    assert len(source.requests) == 3
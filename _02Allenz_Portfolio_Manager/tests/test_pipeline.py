@@ -0,0 +1,92 @@
+"""
+@Title: Pipeline Manifest & Staleness Tests
+@Description: 매니페스트의 해시 캐시(크기/수정시각이 같으면 재해시 생략)와, 실행 기록과 현재 시그니처를 비교하는 재실행 판정(stale_reason)을 검증합니다.
+              매니페스트는 임시 경로에 만들고, 단계 입력/출력은 저장소의 정제 데이터를 읽기만 합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import os
+
+import pytest
+
+from pipeline.manifest import PipelineManifest, _relative_key
+from pipeline.stages import get_stage, stage_signature, stale_reason
+
+
+# 2. Fixtures
+@pytest.fixture
+def manifest(tmp_path) -> PipelineManifest:
+    return PipelineManifest(tmp_path / "manifest.json")
+
+
+@pytest.fixture
+def metrics_stage():
+    stage = get_stage('metrics')
+    missing = [p.name for p in stage.inputs + stage.outputs if not p.exists()]
+    if missing:
+        pytest.skip(f"저장소 정제 데이터 없음: {', '.join(missing)}")
+    return stage
+
+
+# 3. Tests
+def test_fingerprint_is_cached_until_size_or_mtime_changes(manifest, tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("x,y\n1,2\n", encoding='utf-8')
+    sha = manifest.fingerprint(path)
+    assert len(sha) == 64
+
+    # 크기/수정시각이 같으면 캐시된 해시를 그대로 반환 (파일을 다시 읽지 않음)
+    manifest.data['files'][_relative_key(path)]['sha256'] = 'cached'
+    assert manifest.fingerprint(path) == 'cached'
+
+    # 내용이 바뀌면 다시 해시하고, 같은 내용으로 되돌리면 원래 해시와 같음
+    stat = path.stat()
+    path.write_text("x,y\n1,3\n", encoding='utf-8')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed = manifest.fingerprint(path)
+    assert changed not in ('cached', sha)
+
+    path.write_text("x,y\n1,2\n", encoding='utf-8')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+    assert manifest.fingerprint(path) == sha
+
+    path.unlink()
+    assert manifest.fingerprint(path) is None
+    assert _relative_key(path) not in manifest.data['files']
+
+
+def test_stale_reason_follows_the_stage_record(manifest, metrics_stage):
+    signature = stage_signature(metrics_stage, manifest)
+    assert stale_reason(metrics_stage, manifest, signature) == "실행 기록 없음"
+
+    manifest.record_stage(metrics_stage.name, signature, metrics_stage.outputs, elapsed=0.1)
+    assert stale_reason(metrics_stage, manifest, stage_signature(metrics_stage, manifest)) is None
+    assert manifest.data_version is not None
+
+    # 마지막 실행 이후 입력이 바뀐 경우 (기록된 입력 해시와 현재 해시가 다름)
+    record = manifest.stage_record(metrics_stage.name)
+    input_key = next(iter(record['signature']['inputs']))
+    record['signature']['inputs'][input_key] = 'previous'
+    assert stale_reason(metrics_stage, manifest, stage_signature(metrics_stage, manifest)) == \
+        f"입력 변경: {metrics_stage.inputs[0].name}"
+
+    record['signature']['code'] = 'previous'
+    assert stale_reason(metrics_stage, manifest, stage_signature(metrics_stage, manifest)) == "코드 변경"
+
+
+def test_missing_output_reruns_stage(manifest, metrics_stage):
+    signature = stage_signature(metrics_stage, manifest)
+    manifest.record_stage(metrics_stage.name, signature, metrics_stage.outputs, elapsed=0.1)
+    output_key = next(iter(manifest.stage_record(metrics_stage.name)['outputs']))
+    manifest.stage_record(metrics_stage.name)['outputs'][output_key] = None
+    assert stale_reason(metrics_stage, manifest, signature) == "출력 누락/변경"
+
+
+def test_manifest_round_trip(manifest, metrics_stage):
+    manifest.record_stage(metrics_stage.name, stage_signature(metrics_stage, manifest), metrics_stage.outputs, elapsed=0.1)
+    manifest.save()
+    loaded = PipelineManifest.load(manifest.path)
+    assert loaded.data_version == manifest.data_version
+    assert stale_reason(metrics_stage, loaded, stage_signature(metrics_stage, loaded)) is None
@@ -0,0 +1,52 @@
+"""
+@Title: Position History Tests
+@Description: 이동평균 원가의 행렬 풀이(_moving_average_cost)를 날짜별 점화식 루프와 비교하고, 종목별 원가/손익 시계열을 손 계산과 비교합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from engines.positions import _moving_average_cost, build_position_history
+
+
+# 2. Helper Functions
+def loop_cost(retain: np.ndarray, added: np.ndarray) -> np.ndarray:
+    """C[t] = retain[t] * C[t-1] + added[t] (첫날과 retain = 0인 날은 새로 시작)"""
+    cost = np.zeros_like(added)
+    for t in range(len(added)):
+        prev = cost[t - 1] if t > 0 else 0.0
+        cost[t] = retain[t] * prev + added[t]
+    return cost
+
+
+# 3. Tests
+def test_moving_average_cost_matches_daily_loop():
+    rng = np.random.default_rng(7)
+    retain = rng.uniform(0.2, 1.0, size=(400, 6))
+    retain[rng.random(retain.shape) < 0.7] = 1.0
+    retain[rng.random(retain.shape) < 0.03] = 0.0   # 전량 매도 -> 새 구간
+    added = np.where(rng.random(retain.shape) < 0.1, rng.uniform(1e3, 1e7, size=retain.shape), 0.0)
+
+    np.testing.assert_allclose(_moving_average_cost(retain, added), loop_cost(retain, added), rtol=1e-9, atol=1e-6)
+
+
+def test_position_history_moving_average():
+    """10주 @100 매수 -> 10주 @200 매수 -> 5주 매도: 평균단가 150 유지, 원가 1500 -> 2250"""
+    index = pd.date_range('2025-01-01', periods=4)
+    trades = pd.DataFrame({
+        '일자': index[[0, 1, 2]], 'Ticker': 'AAA', '구분': ['해외주식매수', '해외주식매수', '해외주식매도'],
+        '수량': [10.0, 10.0, 5.0], '거래대금': [1000.0, 2000.0, 1100.0], '수수료': 0.0, '제세금': 0.0,
+    })
+    qty = pd.DataFrame({'AAA': [10.0, 20.0, 15.0, 15.0]}, index=index)
+    price = pd.DataFrame({'AAA': [100.0, 200.0, 220.0, 240.0]}, index=index)
+    fx = pd.DataFrame({'AAA': 1000.0}, index=index)
+
+    result = build_position_history(trades, qty, price, fx).set_index('Date')
+    assert result['Cost_Local'].tolist() == pytest.approx([1000, 3000, 2250, 2250])
+    assert result['Avg_Price_Local'].iloc[-1] == pytest.approx(150)
+    assert result['Unrealized_Local'].iloc[-1] == pytest.approx(15 * 240 - 2250)
+    assert result['Cost_KRW'].iloc[-1] == pytest.approx(2250 * 1000)
@@ -0,0 +1,63 @@
+"""
+@Title: MCP Range Query Tests
+@Description: 요청 날짜를 직전 거래일로 맞추는 asof 조회와, 행/토큰 상한에 맞춘 페이지 분할을 검증합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import pandas as pd
+import pytest
+
+from ai import queries
+from ai.queries import asof_date, paginate, resolve_range
+
+
+# 2. Fixtures
+@pytest.fixture
+def business_index() -> pd.DatetimeIndex:
+    return pd.bdate_range('2025-01-06', '2025-01-31')
+
+
+# 3. Tests
+def test_asof_maps_weekend_to_previous_business_day(business_index):
+    # 2025-01-11(토), 01-12(일) -> 01-10(금)
+    assert asof_date(business_index, '2025-01-11') == pd.Timestamp('2025-01-10')
+    assert asof_date(business_index, '2025-01-12') == pd.Timestamp('2025-01-10')
+    assert asof_date(business_index, '2025-01-13') == pd.Timestamp('2025-01-13')
+    # 범위 밖: 앞은 첫 날짜, 뒤는 마지막 날짜
+    assert asof_date(business_index, '2024-12-01') == pd.Timestamp('2025-01-06')
+    assert asof_date(business_index, '2025-03-01') == pd.Timestamp('2025-01-31')
+
+
+def test_resolve_range_swaps_reversed_dates(business_index):
+    assert resolve_range(business_index, '2025-01-19', '2025-01-11') == \
+        (pd.Timestamp('2025-01-10'), pd.Timestamp('2025-01-17'))
+
+
+def test_asof_rejects_bad_input(business_index):
+    with pytest.raises(ValueError):
+        asof_date(business_index, 'not-a-date')
+    with pytest.raises(ValueError):
+        asof_date(pd.DatetimeIndex([]), '2025-01-10')
+
+
+def test_paginate_respects_row_and_token_caps():
+    narrow = pd.DataFrame({'n': range(100)})
+    first = paginate(narrow)
+    assert f"_page 1/{-(-100 // queries.MAX_ROWS_PER_PAGE)} · rows 100_" in first
+    assert "다음 페이지: page=2" in first
+
+    # 긴 행은 토큰 상한 때문에 행 상한보다 적게 잘림
+    wide = pd.DataFrame({'text': ['가' * 300] * 100})
+    for page in (1, 2):
+        text = paginate(wide, page=page)
+        assert queries.estimate_tokens(text) <= queries.MAX_TOKENS_PER_PAGE
+    n_pages = int(text.split('_page ')[1].split('/')[1].split(' ')[0])
+    assert n_pages > 100 // queries.MAX_ROWS_PER_PAGE
+
+
+def test_paginate_clamps_page_and_handles_empty():
+    df = pd.DataFrame({'n': range(5)})
+    assert paginate(df, page=99).endswith("_page 1/1 · rows 5_")
+    assert paginate(pd.DataFrame()) == "(데이터 없음)"
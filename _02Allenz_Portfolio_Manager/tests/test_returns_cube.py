@@ -0,0 +1,50 @@
+"""
+@Title: Returns Cube Tests
+@Description: 월/분기/연도 수익률 큐브(09)의 TWR 연쇄, Modified Dietz MWR, 벤치마크 기간 수익률을 손 계산 값과 비교합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import pandas as pd
+import pytest
+
+from engines.returns_cube import build_cube
+
+
+# 2. Fixtures
+@pytest.fixture
+def cube() -> pd.DataFrame:
+    """1/30 기초 100 -> 1/31 50 입금 후 160 -> 2/1 165 (SPY 100 -> 102 -> 101)"""
+    perf = pd.DataFrame({
+        'Date': pd.to_datetime(['2025-01-30', '2025-01-31', '2025-02-01']),
+        'Calculated_Asset': [100.0, 160.0, 165.0],
+        'External_Flow': [0.0, 50.0, 0.0],
+        'Daily_Return': [0.0, 160 / 150 - 1, 165 / 160 - 1],
+    })
+    bench = pd.DataFrame({'Date': perf['Date'], 'SPY': [100.0, 102.0, 101.0], 'QQQ': 1.0, 'IWM': 1.0})
+    return build_cube(perf, bench).set_index(['Freq', 'Period'])
+
+
+# 3. Tests
+def test_monthly_twr_and_dietz(cube):
+    jan, feb = cube.loc[('M', '2025-01')], cube.loc[('M', '2025-02')]
+    assert jan['TWR'] == pytest.approx(160 / 150 - 1)
+    # 1/31 입금은 2일 중 1일 가중: (160 - 100 - 50) / (100 + 50 x 1/2)
+    assert jan['MWR'] == pytest.approx(10 / 125)
+    assert (jan['Start_Asset'], jan['End_Asset'], jan['Net_Flow']) == (100.0, 160.0, 50.0)
+    assert feb['MWR'] == pytest.approx(5 / 160)
+
+
+def test_yearly_dietz_weights_flow_by_remaining_days(cube):
+    year = cube.loc[('Y', '2025')]
+    assert year['TWR'] == pytest.approx(0.1)
+    # 3일 기간에서 1/31 입금은 2일 가중
+    assert year['MWR'] == pytest.approx(15 / (100 + 50 * 2 / 3))
+    assert year['Days'] == 3
+
+
+def test_benchmark_uses_previous_period_close(cube):
+    assert cube.loc[('M', '2025-01'), 'SPY'] == pytest.approx(0.02)
+    assert cube.loc[('M', '2025-02'), 'SPY'] == pytest.approx(101 / 102 - 1)
+    assert cube.loc[('M', '2025-01'), 'Excess_SPY'] == pytest.approx(160 / 150 - 1 - 0.02)
@@ -0,0 +1,79 @@
+"""
+@Title: Risk Model Tests
+@Description: 저장된 공분산 상태에서 새 거래일만 반영한 증분 갱신이 전체 재계산과 같은지 (EW / 이동창) 확인하고,
+              앞 값으로 채운 꼬리 행은 상태에 저장하지 않는지, 유효한 종가가 없으면 건너뛰는지 검사합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+from engines.risk import generate_risk_model, settled_date
+
+# 2. Constants
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+
+# 3. Helper Functions
+def write_inputs(processed, prices: pd.DataFrame) -> None:
+    """가격 행렬(13)과 타임머신(07, 마지막 날 비중용)을 씁니다."""
+    prices.rename_axis('Date').reset_index().to_csv(processed / config.PROCESSED_FILES['prices'], index=False)
+    timeline = pd.DataFrame({'Date': prices.index, 'AAA': 500.0, 'BBB': 300.0, 'CCC': 100.0, 'Cash': 100.0})
+    timeline.to_csv(processed / config.PROCESSED_FILES['timeline'], index=False)
+
+
+def random_prices(n: int = 90) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    values = 100 * np.cumprod(1 + rng.normal(0, 0.02, size=(n, len(TICKERS))), axis=0)
+    return pd.DataFrame(values, index=pd.date_range('2024-01-01', periods=n), columns=TICKERS)
+
+
+# 4. Tests
+@pytest.mark.parametrize('mode, param', [('ewm', 10), ('rolling', 20)])
+def test_incremental_update_matches_full_recompute(processed_dir, mode, param):
+    prices = random_prices()
+    # 첫 실행: 마지막 두 행은 아직 종가가 없어 앞 값으로 채운 상태
+    provisional = prices.iloc[:60].copy()
+    provisional.iloc[-2:] = provisional.iloc[-3].to_numpy()
+    write_inputs(processed_dir, provisional)
+    generate_risk_model(mode, param)
+
+    state = json.loads((processed_dir / config.RISK_STATE_NAME).read_text(encoding='utf-8'))
+    assert state['last_date'] == f"{prices.index[57]:%Y-%m-%d}"
+
+    write_inputs(processed_dir, prices)
+    incremental = generate_risk_model(mode, param)
+    full = generate_risk_model(mode, param, full=True)
+
+    np.testing.assert_allclose(incremental['covariance'].to_numpy(), full['covariance'].to_numpy(), rtol=1e-10)
+    pd.testing.assert_frame_equal(incremental['contribution'], full['contribution'], rtol=1e-6)
+
+
+def test_incremental_run_reuses_state(processed_dir, capsys):
+    prices = random_prices()
+    write_inputs(processed_dir, prices.iloc[:60])
+    generate_risk_model('ewm', 10)
+    write_inputs(processed_dir, prices)
+    generate_risk_model('ewm', 10)
+    assert "저장된 공분산 상태 사용" in capsys.readouterr().out
+
+
+def test_settled_date_excludes_today_and_filled_tail():
+    prices = random_prices(10)
+    prices.iloc[7:] = prices.iloc[6].to_numpy()
+    assert settled_date(prices, today=prices.index[-1].date()) == prices.index[6]
+    assert settled_date(prices, today=prices.index[0].date()) is None
+
+
+def test_empty_price_matrix_is_skipped(processed_dir):
+    empty = pd.DataFrame(np.nan, index=pd.date_range('2024-01-01', periods=3), columns=TICKERS)
+    write_inputs(processed_dir, empty)
+    assert generate_risk_model() == {}
+    assert not (processed_dir / config.RISK_STATE_NAME).exists()
+    assert not (processed_dir / config.PROCESSED_FILES['risk_cov']).exists()
@@ -0,0 +1,53 @@
+"""
+@Title: What-if Simulator Tests
+@Description: 거래 제외 재생(replay_overlays)의 부호/공매도 방지와 경로 지표(path_metrics)의 자산 0 이하 판정을 손 계산과 비교합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from engines.simulator import path_metrics, replay_overlays
+
+# 2. Constants
+# 종목 1개, 종가 10 -> 20 -> 30 -> 15, 0일차 1주 매수 / 2일차 1주 매도
+PRICES = np.array([[10.0], [20.0], [30.0], [15.0]])
+BUY = np.array([[1.0], [0.0], [0.0], [0.0]])
+SELL = np.array([[0.0], [0.0], [1.0], [0.0]])
+
+
+# 3. Tests
+@pytest.mark.parametrize('drop_sells, drop_buys, start_qty, expected', [
+    (1, 0, 0.0, [0, 0, 0, -15]),      # 30에 판 1주를 계속 보유 -> 15로 하락
+    (0, 1, 0.0, [0, -10, -20, -20]),  # 매수가 없으면 보유하지 않은 매도는 체결되지 않음 (공매도 없음)
+    (0, 1, 1.0, [0, -10, -20, -5]),   # 기초 잔고 1주가 있으면 매도는 그대로 체결
+    (1, 1, 0.0, [0, -10, -20, -20]),  # 매수/매도 모두 제외 -> 거래 없이 현금 보유
+])
+def test_replay_overlays_single_ticker(drop_sells, drop_buys, start_qty, expected):
+    delta = replay_overlays(PRICES, BUY, SELL, np.array([start_qty]),
+                            np.array([[drop_sells]], dtype=float), np.array([[drop_buys]], dtype=float))
+    np.testing.assert_allclose(delta[:, 0], expected)
+
+
+def test_replay_overlays_batches_variants():
+    """변형을 한 번에 계산한 결과는 변형별 개별 계산과 같아야 함"""
+    drop_sells = np.array([[1.0], [0.0], [1.0]])
+    drop_buys = np.array([[0.0], [1.0], [1.0]])
+    batch = replay_overlays(PRICES, BUY, SELL, np.zeros(1), drop_sells, drop_buys)
+    for v in range(3):
+        single = replay_overlays(PRICES, BUY, SELL, np.zeros(1), drop_sells[v:v + 1], drop_buys[v:v + 1])
+        np.testing.assert_allclose(batch[:, v], single[:, 0])
+
+
+def test_path_metrics_flags_insolvent_paths():
+    index = pd.date_range('2025-01-01', periods=4)
+    asset = np.array([[100.0, 100.0], [110.0, 20.0], [121.0, -5.0], [133.1, 10.0]])
+    result = path_metrics(asset, np.zeros(4), index)
+
+    assert result['TWR'][0] == pytest.approx(0.331)
+    assert result['MDD'][0] == pytest.approx(0.0)
+    assert result['Min_Asset'].tolist() == [100.0, -5.0]
+    assert np.isnan([result[k][1] for k in ('TWR', 'CAGR', 'Volatility', 'MDD')]).all()
@@ -0,0 +1,69 @@
+"""
+@Title: Snapshot Index Tests
+@Description: 타임머신 wide 데이터로 만든 스냅샷 인덱스가 날짜별 보유 자산(평가금액 내림차순, 0/결측 제외)과 비중을 원본과 같게 돌려주는지 검증합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ui.snapshot_index import SnapshotIndex
+
+
+# 2. Fixtures
+@pytest.fixture
+def index() -> SnapshotIndex:
+    """날짜가 뒤섞이고 중복된 wide 데이터 (1/3은 보유 자산 없음)"""
+    df = pd.DataFrame({
+        'Date': ['2025-01-02', '2025-01-01', '2025-01-02', '2025-01-03'],
+        'AAA': [100.0, 300.0, 999.0, 0.0],
+        'BBB': [300.0, np.nan, 999.0, 0.0],
+        'CCC': ['50', 100.0, 999.0, np.nan],
+    })
+    return SnapshotIndex.from_wide(df)
+
+
+# 3. Tests
+def test_snapshot_sorted_by_value_with_weights(index):
+    assert len(index) == 3
+    assert (index.min_date, index.max_date) == (date(2025, 1, 1), date(2025, 1, 3))
+
+    snap = index.snapshot(date(2025, 1, 2))
+    # 중복 날짜는 첫 행을 사용, 문자열 숫자도 변환
+    assert snap['자산명'].tolist() == ['BBB', 'AAA', 'CCC']
+    assert snap['평가금액'].tolist() == [300.0, 100.0, 50.0]
+    assert snap['비중'].to_numpy() == pytest.approx([300 / 450 * 100, 100 / 450 * 100, 50 / 450 * 100])
+    assert index.total(date(2025, 1, 2)) == 450.0
+
+    # 결측 자산은 보유 목록에서 제외
+    assert index.snapshot(date(2025, 1, 1))['자산명'].tolist() == ['AAA', 'CCC']
+
+
+def test_missing_and_empty_dates(index):
+    assert index.snapshot(date(2024, 12, 31)) is None
+    assert index.total(date(2024, 12, 31)) == 0.0
+
+    empty = index.snapshot(date(2025, 1, 3))
+    assert empty is not None and empty.empty
+    assert index.total(date(2025, 1, 3)) == 0.0
+
+
+def test_matches_row_wise_reference():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 5, size=(30, 8)) * rng.uniform(1, 100, size=(30, 8))
+    df = pd.DataFrame(values, columns=[f"A{i}" for i in range(8)])
+    df.insert(0, 'Date', pd.date_range('2025-01-01', periods=30, freq='D'))
+    index = SnapshotIndex.from_wide(df)
+
+    for _, row in df.iterrows():
+        held = row.drop('Date').astype(float)
+        held = held[held > 0].sort_values(ascending=False, kind='stable')
+        snap = index.snapshot(row['Date'].date())
+        assert snap['자산명'].tolist() == held.index.tolist()
+        assert snap['평가금액'].to_numpy() == pytest.approx(held.to_numpy())
+        assert snap['비중'].sum() == pytest.approx(100.0 if len(held) else 0.0)
@@ -0,0 +1,114 @@
+"""
+@Title: Tax Lot Tests
+@Description: LotBook의 FIFO / 평균법 / 특정 로트 차감, 부분 매도, 보유 초과 매도 처리를 검증합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+from engines.tax_lots import LotBook
+from pipeline.manifest import PipelineManifest
+from pipeline.stages import get_stage, stage_signature, stale_reason
+
+
+# 2. Helper Functions
+def trade(trade_id: str, side: str, date: str, qty: float, amount: float, isin: str = 'US0000000001'):
+    """LotBook.apply에 넘기는 거래 행 (prepare_trades 결과의 itertuples 행과 같은 속성)"""
+    return SimpleNamespace(**{'Trade_ID': trade_id, 'Side': side, 'Date': pd.Timestamp(date), 'ISIN': isin,
+                              'Currency': 'USD', 'Qty': float(qty), 'Amount_Local': float(amount), 'FX': 1000.0,
+                              '종목명': 'TEST'})
+
+
+def two_buys(book: LotBook) -> None:
+    """10주 @100, 10주 @200 매수"""
+    book.apply(trade('B1', 'BUY', '2025-01-02', 10, 1000))
+    book.apply(trade('B2', 'BUY', '2025-02-03', 10, 2000))
+
+
+# 3. Tests
+def test_fifo_relieves_oldest_lot_first():
+    book = LotBook('fifo')
+    two_buys(book)
+    rows = book.apply(trade('S1', 'SELL', '2025-03-03', 15, 4500))
+
+    assert [(r['Lot_ID'], r['Qty'], r['Cost_Local']) for r in rows] == [('B1', 10, 1000), ('B2', 5, 1000)]
+    assert [r['PnL_Local'] for r in rows] == pytest.approx([2000, 500])
+    assert rows[0]['Holding_Days'] == 60
+    assert rows[1]['PnL_KRW'] == pytest.approx(500 * 1000)
+    (remaining,) = book.lots()
+    assert (remaining.lot_id, remaining.qty, remaining.cost_local) == ('B2', 5, pytest.approx(1000))
+
+
+def test_average_pools_buys_into_single_lot():
+    book = LotBook('average')
+    two_buys(book)
+    (row,) = book.apply(trade('S1', 'SELL', '2025-03-03', 15, 4500))
+
+    assert row['Lot_ID'] == 'US0000000001-AVG'
+    assert row['Cost_Local'] == pytest.approx(2250)
+    assert row['PnL_Local'] == pytest.approx(2250)
+    (remaining,) = book.lots()
+    assert remaining.qty == pytest.approx(5)
+    assert remaining.cost_local == pytest.approx(750)
+
+
+def test_partial_fills_close_lot_exactly():
+    book = LotBook('fifo')
+    two_buys(book)
+    first = book.apply(trade('S1', 'SELL', '2025-03-03', 4, 800))
+    second = book.apply(trade('S2', 'SELL', '2025-03-04', 6, 1200))
+
+    assert [r['Cost_Local'] for r in first + second] == pytest.approx([400, 600])
+    assert [lot.lot_id for lot in book.lots()] == ['B2']
+
+
+def test_specific_selection_then_fifo_remainder():
+    book = LotBook('specific', selections={'S1': {'B2': 5}})
+    two_buys(book)
+    rows = book.apply(trade('S1', 'SELL', '2025-03-03', 8, 2400))
+
+    assert [(r['Lot_ID'], r['Qty']) for r in rows] == [('B2', 5), ('B1', 3)]
+    assert {lot.lot_id: lot.qty for lot in book.lots()} == {'B1': 7, 'B2': 5}
+
+
+def test_oversell_is_recorded_with_unknown_basis():
+    book = LotBook('fifo')
+    book.apply(trade('B1', 'BUY', '2025-01-02', 10, 1000))
+    rows = book.apply(trade('S1', 'SELL', '2025-03-03', 12, 2400))
+
+    assert rows[-1]['Lot_ID'] == 'S1-UNMATCHED'
+    assert rows[-1]['Qty'] == pytest.approx(2)
+    assert np.isnan(rows[-1]['Cost_Local'])
+    assert book.unmatched_qty == pytest.approx(2)
+    assert book.lots() == []
+
+
+def test_state_round_trip_preserves_open_lots():
+    book = LotBook('fifo')
+    two_buys(book)
+    book.apply(trade('S1', 'SELL', '2025-03-03', 15, 4500))
+    restored = LotBook.from_state('fifo', book.to_state())
+    assert restored.to_state() == book.to_state()
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        LotBook('lifo')
+
+
+def test_selection_file_is_part_of_lots_signature(processed_dir):
+    """lot_selections.json을 수정하면 lots 단계가 재실행 대상이 되어야 함 (specific 방식의 지정 변경 반영)"""
+    stage = get_stage('lots')
+    manifest = PipelineManifest()
+    manifest.record_stage(stage.name, stage_signature(stage, manifest), stage.outputs, 0.0)
+    assert stale_reason(stage, manifest, stage_signature(stage, manifest)) is None
+
+    (config.DATA_DIR / 'lot_selections.json').write_text('{"S1": {"B2": 5}}', encoding='utf-8')
+    assert stale_reason(stage, manifest, stage_signature(stage, manifest)) == "입력 변경: lot_selections.json"
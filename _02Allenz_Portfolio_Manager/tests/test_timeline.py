@@ -0,0 +1,48 @@
+"""
+@Title: Timeline Mode Tests
+@Description: 영업일 모드 원장(04)의 누적 TWR이 달력 모드와 같은지 저장소 정제 데이터로 확인하고, 휴장일 거래 이월(carry_forward)을 검사합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import pandas as pd
+import pytest
+
+import config
+from engines.ledger import create_daily_ledger
+from engines.metrics import calculate_metrics
+from engines.timeline import build_timeline, carry_forward
+
+
+# 2. Helper Functions
+def run_mode(data_dir, mode: str) -> pd.DataFrame:
+    """원장 -> 성과 지표를 지정한 날짜 모드로 실행하고 05 결과를 반환합니다."""
+    data_dir(**{config.ENV_TIMELINE_MODE: mode})
+    assert config.TIMELINE_MODE == mode
+    create_daily_ledger()
+    calculate_metrics()
+    perf = pd.read_csv(config.PROCESSED_DIR / config.PROCESSED_FILES['performance'], parse_dates=['Date'])
+    return perf.set_index('Date')
+
+
+# 3. Tests
+def test_business_mode_keeps_calendar_twr(data_dir):
+    calendar = run_mode(data_dir, 'calendar')
+    business = run_mode(data_dir, 'business')
+
+    assert len(business) < len(calendar)
+    assert business.index.isin(calendar.index).all()
+    assert business['Cumulative_TWR'].iloc[-1] == pytest.approx(calendar['Cumulative_TWR'].iloc[-1], rel=1e-9)
+    pd.testing.assert_series_equal(business['Cumulative_TWR'], calendar.loc[business.index, 'Cumulative_TWR'],
+                                   check_exact=False, rtol=1e-9)
+    assert business['External_Flow'].sum() == pytest.approx(calendar['External_Flow'].sum())
+
+
+def test_carry_forward_moves_holidays_to_next_date():
+    index = build_timeline('2025-01-03', '2025-01-07', mode='business')  # 금 -> 화 (주말 제외)
+    assert list(index.day) == [3, 6, 7]
+
+    carried = carry_forward(['2025-01-04', '2025-01-05', '2025-01-06', '2025-01-08'], index)
+    assert list(carried[:3].day) == [6, 6, 6]
+    assert pd.isna(carried[3])
@@ -0,0 +1,33 @@
+"""
+@Title: Watch Daemon Tests
+@Description: 감시 데몬이 실행 전 프로젝트 모듈만 모듈 캐시에서 내리는지 (서드파티/설정/파이프라인 모듈은 유지) 확인합니다.
+@Author: Allen & Gemini
+@Date: 2026-10-19
+"""
+
+# 1. Imports
+import sys
+
+import pytest
+
+pytest.importorskip('watchdog')
+
+import config  # noqa: E402
+from pipeline import watcher  # noqa: E402
+
+
+# 2. Tests
+def test_evict_project_modules_keeps_config_and_pipeline(monkeypatch):
+    from data_loaders import io
+
+    # 테스트가 끝나면 원래 모듈 캐시로 복원 (다른 테스트가 가진 모듈 참조 유지)
+    for name in list(sys.modules):
+        monkeypatch.setitem(sys.modules, name, sys.modules[name])
+
+    assert watcher.evict_project_modules() > 0
+    assert 'data_loaders.io' not in sys.modules
+    assert {'config', 'pipeline.watcher', 'pipeline.stages', 'pandas'} <= set(sys.modules)
+
+    from data_loaders import io as reloaded
+    assert reloaded is not io
+    assert sys.modules['config'] is config
@@ -1,24 +1,45 @@
 """
 @Title: One-Click Pipeline Updater
 @Description: HTS 원본 데이터 파싱부터 퀀트 엔진, 타임머신 역산까지 모든 프로세스를 순차적으로 자동 실행합니다.
+              의존성 매니페스트를 기준으로 입력/코드가 바뀌지 않은 단계는 건너뜁니다. (Make-style 증분 실행)
 @Author: Allen & Gemini
 """
 
 import sys
+import json
+import argparse
+import tempfile
 import subprocess
 import time
 from pathlib import Path
+from typing import List, Optional
 
 # 프로젝트 루트 경로 설정 (_02Allenz_Portfolio_Manager)
 PROJECT_ROOT = Path(__file__).resolve().parent
 SRC_DIR = PROJECT_ROOT / "02src"
 
+# 진입점 부트스트랩: 'pip install -e .'로 설치하지 않은 체크아웃에서도 02src 패키지를 찾을 수 있게 함
+try:
+    import config
+except ImportError:
+    sys.path.insert(0, str(SRC_DIR))
+    import config
 
-def run_script(script_path: Path, step_name: str):
-    """지정된 파이썬 스크립트를 실행하고 결과를 출력합니다."""
+from pipeline.manifest import PipelineManifest
+from pipeline.stages import STAGES, STAGE_NAMES, Stage, stage_signature, stale_reason, downstream_of
+from pipeline.runner import run_incremental, stage_command, StageFailedError
+from pipeline import profiler
+
+
+def run_script(stage: Stage, command: Optional[List[str]] = None) -> float:
+    """
+    단계 모듈을 자식 프로세스('python -m <module>')로 실행하고 결과를 출력합니다.
+    command가 주어지면 (예: 프로파일러 래퍼) 해당 명령어로 실행합니다.
+    """
+    step_name = stage.label
     print(f"\n{'=' * 60}")
     print(f"🚀 [Step: {step_name}] 실행 중...")
-    print(f"📂 경로: {script_path.relative_to(PROJECT_ROOT)}")
+    print(f"📂 모듈: {stage.module}")
     print(f"{'=' * 60}")
 
     start_time = time.time()
@@ -26,13 +47,15 @@ def run_script(script_path: Path, step_name: str):
     try:
         # 현재 실행 중인 파이썬 인터프리터(가상환경 포함)를 사용하여 서브 프로세스 실행
         subprocess.run(
-            [sys.executable, str(script_path)],
+            command or stage_command(stage),
             check=True,
+            env=config.subprocess_env(),
             text=True,
             capture_output=False  # 로그를 실시간으로 터미널에 출력
         )
         elapsed = time.time() - start_time
         print(f"\n✅ [Success] {step_name} 완료 ({elapsed:.2f}초)")
+        return elapsed
 
     except subprocess.CalledProcessError as e:
         print(f"\n❌ [Error] {step_name} 실행 중 오류 발생!")
@@ -40,32 +63,102 @@ def run_script(script_path: Path, step_name: str):
         sys.exit(1)  # 파이프라인 즉시 중단
 
 
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Allenz Portfolio Manager 증분 파이프라인")
+    parser.add_argument('--force', action='append', default=[], choices=STAGE_NAMES + ['all'], metavar='STAGE',
+                        help=f"변경 여부와 무관하게 재실행할 단계 (반복 가능): {', '.join(STAGE_NAMES)}, all")
+    parser.add_argument('--dry-run', action='store_true', help="실행하지 않고 재실행 대상 단계만 출력")
+    parser.add_argument('--profile', action='store_true',
+                        help="단계별 Wall/CPU 시간, 메모리, 행/바이트 수, 네트워크 호출을 logs/에 JSON으로 기록")
+    parser.add_argument('--cprofile', action='store_true', help="--profile과 함께 cProfile 덤프 및 핫스팟 요약 저장")
+    parser.add_argument('--top', type=int, default=profiler.DEFAULT_TOP_N, help="핫스팟 요약 함수 개수 (기본 20)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="두 프로파일 리포트(JSON)를 비교")
+    parser.add_argument('--watch', action='store_true', help="raw 폴더를 감시하여 HTS 파일 변경 시 증분 파이프라인 자동 실행")
+    parser.add_argument('--data-dir', default=None, help="데이터 저장소(01DATA) 경로 재정의 (환경 변수 ALLENZ_DATA_DIR과 동일)")
+    parser.add_argument('--debounce', type=float, default=3.0, help="--watch 모드에서 마지막 파일 이벤트 후 대기 시간(초)")
+    return parser.parse_args()
+
+
+def print_plan(manifest: PipelineManifest, forced: set) -> None:
+    """현재 매니페스트 기준으로 재실행이 필요한 단계와 영향을 받을 수 있는 하위 단계를 출력합니다."""
+    stale = {}
+    for stage in STAGES:
+        reason = "강제 실행(--force)" if stage.name in forced else stale_reason(stage, manifest, stage_signature(stage, manifest))
+        if reason:
+            stale[stage.name] = reason
+
+    maybe = [name for name in downstream_of(list(stale)) if name not in stale]
+    for stage in STAGES:
+        if stage.name in stale:
+            print(f"🚀 {stage.name:<10} 재실행 ({stale[stage.name]})")
+        elif stage.name in maybe:
+            print(f"ℹ️ {stage.name:<10} 상위 단계 출력이 바뀌면 재실행")
+        else:
+            print(f"ℹ️ {stage.name:<10} 최신 상태")
+
+
 def main():
-    print(f"🔥 Allenz Portfolio Manager 데이터 파이프라인 가동 시작...")
+    args = _parse_args()
+    if args.data_dir:
+        config.configure(data_dir=Path(args.data_dir))
+    forced = set(STAGE_NAMES) if 'all' in args.force else set(args.force)
+    manifest = PipelineManifest.load()
+
+    if args.compare:
+        profiler.print_comparison(Path(args.compare[0]), Path(args.compare[1]))
+        return
 
-    # 실행할 스크립트 목록 (순서 보장)
-    pipeline = [
-        (SRC_DIR / "data_loaders" / "parser.py", "1. 데이터 파싱 (HTS -> CSV)"),
-        (SRC_DIR / "engines" / "ledger.py", "2. 자산 원장 생성 (Ledger)"),
-        (SRC_DIR / "engines" / "metrics.py", "3. 성과 지표 산출 (Metrics)"),
-        (SRC_DIR / "engines" / "benchmark.py", "4. 벤치마크 수집 (SPY/QQQ)"),
-        (SRC_DIR / "engines" / "history.py", "5. 타임머신 역산 (Historical Holdings)")
-    ]
+    if args.dry_run:
+        print_plan(manifest, forced)
+        return
 
+    config.ensure_dirs()
+    if args.watch:
+        from pipeline import watcher
+        watcher.run_watch(debounce_sec=args.debounce)
+        return
+
+    print(f"🔥 Allenz Portfolio Manager 데이터 파이프라인 가동 시작...")
     total_start = time.time()
 
-    for script_path, step_name in pipeline:
-        if not script_path.exists():
-            print(f"❌ 파일이 존재하지 않습니다: {script_path}")
-            sys.exit(1)
-        run_script(script_path, step_name)
+    # 프로파일 모드: 단계별 자식 프로세스가 계측 레코드를 임시 파일로 남김
+    profile_report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'stages': {}}
+    report_path = profiler.new_report_path() if args.profile else None
+    cprofile_dir = report_path.with_suffix('') if report_path and args.cprofile else None
 
+    def execute(stage: Stage) -> float:
+        if not args.profile:
+            return run_script(stage)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            record_path = Path(tmp_dir) / f"{stage.name}.json"
+            command = profiler.profile_command(stage, record_path, cprofile_dir, args.top)
+            elapsed = run_script(stage, command)
+            with open(record_path, 'r', encoding='utf-8') as f:
+                profile_report['stages'][stage.name] = json.load(f)
+        return elapsed
+
+    try:
+        executed = run_incremental(manifest, execute, forced)
+    except StageFailedError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     total_elapsed = time.time() - total_start
+
+    if report_path:
+        for name in STAGE_NAMES:
+            profile_report['stages'].setdefault(name, {'skipped': True})
+        profile_report['total_wall_sec'] = round(total_elapsed, 4)
+        profile_report['data_version'] = manifest.data_version
+        profiler.save_report(profile_report, report_path)
     print(f"\n{'=' * 60}")
-    print(f"🎉 모든 파이프라인 업데이트가 성공적으로 완료되었습니다!")
+    if executed:
+        print(f"🎉 파이프라인 업데이트 완료! 실행된 단계: {', '.join(executed)}")
+    else:
+        print(f"✅ 모든 아티팩트가 최신 상태입니다. (실행된 단계 없음)")
+    print(f"ℹ️ 데이터 버전: {manifest.data_version}")
     print(f"⏱️ 총 소요 시간: {total_elapsed:.2f}초")
     print(f"{'=' * 60}")
-    print(f"\n💡 터미널에 'streamlit run 02src/ui/app.py'를 입력하여 대시보드를 확인하세요.")
+    print(f"\n💡 터미널에 'streamlit run main.py'를 입력하여 대시보드를 확인하세요.")
 
 
 if __name__ == "__main__":